@@ -1,5 +1,5 @@
-from dataclasses import dataclass
-from typing import Literal, Optional
+from dataclasses import dataclass, field
+from typing import BinaryIO, Callable, Dict, Literal, Optional, Tuple
 
 
 @dataclass(slots=True)
@@ -18,6 +18,15 @@ class DeleteDocUnitRequest:
     unit_id: str
 
 
+@dataclass(frozen=True, slots=True)
+class DocUnitSummary:
+    """What unit lists show; readable without building the unit's hierarchy."""
+
+    unit_id: str
+    name: str
+    created_at: Optional[str]
+
+
 @dataclass(slots=True)
 class SetActiveDocUnitRequest:
     unit_id: Optional[str]
@@ -29,6 +38,37 @@ class ImportAssetRequest:
     source_path: str
 
 
+@dataclass(slots=True)
+class ImportAssetsRequest:
+    unit_id: str
+    source_paths: list[str]
+    parent_node_id: Optional[str] = None
+
+
+@dataclass(slots=True)
+class ImportAssetsResponse:
+    node_ids: list[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+    cancelled: bool = False
+
+
+@dataclass(slots=True)
+class ImportTreeRequest:
+    unit_id: str
+    source_path: str
+    parent_node_id: Optional[str] = None
+
+
+@dataclass(frozen=True, slots=True)
+class ImportSourceEntry:
+    """One importable file of a directory tree or archive, opened only when copied."""
+
+    folders: Tuple[str, ...]
+    name: str
+    suffix: str
+    open: Callable[[], BinaryIO]
+
+
 @dataclass(slots=True)
 class CreateHierarchyFolderRequest:
     anchor_node_id: Optional[str]
@@ -59,3 +99,21 @@ class MoveHierarchyNodesRequest:
 class SelectHierarchyNodeRequest:
     primary_node_id: Optional[str]
     selected_node_ids: list[str]
+
+
+@dataclass(frozen=True, slots=True)
+class PreviewCacheStats:
+    """Counters of an asset preview cache since it was created."""
+
+    memory_hits: int = 0
+    memory_misses: int = 0
+    disk_hits: int = 0
+    renders: int = 0
+    failures: int = 0
+    evictions: int = 0
+    discarded: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        requests = self.memory_hits + self.memory_misses
+        return self.memory_hits / requests if requests else 0.0
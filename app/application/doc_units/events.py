@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import time
 from collections import defaultdict
+from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import Callable, DefaultDict, List, Optional, Type, TypeVar
+from typing import Any, Callable, DefaultDict, Dict, Hashable, Iterator, List, Optional, Tuple, Type, TypeVar
 
 from app.domain.doc_units.entities import HierarchyNode
+from app.domain.doc_units.services import HierarchyChange
 
 
 @dataclass(slots=True)
@@ -22,6 +25,29 @@ class ProjectDirtyStateChanged:
     is_dirty: bool
 
 
+@dataclass(slots=True)
+class ProjectSaveStarted:
+    save_path: str
+
+
+@dataclass(slots=True)
+class ProjectSaveProgress:
+    stage: str
+    completed: int
+    total: int
+
+
+@dataclass(slots=True)
+class ProjectSaveFinished:
+    access_path: Optional[str]
+    error: Optional[str]
+    duration_s: float
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None
+
+
 @dataclass(slots=True)
 class HierarchyLoaded:
     unit_id: str
@@ -30,9 +56,19 @@ class HierarchyLoaded:
 
 @dataclass(slots=True)
 class HierarchyUpdated:
+    """A new hierarchy ``root`` for a unit.
+
+    When ``changes`` is set it lists the row-level steps that turn
+    ``previous_root`` into ``root``, so listeners holding ``previous_root``
+    can patch their view instead of rebuilding it. ``None`` means the change
+    is only known as a whole.
+    """
+
     unit_id: str
     root: HierarchyNode
     changed_node_ids: List[str]
+    changes: Optional[List[HierarchyChange]] = None
+    previous_root: Optional[HierarchyNode] = None
 
 
 @dataclass(slots=True)
@@ -46,13 +82,146 @@ EventT = TypeVar("EventT")
 Handler = Callable[[EventT], None]
 
 
+@dataclass(slots=True)
+class EventTypeStats:
+    published: int = 0
+    coalesced: int = 0
+    dispatched: int = 0
+
+
+@dataclass(slots=True)
+class HandlerStats:
+    label: str = ""
+    calls: int = 0
+    total_s: float = 0.0
+    max_s: float = 0.0
+
+    @property
+    def mean_s(self) -> float:
+        return self.total_s / self.calls if self.calls else 0.0
+
+
 class DocUnitEventBus:
+    """Synchronous publish/subscribe hub for doc unit and project events.
+
+    Inside :meth:`batch` events are buffered and merged. Events are scoped
+    to their unit, or to the project when they carry none, and a run of
+    events of one kind within a scope collapses into one event at the run's
+    position: the last event wins, except that :class:`HierarchyUpdated`
+    events take the union of their ``changed_node_ids`` and, when they
+    chain, their ``changes`` concatenated. An event of another kind ends the
+    run, so listeners see the events of a scope in the order they happened.
+    The merged events are dispatched once the outermost batch completes; a
+    batch that raises drops the events published inside it.
+
+    Dispatch counts per event type are kept in :attr:`stats`, call timings
+    per subscribed handler in :attr:`handler_stats`, keyed by ``id`` of the
+    handler and labelled with its qualified name.
+    """
+
     def __init__(self) -> None:
-        self._handlers: DefaultDict[Type, List[Callable]] = defaultdict(list)
+        self._handlers: Dict[Type, Tuple[Callable, ...]] = {}
+        self._batch_depth = 0
+        self._pending: List[Any] = []
+        self.stats: DefaultDict[str, EventTypeStats] = defaultdict(EventTypeStats)
+        self.handler_stats: Dict[int, HandlerStats] = {}
 
     def subscribe(self, event_type: Type[EventT], handler: Handler[EventT]) -> None:
-        self._handlers[event_type].append(handler)
+        # Copy on write, so publishing never has to copy the handler list.
+        self._handlers[event_type] = (*self._handlers.get(event_type, ()), handler)
 
     def publish(self, event: EventT) -> None:
-        for handler in list(self._handlers.get(type(event), [])):
-            handler(event)
+        self.stats[type(event).__name__].published += 1
+        if self._batch_depth:
+            self._pending.append(event)
+            return
+        self._dispatch(event)
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Buffer events published in the block and deliver them merged when it completes."""
+        self._batch_depth += 1
+        start = len(self._pending)
+        try:
+            yield
+        except BaseException:
+            # The block did not finish, so its events may describe state that never came to be.
+            del self._pending[start:]
+            raise
+        finally:
+            self._batch_depth -= 1
+        if not self._batch_depth:
+            pending, self._pending = self._pending, []
+            for event in self._coalesce(pending):
+                self._dispatch(event)
+
+    def reset_stats(self) -> None:
+        self.stats.clear()
+        self.handler_stats.clear()
+
+    def _dispatch(self, event: Any) -> None:
+        handlers = self._handlers.get(type(event), ())
+        self.stats[type(event).__name__].dispatched += len(handlers)
+        for handler in handlers:
+            started = time.perf_counter()
+            try:
+                handler(event)
+            finally:
+                elapsed = time.perf_counter() - started
+                stats = self.handler_stats.get(id(handler))
+                if stats is None:
+                    stats = HandlerStats(label=getattr(handler, "__qualname__", repr(handler)))
+                    self.handler_stats[id(handler)] = stats
+                stats.calls += 1
+                stats.total_s += elapsed
+                stats.max_s = max(stats.max_s, elapsed)
+
+    def _coalesce(self, events: List[Any]) -> List[Any]:
+        merged: List[Any] = []
+        # Key and position in ``merged`` of the latest event per scope; only that one takes merges.
+        runs: Dict[Hashable, Tuple[Hashable, int]] = {}
+        for position, event in enumerate(events):
+            key = _coalesce_key(event, position)
+            scope = getattr(event, "unit_id", None) if isinstance(event, _LATEST_PER_UNIT) else None
+            run = runs.get(scope)
+            if run is not None and run[0] == key:
+                self.stats[type(event).__name__].coalesced += 1
+                merged[run[1]] = _merge(merged[run[1]], event)
+                continue
+            runs[scope] = (key, len(merged))
+            merged.append(event)
+        return merged
+
+
+_LATEST_WINS: Tuple[Type, ...] = (
+    DocUnitListUpdated,
+    ActiveDocUnitChanged,
+    ProjectDirtyStateChanged,
+    ProjectSaveProgress,
+)
+_LATEST_PER_UNIT: Tuple[Type, ...] = (HierarchyLoaded, HierarchyUpdated, HierarchySelectionChanged)
+
+
+def _coalesce_key(event: Any, position: int) -> Hashable:
+    if isinstance(event, _LATEST_WINS):
+        return type(event)
+    if isinstance(event, _LATEST_PER_UNIT):
+        return type(event), event.unit_id
+    return type(event), position
+
+
+def _merge(previous: Any, event: Any) -> Any:
+    if isinstance(event, HierarchyUpdated):
+        chained = (
+            previous.changes is not None
+            and event.changes is not None
+            and event.previous_root is previous.root
+        )
+        return HierarchyUpdated(
+            unit_id=event.unit_id,
+            root=event.root,
+            changed_node_ids=list(dict.fromkeys([*previous.changed_node_ids, *event.changed_node_ids])),
+            changes=[*previous.changes, *event.changes] if chained else None,
+            previous_root=previous.previous_root if chained else None,
+        )
+    return event
@@ -1,20 +1,26 @@
 from __future__ import annotations
 
-from typing import Optional, Protocol
+from typing import BinaryIO, Callable, Iterable, Mapping, Optional, Protocol, Sequence
 
+from app.application.doc_units.dto import DocUnitSummary, ImportSourceEntry
 from app.domain.doc_units.entities import DocUnit, HierarchyNode, AssetPointer
+from app.domain.doc_units.services import HierarchyIndex
 from app.domain.doc_units.value_objects import DocUnitId
 
 
 class DocUnitRepository(Protocol):
     def list_units(self) -> list[DocUnit]: ...
+    def list_summaries(self) -> list[DocUnitSummary]: ...
     def get_unit(self, unit_id: DocUnitId) -> Optional[DocUnit]: ...
     def save_unit(self, doc_unit: DocUnit) -> None: ...
     def delete_unit(self, unit_id: DocUnitId) -> None: ...
+    def units_with_staged_assets(self) -> list[DocUnit]: ...
+    def asset_reference_counts(self) -> Mapping[str, int]: ...
 
 
 class DocUnitHierarchyRepository(Protocol):
     def get_hierarchy(self, unit_id: DocUnitId) -> HierarchyNode: ...
+    def get_hierarchy_index(self, unit_id: DocUnitId) -> HierarchyIndex: ...
     def save_hierarchy(self, unit_id: DocUnitId, hierarchy: HierarchyNode) -> None: ...
 
 
@@ -25,8 +31,35 @@ class ActiveDocUnitStore(Protocol):
 
 class MediaStore(Protocol):
     def import_temp(self, source_path: str) -> AssetPointer: ...
+    def import_stream(self, open_source: Callable[[], BinaryIO], suffix: str) -> AssetPointer: ...
     def promote(self, pointer: AssetPointer) -> AssetPointer: ...
+    def promote_many(
+        self,
+        pointers: Sequence[AssetPointer],
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> list[AssetPointer]: ...
     def resolve_path(self, pointer: AssetPointer) -> str: ...
     def cleanup_temp(self) -> None: ...
     def list_final_assets(self) -> list[str]: ...
     def delete_asset(self, path_hint: str) -> None: ...
+    def delete_assets(self, path_hints: Iterable[str]) -> None: ...
+    def collect_garbage(
+        self, reference_counts: Mapping[str, int], project_root: Optional[str] = None
+    ) -> list[str]: ...
+
+
+class ImportSourceReader(Protocol):
+    def read_entries(self, source_path: str) -> list[ImportSourceEntry]: ...
+
+
+class PreviewRenderer(Protocol):
+    """Decodes an image and downsamples it; must be safe to call from worker threads."""
+
+    def render(self, source_path: str, max_edge: int) -> bytes: ...
+
+
+class PreviewStore(Protocol):
+    """Persistent cache of rendered previews, keyed by an opaque string."""
+
+    def get(self, key: str) -> Optional[bytes]: ...
+    def put(self, key: str, data: bytes) -> None: ...
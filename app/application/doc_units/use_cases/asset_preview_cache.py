@@ -0,0 +1,296 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor, Future
+from dataclasses import fields
+from typing import Callable, Collection, Dict, List, Optional, Set, Tuple
+
+from app.application.doc_units.dto import PreviewCacheStats
+from app.application.doc_units.ports import MediaStore, PreviewRenderer, PreviewStore
+from app.application.project.ports import MainThreadDispatcher
+from app.domain.doc_units.entities import AssetPointer
+
+log = logging.getLogger(__name__)
+
+PreviewKey = Tuple[str, int, int]
+LoadKey = Tuple[str, int]
+PreviewCallback = Callable[[Optional[bytes]], None]
+
+
+class AssetPreviewCache:
+    """Downsampled previews of image assets, rendered off the UI thread.
+
+    A preview is keyed by asset id, source mtime and size, so replacing the
+    file on disk produces a fresh one. Mtimes are read on the worker and
+    trusted for ``recheck_interval_s``; past that a memory hit is still served
+    while the file is stat-ed again in the background, so the UI thread never
+    touches the disk. A source that could not be read is reported as having
+    no preview for the same interval and then tried again; the latest caller
+    told so is called back if the source turns up. Lookups go memory first
+    (an LRU bounded by ``memory_budget_bytes``), then ``store`` (the on-disk
+    cache), and only then render on ``executor``. Requests for a key already in flight share
+    the render. Everything except the disk and decode work runs on the UI
+    thread; results come back through ``dispatcher``.
+
+    At most ``max_in_flight`` loads run at once. The rest wait in a queue
+    ordered by priority and, within a priority, newest first: the rows a user
+    just scrolled to matter more than the ones they scrolled past.
+    """
+
+    DEFAULT_MEMORY_BUDGET_BYTES = 64 * 1024 * 1024
+    PRIORITY_VISIBLE = 0
+    PRIORITY_PREFETCH = 1
+
+    def __init__(
+        self,
+        media_store: MediaStore,
+        renderer: PreviewRenderer,
+        store: PreviewStore,
+        dispatcher: MainThreadDispatcher,
+        executor: Executor,
+        memory_budget_bytes: int = DEFAULT_MEMORY_BUDGET_BYTES,
+        max_in_flight: int = 2,
+        recheck_interval_s: float = 2.0,
+    ) -> None:
+        self._media_store = media_store
+        self._renderer = renderer
+        self._store = store
+        self._dispatcher = dispatcher
+        self._executor = executor
+        self._memory_budget_bytes = memory_budget_bytes
+        self._max_in_flight = max(1, max_in_flight)
+        self._recheck_interval_s = recheck_interval_s
+        self._memory: OrderedDict[PreviewKey, bytes] = OrderedDict()
+        self._memory_bytes = 0
+        self._failed: Set[PreviewKey] = set()
+        # Last known source mtime per asset id (``None`` if unreadable) and when it was read.
+        self._mtimes: Dict[str, Tuple[Optional[int], float]] = {}
+        self._rechecking: Set[str] = set()
+        # Latest caller per load told the source is unreadable, called back once it can be read.
+        self._parked: Dict[LoadKey, Tuple[AssetPointer, PreviewCallback]] = {}
+        # Callbacks of every load that is queued or running.
+        self._pending: Dict[LoadKey, List[PreviewCallback]] = {}
+        # Heap of (priority, -sequence, key); entries not matching ``_queued`` are stale.
+        self._queue: List[Tuple[int, int, LoadKey]] = []
+        self._queued: Dict[LoadKey, Tuple[int, int]] = {}
+        self._pointers: Dict[LoadKey, AssetPointer] = {}
+        self._sequence = itertools.count()
+        self._in_flight = 0
+        self._counts: Dict[str, int] = {field.name: 0 for field in fields(PreviewCacheStats)}
+
+    @property
+    def memory_bytes(self) -> int:
+        return self._memory_bytes
+
+    @property
+    def stats(self) -> PreviewCacheStats:
+        return PreviewCacheStats(**self._counts)
+
+    def request(
+        self,
+        pointer: AssetPointer,
+        max_edge: int,
+        on_ready: Optional[PreviewCallback] = None,
+        priority: int = PRIORITY_VISIBLE,
+    ) -> Optional[bytes]:
+        """Return the cached preview, or ``None`` and call ``on_ready`` on the UI thread once rendered.
+
+        ``on_ready`` receives ``None`` when the asset cannot be read or decoded.
+        Without ``on_ready`` the call only warms the cache.
+        """
+        asset_id = pointer.asset_id.value
+        load_key: LoadKey = (asset_id, max_edge)
+        known = self._mtimes.get(asset_id)
+        if known is not None and known[0] is None:
+            if time.monotonic() - known[1] <= self._recheck_interval_s:
+                self._counts["memory_misses"] += 1
+                self._notify_unavailable(on_ready)
+                if on_ready is not None:
+                    self._parked[load_key] = (pointer, on_ready)
+                return None
+            # Stale failures are loaded again like a first request.
+            del self._mtimes[asset_id]
+            known = None
+        if known is not None:
+            mtime_ns, checked_at = known
+            if time.monotonic() - checked_at > self._recheck_interval_s:
+                self._recheck(pointer)
+            key: PreviewKey = (asset_id, mtime_ns, max_edge)
+            cached = self._memory.get(key)
+            if cached is not None:
+                self._memory.move_to_end(key)
+                self._counts["memory_hits"] += 1
+                return cached
+            if key in self._failed:
+                self._counts["memory_misses"] += 1
+                self._notify_unavailable(on_ready)
+                return None
+        self._counts["memory_misses"] += 1
+
+        parked = self._parked.pop(load_key, None)
+        waiting = self._start(load_key, pointer, priority)
+        if parked is not None and parked[1] is not on_ready:
+            waiting.append(parked[1])
+        if on_ready is not None:
+            waiting.append(on_ready)
+        self._pump()
+        return None
+
+    def discard_queued(self, max_edge: int, keep_asset_ids: Collection[str]) -> None:
+        """Forget queued (not yet started) ``max_edge`` requests for assets outside ``keep_asset_ids``.
+
+        Their callbacks are dropped without being called.
+        """
+        for key in [key for key in self._queued if key[1] == max_edge and key[0] not in keep_asset_ids]:
+            del self._queued[key]
+            self._pending.pop(key, None)
+            self._pointers.pop(key, None)
+            self._counts["discarded"] += 1
+        self._compact_queue()
+
+    def clear(self) -> None:
+        """Drop the in-memory previews; the on-disk cache is kept."""
+        self._memory.clear()
+        self._memory_bytes = 0
+        self._failed.clear()
+        self._mtimes.clear()
+        self._parked.clear()
+
+    def _start(self, load_key: LoadKey, pointer: AssetPointer, priority: int) -> List[PreviewCallback]:
+        """Queue a load unless one is pending, and return the callbacks waiting for it."""
+        waiting = self._pending.get(load_key)
+        if waiting is None:
+            waiting = self._pending[load_key] = []
+            self._pointers[load_key] = pointer
+            self._enqueue(load_key, priority)
+        elif load_key in self._queued and priority < self._queued[load_key][0]:
+            self._enqueue(load_key, priority)
+        return waiting
+
+    def _wake(self, asset_id: str) -> None:
+        """Load again for callers parked on ``asset_id`` now that its source can be read."""
+        for load_key in [key for key in self._parked if key[0] == asset_id]:
+            pointer, callback = self._parked.pop(load_key)
+            self._start(load_key, pointer, self.PRIORITY_VISIBLE).append(callback)
+        self._pump()
+
+    def _enqueue(self, key: LoadKey, priority: int) -> None:
+        entry = (priority, -next(self._sequence))
+        self._queued[key] = entry
+        heapq.heappush(self._queue, (*entry, key))
+        self._compact_queue()
+
+    def _compact_queue(self) -> None:
+        if len(self._queue) > 2 * len(self._queued) + 32:
+            self._queue = [(*entry, key) for key, entry in self._queued.items()]
+            heapq.heapify(self._queue)
+
+    def _pump(self) -> None:
+        while self._in_flight < self._max_in_flight and self._queue:
+            priority, order, key = heapq.heappop(self._queue)
+            if self._queued.get(key) != (priority, order):
+                continue
+            del self._queued[key]
+            self._in_flight += 1
+            pointer = self._pointers.pop(key)
+            future = self._executor.submit(self._load, pointer, key[1])
+            future.add_done_callback(
+                lambda done, key=key, pointer=pointer: self._dispatcher.post(lambda: self._finish(key, pointer, done))
+            )
+
+    def _recheck(self, pointer: AssetPointer) -> None:
+        asset_id = pointer.asset_id.value
+        if asset_id in self._rechecking:
+            return
+        self._rechecking.add(asset_id)
+        future = self._executor.submit(self._stat, pointer)
+        future.add_done_callback(lambda done: self._dispatcher.post(lambda: self._finish_recheck(asset_id, done)))
+
+    def _notify_unavailable(self, on_ready: Optional[PreviewCallback]) -> None:
+        if on_ready is not None:
+            self._dispatcher.post(lambda: on_ready(None))
+
+    def _stat(self, pointer: AssetPointer) -> Tuple[str, int]:
+        """Worker side: the source path of ``pointer`` and its mtime."""
+        source_path = self._media_store.resolve_path(pointer)
+        return source_path, os.stat(source_path).st_mtime_ns
+
+    def _load(self, pointer: AssetPointer, max_edge: int) -> Tuple[PreviewKey, Optional[bytes], bool]:
+        """Worker side: read the disk cache or render and store a new preview.
+
+        Returns the preview key, the preview (``None`` if the source cannot be
+        decoded) and whether it came from the disk cache. Raises if the source
+        cannot be resolved or read.
+        """
+        source_path, mtime_ns = self._stat(pointer)
+        key: PreviewKey = (pointer.asset_id.value, mtime_ns, max_edge)
+        store_key = "-".join(map(str, key))
+        data = self._store.get(store_key)
+        if data is not None:
+            return key, data, True
+        started = time.perf_counter()
+        try:
+            data = self._renderer.render(source_path, max_edge)
+        except Exception as exc:  # noqa: BLE001 - any decode failure just means "no preview"
+            log.warning("Preview of %s failed: %s", key[0], exc)
+            return key, None, False
+        log.debug("Rendered preview of %s in %.3fs (%d bytes)", key[0], time.perf_counter() - started, len(data))
+        try:
+            self._store.put(store_key, data)
+        except OSError as exc:
+            log.warning("Could not store preview of %s: %s", key[0], exc)
+        return key, data, False
+
+    def _finish(self, load_key: LoadKey, pointer: AssetPointer, future: Future) -> None:
+        self._in_flight -= 1
+        callbacks = self._pending.pop(load_key, [])
+        data: Optional[bytes]
+        try:
+            key, data, from_disk = future.result()
+        except Exception as exc:  # noqa: BLE001 - an unreadable source just means "no preview"
+            log.debug("No preview for %s: %s", load_key[0], exc)
+            data = None
+            self._mtimes[load_key[0]] = (None, time.monotonic())
+            if callbacks:
+                self._parked[load_key] = (pointer, callbacks[-1])
+        else:
+            self._mtimes[key[0]] = (key[1], time.monotonic())
+            self._wake(key[0])
+            if data is None:
+                self._failed.add(key)
+                self._counts["failures"] += 1
+            else:
+                self._counts["disk_hits" if from_disk else "renders"] += 1
+                self._remember(key, data)
+        for callback in callbacks:
+            callback(data)
+        self._pump()
+
+    def _finish_recheck(self, asset_id: str, future: Future) -> None:
+        self._rechecking.discard(asset_id)
+        try:
+            _, mtime_ns = future.result()
+        except Exception as exc:  # noqa: BLE001
+            log.debug("No preview for %s: %s", asset_id, exc)
+            mtime_ns = None
+        self._mtimes[asset_id] = (mtime_ns, time.monotonic())
+        if mtime_ns is not None:
+            self._wake(asset_id)
+
+    def _remember(self, key: PreviewKey, data: bytes) -> None:
+        if len(data) > self._memory_budget_bytes:
+            return
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= len(previous)
+        self._memory[key] = data
+        self._memory_bytes += len(data)
+        while self._memory_bytes > self._memory_budget_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+            self._counts["evictions"] += 1
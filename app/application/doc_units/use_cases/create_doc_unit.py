@@ -45,11 +45,12 @@ class CreateDocUnit:
 
         self._active_store.set(unit_id)
 
-        units = self._repository.list_units()
-        self._events.publish(
-            DocUnitListUpdated([unit.unit_id.value for unit in units])
-        )
-        self._events.publish(ActiveDocUnitChanged(unit_id.value))
-        self._events.publish(ProjectDirtyStateChanged(True))
+        with self._events.batch():
+            summaries = self._repository.list_summaries()
+            self._events.publish(
+                DocUnitListUpdated([summary.unit_id for summary in summaries])
+            )
+            self._events.publish(ActiveDocUnitChanged(unit_id.value))
+            self._events.publish(ProjectDirtyStateChanged(True))
 
         return doc_unit
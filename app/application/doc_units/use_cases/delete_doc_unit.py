@@ -23,13 +23,14 @@ class DeleteDocUnit:
         unit_id = DocUnitId(request.unit_id)
         self._repository.delete_unit(unit_id)
 
-        active = self._active_store.get()
-        if active and active.value == unit_id.value:
-            self._active_store.set(None)
-            self._events.publish(ActiveDocUnitChanged(None))
+        with self._events.batch():
+            active = self._active_store.get()
+            if active and active.value == unit_id.value:
+                self._active_store.set(None)
+                self._events.publish(ActiveDocUnitChanged(None))
 
-        units = self._repository.list_units()
-        self._events.publish(
-            DocUnitListUpdated([unit.unit_id.value for unit in units])
-        )
-        self._events.publish(ProjectDirtyStateChanged(True))
+            summaries = self._repository.list_summaries()
+            self._events.publish(
+                DocUnitListUpdated([summary.unit_id for summary in summaries])
+            )
+            self._events.publish(ProjectDirtyStateChanged(True))
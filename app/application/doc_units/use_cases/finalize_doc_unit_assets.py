@@ -1,10 +1,15 @@
 ﻿from __future__ import annotations
 
-from typing import List, Set, Tuple
+import logging
+import time
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Tuple
 
 from app.application.doc_units.events import HierarchyUpdated
 from app.application.doc_units.ports import DocUnitRepository, MediaStore
-from app.domain.doc_units.entities import DocUnit, HierarchyNode
+from app.domain.doc_units.entities import AssetPointer, DocUnit, HierarchyNode
+from app.domain.doc_units.services import HierarchyChange
+
+log = logging.getLogger(__name__)
 
 
 class FinalizeDocUnitAssets:
@@ -19,77 +24,142 @@ class FinalizeDocUnitAssets:
         self._events = events
 
     def execute(self) -> None:
-        units = self._repository.list_units()
-        referenced_final_paths: Set[str] = set()
-
-        for unit in units:
-            promoted_hierarchy, changed_node_ids, changed, node_references = self._promote_hierarchy(unit.hierarchy)
-            referenced_final_paths.update(node_references)
-            if not changed:
-                continue
-
-            updated = DocUnit(
-                unit_id=unit.unit_id,
-                name=unit.name,
-                created_at=unit.created_at,
-                hierarchy=promoted_hierarchy,
-                metadata=unit.metadata,
-            )
-            self._repository.save_unit(updated)
-
-            if changed_node_ids:
+        promoted = self.promote(self.collect())
+        referenced = self.apply(promoted)
+        self.prune(referenced)
+
+    def collect(self) -> List[AssetPointer]:
+        """Pointers that still need promotion, one per asset.
+
+        Only units that reference a staged asset are visited; the repository
+        knows them without loading the others.
+        """
+        started = time.perf_counter()
+        pending: Dict[str, AssetPointer] = {}
+        for unit in self._repository.units_with_staged_assets():
+            stack = [unit.hierarchy]
+            while stack:
+                node = stack.pop()
+                if node.pointer and node.pointer.status != "final":
+                    pending.setdefault(node.pointer.asset_id.value, node.pointer)
+                stack.extend(node.children)
+        log.info("Asset finalization: collected %d pending assets in %.3fs", len(pending), time.perf_counter() - started)
+        return list(pending.values())
+
+    def promote(
+        self,
+        pointers: Sequence[AssetPointer],
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> Dict[str, AssetPointer]:
+        """Move staged files into final storage. Only touches the media store."""
+        if not pointers:
+            return {}
+        started = time.perf_counter()
+        promoted = self._media_store.promote_many(pointers, progress=progress)
+        log.info("Asset finalization: promoted %d assets in %.3fs", len(promoted), time.perf_counter() - started)
+        return {pointer.asset_id.value: pointer for pointer in promoted}
+
+    def apply(self, promoted: Dict[str, AssetPointer]) -> Mapping[str, int]:
+        """Point hierarchies at promoted assets and count the nodes referencing each final path.
+
+        Temp storage is cleared only when no node still references a staged
+        asset, e.g. one imported while ``promote`` ran on a worker. Counts come
+        from the repository, which recounts only units whose hierarchy changed.
+        """
+        started = time.perf_counter()
+        pending_temp = False
+
+        # Subscribers run once, after every hierarchy points at final assets.
+        with self._events.batch():
+            for unit in self._repository.units_with_staged_assets():
+                promoted_hierarchy, changed_node_ids, unit_pending = self._promote_hierarchy(unit.hierarchy, promoted)
+                pending_temp = pending_temp or unit_pending
+                if not changed_node_ids:
+                    continue
+
+                updated = DocUnit(
+                    unit_id=unit.unit_id,
+                    name=unit.name,
+                    created_at=unit.created_at,
+                    hierarchy=promoted_hierarchy,
+                    metadata=unit.metadata,
+                )
+                self._repository.save_unit(updated)
                 self._events.publish(
                     HierarchyUpdated(
                         unit_id=unit.unit_id.value,
                         root=promoted_hierarchy,
                         changed_node_ids=list(dict.fromkeys(changed_node_ids)),
+                        changes=self._pointer_changes(promoted_hierarchy, set(changed_node_ids)),
+                        previous_root=unit.hierarchy,
                     )
                 )
 
-        self._media_store.cleanup_temp()
-
-        existing_assets = set(self._media_store.list_final_assets())
-        orphaned = existing_assets - referenced_final_paths
-        for path_hint in orphaned:
-            self._media_store.delete_asset(path_hint)
-
-    def _promote_hierarchy(self, node: HierarchyNode) -> Tuple[HierarchyNode, List[str], bool, Set[str]]:
+        if not pending_temp:
+            self._media_store.cleanup_temp()
+        reference_counts = self._repository.asset_reference_counts()
+        log.info("Asset finalization: updated hierarchies in %.3fs", time.perf_counter() - started)
+        return reference_counts
+
+    def prune(self, reference_counts: Mapping[str, int], project_root: Optional[str] = None) -> None:
+        """Drop final assets no hierarchy references any more. Only touches the media store.
+
+        Pass ``project_root`` when pruning off the UI thread, so the counts
+        are applied to the project they were taken from.
+        """
+        started = time.perf_counter()
+        deleted = self._media_store.collect_garbage(reference_counts, project_root=project_root)
+        log.info("Asset finalization: collected %d unreferenced assets in %.3fs", len(deleted), time.perf_counter() - started)
+
+    @staticmethod
+    def _pointer_changes(root: HierarchyNode, node_ids: set[str]) -> List[HierarchyChange]:
+        """Promotion only swaps pointers, so the tree shape is unchanged."""
+        changes: List[HierarchyChange] = []
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            if node.node_id in node_ids:
+                changes.append(HierarchyChange(kind=HierarchyChange.UPDATED, node_id=node.node_id, node=node))
+            stack.extend(node.children)
+        return changes
+
+    @staticmethod
+    def _promote_hierarchy(
+        root: HierarchyNode, promoted: Dict[str, AssetPointer]
+    ) -> Tuple[HierarchyNode, List[str], bool]:
+        """Promote pointers under ``root``; returns the new root, swapped node ids and whether a staged pointer is left.
+
+        Walks the tree with an explicit stack; only nodes on the path to a
+        swapped pointer are re-created, everything else is shared.
+        """
         changed_ids: List[str] = []
-        pointer = node.pointer
-        pointer_changed = False
-        referenced_paths: Set[str] = set()
-
-        if pointer and pointer.status != "final":
-            promoted = self._media_store.promote(pointer)
-            pointer = promoted
-            pointer_changed = True
-            changed_ids.append(node.node_id)
-        if pointer and pointer.path_hint and pointer.status == "final":
-            referenced_paths.add(pointer.path_hint)
-
-        new_children: List[HierarchyNode] = []
-        children_changed = False
-
-        for child in node.children:
-            promoted_child, child_changed_ids, child_changed, child_references = self._promote_hierarchy(child)
-            new_children.append(promoted_child)
-            if child_changed_ids:
-                changed_ids.extend(child_changed_ids)
-            if child_changed:
-                children_changed = True
-            if child_references:
-                referenced_paths.update(child_references)
-
-        if pointer_changed or children_changed:
-            promoted_node = HierarchyNode(
-                node_id=node.node_id,
-                name=node.name,
-                node_type=node.node_type,
-                settings=dict(node.settings),
-                pointer=pointer,
-                children=new_children,
-            )
-            return promoted_node, changed_ids, True, referenced_paths
-
-        return node, changed_ids, False, referenced_paths
+        pending_temp = False
+        rebuilt: Dict[int, HierarchyNode] = {}
+        stack: List[Tuple[HierarchyNode, bool]] = [(root, False)]
+        while stack:
+            node, children_done = stack.pop()
+            pointer = node.pointer
+            swap = pointer is not None and pointer.status != "final" and pointer.asset_id.value in promoted
+            if not children_done:
+                if swap:
+                    changed_ids.append(node.node_id)
+                stack.append((node, True))
+                stack.extend((child, False) for child in reversed(node.children))
+                continue
 
+            if swap:
+                pointer = promoted[pointer.asset_id.value]
+            pending_temp = pending_temp or bool(pointer and pointer.status != "final")
+            children = [rebuilt[id(child)] for child in node.children]
+            if swap or any(new is not old for new, old in zip(children, node.children)):
+                rebuilt[id(node)] = HierarchyNode(
+                    node_id=node.node_id,
+                    name=node.name,
+                    node_type=node.node_type,
+                    settings=dict(node.settings),
+                    pointer=pointer,
+                    children=children,
+                )
+            else:
+                rebuilt[id(node)] = node
+        return rebuilt[id(root)], changed_ids, pending_temp
@@ -8,12 +8,7 @@ from app.application.doc_units.events import (
 from app.application.doc_units.ports import ActiveDocUnitStore, DocUnitHierarchyRepository
 from app.application.project.ports import IdGenerator
 from app.domain.doc_units.entities import HierarchyNode
-from app.domain.doc_units.services import (
-    collect_node_map,
-    collect_parent_map,
-    create_folder_node,
-    insert_nodes,
-)
+from app.domain.doc_units.services import HierarchyChange, create_folder_node, insert_nodes
 
 
 class CreateHierarchyFolder:
@@ -34,9 +29,9 @@ class CreateHierarchyFolder:
         if unit_id is None:
             raise RuntimeError("No active doc unit.")
 
-        root = self._repository.get_hierarchy(unit_id)
-        node_map = collect_node_map(root)
-        anchor = node_map.get(request.anchor_node_id) if request.anchor_node_id else None
+        index = self._repository.get_hierarchy_index(unit_id)
+        root = index.root
+        anchor = index.get(request.anchor_node_id) if request.anchor_node_id else None
 
         if request.anchor_node_id and anchor is None:
             raise KeyError(f"Anchor node '{request.anchor_node_id}' not found.")
@@ -49,28 +44,34 @@ class CreateHierarchyFolder:
                 raise ValueError("Cannot create folder inside non-folder node.")
             parent_id = anchor.node_id
             insert_index = len(anchor.children)
+        elif anchor is None:
+            parent_id = root.node_id
+            insert_index = len(root.children)
         else:
-            parents, indices = collect_parent_map(root)
-            if anchor is None:
+            parent = index.parent(anchor.node_id)
+            if parent is None:
                 parent_id = root.node_id
                 insert_index = len(root.children)
             else:
-                parent = parents.get(anchor.node_id)
-                parent_id = parent.node_id if parent else root.node_id
-                insert_index = indices.get(anchor.node_id, len(parent.children if parent else root.children))
+                parent_id = parent.node_id
+                insert_index = index.child_index(anchor.node_id)
 
         new_folder_id = self._ids.generate()
         new_folder = create_folder_node(new_folder_id, request.name)
 
-        updated_root = insert_nodes(root, parent_id, insert_index, [new_folder])
+        changes: list[HierarchyChange] = []
+        updated_root = insert_nodes(root, parent_id, insert_index, [new_folder], index=index, changes=changes)
         self._repository.save_hierarchy(unit_id, updated_root)
 
-        self._events.publish(
-            HierarchyUpdated(
-                unit_id=unit_id.value,
-                root=updated_root,
-                changed_node_ids=[new_folder_id],
+        with self._events.batch():
+            self._events.publish(
+                HierarchyUpdated(
+                    unit_id=unit_id.value,
+                    root=updated_root,
+                    changed_node_ids=[new_folder_id],
+                    changes=changes,
+                    previous_root=root,
+                )
             )
-        )
-        self._events.publish(ProjectDirtyStateChanged(True))
+            self._events.publish(ProjectDirtyStateChanged(True))
         return new_folder
@@ -6,7 +6,7 @@ from app.application.doc_units.events import (
     ProjectDirtyStateChanged,
 )
 from app.application.doc_units.ports import ActiveDocUnitStore, DocUnitHierarchyRepository
-from app.domain.doc_units.services import delete_nodes
+from app.domain.doc_units.services import HierarchyChange, delete_nodes
 
 
 class DeleteHierarchyNodes:
@@ -28,15 +28,20 @@ class DeleteHierarchyNodes:
         if not request.node_ids:
             return
 
-        root = self._repository.get_hierarchy(unit_id)
-        updated_root = delete_nodes(root, request.node_ids)
+        index = self._repository.get_hierarchy_index(unit_id)
+        previous_root = index.root
+        changes: list[HierarchyChange] = []
+        updated_root = delete_nodes(previous_root, request.node_ids, index=index, changes=changes)
         self._repository.save_hierarchy(unit_id, updated_root)
 
-        self._events.publish(
-            HierarchyUpdated(
-                unit_id=unit_id.value,
-                root=updated_root,
-                changed_node_ids=request.node_ids,
+        with self._events.batch():
+            self._events.publish(
+                HierarchyUpdated(
+                    unit_id=unit_id.value,
+                    root=updated_root,
+                    changed_node_ids=request.node_ids,
+                    changes=changes,
+                    previous_root=previous_root,
+                )
             )
-        )
-        self._events.publish(ProjectDirtyStateChanged(True))
+            self._events.publish(ProjectDirtyStateChanged(True))
@@ -7,7 +7,7 @@ from app.application.doc_units.events import (
 )
 from app.application.doc_units.ports import ActiveDocUnitStore, DocUnitHierarchyRepository
 from app.application.project.ports import IdGenerator
-from app.domain.doc_units.services import collect_node_map, move_nodes
+from app.domain.doc_units.services import HierarchyChange, move_nodes
 
 
 class MoveHierarchyNodes:
@@ -30,31 +30,42 @@ class MoveHierarchyNodes:
         if not request.node_ids:
             return
 
-        root = self._repository.get_hierarchy(unit_id)
-        before_ids = set(collect_node_map(root).keys())
+        index = self._repository.get_hierarchy_index(unit_id)
+        previous_root = index.root
+        generated_ids: list[str] = []
+        changes: list[HierarchyChange] = []
+
+        def _generate_id() -> str:
+            node_id = self._ids.generate()
+            generated_ids.append(node_id)
+            return node_id
 
         updated_root = move_nodes(
-            root,
+            previous_root,
             request.node_ids,
             request.target_parent_id,
             request.insert_index,
             copy=request.as_copy,
-            id_factory=self._ids.generate if request.as_copy else None,
+            id_factory=_generate_id if request.as_copy else None,
+            index=index,
+            changes=changes,
         )
 
         self._repository.save_hierarchy(unit_id, updated_root)
 
         if request.as_copy:
-            after_ids = set(collect_node_map(updated_root).keys())
-            changed_ids = list(after_ids - before_ids)
+            changed_ids = generated_ids
         else:
             changed_ids = list(dict.fromkeys(request.node_ids))
 
-        self._events.publish(
-            HierarchyUpdated(
-                unit_id=unit_id.value,
-                root=updated_root,
-                changed_node_ids=changed_ids,
+        with self._events.batch():
+            self._events.publish(
+                HierarchyUpdated(
+                    unit_id=unit_id.value,
+                    root=updated_root,
+                    changed_node_ids=changed_ids,
+                    changes=changes,
+                    previous_root=previous_root,
+                )
             )
-        )
-        self._events.publish(ProjectDirtyStateChanged(True))
+            self._events.publish(ProjectDirtyStateChanged(True))
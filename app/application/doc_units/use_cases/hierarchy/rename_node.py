@@ -6,7 +6,7 @@ from app.application.doc_units.events import (
     ProjectDirtyStateChanged,
 )
 from app.application.doc_units.ports import ActiveDocUnitStore, DocUnitHierarchyRepository
-from app.domain.doc_units.services import collect_node_map, rename_node
+from app.domain.doc_units.services import HierarchyChange, rename_node
 
 
 class RenameHierarchyNode:
@@ -25,19 +25,23 @@ class RenameHierarchyNode:
         if unit_id is None:
             raise RuntimeError("No active doc unit.")
 
-        root = self._repository.get_hierarchy(unit_id)
-        node_map = collect_node_map(root)
-        if request.node_id not in node_map:
+        index = self._repository.get_hierarchy_index(unit_id)
+        if request.node_id not in index:
             raise KeyError(f"Hierarchy node '{request.node_id}' not found.")
 
-        updated_root = rename_node(root, request.node_id, request.new_name)
+        previous_root = index.root
+        changes: list[HierarchyChange] = []
+        updated_root = rename_node(previous_root, request.node_id, request.new_name, index=index, changes=changes)
         self._repository.save_hierarchy(unit_id, updated_root)
 
-        self._events.publish(
-            HierarchyUpdated(
-                unit_id=unit_id.value,
-                root=updated_root,
-                changed_node_ids=[request.node_id],
+        with self._events.batch():
+            self._events.publish(
+                HierarchyUpdated(
+                    unit_id=unit_id.value,
+                    root=updated_root,
+                    changed_node_ids=[request.node_id],
+                    changes=changes,
+                    previous_root=previous_root,
+                )
             )
-        )
-        self._events.publish(ProjectDirtyStateChanged(True))
+            self._events.publish(ProjectDirtyStateChanged(True))
@@ -3,7 +3,6 @@ from __future__ import annotations
 from app.application.doc_units.dto import SelectHierarchyNodeRequest
 from app.application.doc_units.events import HierarchySelectionChanged
 from app.application.doc_units.ports import ActiveDocUnitStore, DocUnitHierarchyRepository
-from app.domain.doc_units.services import collect_node_map
 
 
 class SelectHierarchyNode:
@@ -22,16 +21,15 @@ class SelectHierarchyNode:
         if unit_id is None:
             raise RuntimeError("No active doc unit.")
 
-        root = self._repository.get_hierarchy(unit_id)
-        node_map = collect_node_map(root)
+        index = self._repository.get_hierarchy_index(unit_id)
 
         selected_ids = list(dict.fromkeys(request.selected_node_ids))
         for node_id in selected_ids:
-            if node_id not in node_map:
+            if node_id not in index:
                 raise KeyError(f"Hierarchy node '{node_id}' not found.")
 
         primary_node_id = request.primary_node_id
-        if primary_node_id and primary_node_id not in node_map:
+        if primary_node_id and primary_node_id not in index:
             raise KeyError(f"Hierarchy node '{primary_node_id}' not found.")
         if primary_node_id and primary_node_id not in selected_ids:
             selected_ids.insert(0, primary_node_id)
@@ -9,6 +9,7 @@ from app.application.doc_units.events import (
 from app.application.doc_units.ports import DocUnitRepository, MediaStore
 from app.application.project.ports import IdGenerator
 from app.domain.doc_units.entities import DocUnit, HierarchyNode
+from app.domain.doc_units.services import HierarchyChange
 from app.domain.doc_units.value_objects import DocUnitId
 
 
@@ -64,17 +65,28 @@ class ImportDocUnitAsset:
 
         self._repository.save_unit(updated)
 
-        units = self._repository.list_units()
-        self._events.publish(
-            DocUnitListUpdated([unit.unit_id.value for unit in units])
-        )
-        self._events.publish(
-            HierarchyUpdated(
-                unit_id=doc_unit.unit_id.value,
-                root=updated.hierarchy,
-                changed_node_ids=[node_id],
+        with self._events.batch():
+            summaries = self._repository.list_summaries()
+            self._events.publish(
+                DocUnitListUpdated([summary.unit_id for summary in summaries])
             )
-        )
-        self._events.publish(ProjectDirtyStateChanged(True))
+            self._events.publish(
+                HierarchyUpdated(
+                    unit_id=doc_unit.unit_id.value,
+                    root=updated.hierarchy,
+                    changed_node_ids=[node_id],
+                    changes=[
+                        HierarchyChange(
+                            kind=HierarchyChange.INSERTED,
+                            node_id=node_id,
+                            parent_id=new_root.node_id,
+                            row=len(new_children) - 1,
+                            node=new_node,
+                        )
+                    ],
+                    previous_root=doc_unit.hierarchy,
+                )
+            )
+            self._events.publish(ProjectDirtyStateChanged(True))
 
         return updated
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import logging
+import time
+import zipfile
+import zlib
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from functools import partial
+from pathlib import Path
+from typing import Callable, Dict, Hashable, List, Optional, Sequence, Tuple, TypeVar
+
+from app.application.doc_units.dto import ImportAssetsRequest, ImportAssetsResponse
+from app.application.doc_units.events import HierarchyUpdated, ProjectDirtyStateChanged
+from app.application.doc_units.ports import DocUnitHierarchyRepository, MediaStore
+from app.application.project.ports import IdGenerator
+from app.domain.doc_units.entities import AssetPointer, HierarchyNode
+from app.domain.doc_units.services import HierarchyChange, insert_nodes
+from app.domain.doc_units.value_objects import DocUnitId
+
+log = logging.getLogger(__name__)
+
+K = TypeVar("K", bound=Hashable)
+
+# Raised by one unreadable file or archive member; that entry fails, the import goes on.
+ENTRY_ERRORS = (OSError, ValueError, EOFError, zipfile.BadZipFile, zlib.error)
+
+
+class ImportDocUnitAssets:
+    """Import many files into one doc unit with a single hierarchy commit.
+
+    Files are staged through the media store on a bounded thread pool; the
+    hierarchy is read and written once, after every copy finished, and a
+    single :class:`HierarchyUpdated` is published. ``progress`` and
+    ``cancelled`` are called on the calling thread, so a GUI can pump its
+    event loop from them. A cancelled import commits nothing.
+    """
+
+    MAX_WORKERS = 8
+
+    def __init__(
+        self,
+        repository: DocUnitHierarchyRepository,
+        media_store: MediaStore,
+        ids: IdGenerator,
+        events,
+        max_workers: Optional[int] = None,
+    ) -> None:
+        self._repository = repository
+        self._media_store = media_store
+        self._ids = ids
+        self._events = events
+        self._max_workers = max_workers or self.MAX_WORKERS
+
+    def execute(
+        self,
+        request: ImportAssetsRequest,
+        progress: Optional[Callable[[int, int], None]] = None,
+        cancelled: Optional[Callable[[], bool]] = None,
+    ) -> ImportAssetsResponse:
+        unit_id = DocUnitId(request.unit_id)
+        # Fail fast on a missing unit before copying anything.
+        self._repository.get_hierarchy(unit_id)
+
+        started = time.perf_counter()
+        pointers, failed, was_cancelled = self.stage(request.source_paths, progress, cancelled)
+        if was_cancelled:
+            log.info("Import cancelled after staging %d of %d files", len(pointers), len(request.source_paths))
+            return ImportAssetsResponse(failed=failed, cancelled=True)
+
+        nodes = [
+            HierarchyNode(
+                node_id=self._ids.generate(),
+                name=Path(source_path).stem,
+                node_type=HierarchyNode.IMAGE_TYPE,
+                pointer=pointers[source_path],
+                settings={},
+            )
+            for source_path in request.source_paths
+            if source_path in pointers
+        ]
+        node_ids = self.commit(unit_id, request.parent_node_id, nodes)
+        log.info(
+            "Imported %d files (%d failed) in %.3fs",
+            len(node_ids),
+            len(failed),
+            time.perf_counter() - started,
+        )
+        return ImportAssetsResponse(node_ids=node_ids, failed=failed)
+
+    def stage(
+        self,
+        source_paths: List[str],
+        progress: Optional[Callable[[int, int], None]] = None,
+        cancelled: Optional[Callable[[], bool]] = None,
+    ) -> tuple[Dict[str, AssetPointer], Dict[str, str], bool]:
+        """Copy ``source_paths`` into temp storage; returns pointers, failures and whether it was cancelled."""
+        jobs = [
+            (source_path, partial(self._media_store.import_temp, source_path))
+            for source_path in dict.fromkeys(source_paths)
+        ]
+        return stage_assets(jobs, self._max_workers, progress, cancelled)
+
+    def commit(self, unit_id: DocUnitId, parent_node_id: Optional[str], nodes: List[HierarchyNode]) -> List[str]:
+        """Append ``nodes`` under ``parent_node_id`` (the root by default) in one hierarchy write."""
+        if not nodes:
+            return []
+        index = self._repository.get_hierarchy_index(unit_id)
+        parent = index.get(parent_node_id) if parent_node_id else index.root
+        if parent is None:
+            raise KeyError(f"Parent node '{parent_node_id}' not found.")
+        if parent.node_type != HierarchyNode.FOLDER_TYPE:
+            raise ValueError("Cannot import into non-folder node.")
+
+        previous_root = index.root
+        changes: List[HierarchyChange] = []
+        updated_root = insert_nodes(
+            previous_root, parent.node_id, len(parent.children), nodes, index=index, changes=changes
+        )
+        self._repository.save_hierarchy(unit_id, updated_root)
+
+        node_ids = [node.node_id for node in nodes]
+        with self._events.batch():
+            self._events.publish(
+                HierarchyUpdated(
+                    unit_id=unit_id.value,
+                    root=updated_root,
+                    changed_node_ids=node_ids,
+                    changes=changes,
+                    previous_root=previous_root,
+                )
+            )
+            self._events.publish(ProjectDirtyStateChanged(True))
+        return node_ids
+
+
+def stage_assets(
+    jobs: Sequence[Tuple[K, Callable[[], AssetPointer]]],
+    max_workers: int,
+    progress: Optional[Callable[[int, int], None]] = None,
+    cancelled: Optional[Callable[[], bool]] = None,
+) -> tuple[Dict[K, AssetPointer], Dict[K, str], bool]:
+    """Run media-store imports on a thread pool, at most ``2 * max_workers`` in flight.
+
+    The bounded window keeps memory flat for huge imports and lets a
+    cancellation stop promptly. ``progress`` and ``cancelled`` run on the
+    calling thread. Read errors, including corrupt archive members, are
+    collected per key instead of aborting.
+    """
+    pointers: Dict[K, AssetPointer] = {}
+    failed: Dict[K, str] = {}
+    total = len(jobs)
+    if not total:
+        return pointers, failed, False
+
+    window = max_workers * 2
+    remaining = iter(jobs)
+    running: Dict[Future, K] = {}
+    completed = 0
+    with ThreadPoolExecutor(max_workers=min(max_workers, total), thread_name_prefix="asset-import") as pool:
+
+        def fill() -> None:
+            for key, job in remaining:
+                running[pool.submit(job)] = key
+                if len(running) >= window:
+                    break
+
+        fill()
+        while running:
+            done, _ = wait(running, timeout=0.1, return_when=FIRST_COMPLETED)
+            for future in done:
+                key = running.pop(future)
+                try:
+                    pointers[key] = future.result()
+                except ENTRY_ERRORS as exc:
+                    failed[key] = str(exc)
+                completed += 1
+                if progress:
+                    progress(completed, total)
+            if cancelled and cancelled():
+                for future in running:
+                    future.cancel()
+                return pointers, failed, True
+            fill()
+    return pointers, failed, False
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import logging
+import time
+from functools import partial
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from app.application.doc_units.dto import ImportAssetsResponse, ImportTreeRequest
+from app.application.doc_units.ports import ImportSourceReader, MediaStore
+from app.application.doc_units.use_cases.import_doc_unit_assets import (
+    ImportDocUnitAssets,
+    stage_assets,
+)
+from app.application.project.ports import IdGenerator
+from app.domain.doc_units.entities import HierarchyNode
+from app.domain.doc_units.services import create_folder_node
+from app.domain.doc_units.value_objects import DocUnitId
+
+log = logging.getLogger(__name__)
+
+
+class ImportDocUnitTree:
+    """Import a directory tree or ZIP/CBZ archive, mirroring its folders in the hierarchy.
+
+    The source becomes one folder node named after it; sub-directories
+    become nested folders and images become image nodes in natural order.
+    Entries are streamed into the media store on the same bounded pool as
+    :class:`ImportDocUnitAssets`, and the whole tree is committed through it
+    as a single hierarchy update.
+    """
+
+    def __init__(
+        self,
+        importer: ImportDocUnitAssets,
+        source_reader: ImportSourceReader,
+        media_store: MediaStore,
+        ids: IdGenerator,
+        max_workers: Optional[int] = None,
+    ) -> None:
+        self._importer = importer
+        self._source_reader = source_reader
+        self._media_store = media_store
+        self._ids = ids
+        self._max_workers = max_workers or ImportDocUnitAssets.MAX_WORKERS
+
+    def execute(
+        self,
+        request: ImportTreeRequest,
+        progress: Optional[Callable[[int, int], None]] = None,
+        cancelled: Optional[Callable[[], bool]] = None,
+    ) -> ImportAssetsResponse:
+        unit_id = DocUnitId(request.unit_id)
+        started = time.perf_counter()
+        entries = self._source_reader.read_entries(request.source_path)
+        jobs = [
+            (position, partial(self._media_store.import_stream, entry.open, entry.suffix))
+            for position, entry in enumerate(entries)
+        ]
+        pointers, failed_positions, was_cancelled = stage_assets(jobs, self._max_workers, progress, cancelled)
+        failed = {
+            "/".join((*entries[position].folders, entries[position].name)): reason
+            for position, reason in failed_positions.items()
+        }
+        if was_cancelled:
+            log.info("Tree import cancelled after staging %d of %d entries", len(pointers), len(entries))
+            return ImportAssetsResponse(failed=failed, cancelled=True)
+
+        root_name = Path(request.source_path).stem or Path(request.source_path).name
+        # Folder contents keyed by path; sub-folders are listed by their path until built.
+        contents: Dict[Tuple[str, ...], List[Union[HierarchyNode, Tuple[str, ...]]]] = {(): []}
+        for position, entry in enumerate(entries):
+            pointer = pointers.get(position)
+            if pointer is None:
+                continue
+            for depth in range(1, len(entry.folders) + 1):
+                folder = entry.folders[:depth]
+                if folder not in contents:
+                    contents[folder] = []
+                    contents[folder[:-1]].append(folder)
+            contents[entry.folders].append(
+                HierarchyNode(
+                    node_id=self._ids.generate(),
+                    name=entry.name,
+                    node_type=HierarchyNode.IMAGE_TYPE,
+                    pointer=pointer,
+                    settings={},
+                )
+            )
+
+        def build(folder: Tuple[str, ...]) -> HierarchyNode:
+            node = create_folder_node(self._ids.generate(), folder[-1] if folder else root_name)
+            node.children.extend(build(item) if isinstance(item, tuple) else item for item in contents[folder])
+            return node
+
+        node_ids = self._importer.commit(unit_id, request.parent_node_id, [build(())]) if pointers else []
+        log.info(
+            "Imported %d of %d entries into %d folders in %.3fs",
+            len(pointers),
+            len(entries),
+            len(contents),
+            time.perf_counter() - started,
+        )
+        return ImportAssetsResponse(node_ids=node_ids, failed=failed)
@@ -0,0 +1,12 @@
+from app.application.doc_units.dto import DocUnitSummary
+from app.application.doc_units.ports import DocUnitRepository
+
+
+class ListDocUnitSummaries:
+    """Names and ids of every unit, without loading their hierarchies."""
+
+    def __init__(self, repository: DocUnitRepository) -> None:
+        self._repository = repository
+
+    def execute(self) -> list[DocUnitSummary]:
+        return self._repository.list_summaries()
@@ -27,10 +27,11 @@ class RenameDocUnit:
         )
         self._repository.save_unit(renamed)
 
-        units = self._repository.list_units()
-        self._events.publish(
-            DocUnitListUpdated([unit.unit_id.value for unit in units])
-        )
-        self._events.publish(ProjectDirtyStateChanged(True))
+        with self._events.batch():
+            summaries = self._repository.list_summaries()
+            self._events.publish(
+                DocUnitListUpdated([summary.unit_id for summary in summaries])
+            )
+            self._events.publish(ProjectDirtyStateChanged(True))
 
         return renamed
@@ -0,0 +1 @@
+"""Application layer use cases and ports for pipelines."""
@@ -0,0 +1,48 @@
+from dataclasses import dataclass, field
+from typing import Dict, Mapping, Optional
+
+
+@dataclass(frozen=True, slots=True)
+class RunBatchRequest:
+    unit_id: str
+    resume: bool = True
+    limit: Optional[int] = None
+
+
+@dataclass(frozen=True, slots=True)
+class PageRecord:
+    """A finished page, as the batch journal remembers it."""
+
+    node_id: str
+    fingerprint: str
+    output_path: str
+
+
+@dataclass(slots=True)
+class BatchReport:
+    processed: int = 0
+    skipped: int = 0
+    failed: Dict[str, str] = field(default_factory=dict)
+    seconds: float = 0.0
+    node_seconds: Dict[str, float] = field(default_factory=dict)
+    cancelled: bool = False
+
+    @property
+    def pages_per_second(self) -> float:
+        return self.processed / self.seconds if self.seconds else 0.0
+
+
+@dataclass(frozen=True, slots=True)
+class PageJob:
+    node_id: str
+    source_path: str
+    output_path: str
+
+
+@dataclass(frozen=True, slots=True)
+class PageOutcome:
+    """How a page went: seconds per pipeline node, or why it failed."""
+
+    job: PageJob
+    node_seconds: Mapping[str, float] = field(default_factory=dict)
+    error: Optional[str] = None
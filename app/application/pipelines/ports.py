@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from typing import Iterable, Iterator, Mapping, Protocol, Sequence, Tuple
+
+from app.application.pipelines.dto import PageJob, PageOutcome, PageRecord
+
+
+class PageProcessor(Protocol):
+    """Runs pages through a pipeline and writes the results."""
+
+    @property
+    def fingerprint(self) -> str:
+        """Identifies the pipeline; pages done with a different one are redone."""
+        ...
+
+    def process(self, source_path: str, output_path: str) -> Mapping[str, float]:
+        """Process the page and return the seconds spent per pipeline node; raises on failure."""
+        ...
+
+    def process_many(self, jobs: Iterable[PageJob]) -> Iterator[PageOutcome]:
+        """Process ``jobs`` and yield their outcomes in the same order.
+
+        ``jobs`` is consumed lazily, so a caller can stop handing out pages at
+        any time. This default runs them one by one; processors that run
+        pages concurrently override it.
+        """
+        for job in jobs:
+            try:
+                yield PageOutcome(job, self.process(job.source_path, job.output_path))
+            except Exception as exc:  # noqa: BLE001 - reported per page
+                yield PageOutcome(job, error=str(exc) or type(exc).__name__)
+
+
+class BatchOutputStore(Protocol):
+    """Where a batch writes pages, and which of them it already finished."""
+
+    def paths_for(self, pages: Sequence[Tuple[str, Sequence[str], str]]) -> Mapping[str, str]: ...
+    def completed(self) -> Mapping[str, PageRecord]: ...
+    def record(self, record: PageRecord) -> None: ...
+    def clear(self) -> None: ...
@@ -0,0 +1 @@
+"""Use case implementations for pipelines."""
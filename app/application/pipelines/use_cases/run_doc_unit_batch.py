@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import logging
+import os
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from app.application.doc_units.ports import DocUnitHierarchyRepository, MediaStore
+from app.application.pipelines.dto import BatchReport, PageJob, PageOutcome, PageRecord, RunBatchRequest
+from app.application.pipelines.ports import BatchOutputStore, PageProcessor
+from app.domain.doc_units.entities import HierarchyNode
+from app.domain.doc_units.value_objects import DocUnitId
+
+log = logging.getLogger(__name__)
+
+Page = Tuple[HierarchyNode, Tuple[str, ...]]
+
+
+class RunDocUnitBatch:
+    """Run every image page of a doc unit through a pipeline, resumably.
+
+    Pages go in hierarchy order, each written under its folder names. A
+    finished page is recorded in ``outputs`` with a fingerprint of its source
+    file and of the pipeline, so running again after a crash or a cancel
+    skips pages whose output is still current. A page that fails is reported
+    and the batch goes on. Pages are handed to the processor lazily, so one
+    that runs several at once still gets them in order and only as fast as
+    it finishes them. ``progress`` is called as pages finish; once
+    ``cancelled`` returns true no more pages are handed out, and those
+    already running are finished and recorded.
+    """
+
+    def __init__(
+        self,
+        repository: DocUnitHierarchyRepository,
+        media_store: MediaStore,
+        processor: PageProcessor,
+        outputs: BatchOutputStore,
+    ) -> None:
+        self._repository = repository
+        self._media_store = media_store
+        self._processor = processor
+        self._outputs = outputs
+
+    def execute(
+        self,
+        request: RunBatchRequest,
+        progress: Optional[Callable[[int, int], None]] = None,
+        cancelled: Optional[Callable[[], bool]] = None,
+    ) -> BatchReport:
+        pages: List[Page] = list(iter_pages(self._repository.get_hierarchy(DocUnitId(request.unit_id))))
+        # Named from every page of the unit, so a limited or resumed run writes the same files.
+        output_paths = self._outputs.paths_for([(node.node_id, folders, node.name) for node, folders in pages])
+        if request.limit is not None:
+            pages = pages[: request.limit]
+        if not request.resume:
+            self._outputs.clear()
+        done = self._outputs.completed()
+
+        report = BatchReport()
+        fingerprints: Dict[str, str] = {}
+
+        def finished() -> None:
+            if progress is not None:
+                progress(report.processed + report.skipped + len(report.failed), len(pages))
+
+        def jobs() -> Iterator[PageJob]:
+            for node, folders in pages:
+                if cancelled is not None and cancelled():
+                    report.cancelled = True
+                    return
+                job = self._job_for(node, output_paths[node.node_id], done.get(node.node_id), fingerprints, report)
+                if job is None:
+                    finished()
+                else:
+                    yield job
+
+        started = time.perf_counter()
+        for outcome in self._processor.process_many(jobs()):
+            self._finish_page(outcome, fingerprints.pop(outcome.job.node_id), report)
+            finished()
+        report.seconds = time.perf_counter() - started
+        log.info(
+            "Batch of %s: %d processed, %d skipped, %d failed in %.1fs (%.2f pages/s)",
+            request.unit_id,
+            report.processed,
+            report.skipped,
+            len(report.failed),
+            report.seconds,
+            report.pages_per_second,
+        )
+        return report
+
+    def _job_for(
+        self,
+        node: HierarchyNode,
+        output_path: str,
+        previous: Optional[PageRecord],
+        fingerprints: Dict[str, str],
+        report: BatchReport,
+    ) -> Optional[PageJob]:
+        """The job for a page, or None when it is skipped or has no source."""
+        try:
+            source_path = self._media_store.resolve_path(node.pointer)
+            stat = os.stat(source_path)
+        except (OSError, RuntimeError, ValueError) as exc:
+            log.warning("Page %s has no readable source: %s", node.node_id, exc)
+            report.failed[node.node_id] = str(exc)
+            return None
+
+        fingerprint = f"{self._processor.fingerprint}:{node.pointer.asset_id.value}:{stat.st_size}:{stat.st_mtime_ns}"
+        if previous is not None and previous.fingerprint == fingerprint:
+            report.skipped += 1
+            return None
+        fingerprints[node.node_id] = fingerprint
+        return PageJob(node.node_id, source_path, output_path)
+
+    def _finish_page(self, outcome: PageOutcome, fingerprint: str, report: BatchReport) -> None:
+        job = outcome.job
+        if outcome.error is not None:
+            log.warning("Page %s (%s) failed: %s", job.node_id, job.source_path, outcome.error)
+            report.failed[job.node_id] = outcome.error
+            return
+        self._outputs.record(PageRecord(job.node_id, fingerprint, job.output_path))
+        report.processed += 1
+        for name, seconds in outcome.node_seconds.items():
+            report.node_seconds[name] = report.node_seconds.get(name, 0.0) + seconds
+        log.info("Page %s done", job.output_path)
+
+
+def iter_pages(root: HierarchyNode) -> Iterator[Page]:
+    """Image nodes with a pointer, in hierarchy order, with the names of the folders above them."""
+    stack: List[Tuple[HierarchyNode, Tuple[str, ...]]] = [(root, ())]
+    while stack:
+        node, folders = stack.pop()
+        if node.node_type == HierarchyNode.IMAGE_TYPE:
+            if node.pointer is not None:
+                yield node, folders
+            continue
+        inner = folders if node is root else (*folders, node.name)
+        stack.extend((child, inner) for child in reversed(node.children))
@@ -1,6 +1,8 @@
 from dataclasses import dataclass
 from typing import Optional
 
+from app.domain.project.value_objects import ProjectData
+
 
 @dataclass(frozen=True, slots=True)
 class CreateProjectRequest:
@@ -17,6 +19,13 @@ class SaveProjectResponse:
     access_path: str
 
 
+@dataclass(frozen=True, slots=True)
+class PreparedProjectSave:
+    save_path: str
+    project: ProjectData
+    snapshot: ProjectData
+
+
 @dataclass(frozen=True, slots=True)
 class LoadProjectRequest:
     path: str
@@ -1,4 +1,4 @@
-from typing import Optional, Protocol
+from typing import Callable, List, Optional, Protocol
 from app.domain.project.value_objects import ProjectData
 
 
@@ -14,6 +14,39 @@ class CurrentProjectStore(Protocol):
 class ProjectRepository(Protocol):
     def load(self, path: str) -> ProjectData: ...
     def save(self, path: str, project_data: ProjectData) -> str: ...
+    def snapshot(self, project_data: ProjectData) -> ProjectData:
+        """Copy that ``save`` can persist on another thread while the original keeps changing."""
+        ...
+
+
+class PendingChangesSource(Protocol):
+    """Component that buffers edits and writes them into ``ProjectData`` on demand."""
+
+    def flush(self) -> None: ...
+
+
+class RecoveryStore(Protocol):
+    """Crash-recovery slot kept next to, never inside, the project's main files."""
+
+    def write(self, project_data: ProjectData) -> int:
+        """Persist unsaved changes of a snapshot; return the number of bytes written."""
+        ...
+
+    def clear(self, project_data: ProjectData) -> None: ...
+
+    def pending(self, project_data: ProjectData) -> bool:
+        """Whether the slot holds changes newer than the project's last save."""
+        ...
+
+    def restore(self, project_data: ProjectData) -> List[str]:
+        """Apply the slot to ``project_data`` as unsaved changes; return the recovered unit ids."""
+        ...
+
+
+class MainThreadDispatcher(Protocol):
+    """Runs callbacks on the thread that owns the UI and the event bus."""
+
+    def post(self, callback: Callable[[], None]) -> None: ...
 
 
 class ProjectSettingsStore(Protocol):
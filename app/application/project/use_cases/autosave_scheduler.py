@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from concurrent.futures import Executor, Future
+from dataclasses import dataclass
+from typing import Callable, Optional, Tuple
+
+from app.application.doc_units.events import (
+    DocUnitEventBus,
+    ProjectDirtyStateChanged,
+    ProjectSaveFinished,
+)
+from app.domain.project.value_objects import ProjectData
+
+from ..dto import SaveProjectRequest
+from ..errors import ProjectSaveLocationUndefinedError
+from ..ports import MainThreadDispatcher, RecoveryStore
+from .background_project_saver import BackgroundProjectSaver
+from .save_project import SaveProject
+
+log = logging.getLogger(__name__)
+
+Timer = Callable[[float, Callable[[], None]], None]
+
+
+@dataclass(frozen=True, slots=True)
+class AutosavePolicy:
+    debounce_s: float = 2.0
+    """Quiet period after the last edit before an autosave starts."""
+    max_delay_s: float = 30.0
+    """Upper bound on how long a stream of edits can postpone an autosave."""
+    min_interval_s: float = 60.0
+    """Minimum time between two autosave starts (the write-rate budget)."""
+
+
+@dataclass(slots=True)
+class AutosaveMetrics:
+    runs: int = 0
+    failures: int = 0
+    deferred: int = 0
+    bytes_written: int = 0
+    last_prepare_s: float = 0.0
+    max_prepare_s: float = 0.0
+    last_write_s: float = 0.0
+    max_write_s: float = 0.0
+    total_write_s: float = 0.0
+
+    @property
+    def mean_write_s(self) -> float:
+        return self.total_write_s / self.runs if self.runs else 0.0
+
+
+class AutosaveScheduler:
+    """Writes unsaved changes to a recovery slot after bursts of edits settle.
+
+    Dirty-state events start a debounce window; the autosave runs once edits
+    pause for ``debounce_s`` or after ``max_delay_s`` at the latest, but never
+    sooner than ``min_interval_s`` after the previous one. Flushing and
+    snapshotting happen on the UI thread (``last_prepare_s`` measures that
+    interactive cost); the recovery write goes to ``executor``, which should be
+    the worker shared with :class:`BackgroundProjectSaver` so writes stay
+    serialized. Autosaves wait while a regular save runs, and a successful
+    regular save clears the recovery slot.
+    """
+
+    def __init__(
+        self,
+        save_project: SaveProject,
+        recovery: RecoveryStore,
+        dispatcher: MainThreadDispatcher,
+        events: DocUnitEventBus,
+        executor: Executor,
+        policy: AutosavePolicy = AutosavePolicy(),
+        saver: Optional[BackgroundProjectSaver] = None,
+        timer: Optional[Timer] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._save_project = save_project
+        self._recovery = recovery
+        self._dispatcher = dispatcher
+        self._executor = executor
+        self._policy = policy
+        self._saver = saver
+        self._timer = timer or self._thread_timer
+        self._clock = clock
+        self._metrics = AutosaveMetrics()
+
+        self._dirty = False
+        self._armed = False
+        self._writing = False
+        self._first_edit: Optional[float] = None
+        self._last_edit = 0.0
+        self._last_start: Optional[float] = None
+
+        events.subscribe(ProjectDirtyStateChanged, self._on_dirty_state)
+        events.subscribe(ProjectSaveFinished, self._on_save_finished)
+
+    @property
+    def metrics(self) -> AutosaveMetrics:
+        return self._metrics
+
+    def _on_dirty_state(self, event: ProjectDirtyStateChanged) -> None:
+        self._dirty = event.is_dirty
+        if not event.is_dirty:
+            self._first_edit = None
+            return
+        now = self._clock()
+        self._last_edit = now
+        if self._first_edit is None:
+            self._first_edit = now
+        self._arm(self._policy.debounce_s)
+
+    def _on_save_finished(self, event: ProjectSaveFinished) -> None:
+        if not event.succeeded:
+            return
+        project_data = self._save_project.project_slot.get_data()
+        if project_data is not None:
+            self._executor.submit(self._clear, project_data)
+        if self._dirty:
+            # Edits made during the save still need a recovery copy.
+            self._first_edit = self._last_edit = self._clock()
+            self._arm(self._policy.debounce_s)
+
+    def _arm(self, delay: float) -> None:
+        if self._armed:
+            return
+        self._armed = True
+        self._timer(delay, self._on_timer)
+
+    def _on_timer(self) -> None:
+        self._armed = False
+        if not self._dirty or self._first_edit is None or self._writing:
+            return
+
+        now = self._clock()
+        wait = min(
+            self._last_edit + self._policy.debounce_s - now,
+            self._first_edit + self._policy.max_delay_s - now,
+        )
+        if self._last_start is not None:
+            wait = max(wait, self._last_start + self._policy.min_interval_s - now)
+        if self._saver is not None and self._saver.is_saving:
+            self._metrics.deferred += 1
+            wait = max(wait, self._policy.debounce_s)
+        if wait > 0:
+            self._arm(wait)
+            return
+        self._run(now)
+
+    def _run(self, now: float) -> None:
+        started = time.perf_counter()
+        try:
+            prepared = self._save_project.prepare(SaveProjectRequest())
+        except ProjectSaveLocationUndefinedError:
+            # Never saved: there is no project folder to hold a recovery slot yet.
+            self._metrics.deferred += 1
+            self._first_edit = None
+            return
+        prepare_s = time.perf_counter() - started
+        self._metrics.last_prepare_s = prepare_s
+        self._metrics.max_prepare_s = max(self._metrics.max_prepare_s, prepare_s)
+
+        self._writing = True
+        self._last_start = now
+        self._first_edit = None
+        future = self._executor.submit(self._write, prepared.snapshot)
+        future.add_done_callback(lambda done: self._dispatcher.post(lambda: self._on_written(done)))
+
+    def _write(self, snapshot: ProjectData) -> Tuple[int, float]:
+        started = time.perf_counter()
+        bytes_written = self._recovery.write(snapshot)
+        return bytes_written, time.perf_counter() - started
+
+    def _on_written(self, future: Future) -> None:
+        self._writing = False
+        try:
+            bytes_written, write_s = future.result()
+        except Exception as ex:
+            self._metrics.failures += 1
+            log.error("Autosave failed: %s", ex)
+        else:
+            metrics = self._metrics
+            metrics.runs += 1
+            metrics.bytes_written += bytes_written
+            metrics.last_write_s = write_s
+            metrics.max_write_s = max(metrics.max_write_s, write_s)
+            metrics.total_write_s += write_s
+            log.debug("Autosaved %d bytes in %.3fs", bytes_written, write_s)
+        if self._first_edit is not None:
+            self._arm(self._policy.debounce_s)
+
+    def _clear(self, project_data: ProjectData) -> None:
+        try:
+            self._recovery.clear(project_data)
+        except Exception as ex:
+            log.error("Failed to clear recovery slot: %s", ex)
+
+    def _thread_timer(self, delay: float, callback: Callable[[], None]) -> None:
+        timer = threading.Timer(delay, self._dispatcher.post, args=(callback,))
+        timer.daemon = True
+        timer.start()
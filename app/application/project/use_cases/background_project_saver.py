@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import logging
+import time
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+from app.application.doc_units.events import (
+    DocUnitEventBus,
+    ProjectDirtyStateChanged,
+    ProjectSaveFinished,
+    ProjectSaveProgress,
+    ProjectSaveStarted,
+)
+from app.application.doc_units.use_cases.finalize_doc_unit_assets import (
+    FinalizeDocUnitAssets,
+)
+from app.domain.doc_units.entities import AssetPointer
+from app.domain.project.value_objects import ProjectData
+
+from ..dto import PreparedProjectSave, SaveProjectRequest, SaveProjectResponse
+from ..ports import MainThreadDispatcher
+from .save_project import SaveProject
+
+log = logging.getLogger(__name__)
+
+
+class BackgroundProjectSaver:
+    """Runs project saves without blocking the UI thread.
+
+    A save alternates between the UI thread and a single worker thread:
+
+    1. UI: collect staged assets.
+    2. Worker: promote them (file moves).
+    3. UI: point hierarchies at the promoted assets, flush and snapshot.
+    4. Worker: write the snapshot, then delete orphaned assets of the
+       project root captured in step 3.
+    5. UI: record the saved location and report completion.
+
+    Only one save is in flight and the single worker orders all writes, so
+    saves never interleave. Requests made meanwhile are coalesced into one
+    follow-up save. Public methods must be called on the UI thread; worker
+    results come back through ``dispatcher``. Progress and completion are
+    published on the event bus.
+    """
+
+    def __init__(
+        self,
+        save_project: SaveProject,
+        dispatcher: MainThreadDispatcher,
+        events: DocUnitEventBus,
+        finalize_assets: Optional[FinalizeDocUnitAssets] = None,
+        executor: Optional[Executor] = None,
+    ) -> None:
+        self._save_project = save_project
+        self._dispatcher = dispatcher
+        self._events = events
+        self._finalize_assets = finalize_assets
+        self._executor = executor or ThreadPoolExecutor(max_workers=1, thread_name_prefix="project-save")
+        self._running = False
+        self._pending: Optional[SaveProjectRequest] = None
+        self._project: Optional[ProjectData] = None
+        self._snapshot_taken = False
+        self._dirtied_since_snapshot = False
+        self._started_at = 0.0
+
+        self._events.subscribe(ProjectDirtyStateChanged, self._on_dirty_state)
+
+    @property
+    def is_saving(self) -> bool:
+        return self._running
+
+    def request(self, req: SaveProjectRequest) -> None:
+        """Start a save, or queue one behind the save in flight.
+
+        Raises ``ProjectSaveLocationUndefinedError`` right away when there is
+        nowhere to save to, so the caller can prompt for a location.
+        """
+        save_path = self._save_project.resolve_save_path(req)
+        if self._running:
+            # A queued "save as" must not be downgraded by a later plain save.
+            if self._pending is None or req.path or not self._pending.path:
+                self._pending = req
+            return
+        self._start(req, save_path)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+    def _start(self, req: SaveProjectRequest, save_path: str) -> None:
+        self._running = True
+        self._project = self._save_project.project_slot.get_data()
+        self._snapshot_taken = False
+        self._dirtied_since_snapshot = False
+        self._started_at = time.perf_counter()
+        self._events.publish(ProjectSaveStarted(save_path))
+        try:
+            pointers = self._finalize_assets.collect() if self._finalize_assets else []
+        except Exception as ex:
+            self._finish(None, ex)
+            return
+        self._submit(lambda: self._promote(pointers), lambda promoted: self._prepare(req, promoted))
+
+    def _promote(self, pointers: List[AssetPointer]) -> Dict[str, AssetPointer]:
+        if not self._finalize_assets or not pointers:
+            return {}
+        return self._finalize_assets.promote(
+            pointers, progress=lambda done, total: self._report("promote", done, total)
+        )
+
+    def _prepare(self, req: SaveProjectRequest, promoted: Dict[str, AssetPointer]) -> None:
+        if self._save_project.project_slot.get_data() is not self._project:
+            raise RuntimeError("Project changed while it was being saved.")
+        referenced = self._finalize_assets.apply(promoted) if self._finalize_assets else None
+        prepared = self._save_project.prepare(req)
+        project_root = prepared.project.metadata.get("project_root_path")
+        self._snapshot_taken = True
+        self._submit(
+            lambda: self._write(prepared, referenced, project_root),
+            lambda response: self._complete(prepared, response),
+        )
+
+    def _write(
+        self,
+        prepared: PreparedProjectSave,
+        referenced: Optional[Mapping[str, int]],
+        project_root: Optional[str],
+    ) -> SaveProjectResponse:
+        self._report("write", 0, 1)
+        response = self._save_project.write(prepared)
+        self._report("write", 1, 1)
+        # Only once the manifest no longer references them; a failed prune leaves orphans, not a failed save.
+        if self._finalize_assets and referenced is not None and project_root:
+            try:
+                self._finalize_assets.prune(referenced, project_root)
+            except Exception as ex:
+                log.warning("Pruning unreferenced assets failed: %s", ex)
+        return response
+
+    def _complete(self, prepared: PreparedProjectSave, response: SaveProjectResponse) -> None:
+        self._save_project.complete(prepared, response)
+        self._finish(response.access_path, None)
+
+    def _finish(self, access_path: Optional[str], error: Optional[Exception]) -> None:
+        if not self._running:
+            log.error("Project save finished twice", exc_info=error)
+            return
+        self._running = False
+        self._project = None
+        duration = time.perf_counter() - self._started_at
+        if error is None:
+            log.info("Project saved to: %s (%.2fs)", access_path, duration)
+            if not self._dirtied_since_snapshot:
+                self._events.publish(ProjectDirtyStateChanged(False))
+        else:
+            log.error("Project save failed: %s", error)
+        self._events.publish(ProjectSaveFinished(access_path, str(error) if error else None, duration))
+
+        if self._pending is not None:
+            req, self._pending = self._pending, None
+            try:
+                self.request(req)
+            except Exception as ex:
+                log.error("Queued project save dropped: %s", ex)
+
+    def _submit(self, work: Callable[[], Any], then: Callable[[Any], None]) -> None:
+        future = self._executor.submit(work)
+        future.add_done_callback(lambda done: self._dispatcher.post(lambda: self._resume(done, then)))
+
+    def _resume(self, future: Future, then: Callable[[Any], None]) -> None:
+        try:
+            then(future.result())
+        except Exception as ex:
+            self._finish(None, ex)
+
+    def _report(self, stage: str, completed: int, total: int) -> None:
+        self._dispatcher.post(lambda: self._events.publish(ProjectSaveProgress(stage, completed, total)))
+
+    def _on_dirty_state(self, event: ProjectDirtyStateChanged) -> None:
+        if event.is_dirty and self._snapshot_taken:
+            self._dirtied_since_snapshot = True
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import logging
+from typing import List
+
+from ..ports import CurrentProjectStore, RecoveryStore
+
+log = logging.getLogger(__name__)
+
+
+class RestoreRecovery:
+    """Offers the autosaved changes a crash left behind for the current project.
+
+    Restored units become unsaved changes, so the slot stays in place until
+    the next regular save clears it; discarding deletes it right away.
+    """
+
+    def __init__(self, project_store: CurrentProjectStore, recovery: RecoveryStore) -> None:
+        self._project_store = project_store
+        self._recovery = recovery
+
+    def available(self) -> bool:
+        project_data = self._project_store.get_data()
+        if project_data is None or not project_data.metadata.get("project_root_path"):
+            return False
+        try:
+            return self._recovery.pending(project_data)
+        except Exception as ex:
+            log.error("Failed to inspect recovery slot: %s", ex)
+            return False
+
+    def execute(self) -> List[str]:
+        project_data = self._project_store.get_data()
+        if project_data is None:
+            raise RuntimeError("No project loaded.")
+        recovered = self._recovery.restore(project_data)
+        self._project_store.set_data(project_data)
+        log.info("Restored %d doc units from the recovery slot", len(recovered))
+        return recovered
+
+    def discard(self) -> None:
+        project_data = self._project_store.get_data()
+        if project_data is not None:
+            self._recovery.clear(project_data)
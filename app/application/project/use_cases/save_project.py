@@ -1,30 +1,76 @@
-from ..ports import CurrentProjectStore, ProjectRepository, ProjectSettingsStore
-from ..dto import SaveProjectRequest, SaveProjectResponse
+from typing import Sequence
+
+from app.domain.project.value_objects import ProjectData
+
+from ..ports import (
+    CurrentProjectStore,
+    PendingChangesSource,
+    ProjectRepository,
+    ProjectSettingsStore,
+)
+from ..dto import PreparedProjectSave, SaveProjectRequest, SaveProjectResponse
 from ..errors import InvalidProjectDataError, ProjectSaveLocationUndefinedError
 
 
 class SaveProject:
+    """Persist the current project.
+
+    ``execute`` runs the whole save. Background saves call the phases
+    separately: ``prepare`` and ``complete`` on the thread that owns the
+    project, ``write`` on a worker.
+    """
+
     def __init__(
         self,
         project_slot: CurrentProjectStore,
         project_repository: ProjectRepository,
         project_settings_store: ProjectSettingsStore,
+        pending_changes: Sequence[PendingChangesSource] = (),
     ):
         self.project_slot = project_slot
         self.project_repository = project_repository
         self.project_settings_store = project_settings_store
+        self.pending_changes = list(pending_changes)
 
 
     def execute(self, req: SaveProjectRequest) -> SaveProjectResponse:
-        if project_data := self.project_slot.get_data():
-            save_path = req.path or project_data.metadata.get("project_meta_path")
-            if not save_path:
-                raise ProjectSaveLocationUndefinedError("Project save location is undefined.")
+        prepared = self.prepare(req)
+        response = self.write(prepared)
+        self.complete(prepared, response)
+        return response
 
-            access_path = self.project_repository.save(save_path, project_data)
-            project_data.metadata["project_meta_path"] = access_path
+    def resolve_save_path(self, req: SaveProjectRequest) -> str:
+        return self._resolve_save_path(self._require_project(), req)
+
+    def prepare(self, req: SaveProjectRequest) -> PreparedProjectSave:
+        """Flush buffered edits and snapshot the project for ``write``."""
+        project_data = self._require_project()
+        save_path = self._resolve_save_path(project_data, req)
+        for source in self.pending_changes:
+            source.flush()
+        snapshot = self.project_repository.snapshot(project_data)
+        return PreparedProjectSave(save_path, project_data, snapshot)
+
+    def write(self, prepared: PreparedProjectSave) -> SaveProjectResponse:
+        access_path = self.project_repository.save(prepared.save_path, prepared.snapshot)
+        return SaveProjectResponse(access_path)
+
+    def complete(self, prepared: PreparedProjectSave, response: SaveProjectResponse) -> None:
+        project_data = prepared.project
+        project_data.metadata.update(prepared.snapshot.metadata)
+        project_data.metadata["project_meta_path"] = response.access_path
+        if self.project_slot.get_data() is project_data:
             self.project_slot.set_data(project_data)
-            self.project_settings_store.set_last_project_path(access_path)
-            return SaveProjectResponse(access_path)
+        self.project_settings_store.set_last_project_path(response.access_path)
 
+    def _require_project(self) -> ProjectData:
+        if project_data := self.project_slot.get_data():
+            return project_data
         raise InvalidProjectDataError("Project slot is empty")
+
+    @staticmethod
+    def _resolve_save_path(project_data: ProjectData, req: SaveProjectRequest) -> str:
+        save_path = req.path or project_data.metadata.get("project_meta_path")
+        if not save_path:
+            raise ProjectSaveLocationUndefinedError("Project save location is undefined.")
+        return save_path
@@ -1,14 +1,22 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 
 from app.application.doc_units.events import DocUnitEventBus
+from app.application.doc_units.use_cases.asset_preview_cache import AssetPreviewCache
 from app.application.doc_units.use_cases.create_doc_unit import CreateDocUnit
 from app.application.doc_units.use_cases.delete_doc_unit import DeleteDocUnit
 from app.application.doc_units.use_cases.import_doc_unit_asset import (
     ImportDocUnitAsset,
 )
-from app.application.doc_units.use_cases.list_doc_units import ListDocUnits
+from app.application.doc_units.use_cases.import_doc_unit_assets import (
+    ImportDocUnitAssets,
+)
+from app.application.doc_units.use_cases.import_doc_unit_tree import (
+    ImportDocUnitTree,
+)
+from app.application.doc_units.use_cases.list_doc_unit_summaries import ListDocUnitSummaries
 from app.application.doc_units.use_cases.rename_doc_unit import RenameDocUnit
 from app.application.doc_units.use_cases.set_active_doc_unit import (
     SetActiveDocUnit,
@@ -25,7 +33,9 @@ from app.application.doc_units.use_cases.finalize_doc_unit_assets import (
     FinalizeDocUnitAssets,
 )
 from app.application.doc_units.ports import ActiveDocUnitStore
-from app.application.project.ports import CurrentProjectStore, IdGenerator
+from app.application.project.ports import CurrentProjectStore, IdGenerator, MainThreadDispatcher
+from app.frameworks.pyside6_gui.qt_main_thread_dispatcher import QtMainThreadDispatcher
+from app.frameworks.pyside6_gui.qt_preview_renderer import QtPreviewRenderer
 from app.frameworks.pyside6_gui.tabs.doc_units.doc_unit_tab import DocUnitTab
 from app.interface_adapters.doc_units.controllers.doc_unit_controller import (
     DocUnitController,
@@ -42,14 +52,21 @@ from app.interface_adapters.doc_units.presenters.hierarchy_presenter import (
 from app.interface_adapters.doc_units.presenters.hierarchy_details_presenter import (
     HierarchyDetailsPresenter,
 )
+from app.interface_adapters.doc_units.presenters.hierarchy_thumbnail_presenter import (
+    HierarchyThumbnailPresenter,
+)
 from app.interface_adapters.doc_units.repositories.project_doc_unit_repository import (
     ProjectDocUnitRepository,
 )
 from app.interface_adapters.doc_units.stores.mem_active_doc_unit_store import (
     MemActiveDocUnitStore,
 )
-from app.interface_adapters.media.filesystem_media_store import (
-    FileSystemMediaStore,
+from app.interface_adapters.media.content_addressed_media_store import (
+    ContentAddressedMediaStore,
+)
+from app.interface_adapters.media.filesystem_preview_store import FileSystemPreviewStore
+from app.interface_adapters.media.import_source_reader import (
+    FileSystemImportSourceReader,
 )
 
 
@@ -58,18 +75,20 @@ class DocUnitTabBundle:
     tab: DocUnitTab
     finalize_assets: FinalizeDocUnitAssets
     event_bus: DocUnitEventBus
+    repository: ProjectDocUnitRepository
 
 
 def build_doc_unit_tab(
     project_store: CurrentProjectStore,
     id_generator: IdGenerator,
     active_store: ActiveDocUnitStore | None = None,
+    dispatcher: MainThreadDispatcher | None = None,
 ) -> DocUnitTabBundle:
     doc_unit_repository = ProjectDocUnitRepository(project_store)
     active_doc_unit_store = active_store or MemActiveDocUnitStore()
     event_bus = DocUnitEventBus()
 
-    list_use_case = ListDocUnits(doc_unit_repository)
+    list_use_case = ListDocUnitSummaries(doc_unit_repository)
     presenter = DocUnitPresenter(event_bus, list_use_case)
 
     create_use_case = CreateDocUnit(
@@ -85,13 +104,25 @@ def build_doc_unit_tab(
         events=event_bus,
     )
     set_active_use_case = SetActiveDocUnit(active_doc_unit_store, event_bus)
-    media_store = FileSystemMediaStore(project_store, id_generator)
+    media_store = ContentAddressedMediaStore(project_store, id_generator)
     import_use_case = ImportDocUnitAsset(
         repository=doc_unit_repository,
         media_store=media_store,
         ids=id_generator,
         events=event_bus,
     )
+    import_batch_use_case = ImportDocUnitAssets(
+        repository=doc_unit_repository,
+        media_store=media_store,
+        ids=id_generator,
+        events=event_bus,
+    )
+    import_tree_use_case = ImportDocUnitTree(
+        importer=import_batch_use_case,
+        source_reader=FileSystemImportSourceReader(),
+        media_store=media_store,
+        ids=id_generator,
+    )
 
     load_hierarchy_use_case = LoadHierarchy(
         repository=doc_unit_repository,
@@ -132,13 +163,24 @@ def build_doc_unit_tab(
         delete_use_case=delete_use_case,
         set_active_use_case=set_active_use_case,
         import_asset_use_case=import_use_case,
+        import_assets_use_case=import_batch_use_case,
+        import_tree_use_case=import_tree_use_case,
     )
     hierarchy_presenter = HierarchyPresenter(event_bus, load_hierarchy_use_case)
+    preview_cache = AssetPreviewCache(
+        media_store=media_store,
+        renderer=QtPreviewRenderer(),
+        store=FileSystemPreviewStore(project_store),
+        dispatcher=dispatcher or QtMainThreadDispatcher(),
+        executor=ThreadPoolExecutor(max_workers=2, thread_name_prefix="previews"),
+        max_in_flight=2,
+    )
     hierarchy_details_presenter = HierarchyDetailsPresenter(
         event_bus=event_bus,
         repository=doc_unit_repository,
         active_store=active_doc_unit_store,
         media_store=media_store,
+        previews=preview_cache,
     )
     hierarchy_controller = HierarchyController(
         load_use_case=load_hierarchy_use_case,
@@ -161,10 +203,12 @@ def build_doc_unit_tab(
         hierarchy_presenter=hierarchy_presenter,
         hierarchy_controller=hierarchy_controller,
         hierarchy_details_presenter=hierarchy_details_presenter,
+        hierarchy_thumbnail_presenter=HierarchyThumbnailPresenter(preview_cache),
     )
 
     return DocUnitTabBundle(
         tab=tab,
         finalize_assets=finalize_assets_use_case,
         event_bus=event_bus,
+        repository=doc_unit_repository,
     )
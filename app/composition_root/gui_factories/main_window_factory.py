@@ -1,5 +1,12 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from app.application.project.use_cases.autosave_scheduler import AutosaveScheduler
+from app.application.project.use_cases.background_project_saver import (
+    BackgroundProjectSaver,
+)
 from app.application.project.use_cases.create_project import CreateProject
 from app.application.project.use_cases.load_project import LoadProject
+from app.application.project.use_cases.restore_recovery import RestoreRecovery
 from app.application.project.use_cases.save_project import SaveProject
 from app.composition_root.gui_factories.doc_units.tab_factory import (
     DocUnitTabBundle,
@@ -10,6 +17,7 @@ from app.composition_root.gui_factories.pipelines.tab_factory import (
     build_graph_editor_tab,
 )
 from app.frameworks.pyside6_gui.main_window import MainWindow
+from app.frameworks.pyside6_gui.qt_main_thread_dispatcher import QtMainThreadDispatcher
 from app.interface_adapters.gui.controllers.main_window_controller import (
     MainWindowController,
 )
@@ -19,9 +27,11 @@ from app.interface_adapters.gui.presenters.main_window_presenter import (
 from app.interface_adapters.project.repositories.fs_project_repository import (
     FsProjectRepository,
 )
+from app.interface_adapters.project.repositories.fs_recovery_slot import FsRecoverySlot
 from app.interface_adapters.project.repositories.mem_current_project_store import (
     MemCurrentProjectStore,
 )
+from app.interface_adapters.project.serialization.project_serializer import serializer_named
 from app.frameworks.pyside6_gui.project.qt_project_settings_store import QtProjectSettingsStore
 from app.interface_adapters.project.util.idgen_uuid import UUIDGenerator
 
@@ -29,12 +39,16 @@ from app.interface_adapters.project.util.idgen_uuid import UUIDGenerator
 def build_main_window() -> MainWindow:
     id_generator = UUIDGenerator()
     mem_current_project_store = MemCurrentProjectStore()
-    fs_project_repository = FsProjectRepository()
     project_settings_store = QtProjectSettingsStore()
+    fs_project_repository = FsProjectRepository(
+        doc_unit_serializer=serializer_named(project_settings_store.get_doc_unit_format()),
+    )
+    main_thread_dispatcher = QtMainThreadDispatcher()
 
     doc_unit_bundle: DocUnitTabBundle = build_doc_unit_tab(
         project_store=mem_current_project_store,
         id_generator=id_generator,
+        dispatcher=main_thread_dispatcher,
     )
     doc_unit_tab = doc_unit_bundle.tab
     doc_unit_event_bus = doc_unit_bundle.event_bus
@@ -47,6 +61,25 @@ def build_main_window() -> MainWindow:
         mem_current_project_store,
         fs_project_repository,
         project_settings_store,
+        pending_changes=[doc_unit_bundle.repository],
+    )
+    # One worker for every project write keeps saves and autosaves from interleaving.
+    recovery_slot = FsRecoverySlot()
+    project_io_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="project-io")
+    project_saver = BackgroundProjectSaver(
+        save_project_use_case,
+        dispatcher=main_thread_dispatcher,
+        events=doc_unit_event_bus,
+        finalize_assets=doc_unit_bundle.finalize_assets,
+        executor=project_io_executor,
+    )
+    autosave_scheduler = AutosaveScheduler(
+        save_project_use_case,
+        recovery=recovery_slot,
+        dispatcher=main_thread_dispatcher,
+        events=doc_unit_event_bus,
+        executor=project_io_executor,
+        saver=project_saver,
     )
     load_project_use_case = LoadProject(
         mem_current_project_store,
@@ -70,6 +103,8 @@ def build_main_window() -> MainWindow:
             doc_unit_tab.on_project_available,
             graph_editor_tab.on_project_available,
         ],
+        project_saver=project_saver,
+        restore_recovery=RestoreRecovery(mem_current_project_store, recovery_slot),
     )
 
     main_window = MainWindow(presenter, controller)
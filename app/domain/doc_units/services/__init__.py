@@ -3,6 +3,7 @@
 from .hierarchy import (
     collect_parent_map,
     collect_node_map,
+    count_asset_references,
     create_folder_node,
     delete_nodes,
     find_node,
@@ -11,10 +12,16 @@ from .hierarchy import (
     rename_node,
     replace_root,
 )
+from .hierarchy_changes import HierarchyChange
+from .hierarchy_index import HierarchyIndex, HierarchyIndexEntry
 
 __all__ = [
+    "HierarchyChange",
+    "HierarchyIndex",
+    "HierarchyIndexEntry",
     "collect_parent_map",
     "collect_node_map",
+    "count_asset_references",
     "create_folder_node",
     "delete_nodes",
     "find_node",
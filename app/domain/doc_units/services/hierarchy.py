@@ -1,89 +1,225 @@
+"""Persistent edit operations for doc unit hierarchies.
+
+Hierarchy nodes are treated as immutable values. Every edit returns a new root
+that only re-creates the nodes on the path from the root to the changed nodes
+(path copying); all untouched subtrees, including their ``settings`` mappings,
+are shared with the previous version. Callers must therefore never mutate a
+node that is part of a published hierarchy.
+
+Every edit accepts an optional :class:`HierarchyIndex` bound to ``root``. When
+given, lookups go through the index instead of walking the tree and the index
+is rebound to the returned root. Edits also accept a ``changes`` list; when
+given, the row-level :class:`HierarchyChange` steps that turn ``root`` into
+the returned root are appended to it.
+"""
 from __future__ import annotations
 
-from copy import deepcopy
+from collections import Counter
 from dataclasses import replace
-from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
 
 from app.domain.doc_units.entities import HierarchyNode
 
+from .hierarchy_changes import HierarchyChange, record_moves
+from .hierarchy_index import HierarchyIndex
+
 
 NodeMap = Dict[str, HierarchyNode]
 ParentMap = Dict[str, Optional[HierarchyNode]]
 IndexMap = Dict[str, int]
+PathMap = Dict[str, List[HierarchyNode]]
 
 
 def collect_node_map(root: HierarchyNode) -> NodeMap:
     nodes: NodeMap = {}
-
-    def _walk(node: HierarchyNode) -> None:
+    stack = [root]
+    while stack:
+        node = stack.pop()
         nodes[node.node_id] = node
-        for child in node.children:
-            _walk(child)
-
-    _walk(root)
+        stack.extend(reversed(node.children))
     return nodes
 
 
 def collect_parent_map(root: HierarchyNode) -> Tuple[ParentMap, IndexMap]:
     parents: ParentMap = {root.node_id: None}
     indices: IndexMap = {}
-
-    def _walk(node: HierarchyNode) -> None:
+    stack = [root]
+    while stack:
+        node = stack.pop()
         for idx, child in enumerate(node.children):
             parents[child.node_id] = node
             indices[child.node_id] = idx
-            _walk(child)
-
-    _walk(root)
+            stack.append(child)
     return parents, indices
 
 
 def find_node(root: HierarchyNode, node_id: str) -> Optional[HierarchyNode]:
-    if root.node_id == node_id:
-        return root
-    for child in root.children:
-        found = find_node(child, node_id)
-        if found:
-            return found
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if node.node_id == node_id:
+            return node
+        stack.extend(reversed(node.children))
     return None
 
 
-def _clone_node(node: HierarchyNode, *, children: Optional[List[HierarchyNode]] = None, node_id: Optional[str] = None) -> HierarchyNode:
-    return HierarchyNode(
-        node_id=node_id or node.node_id,
-        name=node.name,
-        node_type=node.node_type,
-        settings=deepcopy(node.settings),
-        pointer=node.pointer,
-        children=children if children is not None else [_clone_node(child) for child in node.children],
-    )
+def count_asset_references(root: HierarchyNode) -> Tuple[Counter[str], bool]:
+    """Nodes referencing each final asset path, and whether any node still points at a staged asset."""
+    counts: Counter[str] = Counter()
+    staged = False
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        pointer = node.pointer
+        if pointer is not None:
+            if pointer.status != "final":
+                staged = True
+            elif pointer.path_hint:
+                counts[pointer.path_hint] += 1
+        stack.extend(node.children)
+    return counts, staged
+
+
+def _locate(root: HierarchyNode, node_ids: Iterable[str]) -> PathMap:
+    """Return the root-to-node path for every requested id that exists.
+
+    The walk stops as soon as all requested nodes were seen, so lookups of
+    nodes close to the front of the tree do not pay for the whole hierarchy.
+    """
+    wanted = set(node_ids)
+    parents: ParentMap = {root.node_id: None}
+    found: NodeMap = {}
+    stack: List[HierarchyNode] = [root]
+
+    while stack and len(found) < len(wanted):
+        node = stack.pop()
+        if node.node_id in wanted:
+            found[node.node_id] = node
+        for child in reversed(node.children):
+            parents[child.node_id] = node
+            stack.append(child)
 
+    paths: PathMap = {}
+    for node_id, node in found.items():
+        path = [node]
+        parent = parents[node_id]
+        while parent is not None:
+            path.append(parent)
+            parent = parents[parent.node_id]
+        path.reverse()
+        paths[node_id] = path
+    return paths
 
-def _clone_with_new_ids(node: HierarchyNode, id_factory: Callable[[], str]) -> HierarchyNode:
-    new_id = id_factory()
-    return HierarchyNode(
-        node_id=new_id,
-        name=node.name,
-        node_type=node.node_type,
-        settings=deepcopy(node.settings),
-        pointer=node.pointer,
-        children=[_clone_with_new_ids(child, id_factory) for child in node.children],
-    )
 
+def _paths(root: HierarchyNode, node_ids: Iterable[str], index: Optional[HierarchyIndex]) -> PathMap:
+    if index is None:
+        return _locate(root, node_ids)
+    if index.root is not root:
+        raise ValueError("Hierarchy index is bound to a different root.")
+    return {node_id: index.path(node_id) for node_id in node_ids if node_id in index}
 
-def rename_node(root: HierarchyNode, target_id: str, new_name: str) -> HierarchyNode:
-    if root.node_id == target_id:
-        renamed_children = [_clone_node(child) for child in root.children]
-        return replace(root, name=new_name, children=renamed_children)
 
-    new_children: List[HierarchyNode] = []
-    for child in root.children:
-        if child.node_id == target_id:
-            renamed_child = replace(child, name=new_name, children=[_clone_node(grand) for grand in child.children])
-            new_children.append(renamed_child)
+def _commit(
+    root: HierarchyNode,
+    updated: NodeMap,
+    paths: PathMap,
+    index: Optional[HierarchyIndex],
+    *,
+    removed: Iterable[HierarchyNode] = (),
+    reordered: Iterable[str] = (),
+) -> HierarchyNode:
+    """Rebuild the spine above ``updated`` nodes and return the new root.
+
+    ``updated`` maps node ids to their replacement nodes and ``paths`` holds the
+    original root-to-node path for each of them. Ancestors are rebuilt deepest
+    first so every parent picks up its already rebuilt children; all other
+    children are shared with the previous version. ``removed`` and
+    ``reordered`` (ids of nodes whose child list changed shape) are forwarded
+    to the index.
+    """
+    pending: NodeMap = dict(updated)
+    spine: Dict[str, Tuple[int, HierarchyNode]] = {}
+    changed_children: Dict[str, Set[str]] = {}
+    for node_id in updated:
+        path = paths[node_id]
+        for depth, ancestor in enumerate(path[:-1]):
+            spine.setdefault(ancestor.node_id, (depth, ancestor))
+            changed_children.setdefault(ancestor.node_id, set()).add(path[depth + 1].node_id)
+
+    for ancestor_id, (_, original) in sorted(spine.items(), key=lambda item: item[1][0], reverse=True):
+        base = pending.get(ancestor_id, original)
+        if index is not None and base is original:
+            # Positions are known, so only the rebuilt slots are touched.
+            children = list(base.children)
+            for child_id in changed_children[ancestor_id]:
+                children[index.child_index(child_id)] = pending[child_id]
         else:
-            new_children.append(rename_node(child, target_id, new_name))
-    return replace(root, children=new_children)
+            children = [pending.get(child.node_id, child) for child in base.children]
+        pending[ancestor_id] = replace(base, children=children)
+
+    new_root = pending.get(root.node_id, root)
+    if index is not None:
+        index.apply(new_root, pending.values(), removed=removed, reordered=reordered)
+    return new_root
+
+
+def _clone_with_new_ids(node: HierarchyNode, id_factory: Callable[[], str]) -> HierarchyNode:
+    def _copy(source: HierarchyNode) -> HierarchyNode:
+        return HierarchyNode(
+            node_id=id_factory(),
+            name=source.name,
+            node_type=source.node_type,
+            settings=source.settings,
+            pointer=source.pointer,
+            children=[],
+        )
+
+    clone = _copy(node)
+    stack = [(node, clone)]
+    while stack:
+        source, target = stack.pop()
+        for child in source.children:
+            child_clone = _copy(child)
+            target.children.append(child_clone)
+            stack.append((child, child_clone))
+    return clone
+
+
+def _child_position(parent: HierarchyNode, child: HierarchyNode, index: Optional[HierarchyIndex]) -> int:
+    if index is not None:
+        return index.child_index(child.node_id)
+    for idx, candidate in enumerate(parent.children):
+        if candidate is child:
+            return idx
+    return -1
+
+
+def _outermost(node_ids: Iterable[str], paths: PathMap) -> List[str]:
+    """Drop ids whose ancestor is also listed; the ancestor carries them along."""
+    ids = list(dict.fromkeys(node_ids))
+    selected = set(ids)
+    return [
+        node_id
+        for node_id in ids
+        if not any(ancestor.node_id in selected for ancestor in paths[node_id][:-1])
+    ]
+
+
+def rename_node(
+    root: HierarchyNode,
+    target_id: str,
+    new_name: str,
+    *,
+    index: Optional[HierarchyIndex] = None,
+    changes: Optional[List[HierarchyChange]] = None,
+) -> HierarchyNode:
+    paths = _paths(root, [target_id], index)
+    if target_id not in paths:
+        return root
+    renamed = replace(paths[target_id][-1], name=new_name)
+    if changes is not None:
+        changes.append(HierarchyChange(kind=HierarchyChange.UPDATED, node_id=target_id, node=renamed))
+    return _commit(root, {target_id: renamed}, paths, index)
 
 
 def create_folder_node(node_id: str, name: str) -> HierarchyNode:
@@ -96,59 +232,87 @@ def create_folder_node(node_id: str, name: str) -> HierarchyNode:
     )
 
 
-def insert_nodes(root: HierarchyNode, parent_id: str, insert_index: int, nodes: Iterable[HierarchyNode]) -> HierarchyNode:
-    nodes_to_insert = [_clone_node(node) for node in nodes]
-    inserted = False
-
-    def _insert(node: HierarchyNode) -> HierarchyNode:
-        nonlocal inserted
-        if node.node_id != parent_id:
-            new_children = [_insert(child) for child in node.children]
-            return replace(node, children=new_children)
-
-        bounded_index = max(0, min(insert_index, len(node.children)))
-        new_children: List[HierarchyNode] = []
-        for idx, child in enumerate(node.children):
-            if idx == bounded_index:
-                new_children.extend(nodes_to_insert)
-                inserted = True
-            new_children.append(_clone_node(child))
-        if bounded_index == len(node.children):
-            new_children.extend(nodes_to_insert)
-            inserted = True
-
-        return replace(node, children=new_children)
-
-    updated = _insert(root)
-    if not inserted:
+def insert_nodes(
+    root: HierarchyNode,
+    parent_id: str,
+    insert_index: int,
+    nodes: Iterable[HierarchyNode],
+    *,
+    index: Optional[HierarchyIndex] = None,
+    changes: Optional[List[HierarchyChange]] = None,
+) -> HierarchyNode:
+    paths = _paths(root, [parent_id], index)
+    if parent_id not in paths:
         raise KeyError(f"Parent node '{parent_id}' not found.")
-    return updated
 
+    parent = paths[parent_id][-1]
+    bounded_index = max(0, min(insert_index, len(parent.children)))
+    inserted = list(nodes)
+    new_children = list(parent.children)
+    new_children[bounded_index:bounded_index] = inserted
+    if changes is not None:
+        changes.extend(
+            HierarchyChange(
+                kind=HierarchyChange.INSERTED,
+                node_id=node.node_id,
+                parent_id=parent_id,
+                row=bounded_index + offset,
+                node=node,
+            )
+            for offset, node in enumerate(inserted)
+        )
+    return _commit(
+        root,
+        {parent_id: replace(parent, children=new_children)},
+        paths,
+        index,
+        reordered=[parent_id],
+    )
 
-def delete_nodes(root: HierarchyNode, node_ids: Iterable[str]) -> HierarchyNode:
+
+def delete_nodes(
+    root: HierarchyNode,
+    node_ids: Iterable[str],
+    *,
+    index: Optional[HierarchyIndex] = None,
+    changes: Optional[List[HierarchyChange]] = None,
+) -> HierarchyNode:
     ids = set(node_ids)
-    node_map = collect_node_map(root)
-    missing = ids - set(node_map.keys())
+    paths = _paths(root, ids, index)
+    missing = ids - set(paths.keys())
     if missing:
         raise KeyError(f"Nodes not found in hierarchy: {sorted(missing)}")
 
     if root.node_id in ids:
         raise ValueError("Cannot delete the root node of a hierarchy.")
 
-    def _prune(node: HierarchyNode) -> Optional[HierarchyNode]:
-        if node.node_id in ids:
-            return None
-        new_children: List[HierarchyNode] = []
-        for child in node.children:
-            pruned = _prune(child)
-            if pruned:
-                new_children.append(pruned)
-        return replace(node, children=new_children)
-
-    updated = _prune(root)
-    if updated is None:
-        raise ValueError("Hierarchy became empty after deletion.")
-    return updated
+    parent_paths: PathMap = {}
+    removed: List[HierarchyNode] = []
+    for node_id in _outermost(ids, paths):
+        parent_path = paths[node_id][:-1]
+        parent_paths.setdefault(parent_path[-1].node_id, parent_path)
+        removed.append(paths[node_id][-1])
+
+    updated: NodeMap = {}
+    for parent_id, parent_path in parent_paths.items():
+        parent = parent_path[-1]
+        updated[parent_id] = replace(
+            parent,
+            children=[child for child in parent.children if child.node_id not in ids],
+        )
+        if changes is not None:
+            # Highest rows first, so every recorded row is still valid when applied.
+            removed_rows = [row for row, child in enumerate(parent.children) if child.node_id in ids]
+            changes.extend(
+                HierarchyChange(
+                    kind=HierarchyChange.REMOVED,
+                    node_id=parent.children[row].node_id,
+                    source_parent_id=parent_id,
+                    source_row=row,
+                )
+                for row in reversed(removed_rows)
+            )
+    return _commit(root, updated, parent_paths, index, removed=removed, reordered=updated.keys())
 
 
 def move_nodes(
@@ -159,57 +323,70 @@ def move_nodes(
     *,
     copy: bool = False,
     id_factory: Optional[Callable[[], str]] = None,
+    index: Optional[HierarchyIndex] = None,
+    changes: Optional[List[HierarchyChange]] = None,
 ) -> HierarchyNode:
     if not node_ids:
-        return _clone_node(root)
+        return root
 
-    node_map = collect_node_map(root)
-    parents, indices = collect_parent_map(root)
+    paths = _paths(root, [*node_ids, target_parent_id], index)
 
-    if target_parent_id not in node_map and target_parent_id != root.node_id:
-        if root.node_id != target_parent_id:
-            raise KeyError(f"Target parent '{target_parent_id}' not found.")
+    if target_parent_id not in paths:
+        raise KeyError(f"Target parent '{target_parent_id}' not found.")
 
-    if any(node_id not in node_map for node_id in node_ids):
-        missing = [node_id for node_id in node_ids if node_id not in node_map]
+    if any(node_id not in paths for node_id in node_ids):
+        missing = [node_id for node_id in node_ids if node_id not in paths]
         raise KeyError(f"Nodes not found in hierarchy: {missing}")
 
     if target_parent_id in node_ids:
         raise ValueError("Cannot move nodes into themselves.")
 
     # Prevent moving a node into its descendant
-    current_parent = parents.get(target_parent_id)
-    while current_parent is not None:
-        if current_parent.node_id in node_ids:
-            raise ValueError("Cannot move a node into one of its descendants.")
-        current_parent = parents.get(current_parent.node_id)
+    if any(ancestor.node_id in node_ids for ancestor in paths[target_parent_id][:-1]):
+        raise ValueError("Cannot move a node into one of its descendants.")
+
+    moving_ids = _outermost(node_ids, paths)
+    moving_nodes = [paths[node_id][-1] for node_id in moving_ids]
 
-    # Prepare nodes to insert
     if copy:
         if id_factory:
-            nodes_to_insert = [_clone_with_new_ids(node_map[node_id], id_factory) for node_id in node_ids]
+            nodes_to_insert = [_clone_with_new_ids(node, id_factory) for node in moving_nodes]
         else:
-            nodes_to_insert = [_clone_node(node_map[node_id]) for node_id in node_ids]
-        working_root = _clone_node(root)
-    else:
-        nodes_to_insert = [_clone_node(node_map[node_id]) for node_id in node_ids]
-        working_root = delete_nodes(root, node_ids)
-
-        # adjust index when removing siblings before the insertion point
-        for node_id in node_ids:
-            parent = parents.get(node_id)
-            if parent and parent.node_id == target_parent_id:
-                node_index = indices.get(node_id, -1)
-                if node_index != -1 and node_index < insert_index:
-                    insert_index -= 1
-
-    if working_root.node_id == target_parent_id:
-        target_id = working_root.node_id
-    else:
-        target_id = target_parent_id
-
-    return insert_nodes(working_root, target_id, insert_index, nodes_to_insert)
-
-
-def replace_root(root: HierarchyNode, new_root: HierarchyNode) -> HierarchyNode:
-    return _clone_node(new_root)
+            nodes_to_insert = moving_nodes
+        return insert_nodes(root, target_parent_id, insert_index, nodes_to_insert, index=index, changes=changes)
+
+    # adjust index when removing siblings before the insertion point
+    for node_id in moving_ids:
+        parent_path = paths[node_id][:-1]
+        if parent_path and parent_path[-1].node_id == target_parent_id:
+            if _child_position(parent_path[-1], paths[node_id][-1], index) < insert_index:
+                insert_index -= 1
+
+    if changes is not None:
+        sources = [(node_id, paths[node_id][-2]) for node_id in moving_ids]
+        target = paths[target_parent_id][-1]
+        child_ids = {parent.node_id: [child.node_id for child in parent.children] for _, parent in sources}
+        child_ids[target.node_id] = [child.node_id for child in target.children]
+        remaining = len(target.children) - sum(1 for _, parent in sources if parent.node_id == target_parent_id)
+        changes.extend(
+            record_moves(
+                child_ids,
+                [(paths[node_id][-1], parent.node_id) for node_id, parent in sources],
+                target_parent_id,
+                max(0, min(insert_index, remaining)),
+            )
+        )
+
+    working_root = delete_nodes(root, moving_ids, index=index)
+    return insert_nodes(working_root, target_parent_id, insert_index, moving_nodes, index=index)
+
+
+def replace_root(
+    root: HierarchyNode,
+    new_root: HierarchyNode,
+    *,
+    index: Optional[HierarchyIndex] = None,
+) -> HierarchyNode:
+    if index is not None:
+        index.reset(new_root)
+    return new_root
@@ -0,0 +1,78 @@
+"""Structural deltas describing how one hierarchy version became the next."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from app.domain.doc_units.entities import HierarchyNode
+
+
+@dataclass(frozen=True, slots=True)
+class HierarchyChange:
+    """One row-level step; a list of changes is applied strictly in order.
+
+    ``parent_id``/``row`` give the node's position right after the step and
+    ``source_parent_id``/``source_row`` its position right before it, so
+    every row refers to the child lists as they are at that point of the
+    sequence. ``node`` is the node after the step; removals leave it unset.
+    """
+
+    INSERTED = "inserted"
+    REMOVED = "removed"
+    MOVED = "moved"
+    UPDATED = "updated"
+
+    kind: str
+    node_id: str
+    parent_id: Optional[str] = None
+    row: int = -1
+    source_parent_id: Optional[str] = None
+    source_row: int = -1
+    node: Optional[HierarchyNode] = None
+
+
+def record_moves(
+    child_ids: Dict[str, List[str]],
+    moving: List[tuple[HierarchyNode, str]],
+    target_parent_id: str,
+    insert_index: int,
+) -> List[HierarchyChange]:
+    """Changes that move ``moving`` (node, current parent id) pairs into a contiguous run.
+
+    ``child_ids`` holds the child ids of every source parent and of the
+    target before the move; the lists are updated in place step by step.
+    ``insert_index`` is the position of the run among the target's
+    remaining children, as used by :func:`move_nodes`.
+    """
+    moving_ids = {node.node_id for node, _ in moving}
+    remaining = [child_id for child_id in child_ids[target_parent_id] if child_id not in moving_ids]
+    anchor = remaining[insert_index - 1] if 0 < insert_index <= len(remaining) else None
+    target = child_ids[target_parent_id]
+
+    changes: List[HierarchyChange] = []
+    previous: Optional[str] = None
+    for node, source_parent_id in moving:
+        node_id = node.node_id
+        siblings = child_ids[source_parent_id]
+        source_row = siblings.index(node_id)
+        del siblings[source_row]
+        if previous is not None:
+            row = target.index(previous) + 1
+        elif anchor is not None:
+            row = target.index(anchor) + 1
+        else:
+            row = 0
+        target.insert(row, node_id)
+        changes.append(
+            HierarchyChange(
+                kind=HierarchyChange.MOVED,
+                node_id=node_id,
+                parent_id=target_parent_id,
+                row=row,
+                source_parent_id=source_parent_id,
+                source_row=source_row,
+                node=node,
+            )
+        )
+        previous = node_id
+    return changes
@@ -0,0 +1,169 @@
+"""Incrementally maintained lookup table for a doc unit hierarchy."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from app.domain.doc_units.entities import HierarchyNode
+
+
+@dataclass(slots=True)
+class HierarchyIndexEntry:
+    node: HierarchyNode
+    parent_id: Optional[str]
+    child_index: int
+    depth: int
+
+
+class HierarchyIndex:
+    """Maps node ids of one hierarchy version to node, parent, position and depth.
+
+    The index is bound to a root. Edit functions in
+    :mod:`app.domain.doc_units.services.hierarchy` accept it through their
+    ``index`` argument, use it for O(1) lookups and O(depth) ancestor walks, and
+    rebind it to the root they return by calling :meth:`apply`.
+    """
+
+    def __init__(self, root: HierarchyNode) -> None:
+        self._root = root
+        self._entries: Dict[str, HierarchyIndexEntry] = {}
+        self._register(root, None, 0, 0)
+
+    def reset(self, root: HierarchyNode) -> None:
+        """Re-index from scratch for an unrelated root."""
+        self._root = root
+        self._entries = {}
+        self._register(root, None, 0, 0)
+
+    @property
+    def root(self) -> HierarchyNode:
+        return self._root
+
+    def __contains__(self, node_id: object) -> bool:
+        return node_id in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def get(self, node_id: str) -> Optional[HierarchyNode]:
+        entry = self._entries.get(node_id)
+        return entry.node if entry else None
+
+    def entry(self, node_id: str) -> HierarchyIndexEntry:
+        try:
+            return self._entries[node_id]
+        except KeyError:
+            raise KeyError(f"Hierarchy node '{node_id}' not found.") from None
+
+    def parent(self, node_id: str) -> Optional[HierarchyNode]:
+        parent_id = self.entry(node_id).parent_id
+        return self._entries[parent_id].node if parent_id is not None else None
+
+    def child_index(self, node_id: str) -> int:
+        return self.entry(node_id).child_index
+
+    def depth(self, node_id: str) -> int:
+        return self.entry(node_id).depth
+
+    def path(self, node_id: str) -> List[HierarchyNode]:
+        """Nodes from the root down to ``node_id`` (inclusive)."""
+        path: List[HierarchyNode] = []
+        entry: Optional[HierarchyIndexEntry] = self.entry(node_id)
+        while entry is not None:
+            path.append(entry.node)
+            entry = self._entries[entry.parent_id] if entry.parent_id is not None else None
+        path.reverse()
+        return path
+
+    def is_ancestor(self, ancestor_id: str, node_id: str) -> bool:
+        parent_id = self.entry(node_id).parent_id
+        while parent_id is not None:
+            if parent_id == ancestor_id:
+                return True
+            parent_id = self._entries[parent_id].parent_id
+        return False
+
+    def apply(
+        self,
+        new_root: HierarchyNode,
+        rebuilt: Iterable[HierarchyNode],
+        *,
+        removed: Iterable[HierarchyNode] = (),
+        reordered: Iterable[str] = (),
+    ) -> None:
+        """Rebind the index to ``new_root`` after a path-copying edit.
+
+        ``rebuilt`` lists every node object the edit re-created (the spine),
+        ``removed`` the roots of detached subtrees and ``reordered`` the ids of
+        rebuilt nodes whose child list gained, lost or reordered entries. Only
+        those child lists are rescanned: new children are registered as
+        subtrees and existing ones get their parent and position refreshed.
+        Children that changed parent get their depth, and that of their
+        descendants, recomputed. The cost is bounded by the spine, the reordered
+        child lists and the size of inserted, removed or moved subtrees.
+        """
+        for subtree in removed:
+            for node in _iter_subtree(subtree):
+                self._entries.pop(node.node_id, None)
+
+        reordered_ids = set(reordered)
+        moved: List[str] = []
+        for node in rebuilt:
+            entry = self._entries[node.node_id]
+            entry.node = node
+            if node.node_id not in reordered_ids:
+                continue
+            child_depth = entry.depth + 1
+            for idx, child in enumerate(node.children):
+                child_entry = self._entries.get(child.node_id)
+                if child_entry is None:
+                    self._register(child, node.node_id, idx, child_depth)
+                else:
+                    if child_entry.parent_id != node.node_id:
+                        moved.append(child.node_id)
+                    child_entry.parent_id = node.node_id
+                    child_entry.child_index = idx
+
+        # Parents are final only now; a moved node may sit inside another moved subtree.
+        for node_id in moved:
+            self._refresh_depth(node_id)
+        self._root = new_root
+
+    def _refresh_depth(self, node_id: str) -> None:
+        entry = self._entries[node_id]
+        depth = 0
+        parent_id = entry.parent_id
+        while parent_id is not None:
+            depth += 1
+            parent_id = self._entries[parent_id].parent_id
+        if entry.depth == depth:
+            return
+        stack = [(entry.node, depth)]
+        while stack:
+            node, node_depth = stack.pop()
+            self._entries[node.node_id].depth = node_depth
+            stack.extend((child, node_depth + 1) for child in node.children)
+
+    def _register(self, subtree: HierarchyNode, parent_id: Optional[str], child_index: int, depth: int) -> None:
+        stack = [(subtree, parent_id, child_index, depth)]
+        while stack:
+            node, node_parent_id, node_index, node_depth = stack.pop()
+            self._entries[node.node_id] = HierarchyIndexEntry(
+                node=node,
+                parent_id=node_parent_id,
+                child_index=node_index,
+                depth=node_depth,
+            )
+            for idx, child in enumerate(node.children):
+                stack.append((child, node.node_id, idx, node_depth + 1))
+
+
+def _iter_subtree(root: HierarchyNode) -> Iterator[HierarchyNode]:
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(node.children)
@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from typing import Any, Dict, Optional
+from typing import Any, Dict, MutableMapping, Optional
 
 
 @dataclass(frozen=True)
@@ -20,7 +20,7 @@ class ProjectID:
 class ProjectData:
     project_id: ProjectID
     name: ProjectName
-    doc_units: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    doc_units: MutableMapping[str, Dict[str, Any]] = field(default_factory=dict)
     last_active_doc_unit_id: Optional[str] = None
     metadata: Dict[str, Any] = field(default_factory=dict)
 
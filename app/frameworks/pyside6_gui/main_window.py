@@ -4,6 +4,7 @@ from PySide6.QtWidgets import (
     QMainWindow,
     QMenu,
     QMenuBar,
+    QMessageBox,
     QTabWidget,
     QWidget,
 )
@@ -92,6 +93,18 @@ class MainWindow(QMainWindow):
         return location or None
 
 
+    def confirm_restore_recovery(self) -> bool:
+        answer = QMessageBox.question(
+            self,
+            "Restore unsaved changes",
+            "This project has unsaved changes from a session that did not close properly.\n"
+            "Restore them? Choosing No discards them.",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            QMessageBox.StandardButton.Yes,
+        )
+        return answer == QMessageBox.StandardButton.Yes
+
+
     def connect_tabs(self, tabs: Sequence[Tab]) -> None:
         if self._tab_widget is None:
             raise RuntimeError("Tab widget is not initialized.")
@@ -7,6 +7,8 @@ from app.application.project.ports import ProjectSettingsStore
 
 class QtProjectSettingsStore(ProjectSettingsStore):
     LAST_PROJECT_KEY = "project/last_meta_path"
+    DOC_UNIT_FORMAT_KEY = "project/doc_unit_format"
+    DEFAULT_DOC_UNIT_FORMAT = "json"
 
     def __init__(self, organization: str = "MangaTranslator", application: str = "MangaTranslator"):
         self._settings = QSettings(organization, application)
@@ -20,3 +22,8 @@ class QtProjectSettingsStore(ProjectSettingsStore):
 
     def clear_last_project_path(self) -> None:
         self._settings.remove(self.LAST_PROJECT_KEY)
+
+    def get_doc_unit_format(self) -> str:
+        """Codec name doc unit files are saved with (``json`` or ``msgpack``)."""
+        value = self._settings.value(self.DOC_UNIT_FORMAT_KEY, self.DEFAULT_DOC_UNIT_FORMAT, type=str)
+        return value or self.DEFAULT_DOC_UNIT_FORMAT
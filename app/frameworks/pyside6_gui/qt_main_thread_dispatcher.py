@@ -0,0 +1,21 @@
+from typing import Callable, Optional
+
+from PySide6.QtCore import QObject, Qt, Signal, Slot
+
+
+class QtMainThreadDispatcher(QObject):
+    """``MainThreadDispatcher`` running posted callbacks on the thread this object lives in."""
+
+    _posted = Signal(object)
+
+    def __init__(self, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self._posted.connect(self._run, Qt.ConnectionType.QueuedConnection)
+
+    def post(self, callback: Callable[[], None]) -> None:
+        self._posted.emit(callback)
+
+    @Slot(object)
+    def _run(self, callback: Callable[[], None]) -> None:
+        callback()
+
@@ -0,0 +1,33 @@
+from PySide6.QtCore import QBuffer, QByteArray, QIODevice, Qt
+from PySide6.QtGui import QImageReader
+
+
+class QtPreviewRenderer:
+    """``PreviewRenderer`` built on ``QImageReader``; safe on worker threads since it never touches QPixmap.
+
+    The reader is asked for the target size up front, which lets JPEG
+    decoding skip most of the full-resolution work. Previews are encoded as
+    JPEG, or PNG when the image has an alpha channel.
+    """
+
+    JPEG_QUALITY = 85
+
+    def render(self, source_path: str, max_edge: int) -> bytes:
+        reader = QImageReader(source_path)
+        reader.setAutoTransform(True)
+        size = reader.size()
+        if size.isValid() and max(size.width(), size.height()) > max_edge:
+            reader.setScaledSize(size.scaled(max_edge, max_edge, Qt.AspectRatioMode.KeepAspectRatio))
+        image = reader.read()
+        if image.isNull():
+            raise ValueError(f"Cannot decode '{source_path}': {reader.errorString()}")
+
+        data = QByteArray()
+        buffer = QBuffer(data)
+        buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+        if image.hasAlphaChannel():
+            image.save(buffer, "PNG")
+        else:
+            image.save(buffer, "JPG", self.JPEG_QUALITY)
+        buffer.close()
+        return bytes(data.data())
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import Dict, List, Optional, Tuple
 
-from PySide6.QtCore import Qt
+from PySide6.QtCore import QCoreApplication, Qt
 from PySide6.QtGui import QPixmap
 from PySide6.QtWidgets import (
     QFileDialog,
@@ -10,7 +10,9 @@ from PySide6.QtWidgets import (
     QListWidget,
     QListWidgetItem,
     QMainWindow,
+    QMenu,
     QMessageBox,
+    QProgressDialog,
 )
 
 from app.frameworks.pyside6_gui.tabs.tab import Tab
@@ -34,6 +36,9 @@ from app.interface_adapters.doc_units.presenters.hierarchy_details_presenter imp
     HierarchyDetailsView,
     HierarchyDetailsViewModel,
 )
+from app.interface_adapters.doc_units.presenters.hierarchy_thumbnail_presenter import (
+    HierarchyThumbnailPresenter,
+)
 
 from .details_view.details_view import DetailsView
 from .hierarchy.dock import HierarchyDock
@@ -51,6 +56,7 @@ class DocUnitTab(Tab):
         hierarchy_presenter: HierarchyPresenter,
         hierarchy_controller: HierarchyController,
         hierarchy_details_presenter: HierarchyDetailsPresenter,
+        hierarchy_thumbnail_presenter: Optional[HierarchyThumbnailPresenter] = None,
         parent: Optional[QMainWindow] = None,
     ) -> None:
         super().__init__(parent)
@@ -69,6 +75,7 @@ class DocUnitTab(Tab):
             self.ui.unitHierarchyTreeView,
             hierarchy_controller,
             hierarchy_presenter,
+            hierarchy_thumbnail_presenter,
         )
 
         self._unit_items: Dict[str, Tuple[QListWidgetItem, UnitListItem]] = {}
@@ -77,16 +84,38 @@ class DocUnitTab(Tab):
         self._details_current_unit_id: Optional[str] = None
         self._details_original_name: Optional[str] = None
         self._hierarchy_details_attached = False
+        self._preview_node_id: Optional[str] = None
 
         self._setup_connections()
         self._update_details_actions_state()
 
     # region View interface implementation
     def display_units(self, units: List[DocUnitViewModel]) -> None:
+        """Bring the list in line with ``units``, keyed by unit id.
+
+        Rows of removed units are taken out, renamed units update their
+        widget in place and new units get a row; only rows that ended up
+        out of order are rebuilt.
+        """
         selection = self._current_selection()
-        self._clear_unit_list()
-        for view_model in units:
-            self._add_unit_item(view_model, selection == view_model.unit_id)
+        list_widget: QListWidget = self.ui.unitListWidget
+        wanted = {view_model.unit_id for view_model in units}
+        list_widget.setUpdatesEnabled(False)
+        try:
+            for unit_id in [unit_id for unit_id in self._unit_items if unit_id not in wanted]:
+                self._remove_unit_item(unit_id)
+            for row, view_model in enumerate(units):
+                entry = self._unit_items.get(view_model.unit_id)
+                if entry is not None and list_widget.row(entry[0]) != row:
+                    # Item widgets do not survive takeItem/insertItem, so rebuild the row.
+                    self._remove_unit_item(view_model.unit_id)
+                    entry = None
+                if entry is None:
+                    self._add_unit_item(view_model, selection == view_model.unit_id, row)
+                elif entry[1].unit != view_model:
+                    entry[1].set_unit(view_model)
+        finally:
+            list_widget.setUpdatesEnabled(True)
 
     def highlight_active(self, unit_id: Optional[str]) -> None:
         for uid, (_, widget) in self._unit_items.items():
@@ -126,36 +155,33 @@ class DocUnitTab(Tab):
         widget.image_preview_label.hide()
         widget.image_preview_label.clear()
 
+        self._preview_node_id = None
         if view_model.node_type == HierarchyNode.FOLDER_TYPE:
             widget.children_number_widget.show()
             widget.children_number_lineEdit.setText(str(view_model.children_count or 0))
         else:
-            image_path = view_model.image_path or ""
             widget.image_path_widget.show()
-            widget.image_path_lineEdit.setText(image_path)
-            if image_path:
-                pixmap = QPixmap(image_path)
-                if not pixmap.isNull():
-                    image_width = pixmap.width()
-                    image_height = pixmap.height() or 1
-                    preview_height = max(1, int(self._details_view.width() * 0.4))
-                    ratio = image_width / image_height
-                    preview_width = max(1, int(preview_height * ratio))
-                    widget.image_preview_label.setFixedSize(preview_width, preview_height)
-                    widget.image_preview_label.setPixmap(pixmap)
-                    widget.image_preview_label.setScaledContents(True)
-                    widget.image_preview_label.show()
-                else:
-                    widget.image_preview_label.setText("Preview unavailable")
-                    widget.image_preview_label.show()
-            else:
-                widget.image_preview_label.setText("Preview unavailable")
+            widget.image_path_lineEdit.setText(view_model.image_path or "")
+            if view_model.preview is not None:
+                self._set_preview(view_model.preview)
+            elif view_model.preview_pending:
+                self._preview_node_id = view_model.node_id
+                widget.image_preview_label.setText("Loading preview…")
                 widget.image_preview_label.show()
+            else:
+                self._set_preview(None)
 
         self._details_view.switch_display_mode(self._details_view.HIERARCHY_ITEM_DISPLAY_MODE)
 
+    def show_preview(self, node_id: str, preview: Optional[bytes]) -> None:
+        if node_id != self._preview_node_id:
+            return
+        self._preview_node_id = None
+        self._set_preview(preview)
+
     def show_no_selection(self) -> None:
         widget = self._details_view.hierarchy_item_details_widget
+        self._preview_node_id = None
         widget.item_name_lineEdit.clear()
         widget.item_type_lineEdit.clear()
         widget.children_number_lineEdit.clear()
@@ -192,9 +218,30 @@ class DocUnitTab(Tab):
         self._hierarchy_dock.dispose()
         super().closeEvent(event)
 
+    def _set_preview(self, data: Optional[bytes]) -> None:
+        label = self._details_view.hierarchy_item_details_widget.image_preview_label
+        pixmap = QPixmap()
+        if data is None or not pixmap.loadFromData(data):
+            label.setText("Preview unavailable")
+            label.show()
+            return
+        preview_height = max(1, int(self._details_view.width() * 0.4))
+        ratio = pixmap.width() / (pixmap.height() or 1)
+        preview_width = max(1, int(preview_height * ratio))
+        label.setFixedSize(preview_width, preview_height)
+        label.setScaledContents(False)
+        label.setPixmap(
+            pixmap.scaled(preview_width, preview_height, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        )
+        label.show()
+
     def _setup_connections(self) -> None:
         self.ui.newUnitButton.clicked.connect(self._handle_create_unit)
-        self.ui.importFilesPushButton.clicked.connect(self._handle_import_assets)
+        import_menu = QMenu(self.ui.importFilesPushButton)
+        import_menu.addAction("Files...", self._handle_import_assets)
+        import_menu.addAction("Folder...", self._handle_import_folder)
+        import_menu.addAction("Archive (CBZ/ZIP)...", self._handle_import_archive)
+        self.ui.importFilesPushButton.setMenu(import_menu)
         self.ui.unitListWidget.itemSelectionChanged.connect(self._handle_selection_changed)
         self.ui.unitListWidget.itemDoubleClicked.connect(self._handle_rename_requested)
         details_widget = self._details_view.unit_details_widget
@@ -204,13 +251,13 @@ class DocUnitTab(Tab):
             lambda _: self._update_details_actions_state()
         )
 
-    def _add_unit_item(self, view_model: DocUnitViewModel, selected: bool) -> None:
+    def _add_unit_item(self, view_model: DocUnitViewModel, selected: bool, row: int) -> None:
         list_widget: QListWidget = self.ui.unitListWidget
-        item = QListWidgetItem(list_widget)
+        item = QListWidgetItem()
         unit_widget = UnitListItem(view_model, is_active=selected)
         item.setData(Qt.ItemDataRole.UserRole, view_model.unit_id)
         item.setSizeHint(unit_widget.sizeHint())
-        list_widget.addItem(item)
+        list_widget.insertItem(row, item)
         list_widget.setItemWidget(item, unit_widget)
         if selected:
             list_widget.setCurrentItem(item)
@@ -219,9 +266,11 @@ class DocUnitTab(Tab):
         )
         self._unit_items[view_model.unit_id] = (item, unit_widget)
 
-    def _clear_unit_list(self) -> None:
-        self.ui.unitListWidget.clear()
-        self._unit_items.clear()
+    def _remove_unit_item(self, unit_id: str) -> None:
+        list_widget: QListWidget = self.ui.unitListWidget
+        item, _ = self._unit_items.pop(unit_id)
+        list_widget.removeItemWidget(item)
+        list_widget.takeItem(list_widget.row(item))
 
     def _handle_create_unit(self) -> None:
         name, ok = QInputDialog.getText(self, "Create Doc Unit", "Doc unit name:")
@@ -232,21 +281,83 @@ class DocUnitTab(Tab):
                 self.show_error(str(exc))
 
     def _handle_import_assets(self) -> None:
-        unit_id = self._current_selection()
+        unit_id = self._require_import_target()
+        if not unit_id:
+            return
+        source_paths, _ = QFileDialog.getOpenFileNames(
+            self,
+            "Import assets",
+            "",
+            "Images (*.png *.jpg *.jpeg *.bmp *.webp);;All Files (*)",
+        )
+        if source_paths:
+            self._run_import(
+                len(source_paths),
+                lambda progress, cancelled: self._controller.import_assets(
+                    unit_id, source_paths, progress=progress, cancelled=cancelled
+                ),
+            )
+
+    def _handle_import_folder(self) -> None:
+        unit_id = self._require_import_target()
+        if not unit_id:
+            return
+        source_path = QFileDialog.getExistingDirectory(self, "Import folder")
+        if source_path:
+            self._run_import(
+                0,
+                lambda progress, cancelled: self._controller.import_tree(
+                    unit_id, source_path, progress=progress, cancelled=cancelled
+                ),
+            )
+
+    def _handle_import_archive(self) -> None:
+        unit_id = self._require_import_target()
         if not unit_id:
-            QMessageBox.information(self, "Import assets", "Select a doc unit first.")
             return
         source_path, _ = QFileDialog.getOpenFileName(
             self,
-            "Import asset",
+            "Import archive",
             "",
-            "Images (*.png *.jpg *.jpeg *.bmp);;All Files (*)",
+            "Comic archives (*.cbz *.zip);;All Files (*)",
         )
         if source_path:
-            try:
-                self._controller.import_asset(unit_id, source_path)
-            except Exception as exc:
-                self.show_error(str(exc))
+            self._run_import(
+                0,
+                lambda progress, cancelled: self._controller.import_tree(
+                    unit_id, source_path, progress=progress, cancelled=cancelled
+                ),
+            )
+
+    def _require_import_target(self) -> Optional[str]:
+        unit_id = self._current_selection()
+        if not unit_id:
+            QMessageBox.information(self, "Import assets", "Select a doc unit first.")
+        return unit_id
+
+    def _run_import(self, expected_total: int, run) -> None:
+        progress_dialog = QProgressDialog("Importing assets...", "Cancel", 0, expected_total, self)
+        progress_dialog.setWindowModality(Qt.WindowModality.WindowModal)
+        progress_dialog.setMinimumDuration(300)
+
+        def report_progress(completed: int, total: int) -> None:
+            progress_dialog.setMaximum(total)
+            progress_dialog.setValue(completed)
+
+        def is_cancelled() -> bool:
+            QCoreApplication.processEvents()
+            return progress_dialog.wasCanceled()
+
+        try:
+            response = run(report_progress, is_cancelled)
+        except Exception as exc:
+            self.show_error(str(exc))
+            return
+        finally:
+            progress_dialog.close()
+        if response and response.failed:
+            failures = "\n".join(f"{path}: {reason}" for path, reason in response.failed.items())
+            self.show_error(f"Some files could not be imported:\n{failures}")
 
     def _handle_selection_changed(self) -> None:
         unit_id = self._current_selection()
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
+import logging
 from typing import List, Optional, Sequence
 
-from PySide6.QtCore import QItemSelectionModel, QModelIndex, QPoint, Qt
+from PySide6.QtCore import QItemSelectionModel, QModelIndex, QPoint, QSize, Qt, QTimer
 from PySide6.QtGui import QAction
 from PySide6.QtWidgets import QApplication, QMenu, QMessageBox, QStyle, QTreeView
 
@@ -13,13 +14,23 @@ from app.interface_adapters.doc_units.controllers.hierarchy_controller import (
     HierarchyController,
 )
 from app.interface_adapters.doc_units.presenters.hierarchy_presenter import (
+    HierarchyChangeViewModel,
     HierarchyNodeViewModel,
     HierarchyPresenter,
     HierarchyView,
 )
+from app.interface_adapters.doc_units.presenters.hierarchy_thumbnail_presenter import (
+    HierarchyThumbnailPresenter,
+)
+
+log = logging.getLogger(__name__)
 
 
 NEW_FOLDER_DEFAULT_NAME = "New Chapter"
+# Rows above and below the viewport whose thumbnails are loaded ahead of scrolling.
+THUMBNAIL_PREFETCH_ROWS = 40
+# Quiet period after scrolling before the prefetch window is recomputed.
+THUMBNAIL_PREFETCH_DELAY_MS = 80
 
 
 class HierarchyDock(HierarchyView):
@@ -28,10 +39,12 @@ class HierarchyDock(HierarchyView):
         tree_view: QTreeView,
         controller: HierarchyController,
         presenter: HierarchyPresenter,
+        thumbnails: Optional[HierarchyThumbnailPresenter] = None,
     ) -> None:
         self._tree_view = tree_view
         self._controller = controller
         self._presenter = presenter
+        self._thumbnails = thumbnails
         self._expanded_ids: set[str] = set()
         self._pending_focus_ids: List[str] = []
         self._pending_focus_primary: Optional[str] = None
@@ -43,11 +56,27 @@ class HierarchyDock(HierarchyView):
             rename_handler=self._on_rename_requested,
             move_handler=self._on_move_requested,
         )
+        self._prefetch_timer = QTimer(self._tree_view)
+        self._prefetch_timer.setSingleShot(True)
+        self._prefetch_timer.setInterval(THUMBNAIL_PREFETCH_DELAY_MS)
+        self._prefetch_timer.timeout.connect(self._prefetch_thumbnails)
         self._configure_tree_view()
         self._presenter.attach_view(self)
 
     def dispose(self) -> None:
+        self._prefetch_timer.stop()
         self._presenter.detach_view()
+        if self._thumbnails:
+            stats = self._thumbnails.stats
+            log.debug(
+                "Preview cache: %.0f%% memory hits, %d from disk, %d rendered, %d failed, %d evicted, %d discarded",
+                stats.hit_rate * 100,
+                stats.disk_hits,
+                stats.renders,
+                stats.failures,
+                stats.evictions,
+                stats.discarded,
+            )
 
     # HierarchyView implementation
     def display_hierarchy(self, root: HierarchyNodeViewModel, changed_node_ids: List[str]) -> None:
@@ -57,19 +86,26 @@ class HierarchyDock(HierarchyView):
         try:
             self._model.update_tree(root)
             self._restore_expanded_nodes()
-            focus_ids = self._pending_focus_ids or changed_node_ids
-            focus_primary = self._pending_focus_primary
-            self._pending_focus_ids = []
-            self._pending_focus_primary = None
-
-            if focus_ids:
-                desired_ids = focus_ids
-                desired_primary = focus_primary or focus_ids[0]
-            else:
-                desired_ids = previous_selection
-                desired_primary = previous_primary
+            self._focus_changed_nodes(changed_node_ids, previous_selection, previous_primary)
+        finally:
+            self._suppress_selection_signal = False
 
-            self._apply_selection(desired_ids, desired_primary)
+    def apply_hierarchy_changes(
+        self,
+        root: HierarchyNodeViewModel,
+        changes: List[HierarchyChangeViewModel],
+        changed_node_ids: List[str],
+    ) -> bool:
+        previous_selection = list(self._current_selection_ids)
+        previous_primary = self._current_primary_id
+        self._suppress_selection_signal = True
+        try:
+            if not self._model.apply_changes(root, changes):
+                return False
+            # Moved rows keep their expansion; inserted folders pick up remembered state here.
+            self._restore_expanded_nodes()
+            self._focus_changed_nodes(changed_node_ids, previous_selection, previous_primary)
+            return True
         finally:
             self._suppress_selection_signal = False
 
@@ -97,6 +133,7 @@ class HierarchyDock(HierarchyView):
         folder_icon = style.standardIcon(QStyle.SP_DirIcon)
         image_icon = style.standardIcon(QStyle.SP_FileIcon)
         self._model.set_icons(folder_icon, image_icon)
+        self._model.set_thumbnails(self._thumbnails)
 
         self._tree_view.setModel(self._model)
         self._tree_view.setHeaderHidden(True)
@@ -117,6 +154,15 @@ class HierarchyDock(HierarchyView):
         if selection_model:
             selection_model.selectionChanged.connect(self._on_selection_changed)
 
+        if self._thumbnails:
+            edge = self._thumbnails.edge
+            self._tree_view.setIconSize(QSize(edge, edge))
+            self._tree_view.setUniformRowHeights(True)
+            self._tree_view.verticalScrollBar().valueChanged.connect(self._prefetch_timer.start)
+            self._tree_view.expanded.connect(self._prefetch_timer.start)
+            self._model.modelReset.connect(self._prefetch_timer.start)
+            self._model.rowsInserted.connect(self._prefetch_timer.start)
+
     def _open_context_menu(self, position: QPoint) -> None:
         menu = QMenu(self._tree_view)
         index = self._tree_view.indexAt(position)
@@ -199,6 +245,55 @@ class HierarchyDock(HierarchyView):
         except Exception as exc:
             self._show_error(str(exc))
 
+    def _prefetch_thumbnails(self) -> None:
+        """Warm thumbnails of the rows around the viewport and drop queued ones further away."""
+        view = self._tree_view
+        first = view.indexAt(QPoint(0, 0))
+        if not first.isValid():
+            return
+        row_height = max(1, view.sizeHintForRow(0))
+        visible_rows = view.viewport().height() // row_height + 1
+
+        # (distance from the viewport, index); requested farthest first since the cache serves newest first.
+        window: List[tuple[int, QModelIndex]] = []
+        index = first
+        for distance in range(1, THUMBNAIL_PREFETCH_ROWS + 1):
+            index = view.indexAbove(index)
+            if not index.isValid():
+                break
+            window.append((distance, index))
+        index = first
+        for row in range(visible_rows + THUMBNAIL_PREFETCH_ROWS):
+            if not index.isValid():
+                break
+            window.append((max(0, row - visible_rows + 1), index))
+            index = view.indexBelow(index)
+        window.sort(key=lambda entry: entry[0], reverse=True)
+
+        nodes = [node for node in (self._model.node_from_index(index) for _, index in window) if node]
+        self._thumbnails.retain(nodes)
+        self._thumbnails.prefetch(nodes)
+
+    def _focus_changed_nodes(
+        self,
+        changed_node_ids: List[str],
+        previous_selection: List[str],
+        previous_primary: Optional[str],
+    ) -> None:
+        focus_ids = self._pending_focus_ids or changed_node_ids
+        focus_primary = self._pending_focus_primary
+        self._pending_focus_ids = []
+        self._pending_focus_primary = None
+
+        if focus_ids:
+            desired_ids = focus_ids
+            desired_primary = focus_primary or focus_ids[0]
+        else:
+            desired_ids = previous_selection
+            desired_primary = previous_primary
+
+        self._apply_selection(desired_ids, desired_primary)
+
     def _restore_expanded_nodes(self) -> None:
         if not self._expanded_ids:
             return
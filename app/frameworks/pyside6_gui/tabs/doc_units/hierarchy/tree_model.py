@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Callable, Dict, Iterable, List, Optional
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
 from PySide6.QtCore import (
     QAbstractItemModel,
@@ -12,29 +13,45 @@ from PySide6.QtCore import (
     Qt,
     QMimeData,
 )
-from PySide6.QtGui import QIcon
+from PySide6.QtGui import QIcon, QPixmap
 
+from app.domain.doc_units.entities import HierarchyNode
 from app.interface_adapters.doc_units.presenters.hierarchy_presenter import (
+    HierarchyChangeViewModel,
     HierarchyNodeViewModel,
 )
+from app.interface_adapters.doc_units.presenters.hierarchy_thumbnail_presenter import (
+    HierarchyThumbnailPresenter,
+)
 
 
 MimeType = "application/x-doc-unit-hierarchy"
+# Decoded thumbnails kept as icons; the preview cache holds the encoded bytes behind them.
+MAX_THUMBNAIL_ICONS = 1024
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, eq=False)
 class _TreeItem:
     node: HierarchyNodeViewModel
     parent: Optional["_TreeItem"]
-    children: List["_TreeItem"]
+    # ``None`` until the folder's children are fetched.
+    children: Optional[List["_TreeItem"]]
+    # Position in ``parent.children``; kept current by every insert, remove and move.
+    position: int = 0
 
     def row(self) -> int:
-        if not self.parent:
-            return 0
-        return self.parent.children.index(self)
+        return self.position
 
 
 class HierarchyTreeModel(QAbstractItemModel):
+    """Qt model over a hierarchy view model, built lazily.
+
+    Only the root's children get items up front; a folder's items are
+    created by :meth:`fetchMore` when the view first expands it, or when
+    :meth:`find_index_by_id` has to reach a node inside it. Opening a huge
+    unit therefore costs as much as the rows that are actually shown.
+    """
+
     def __init__(
         self,
         rename_handler: Callable[[str, str], bool],
@@ -46,22 +63,63 @@ class HierarchyTreeModel(QAbstractItemModel):
         self._move_handler = move_handler
         self._root_item: Optional[_TreeItem] = None
         self._items_by_id: Dict[str, _TreeItem] = {}
+        # Parent id of every node, built on the first lookup of an unfetched node and then patched by changes.
+        self._parent_ids: Optional[Dict[str, str]] = None
         self._folder_icon: Optional[QIcon] = None
         self._image_icon: Optional[QIcon] = None
+        self._thumbnails: Optional[HierarchyThumbnailPresenter] = None
+        self._thumbnail_icons: OrderedDict[str, QIcon] = OrderedDict()
 
     def set_icons(self, folder_icon: QIcon, image_icon: QIcon) -> None:
         self._folder_icon = folder_icon
         self._image_icon = image_icon
 
+    def set_thumbnails(self, thumbnails: Optional[HierarchyThumbnailPresenter]) -> None:
+        """Decorate image rows with thumbnails; ``image_icon`` stays the placeholder until one is ready."""
+        self._thumbnails = thumbnails
+        self._thumbnail_icons.clear()
+
     def update_tree(self, root: HierarchyNodeViewModel) -> None:
         self.beginResetModel()
         self._items_by_id.clear()
-        self._root_item = self._build_tree(root, None)
+        self._thumbnail_icons.clear()
+        self._parent_ids = None
+        self._root_item = self._create_item(root, None, 0)
+        self._root_item.children = self._create_children(root, self._root_item)
         self.endResetModel()
 
+    def apply_changes(self, root: HierarchyNodeViewModel, changes: Iterable[HierarchyChangeViewModel]) -> bool:
+        """Patch the tree row by row; ``False`` means it no longer matches and needs :meth:`update_tree`.
+
+        Views keep their expansion state and selection because only the
+        touched rows are announced, instead of a model reset. Rows inside
+        folders that were never fetched are skipped; afterwards the items of
+        the changed nodes and their ancestors are rebound to ``root``.
+        """
+        if not self._root_item or self._root_item.node.node_id != root.node_id:
+            return False
+        changes = list(changes)
+        for change in changes:
+            if change.kind == "inserted":
+                applied = self._insert_row(change)
+            elif change.kind == "removed":
+                applied = self._remove_row(change)
+            elif change.kind == "moved":
+                applied = self._move_row(change)
+            elif change.kind == "updated":
+                applied = self._update_row(change)
+            else:
+                applied = False
+            if not applied:
+                return False
+            self._track_parent(change)
+        return self._rebind(root, changes)
+
     def clear(self) -> None:
         self.beginResetModel()
         self._items_by_id.clear()
+        self._thumbnail_icons.clear()
+        self._parent_ids = None
         self._root_item = None
         self.endResetModel()
 
@@ -71,7 +129,7 @@ class HierarchyTreeModel(QAbstractItemModel):
             return QModelIndex()
 
         parent_item = parent.internalPointer() if parent.isValid() else self._root_item
-        if not isinstance(parent_item, _TreeItem):
+        if not isinstance(parent_item, _TreeItem) or parent_item.children is None:
             return QModelIndex()
         if not 0 <= row < len(parent_item.children):
             return QModelIndex()
@@ -82,7 +140,7 @@ class HierarchyTreeModel(QAbstractItemModel):
         if not index.isValid():
             return QModelIndex()
         item: _TreeItem = index.internalPointer()
-        if not item.parent or item.parent == self._root_item:
+        if not item.parent or item.parent is self._root_item:
             return QModelIndex()
         return self.createIndex(item.parent.row(), 0, item.parent)
 
@@ -92,10 +150,38 @@ class HierarchyTreeModel(QAbstractItemModel):
         if not parent.isValid():
             return len(self._root_item.children)
         item: _TreeItem = parent.internalPointer()
-        if item.node.node_type == "folder":
+        if item.node.node_type == "folder" and item.children is not None:
             return len(item.children)
         return 0
 
+    def hasChildren(self, parent: QModelIndex = QModelIndex()) -> bool:
+        if not self._root_item:
+            return False
+        item: _TreeItem = parent.internalPointer() if parent.isValid() else self._root_item
+        if item.node.node_type != "folder":
+            return False
+        if item.children is None:
+            return item.node.child_count > 0
+        return bool(item.children)
+
+    def canFetchMore(self, parent: QModelIndex) -> bool:
+        if not self._root_item or not parent.isValid():
+            return False
+        item: _TreeItem = parent.internalPointer()
+        return item.children is None
+
+    def fetchMore(self, parent: QModelIndex) -> None:
+        if not self.canFetchMore(parent):
+            return
+        item: _TreeItem = parent.internalPointer()
+        children = item.node.children
+        if not children:
+            item.children = []
+            return
+        self.beginInsertRows(parent, 0, len(children) - 1)
+        item.children = self._create_children(item.node, item)
+        self.endInsertRows()
+
     def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:  # noqa: ARG002
         return 1
 
@@ -107,8 +193,13 @@ class HierarchyTreeModel(QAbstractItemModel):
 
         if role in (Qt.DisplayRole, Qt.EditRole):
             return node.name
-        if role == Qt.DecorationRole and self._folder_icon and self._image_icon:
-            return self._folder_icon if node.node_type == "folder" else self._image_icon
+        if role == Qt.DecorationRole:
+            if node.node_type != "folder" and self._thumbnails:
+                thumbnail = self._thumbnail_icon(node)
+                if thumbnail is not None:
+                    return thumbnail
+            if self._folder_icon and self._image_icon:
+                return self._folder_icon if node.node_type == "folder" else self._image_icon
         return None
 
     def flags(self, index: QModelIndex) -> Qt.ItemFlags:
@@ -183,7 +274,7 @@ class HierarchyTreeModel(QAbstractItemModel):
 
         insert_row = row
         if insert_row == -1:
-            insert_row = len(target_item.children)
+            insert_row = target_item.node.child_count
 
         if target_item is self._root_item:
             target_parent_id = self._root_item.node.node_id
@@ -198,38 +289,239 @@ class HierarchyTreeModel(QAbstractItemModel):
     # endregion
 
     def find_index_by_id(self, node_id: str) -> QModelIndex:
-        item = self._items_by_id.get(node_id)
+        item = self._items_by_id.get(node_id) or self._fetch_path_to(node_id)
         if not item or item is self._root_item:
             return QModelIndex()
-        path: List[int] = []
-        current = item
-        while current.parent and current.parent is not self._root_item:
-            path.append(current.row())
-            current = current.parent
-        path.append(current.row())
-        path.reverse()
-
-        model_index = QModelIndex()
-        parent_item = self._root_item
-        for row in path:
-            if parent_item is None or row >= len(parent_item.children):
-                return QModelIndex()
-            child_item = parent_item.children[row]
-            model_index = self.createIndex(row, 0, child_item)
-            parent_item = child_item
-        return model_index
-
-    def expanded_ids(self) -> List[str]:
-        return [node_id for node_id, item in self._items_by_id.items() if item is not self._root_item and item.node.node_type == "folder"]
-
-    def _build_tree(self, node: HierarchyNodeViewModel, parent: Optional[_TreeItem]) -> _TreeItem:
-        item = _TreeItem(node=node, parent=parent, children=[])
+        # Items know their row, so Qt needs no ancestor chain to resolve the index.
+        return self.createIndex(item.position, 0, item)
+
+    def fetched_folder_ids(self) -> List[str]:
+        """Folders whose children have items; whether the view shows them expanded is up to the view."""
+        return [
+            node_id
+            for node_id, item in self._items_by_id.items()
+            if item is not self._root_item and item.node.node_type == "folder" and item.children is not None
+        ]
+
+    def _insert_row(self, change: HierarchyChangeViewModel) -> bool:
+        parent = self._items_by_id.get(change.parent_id or "")
+        if change.node is None:
+            return False
+        if parent is None or parent.children is None:
+            self._refresh_item(parent)
+            return True
+        if not 0 <= change.row <= len(parent.children):
+            return False
+        self.beginInsertRows(self._index_for_item(parent), change.row, change.row)
+        parent.children.insert(change.row, self._create_item(change.node, parent, change.row))
+        _renumber(parent.children, change.row)
+        self.endInsertRows()
+        return True
+
+    def _remove_row(self, change: HierarchyChangeViewModel) -> bool:
+        parent = self._items_by_id.get(change.source_parent_id or "")
+        if parent is None or parent.children is None:
+            self._refresh_item(parent)
+            return True
+        if not self._holds(parent, change.source_row, change.node_id):
+            return False
+        self.beginRemoveRows(self._index_for_item(parent), change.source_row, change.source_row)
+        item = parent.children.pop(change.source_row)
+        _renumber(parent.children, change.source_row)
+        stack = [item]
+        while stack:
+            current = stack.pop()
+            self._items_by_id.pop(current.node.node_id, None)
+            self._thumbnail_icons.pop(current.node.node_id, None)
+            stack.extend(current.children or ())
+        self.endRemoveRows()
+        return True
+
+    def _move_row(self, change: HierarchyChangeViewModel) -> bool:
+        source = self._items_by_id.get(change.source_parent_id or "")
+        target = self._items_by_id.get(change.parent_id or "")
+        if target is None or target.children is None:
+            # The row leaves the fetched part of the tree (or never was in it).
+            self._refresh_item(target)
+            return self._remove_row(change)
+        if source is None or source.children is None:
+            self._refresh_item(source)
+            return self._insert_row(change)
+        if not self._holds(source, change.source_row, change.node_id):
+            return False
+        if source is target and change.row == change.source_row:
+            return True
+        target_size = len(target.children) - (1 if source is target else 0)
+        if not 0 <= change.row <= target_size:
+            return False
+        # Qt counts the destination row before the source row is taken out.
+        destination = change.row + 1 if source is target and change.row > change.source_row else change.row
+        if not self.beginMoveRows(
+            self._index_for_item(source),
+            change.source_row,
+            change.source_row,
+            self._index_for_item(target),
+            destination,
+        ):
+            return False
+        item = source.children.pop(change.source_row)
+        item.parent = target
+        target.children.insert(change.row, item)
+        if source is target:
+            _renumber(target.children, min(change.row, change.source_row))
+        else:
+            _renumber(source.children, change.source_row)
+            _renumber(target.children, change.row)
+        self.endMoveRows()
+        return True
+
+    def _update_row(self, change: HierarchyChangeViewModel) -> bool:
+        if change.node is None:
+            return False
+        item = self._items_by_id.get(change.node_id)
+        if item is not None:
+            item.node = change.node
+            # The pointer may have changed (e.g. finalized assets), so look the thumbnail up again.
+            self._thumbnail_icons.pop(change.node_id, None)
+            self._refresh_item(item)
+        return True
+
+    def _thumbnail_icon(self, node: HierarchyNodeViewModel) -> Optional[QIcon]:
+        icon = self._thumbnail_icons.get(node.node_id)
+        if icon is not None:
+            self._thumbnail_icons.move_to_end(node.node_id)
+            return icon
+        data = self._thumbnails.thumbnail(node, self._handle_thumbnail_ready)
+        pixmap = QPixmap()
+        if data is None or not pixmap.loadFromData(data):
+            return None
+        icon = QIcon(pixmap)
+        self._thumbnail_icons[node.node_id] = icon
+        if len(self._thumbnail_icons) > MAX_THUMBNAIL_ICONS:
+            self._thumbnail_icons.popitem(last=False)
+        return icon
+
+    def _handle_thumbnail_ready(self, node_id: str) -> None:
+        item = self._items_by_id.get(node_id)
+        if item is None or item is self._root_item:
+            return
+        index = self.createIndex(item.row(), 0, item)
+        self.dataChanged.emit(index, index, [Qt.DecorationRole])
+
+    def _refresh_item(self, item: Optional[_TreeItem]) -> None:
+        """Repaint ``item``, e.g. when its name changed or it gained its first child."""
+        if item is None or item is self._root_item:
+            return
+        index = self.createIndex(item.row(), 0, item)
+        self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole, Qt.DecorationRole])
+
+    def _rebind(self, root: HierarchyNodeViewModel, changes: List[HierarchyChangeViewModel]) -> bool:
+        """Point the items of changed nodes and their ancestors at the nodes of ``root``.
+
+        Edits copy only the path from the root to the nodes they touch, so
+        every other item still holds a node of ``root``. Returns ``False`` if
+        an item's row or child count does not match ``root``.
+        """
+        stale: Dict[int, Tuple[int, _TreeItem]] = {}
+        for change in changes:
+            for node_id in (change.node_id, change.parent_id, change.source_parent_id):
+                item = self._nearest_item(node_id, root)
+                chain: List[_TreeItem] = []
+                while item is not None and item is not self._root_item and id(item) not in stale:
+                    chain.append(item)
+                    item = item.parent
+                depth = stale[id(item)][0] if item is not None and id(item) in stale else 0
+                for offset, link in enumerate(reversed(chain), start=1):
+                    stale[id(link)] = (depth + offset, link)
+
+        self._root_item.node = root
+        if self._root_item.children is not None and len(self._root_item.children) != root.child_count:
+            return False
+        for _, item in sorted(stale.values(), key=lambda entry: entry[0]):
+            siblings = item.parent.node.source.children
+            if item.position >= len(siblings) or siblings[item.position].node_id != item.node.node_id:
+                return False
+            source = siblings[item.position]
+            if item.node.source is not source:
+                item.node = HierarchyNodeViewModel(source)
+            if item.children is not None and len(item.children) != len(source.children):
+                return False
+        return True
+
+    def _nearest_item(self, node_id: Optional[str], root: HierarchyNodeViewModel) -> Optional[_TreeItem]:
+        """The item of ``node_id``, or of its closest ancestor that has one."""
+        if node_id is None:
+            return None
+        parent_ids = self._parent_map(root) if node_id not in self._items_by_id else None
+        current: Optional[str] = node_id
+        while current is not None and current not in self._items_by_id:
+            current = parent_ids.get(current)
+        return self._items_by_id.get(current) if current is not None else None
+
+    def _parent_map(self, root: HierarchyNodeViewModel) -> Dict[str, str]:
+        """Parent id of every node of ``root``; built once, then kept current by :meth:`_track_parent`."""
+        if self._parent_ids is None:
+            self._parent_ids = {}
+            self._register_parents(root.source)
+        return self._parent_ids
+
+    def _register_parents(self, subtree: HierarchyNode) -> None:
+        stack = [subtree]
+        while stack:
+            node = stack.pop()
+            for child in node.children:
+                self._parent_ids[child.node_id] = node.node_id
+                stack.append(child)
+
+    def _track_parent(self, change: HierarchyChangeViewModel) -> None:
+        if self._parent_ids is None:
+            return
+        if change.kind == "removed":
+            # Descendants keep stale entries; a node inserted again is registered afresh.
+            self._parent_ids.pop(change.node_id, None)
+        elif change.kind in ("inserted", "moved") and change.parent_id is not None:
+            self._parent_ids[change.node_id] = change.parent_id
+            if change.kind == "inserted" and change.node is not None:
+                self._register_parents(change.node.source)
+
+    def _fetch_path_to(self, node_id: str) -> Optional[_TreeItem]:
+        """Fetch the folders above ``node_id`` so it gets an item; ``None`` if it is not in the tree."""
+        if not self._root_item:
+            return None
+        parent_ids = self._parent_map(self._root_item.node)
+        pending: List[str] = []
+        current = node_id
+        while current not in self._items_by_id:
+            parent_id = parent_ids.get(current)
+            if parent_id is None:
+                return None
+            pending.append(parent_id)
+            current = parent_id
+        for folder_id in reversed(pending):
+            folder = self._items_by_id.get(folder_id)
+            if folder is None:
+                return None
+            self.fetchMore(self._index_for_item(folder))
+        return self._items_by_id.get(node_id)
+
+    @staticmethod
+    def _holds(parent: _TreeItem, row: int, node_id: str) -> bool:
+        return 0 <= row < len(parent.children) and parent.children[row].node.node_id == node_id
+
+    def _index_for_item(self, item: _TreeItem) -> QModelIndex:
+        if item is self._root_item:
+            return QModelIndex()
+        return self.createIndex(item.row(), 0, item)
+
+    def _create_item(self, node: HierarchyNodeViewModel, parent: Optional[_TreeItem], position: int) -> _TreeItem:
+        unfetched = node.node_type == "folder" and node.child_count > 0
+        item = _TreeItem(node=node, parent=parent, children=None if unfetched else [], position=position)
         self._items_by_id[node.node_id] = item
-        for child_model in node.children:
-            child_item = self._build_tree(child_model, item)
-            item.children.append(child_item)
         return item
 
+    def _create_children(self, node: HierarchyNodeViewModel, parent: _TreeItem) -> List[_TreeItem]:
+        return [self._create_item(child, parent, position) for position, child in enumerate(node.children)]
+
     def node_from_index(self, index: QModelIndex) -> Optional[HierarchyNodeViewModel]:
         if not index.isValid():
             return None
@@ -240,3 +532,8 @@ class HierarchyTreeModel(QAbstractItemModel):
         if not self._root_item:
             return None
         return self._root_item.node.node_id
+
+
+def _renumber(items: List[_TreeItem], start: int) -> None:
+    for position in range(start, len(items)):
+        items[position].position = position
@@ -24,6 +24,10 @@ class UnitListItem(QWidget):
         self.is_active_label = self.ui.isActiveLabel
         self.delete_button = self.ui.deleteUnitPushButton
 
+    def set_unit(self, unit: DocUnitViewModel):
+        self.unit = unit
+        self.unit_name_label.setText(unit.name or self.NONE_ITEM_MESSAGE)
+
     def set_activity_status(self, is_active: bool):
         if is_active:
             self.is_active_label.setText("active")
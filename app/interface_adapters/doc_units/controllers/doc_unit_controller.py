@@ -1,9 +1,11 @@
-from typing import Optional
+from typing import Callable, Optional, Sequence
 
 from app.application.doc_units.dto import (
     CreateDocUnitRequest,
     DeleteDocUnitRequest,
     ImportAssetRequest,
+    ImportAssetsRequest,
+    ImportTreeRequest,
     RenameDocUnitRequest,
     SetActiveDocUnitRequest,
 )
@@ -12,6 +14,12 @@ from app.application.doc_units.use_cases.delete_doc_unit import DeleteDocUnit
 from app.application.doc_units.use_cases.import_doc_unit_asset import (
     ImportDocUnitAsset,
 )
+from app.application.doc_units.use_cases.import_doc_unit_assets import (
+    ImportDocUnitAssets,
+)
+from app.application.doc_units.use_cases.import_doc_unit_tree import (
+    ImportDocUnitTree,
+)
 from app.application.doc_units.use_cases.rename_doc_unit import RenameDocUnit
 from app.application.doc_units.use_cases.set_active_doc_unit import (
     SetActiveDocUnit,
@@ -26,12 +34,16 @@ class DocUnitController:
         delete_use_case: DeleteDocUnit,
         set_active_use_case: SetActiveDocUnit,
         import_asset_use_case: ImportDocUnitAsset,
+        import_assets_use_case: Optional[ImportDocUnitAssets] = None,
+        import_tree_use_case: Optional[ImportDocUnitTree] = None,
     ) -> None:
         self._create_use_case = create_use_case
         self._rename_use_case = rename_use_case
         self._delete_use_case = delete_use_case
         self._set_active_use_case = set_active_use_case
         self._import_asset_use_case = import_asset_use_case
+        self._import_assets_use_case = import_assets_use_case
+        self._import_tree_use_case = import_tree_use_case
 
     def create_doc_unit(self, name: str):
         return self._create_use_case.execute(CreateDocUnitRequest(name=name))
@@ -51,3 +63,35 @@ class DocUnitController:
         return self._import_asset_use_case.execute(
             ImportAssetRequest(unit_id=unit_id, source_path=source_path)
         )
+
+    def import_assets(
+        self,
+        unit_id: str,
+        source_paths: Sequence[str],
+        progress: Optional[Callable[[int, int], None]] = None,
+        cancelled: Optional[Callable[[], bool]] = None,
+    ):
+        if self._import_assets_use_case is None:
+            for source_path in source_paths:
+                self.import_asset(unit_id, source_path)
+            return None
+        return self._import_assets_use_case.execute(
+            ImportAssetsRequest(unit_id=unit_id, source_paths=list(source_paths)),
+            progress=progress,
+            cancelled=cancelled,
+        )
+
+    def import_tree(
+        self,
+        unit_id: str,
+        source_path: str,
+        progress: Optional[Callable[[int, int], None]] = None,
+        cancelled: Optional[Callable[[], bool]] = None,
+    ):
+        if self._import_tree_use_case is None:
+            raise RuntimeError("Folder and archive import is not available.")
+        return self._import_tree_use_case.execute(
+            ImportTreeRequest(unit_id=unit_id, source_path=source_path),
+            progress=progress,
+            cancelled=cancelled,
+        )
@@ -9,10 +9,10 @@ from app.application.doc_units.events import (
     DocUnitListUpdated,
     ProjectDirtyStateChanged,
 )
-from app.application.doc_units.use_cases.list_doc_units import ListDocUnits
+from app.application.doc_units.use_cases.list_doc_unit_summaries import ListDocUnitSummaries
 
 
-@dataclass(slots=True)
+@dataclass(frozen=True, slots=True)
 class DocUnitViewModel:
     unit_id: str
     name: str
@@ -27,7 +27,7 @@ class DocUnitView(Protocol):
 
 
 class DocUnitPresenter:
-    def __init__(self, event_bus: DocUnitEventBus, list_use_case: ListDocUnits) -> None:
+    def __init__(self, event_bus: DocUnitEventBus, list_use_case: ListDocUnitSummaries) -> None:
         self._event_bus = event_bus
         self._list_use_case = list_use_case
         self._view: Optional[DocUnitView] = None
@@ -62,14 +62,14 @@ class DocUnitPresenter:
         if not self._view:
             return
         try:
-            units = self._list_use_case.execute()
+            summaries = self._list_use_case.execute()
             view_models = [
                 DocUnitViewModel(
-                    unit_id=unit.unit_id.value,
-                    name=unit.name.value,
-                    created_at=unit.created_at,
+                    unit_id=summary.unit_id,
+                    name=summary.name,
+                    created_at=summary.created_at,
                 )
-                for unit in units
+                for summary in summaries
             ]
             self._view.display_units(view_models)
         except RuntimeError as exc:
@@ -1,16 +1,18 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Optional, Protocol
+from typing import Dict, Optional, Protocol, Tuple
 
 from app.application.doc_units.events import (
     ActiveDocUnitChanged,
+    HierarchyLoaded,
     HierarchySelectionChanged,
     HierarchyUpdated,
 )
 from app.application.doc_units.ports import ActiveDocUnitStore, DocUnitHierarchyRepository, MediaStore
-from app.domain.doc_units.entities import HierarchyNode
-from app.domain.doc_units.services import find_node
+from app.application.doc_units.use_cases.asset_preview_cache import AssetPreviewCache
+from app.domain.doc_units.entities import AssetPointer, HierarchyNode
+from app.domain.doc_units.services import HierarchyIndex
 
 
 @dataclass(slots=True)
@@ -20,29 +22,48 @@ class HierarchyDetailsViewModel:
     node_type: str
     children_count: Optional[int]
     image_path: Optional[str]
+    preview: Optional[bytes] = None
+    preview_pending: bool = False
 
 
 class HierarchyDetailsView(Protocol):
     def show_hierarchy_item(self, view_model: HierarchyDetailsViewModel) -> None: ...
+    def show_preview(self, node_id: str, preview: Optional[bytes]) -> None: ...
     def show_no_selection(self) -> None: ...
 
 
 class HierarchyDetailsPresenter:
+    """Details of the primary selected hierarchy node.
+
+    The presenter follows the active unit's root from hierarchy events and
+    looks nodes up through an index of it, so moving the selection costs a
+    dict lookup instead of a repository round trip. Resolved image paths are
+    remembered per pointer until the active unit changes.
+    """
+
+    PREVIEW_MAX_EDGE = 1024
+
     def __init__(
         self,
         event_bus,
         repository: DocUnitHierarchyRepository,
         active_store: ActiveDocUnitStore,
         media_store: MediaStore,
+        previews: Optional[AssetPreviewCache] = None,
     ) -> None:
         self._event_bus = event_bus
         self._repository = repository
         self._active_store = active_store
         self._media_store = media_store
+        self._previews = previews
         self._view: Optional[HierarchyDetailsView] = None
         self._current_primary_id: Optional[str] = None
         self._current_selected_ids: list[str] = []
+        self._root: Optional[HierarchyNode] = None
+        self._index: Optional[HierarchyIndex] = None
+        self._image_paths: Dict[Tuple[str, str, str, Optional[str]], str] = {}
 
+        self._event_bus.subscribe(HierarchyLoaded, self._handle_hierarchy_loaded)
         self._event_bus.subscribe(HierarchySelectionChanged, self._handle_selection_changed)
         self._event_bus.subscribe(HierarchyUpdated, self._handle_hierarchy_updated)
         self._event_bus.subscribe(ActiveDocUnitChanged, self._handle_active_unit_changed)
@@ -67,17 +88,24 @@ class HierarchyDetailsPresenter:
             return
         self._refresh_details()
 
+    def _handle_hierarchy_loaded(self, event: HierarchyLoaded) -> None:
+        if self._is_active(event.unit_id):
+            self._bind(event.root)
+
     def _handle_hierarchy_updated(self, event: HierarchyUpdated) -> None:
-        if not self._view or not self._current_primary_id:
+        if not self._is_active(event.unit_id):
             return
-        unit_id = self._active_store.get()
-        if not unit_id or unit_id.value != event.unit_id:
+        self._bind(event.root)
+        if not self._view or not self._current_primary_id:
             return
         self._refresh_details()
 
     def _handle_active_unit_changed(self, event: ActiveDocUnitChanged) -> None:
         self._current_primary_id = None
         self._current_selected_ids = []
+        self._root = None
+        self._index = None
+        self._image_paths.clear()
         if self._view:
             self._view.show_no_selection()
 
@@ -88,18 +116,7 @@ class HierarchyDetailsPresenter:
             self._view.show_no_selection()
             return
 
-        unit_id = self._active_store.get()
-        if not unit_id:
-            self._view.show_no_selection()
-            return
-
-        try:
-            root = self._repository.get_hierarchy(unit_id)
-        except Exception:
-            self._view.show_no_selection()
-            return
-
-        node = find_node(root, self._current_primary_id)
+        node = self._find_node(self._current_primary_id)
         if not node:
             self._view.show_no_selection()
             return
@@ -107,22 +124,71 @@ class HierarchyDetailsPresenter:
         view_model = self._build_view_model(node)
         self._view.show_hierarchy_item(view_model)
 
+    def _is_active(self, unit_id: str) -> bool:
+        active = self._active_store.get()
+        return bool(active) and active.value == unit_id
+
+    def _bind(self, root: HierarchyNode) -> None:
+        if root is not self._root:
+            self._root = root
+            self._index = None
+
+    def _find_node(self, node_id: str) -> Optional[HierarchyNode]:
+        if self._index is None:
+            unit_id = self._active_store.get()
+            if not unit_id:
+                return None
+            try:
+                # The repository keeps its index rebound across edits; share it when it is current.
+                index = self._repository.get_hierarchy_index(unit_id)
+            except Exception:
+                return None
+            if self._root is None:
+                self._root = index.root
+            self._index = index if index.root is self._root else HierarchyIndex(self._root)
+        if self._index.root is not self._root:
+            # A shared index moved on to a newer root before our event arrived.
+            self._index = HierarchyIndex(self._root)
+        return self._index.get(node_id)
+
+    def _resolve_image_path(self, pointer: AssetPointer) -> Optional[str]:
+        key = (pointer.asset_id.value, pointer.resolver, pointer.status, pointer.path_hint)
+        image_path = self._image_paths.get(key)
+        if image_path is None:
+            try:
+                image_path = self._media_store.resolve_path(pointer)
+            except Exception:
+                return None
+            self._image_paths[key] = image_path
+        return image_path
+
     def _build_view_model(self, node: HierarchyNode) -> HierarchyDetailsViewModel:
         if node.node_type == HierarchyNode.FOLDER_TYPE:
             children_count = len(node.children)
             image_path: Optional[str] = None
         else:
             children_count = None
-            image_path = None
-            if node.pointer:
-                try:
-                    image_path = self._media_store.resolve_path(node.pointer)
-                except Exception:
-                    image_path = None
+            image_path = self._resolve_image_path(node.pointer) if node.pointer else None
+        preview = None
+        preview_pending = False
+        if image_path and node.pointer and self._previews:
+            preview = self._previews.request(
+                node.pointer,
+                self.PREVIEW_MAX_EDGE,
+                lambda data, node_id=node.node_id: self._handle_preview_ready(node_id, data),
+            )
+            preview_pending = preview is None
         return HierarchyDetailsViewModel(
             node_id=node.node_id,
             name=node.name,
             node_type=node.node_type,
             children_count=children_count,
             image_path=image_path,
+            preview=preview,
+            preview_pending=preview_pending,
         )
+
+    def _handle_preview_ready(self, node_id: str, preview: Optional[bytes]) -> None:
+        # Selection may have moved on while the preview was rendering.
+        if self._view and self._current_primary_id == node_id:
+            self._view.show_preview(node_id, preview)
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, List, Optional, Protocol
+from types import MappingProxyType
+from typing import Any, List, Mapping, Optional, Protocol
 
 from app.application.doc_units.events import (
     ActiveDocUnitChanged,
@@ -11,20 +12,73 @@ from app.application.doc_units.events import (
 )
 from app.application.doc_units.use_cases.hierarchy.load_hierarchy import LoadHierarchy
 from app.domain.doc_units.entities import AssetPointer, HierarchyNode
+from app.domain.doc_units.services import HierarchyChange
 
 
-@dataclass(slots=True)
+@dataclass(frozen=True, slots=True)
 class HierarchyNodeViewModel:
+    """Read-only view of one hierarchy node, created on demand.
+
+    Published hierarchy nodes are never mutated, so the view model reads
+    straight from ``source``: ``settings`` is a read-only proxy rather than
+    a copy, and child view models only exist once :attr:`children` is read.
+    """
+
+    source: HierarchyNode
+
+    @property
+    def node_id(self) -> str:
+        return self.source.node_id
+
+    @property
+    def name(self) -> str:
+        return self.source.name
+
+    @property
+    def node_type(self) -> str:
+        return self.source.node_type
+
+    @property
+    def pointer(self) -> Optional[AssetPointer]:
+        return self.source.pointer
+
+    @property
+    def settings(self) -> Mapping[str, Any]:
+        return MappingProxyType(self.source.settings)
+
+    @property
+    def child_count(self) -> int:
+        return len(self.source.children)
+
+    @property
+    def children(self) -> List["HierarchyNodeViewModel"]:
+        return [HierarchyNodeViewModel(child) for child in self.source.children]
+
+
+@dataclass(slots=True)
+class HierarchyChangeViewModel:
+    """One row-level step of a hierarchy update; see :class:`HierarchyChange`.
+
+    ``node`` is the node after the step; it is ``None`` for removals.
+    """
+
+    kind: str
     node_id: str
-    name: str
-    node_type: str
-    pointer: Optional[AssetPointer]
-    settings: dict[str, Any]
-    children: List["HierarchyNodeViewModel"]
+    parent_id: Optional[str]
+    row: int
+    source_parent_id: Optional[str]
+    source_row: int
+    node: Optional[HierarchyNodeViewModel]
 
 
 class HierarchyView(Protocol):
     def display_hierarchy(self, root: HierarchyNodeViewModel, changed_node_ids: List[str]) -> None: ...
+    def apply_hierarchy_changes(
+        self,
+        root: HierarchyNodeViewModel,
+        changes: List[HierarchyChangeViewModel],
+        changed_node_ids: List[str],
+    ) -> bool: ...
     def clear(self) -> None: ...
     def select_nodes(self, primary_node_id: Optional[str], selected_node_ids: List[str]) -> None: ...
 
@@ -76,10 +130,22 @@ class HierarchyPresenter:
         if self._active_unit_id != event.unit_id:
             # Ignore updates for inactive units
             return
-        self._current_root = event.root
-        if self._view:
-            model = self._build_view_model(event.root)
-            self._view.display_hierarchy(model, event.changed_node_ids)
+        previous_root, self._current_root = self._current_root, event.root
+        if not self._view:
+            return
+        if (
+            event.changes is not None
+            and previous_root is not None
+            and event.previous_root is previous_root
+        ):
+            # The view shows ``previous_root``; patch the changed rows only.
+            changes = [self._build_change_view_model(change) for change in event.changes]
+            if self._view.apply_hierarchy_changes(
+                self._build_view_model(event.root), changes, event.changed_node_ids
+            ):
+                return
+        model = self._build_view_model(event.root)
+        self._view.display_hierarchy(model, event.changed_node_ids)
 
     def _handle_selection_changed(self, event: HierarchySelectionChanged) -> None:
         if self._active_unit_id != event.unit_id:
@@ -95,11 +161,16 @@ class HierarchyPresenter:
                 self._view.clear()
 
     def _build_view_model(self, node: HierarchyNode) -> HierarchyNodeViewModel:
-        return HierarchyNodeViewModel(
-            node_id=node.node_id,
-            name=node.name,
-            node_type=node.node_type,
-            pointer=node.pointer,
-            settings=dict(node.settings),
-            children=[self._build_view_model(child) for child in node.children],
+        return HierarchyNodeViewModel(node)
+
+    def _build_change_view_model(self, change: HierarchyChange) -> HierarchyChangeViewModel:
+        node = self._build_view_model(change.node) if change.node is not None else None
+        return HierarchyChangeViewModel(
+            kind=change.kind,
+            node_id=change.node_id,
+            parent_id=change.parent_id,
+            row=change.row,
+            source_parent_id=change.source_parent_id,
+            source_row=change.source_row,
+            node=node,
         )
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from typing import Callable, Iterable, Optional
+
+from app.application.doc_units.dto import PreviewCacheStats
+from app.application.doc_units.use_cases.asset_preview_cache import AssetPreviewCache
+from app.domain.doc_units.entities import HierarchyNode
+from app.interface_adapters.doc_units.presenters.hierarchy_presenter import HierarchyNodeViewModel
+
+
+class HierarchyThumbnailPresenter:
+    """Thumbnails of image nodes for the hierarchy tree.
+
+    They share the preview cache (and its memory budget) with the details
+    pane, at a smaller size. Rows being painted are requested first;
+    :meth:`prefetch` warms the rows around them at a lower priority and
+    :meth:`retain` drops queued work for rows that scrolled out of reach.
+    """
+
+    THUMBNAIL_EDGE = 48
+
+    def __init__(self, previews: AssetPreviewCache, edge: int = THUMBNAIL_EDGE) -> None:
+        self._previews = previews
+        self._edge = edge
+
+    @property
+    def edge(self) -> int:
+        return self._edge
+
+    @property
+    def stats(self) -> PreviewCacheStats:
+        return self._previews.stats
+
+    def thumbnail(self, node: HierarchyNodeViewModel, on_ready: Callable[[str], None]) -> Optional[bytes]:
+        """Return the node's thumbnail, or ``None`` and call ``on_ready(node_id)`` once it is available.
+
+        Nodes without a readable image never call back, so a view can ask
+        again on every paint without looping.
+        """
+        if node.node_type != HierarchyNode.IMAGE_TYPE or node.pointer is None:
+            return None
+        node_id = node.node_id
+
+        def handle_ready(data: Optional[bytes]) -> None:
+            if data is not None:
+                on_ready(node_id)
+
+        return self._previews.request(node.pointer, self._edge, handle_ready)
+
+    def prefetch(self, nodes: Iterable[HierarchyNodeViewModel]) -> None:
+        for node in nodes:
+            if node.node_type == HierarchyNode.IMAGE_TYPE and node.pointer is not None:
+                self._previews.request(node.pointer, self._edge, priority=AssetPreviewCache.PRIORITY_PREFETCH)
+
+    def retain(self, nodes: Iterable[HierarchyNodeViewModel]) -> None:
+        """Keep queued thumbnails of ``nodes`` only; the others are no longer near the viewport."""
+        keep = {node.pointer.asset_id.value for node in nodes if node.pointer is not None}
+        self._previews.discard_queued(self._edge, keep)
@@ -1,46 +1,119 @@
 from __future__ import annotations
 
-from typing import Optional
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Mapping, Optional, Set, Tuple
 
+from app.application.doc_units.dto import DocUnitSummary
 from app.application.doc_units.ports import (
     DocUnitHierarchyRepository,
     DocUnitRepository,
 )
 from app.application.project.ports import CurrentProjectStore
 from app.domain.doc_units.entities import DocUnit, HierarchyNode
+from app.domain.doc_units.services import HierarchyIndex, count_asset_references
 from app.domain.doc_units.value_objects import DocUnitId
 from app.domain.project.value_objects import ProjectData
+from app.interface_adapters.project.mappers.lazy_doc_units import (
+    LazyDocUnitMap,
+    count_asset_references as count_dict_asset_references,
+    unit_summary,
+)
+
+
+@dataclass(slots=True)
+class DocUnitCacheStats:
+    hits: int = 0
+    misses: int = 0
+    write_backs: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
 
 
 class ProjectDocUnitRepository(DocUnitRepository, DocUnitHierarchyRepository):
+    """Identity-mapped, write-back view over ``ProjectData.doc_units``.
+
+    Units are hydrated from their dicts once per loaded project and handed out
+    as the same ``DocUnit`` objects afterwards. Saves only replace the cached
+    object and mark it dirty; dirty units are serialized back into the project
+    dicts by :meth:`flush`, which runs right before the project is persisted.
+    :meth:`list_summaries` reads names straight from those dicts, so listing
+    units does not hydrate any hierarchy.
+
+    Asset references are counted per unit: hydrated units are recounted only
+    when their hierarchy was replaced, the others use the counts stored next
+    to their files. Whether a unit still points at staged assets comes from
+    its manifest summary, so neither question loads a unit.
+    """
+
     def __init__(self, project_store: CurrentProjectStore) -> None:
         self._project_store = project_store
+        self._bound_project: Optional[ProjectData] = None
+        self._units: Dict[str, DocUnit] = {}
+        self._indexes: Dict[str, HierarchyIndex] = {}
+        self._summaries: Dict[str, DocUnitSummary] = {}
+        self._asset_references: Dict[str, Tuple[HierarchyNode, Counter[str], bool]] = {}
+        self._dirty: Set[str] = set()
+        self._stats = DocUnitCacheStats()
+
+    @property
+    def stats(self) -> DocUnitCacheStats:
+        return self._stats
 
     def list_units(self) -> list[DocUnit]:
         project_data = self._require_project_data()
-        return [
-            DocUnit.from_dict(unit_id, data)
-            for unit_id, data in project_data.doc_units.items()
-        ]
+        return [self._hydrate(project_data, unit_id) for unit_id in self._unit_ids(project_data)]
+
+    def list_summaries(self) -> list[DocUnitSummary]:
+        project_data = self._require_project_data()
+        return [self._summary(project_data, unit_id) for unit_id in self._unit_ids(project_data)]
 
     def get_unit(self, unit_id: DocUnitId) -> Optional[DocUnit]:
         project_data = self._require_project_data()
-        if unit_dict := project_data.doc_units.get(unit_id.value):
-            return DocUnit.from_dict(unit_id.value, unit_dict)
+        if unit_id.value in self._units or unit_id.value in project_data.doc_units:
+            return self._hydrate(project_data, unit_id.value)
         return None
 
     def save_unit(self, doc_unit: DocUnit) -> None:
-        project_data = self._require_project_data()
-        project_data.doc_units[doc_unit.unit_id.value] = doc_unit.to_dict()
-        self._project_store.set_data(project_data)
+        self._require_project_data()
+        unit_id = doc_unit.unit_id.value
+        self._units[unit_id] = doc_unit
+        self._dirty.add(unit_id)
 
     def delete_unit(self, unit_id: DocUnitId) -> None:
         project_data = self._require_project_data()
+        known = unit_id.value in self._units or unit_id.value in project_data.doc_units
+        self._units.pop(unit_id.value, None)
+        self._indexes.pop(unit_id.value, None)
+        self._summaries.pop(unit_id.value, None)
+        self._asset_references.pop(unit_id.value, None)
+        self._dirty.discard(unit_id.value)
+        if not known:
+            return
         if unit_id.value in project_data.doc_units:
+            # ``del`` rather than ``pop`` so a lazily stored unit is not read just to be dropped.
             del project_data.doc_units[unit_id.value]
-            if project_data.last_active_doc_unit_id == unit_id.value:
-                project_data.last_active_doc_unit_id = None
-            self._project_store.set_data(project_data)
+        if project_data.last_active_doc_unit_id == unit_id.value:
+            project_data.last_active_doc_unit_id = None
+        self._project_store.set_data(project_data)
+
+    def units_with_staged_assets(self) -> list[DocUnit]:
+        project_data = self._require_project_data()
+        return [
+            self._hydrate(project_data, unit_id)
+            for unit_id in self._unit_ids(project_data)
+            if self._has_staged_assets(project_data, unit_id)
+        ]
+
+    def asset_reference_counts(self) -> Mapping[str, int]:
+        project_data = self._require_project_data()
+        counts: Counter[str] = Counter()
+        for unit_id in self._unit_ids(project_data):
+            counts.update(self._asset_counts(project_data, unit_id))
+        return counts
 
     def get_hierarchy(self, unit_id: DocUnitId) -> HierarchyNode:
         doc_unit = self.get_unit(unit_id)
@@ -48,6 +121,14 @@ class ProjectDocUnitRepository(DocUnitRepository, DocUnitHierarchyRepository):
             raise KeyError(f"Doc unit '{unit_id.value}' not found.")
         return doc_unit.hierarchy
 
+    def get_hierarchy_index(self, unit_id: DocUnitId) -> HierarchyIndex:
+        hierarchy = self.get_hierarchy(unit_id)
+        index = self._indexes.get(unit_id.value)
+        if index is None or index.root is not hierarchy:
+            index = HierarchyIndex(hierarchy)
+            self._indexes[unit_id.value] = index
+        return index
+
     def save_hierarchy(self, unit_id: DocUnitId, hierarchy: HierarchyNode) -> None:
         doc_unit = self.get_unit(unit_id)
         if not doc_unit:
@@ -61,8 +142,76 @@ class ProjectDocUnitRepository(DocUnitRepository, DocUnitHierarchyRepository):
         )
         self.save_unit(updated)
 
+    def flush(self) -> None:
+        """Serialize dirty units back into the current project's dicts."""
+        project_data = self._project_store.get_data()
+        if project_data is None or project_data is not self._bound_project or not self._dirty:
+            return
+        for unit_id in list(self._dirty):
+            project_data.doc_units[unit_id] = self._units[unit_id].to_dict()
+            self._stats.write_backs += 1
+        self._dirty.clear()
+        self._project_store.set_data(project_data)
+
+    def _unit_ids(self, project_data: ProjectData) -> list[str]:
+        unit_ids = list(project_data.doc_units.keys())
+        unit_ids.extend(unit_id for unit_id in self._units if unit_id not in project_data.doc_units)
+        return unit_ids
+
+    def _summary(self, project_data: ProjectData, unit_id: str) -> DocUnitSummary:
+        if cached := self._units.get(unit_id):
+            # Hydrated units are the source of truth once they exist.
+            return DocUnitSummary(unit_id=unit_id, name=cached.name.value, created_at=cached.created_at)
+        summary = self._summaries.get(unit_id)
+        if summary is None:
+            doc_units = project_data.doc_units
+            # The manifest lists names, so listing stays clear of lazily stored unit files.
+            data = doc_units.summary(unit_id) if isinstance(doc_units, LazyDocUnitMap) else doc_units[unit_id]
+            summary = DocUnitSummary(unit_id=unit_id, name=data.get("name") or unit_id, created_at=data.get("created_at"))
+            self._summaries[unit_id] = summary
+        return summary
+
+    def _asset_counts(self, project_data: ProjectData, unit_id: str) -> Mapping[str, int]:
+        if cached_unit := self._units.get(unit_id):
+            return self._hydrated_asset_references(unit_id, cached_unit)[0]
+        doc_units = project_data.doc_units
+        if isinstance(doc_units, LazyDocUnitMap):
+            return doc_units.asset_references(unit_id)
+        return count_dict_asset_references(doc_units[unit_id])
+
+    def _has_staged_assets(self, project_data: ProjectData, unit_id: str) -> bool:
+        if cached_unit := self._units.get(unit_id):
+            return self._hydrated_asset_references(unit_id, cached_unit)[1]
+        doc_units = project_data.doc_units
+        data = doc_units.summary(unit_id) if isinstance(doc_units, LazyDocUnitMap) else unit_summary(doc_units[unit_id])
+        return data["staged_assets"]
+
+    def _hydrated_asset_references(self, unit_id: str, unit: DocUnit) -> Tuple[Counter[str], bool]:
+        cached = self._asset_references.get(unit_id)
+        if cached is None or cached[0] is not unit.hierarchy:
+            cached = (unit.hierarchy, *count_asset_references(unit.hierarchy))
+            self._asset_references[unit_id] = cached
+        return cached[1], cached[2]
+
+    def _hydrate(self, project_data: ProjectData, unit_id: str) -> DocUnit:
+        if cached := self._units.get(unit_id):
+            self._stats.hits += 1
+            return cached
+        self._stats.misses += 1
+        doc_unit = DocUnit.from_dict(unit_id, project_data.doc_units[unit_id])
+        self._units[unit_id] = doc_unit
+        return doc_unit
+
     def _require_project_data(self) -> ProjectData:
         project_data = self._project_store.get_data()
         if project_data is None:
             raise RuntimeError("No project loaded.")
+        if project_data is not self._bound_project:
+            # A different project was created or loaded; drop the identity map.
+            self._bound_project = project_data
+            self._units.clear()
+            self._indexes.clear()
+            self._summaries.clear()
+            self._asset_references.clear()
+            self._dirty.clear()
         return project_data
@@ -8,9 +8,13 @@ from app.application.doc_units.events import (
     DocUnitEventBus,
     ProjectDirtyStateChanged,
 )
+from app.application.project.use_cases.background_project_saver import (
+    BackgroundProjectSaver,
+)
 from app.application.project.use_cases.create_project import CreateProject
 from app.application.project.use_cases.save_project import SaveProject
 from app.application.project.use_cases.load_project import LoadProject
+from app.application.project.use_cases.restore_recovery import RestoreRecovery
 from app.application.project.dto import (
     CreateProjectRequest,
     SaveProjectRequest,
@@ -35,6 +39,8 @@ class MainWindowController:
         doc_unit_event_bus: DocUnitEventBus,
         finalize_doc_unit_assets: FinalizeDocUnitAssets | None = None,
         project_ready_callbacks: Optional[Sequence[Callable[[], None]]] = None,
+        project_saver: BackgroundProjectSaver | None = None,
+        restore_recovery: RestoreRecovery | None = None,
     ) -> None:
         self._presenter = presenter
         self._create_project_use_case = create_project_use_case
@@ -44,8 +50,12 @@ class MainWindowController:
         self._project_ready_callbacks = list(project_ready_callbacks or [])
         self._finalize_doc_unit_assets = finalize_doc_unit_assets
         self._doc_unit_event_bus = doc_unit_event_bus
+        self._project_saver = project_saver
+        self._restore_recovery = restore_recovery
 
     def on_new_project_triggered(self) -> None:
+        if self._save_in_progress("create a project"):
+            return
         if project_name := self._presenter.request_project_name():
             req = CreateProjectRequest(project_name)
             self._create_project_use_case.execute(req)
@@ -66,13 +76,13 @@ class MainWindowController:
         self._prompt_and_save()
 
     def on_load_project_triggered(self) -> None:
+        if self._save_in_progress("load a project"):
+            return
         if load_location := self._presenter.request_load_location_path():
             try:
                 req = LoadProjectRequest(load_location)
                 self._load_project_use_case.execute(req)
-                self._presenter.refresh_window_title()
-                self._notify_project_ready()
-                self._publish_clean_state()
+                self._after_load()
                 log.info("Project loaded")
             except Exception as ex:
                 log.error(ex)
@@ -85,14 +95,41 @@ class MainWindowController:
         try:
             req = LoadProjectRequest(last_path)
             self._load_project_use_case.execute(req)
-            self._presenter.refresh_window_title()
-            self._notify_project_ready()
-            self._publish_clean_state()
+            self._after_load()
             log.info("Last project loaded")
         except Exception as ex:
             log.error(ex)
             self._project_settings_store.clear_last_project_path()
 
+    def _save_in_progress(self, action: str) -> bool:
+        """Whether a background save is running; swapping projects under it would mix the two."""
+        if self._project_saver and self._project_saver.is_saving:
+            log.warning("Cannot %s while the project is being saved.", action)
+            return True
+        return False
+
+    def _after_load(self) -> None:
+        recovered = self._offer_recovery()
+        self._presenter.refresh_window_title()
+        self._notify_project_ready()
+        if recovered:
+            self._publish_dirty_state(True)
+        else:
+            self._publish_clean_state()
+
+    def _offer_recovery(self) -> bool:
+        """Ask whether to restore autosaved changes left by a crash; True if they were restored."""
+        if not self._restore_recovery or not self._restore_recovery.available():
+            return False
+        try:
+            if self._presenter.confirm_restore_recovery():
+                self._restore_recovery.execute()
+                return True
+            self._restore_recovery.discard()
+        except Exception as ex:
+            log.exception("Failed to restore recovery slot: %s", ex)
+        return False
+
     def _notify_project_ready(self) -> None:
         for callback in self._project_ready_callbacks:
             try:
@@ -101,6 +138,8 @@ class MainWindowController:
                 log.exception("Project ready callback failed: %s", ex)
 
     def _attempt_save(self, save_path: Optional[str]) -> bool:
+        if self._project_saver:
+            return self._request_background_save(save_path)
         try:
             if self._finalize_doc_unit_assets:
                 self._finalize_doc_unit_assets.execute()
@@ -116,6 +155,18 @@ class MainWindowController:
             log.error(ex)
             return False
 
+    def _request_background_save(self, save_path: Optional[str]) -> bool:
+        # Asset finalization, completion logging and the clean-state event are
+        # handled by the saver once the worker is done.
+        try:
+            self._project_saver.request(SaveProjectRequest(save_path))
+            return True
+        except ProjectSaveLocationUndefinedError:
+            raise
+        except Exception as ex:
+            log.error(ex)
+            return False
+
     def _prompt_and_save(self) -> None:
         if save_location := self._presenter.request_save_as_location_path():
             try:
@@ -124,7 +175,10 @@ class MainWindowController:
                 log.error("Save location remained undefined after prompting the user.")
 
     def _publish_clean_state(self) -> None:
+        self._publish_dirty_state(False)
+
+    def _publish_dirty_state(self, is_dirty: bool) -> None:
         try:
-            self._doc_unit_event_bus.publish(ProjectDirtyStateChanged(False))
+            self._doc_unit_event_bus.publish(ProjectDirtyStateChanged(is_dirty))
         except Exception as ex:
-            log.exception("Failed to publish clean state: %s", ex)
+            log.exception("Failed to publish dirty state: %s", ex)
@@ -43,6 +43,9 @@ class MainWindowPresenter:
     def request_load_location_path(self) -> Optional[str]:
         return self.view.prompt_existing_project_location() if self.view else None
 
+    def confirm_restore_recovery(self) -> bool:
+        return self.view.confirm_restore_recovery() if self.view else False
+
     def refresh_window_title(self) -> None:
         self._update_window_title()
 
@@ -8,4 +8,6 @@ class MainWindowView(Protocol):
 
     def prompt_existing_project_location(self) -> Optional[str]: ...
 
+    def confirm_restore_recovery(self) -> bool: ...
+
     def update_window_title(self, title: str) -> None: ...
@@ -0,0 +1,334 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, Mapping, Optional, Sequence, Set
+
+from app.application.project.ports import CurrentProjectStore, IdGenerator
+from app.domain.doc_units.entities import AssetPointer
+from app.domain.doc_units.value_objects import AssetId
+from app.interface_adapters.project.util.atomic_files import write_atomic
+
+from .filesystem_media_store import FileSystemMediaStore
+
+try:  # Reflinks are a Linux ioctl; elsewhere we go straight to the fallbacks.
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+log = logging.getLogger(__name__)
+
+_FICLONE = 0x40049409
+_HASH_CHUNK_SIZE = 1024 * 1024
+_DIGEST_SIZE = 20
+
+
+class ContentAddressedMediaStore(FileSystemMediaStore):
+    """Media store that keeps every distinct file once, keyed by its BLAKE2 digest.
+
+    The digest is the asset id. Importing bytes that are already staged or
+    already final reuses the existing file instead of copying again, so many
+    pointers can share one asset. Final blobs live under ``CAS_DIR`` and an
+    index next to them records how many hierarchy nodes referenced each one
+    at the last save; :meth:`collect_garbage` updates those counts and deletes
+    blobs that dropped to zero without walking the asset directory.
+
+    New files are materialized with a reflink when the filesystem supports
+    it, otherwise copied. ``use_hardlinks`` links to the source instead of
+    copying; it is off by default because edits to the source file would
+    then show up in the project.
+    """
+
+    CAS_DIR = "docs_units/assets/cas"
+    INDEX_FILE = "docs_units/asset_index.json"
+    _INDEX_VERSION = 1
+
+    def __init__(
+        self,
+        project_store: CurrentProjectStore,
+        ids: IdGenerator,
+        max_io_workers: Optional[int] = None,
+        use_hardlinks: bool = False,
+    ) -> None:
+        super().__init__(project_store, ids, max_io_workers)
+        self._use_hardlinks = use_hardlinks
+        self._lock = threading.Lock()
+        self._index_root: Optional[Path] = None
+        self._refs: Dict[str, int] = {}
+        self._by_digest: Dict[str, str] = {}
+        self._staged: Dict[str, str] = {}
+        self._pinned: Set[str] = set()
+
+    def import_temp(self, source_path: str) -> AssetPointer:
+        project_root = self._require_project_root()
+        source = Path(source_path)
+        if not source.exists():
+            raise FileNotFoundError(source_path)
+
+        digest = self.hash_file(source)
+        existing = self._existing_pointer(project_root, digest)
+        if existing is not None:
+            return existing
+
+        dest_dir = project_root.joinpath(self.TEMP_DIR)
+        dest_dir.mkdir(parents=True, exist_ok=True)
+        dest_path = dest_dir.joinpath(f"{digest}{source.suffix.lower()}")
+        self._materialize(source, dest_path)
+
+        relative_path = dest_path.relative_to(project_root).as_posix()
+        with self._lock:
+            self._staged[digest] = relative_path
+        return self._pointer(digest, "tmp", relative_path)
+
+    def import_stream(self, open_source: Callable[[], BinaryIO], suffix: str) -> AssetPointer:
+        """Copy a stream into temp storage while hashing it, then deduplicate by digest."""
+        project_root = self._require_project_root()
+        dest_dir = project_root.joinpath(self.TEMP_DIR)
+        dest_dir.mkdir(parents=True, exist_ok=True)
+        partial = dest_dir.joinpath(f"{self._ids.generate()}.part")
+        hasher = hashlib.blake2b(digest_size=_DIGEST_SIZE)
+        try:
+            with open_source() as source, open(partial, "wb") as dest:
+                while chunk := source.read(self.COPY_CHUNK_SIZE):
+                    hasher.update(chunk)
+                    dest.write(chunk)
+            digest = hasher.hexdigest()
+            existing = self._existing_pointer(project_root, digest)
+            if existing is not None:
+                return existing
+            dest_path = dest_dir.joinpath(f"{digest}{suffix.lower()}")
+            partial.replace(dest_path)
+        finally:
+            partial.unlink(missing_ok=True)
+
+        relative_path = dest_path.relative_to(project_root).as_posix()
+        with self._lock:
+            self._staged[digest] = relative_path
+        return self._pointer(digest, "tmp", relative_path)
+
+    def _existing_pointer(self, project_root: Path, digest: str) -> Optional[AssetPointer]:
+        """Pointer to bytes with ``digest`` that are already final or staged, if any."""
+        with self._lock:
+            self._ensure_index(project_root)
+            final_path = self._by_digest.get(digest)
+            if final_path and project_root.joinpath(final_path).exists():
+                # Keep the blob alive until the next collection has counted this pointer.
+                self._pinned.add(final_path)
+                return self._pointer(digest, "final", final_path)
+            staged_path = self._staged.get(digest)
+            if staged_path and project_root.joinpath(staged_path).exists():
+                return self._pointer(digest, "tmp", staged_path)
+        return None
+
+    def _promote_file(self, project_root: Path, dest_dir: Path, pointer: AssetPointer) -> AssetPointer:
+        digest = pointer.asset_id.value
+        if not _is_digest(digest):
+            # Staged by a store without content addressing; keep its layout.
+            promoted = super()._promote_file(project_root, dest_dir, pointer)
+            with self._lock:
+                self._ensure_index(project_root)
+                self._refs.setdefault(promoted.path_hint, 0)
+            return promoted
+        if not pointer.path_hint:
+            raise ValueError("Pointer without path_hint cannot be promoted.")
+
+        source_path = project_root.joinpath(pointer.path_hint)
+        with self._lock:
+            self._ensure_index(project_root)
+            final_path = self._by_digest.get(digest)
+        if final_path and project_root.joinpath(final_path).exists():
+            source_path.unlink(missing_ok=True)
+        else:
+            if not source_path.exists():
+                raise FileNotFoundError(str(source_path))
+            final_path = f"{self.CAS_DIR}/{digest[:2]}/{digest}{source_path.suffix}"
+            dest_path = project_root.joinpath(final_path)
+            dest_path.parent.mkdir(parents=True, exist_ok=True)
+            shutil.move(str(source_path), dest_path)
+
+        with self._lock:
+            self._refs.setdefault(final_path, 0)
+            self._by_digest[digest] = final_path
+            self._staged.pop(digest, None)
+        return self._pointer(digest, "final", final_path)
+
+    def promote_many(
+        self,
+        pointers: Sequence[AssetPointer],
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> list[AssetPointer]:
+        promoted = super().promote_many(pointers, progress)
+        if promoted:
+            self._save_index(self._require_project_root())
+        return promoted
+
+    def collect_garbage(
+        self, reference_counts: Mapping[str, int], project_root: Optional[str] = None
+    ) -> list[str]:
+        """Store the new reference counts and delete indexed assets nobody references.
+
+        ``project_root`` pins the project the counts belong to; it defaults to
+        the current one.
+        """
+        started = time.perf_counter()
+        root = Path(project_root) if project_root else self._require_project_root()
+        with self._lock:
+            self._ensure_index(root)
+            orphaned: list[str] = []
+            for path_hint in self._refs:
+                count = reference_counts.get(path_hint, 0)
+                if count or path_hint in self._pinned:
+                    self._refs[path_hint] = count
+                else:
+                    orphaned.append(path_hint)
+            for path_hint in orphaned:
+                del self._refs[path_hint]
+                digest = Path(path_hint).stem
+                if self._by_digest.get(digest) == path_hint:
+                    del self._by_digest[digest]
+            for path_hint, count in reference_counts.items():
+                if count and path_hint not in self._refs:
+                    self._refs[path_hint] = count
+            self._pinned.clear()
+
+        if orphaned:
+            self._delete_assets(root, orphaned)
+        self._save_index(root)
+        log.info(
+            "Media store: collected %d of %d indexed assets in %.3fs",
+            len(orphaned),
+            len(self._refs) + len(orphaned),
+            time.perf_counter() - started,
+        )
+        return orphaned
+
+    def resolve_path(self, pointer: AssetPointer) -> str:
+        path = super().resolve_path(pointer)
+        if pointer.status != "final" and not os.path.exists(path):
+            # Staged bytes may already have been promoted for another pointer.
+            with self._lock:
+                final_path = self._by_digest.get(pointer.asset_id.value)
+            if final_path:
+                return super().resolve_path(self._pointer(pointer.asset_id.value, "final", final_path))
+        return path
+
+    def reference_count(self, pointer: AssetPointer) -> int:
+        """References recorded for ``pointer``'s final file at the last collection."""
+        project_root = self._require_project_root()
+        with self._lock:
+            self._ensure_index(project_root)
+            return self._refs.get(pointer.path_hint or "", 0)
+
+    def cleanup_temp(self) -> None:
+        with self._lock:
+            self._staged.clear()
+        super().cleanup_temp()
+
+    @staticmethod
+    def hash_file(path: Path) -> str:
+        """BLAKE2b digest of ``path``, read in fixed-size chunks so memory stays flat."""
+        hasher = hashlib.blake2b(digest_size=_DIGEST_SIZE)
+        buffer = bytearray(_HASH_CHUNK_SIZE)
+        view = memoryview(buffer)
+        with open(path, "rb") as handle:
+            while True:
+                read = handle.readinto(buffer)
+                if not read:
+                    break
+                hasher.update(view[:read])
+        return hasher.hexdigest()
+
+    def _materialize(self, source: Path, dest: Path) -> None:
+        """Place a copy of ``source`` at ``dest``, as cheaply as the filesystem allows."""
+        partial = dest.with_name(f"{dest.name}.{threading.get_ident()}.part")
+        try:
+            if not self._reflink(source, partial):
+                if not (self._use_hardlinks and self._hardlink(source, partial)):
+                    shutil.copy2(str(source), partial)
+            partial.replace(dest)
+        finally:
+            partial.unlink(missing_ok=True)
+
+    @staticmethod
+    def _reflink(source: Path, dest: Path) -> bool:
+        if fcntl is None:
+            return False
+        try:
+            with open(source, "rb") as src, open(dest, "wb") as dst:
+                fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+            return True
+        except OSError:
+            dest.unlink(missing_ok=True)
+            return False
+
+    @staticmethod
+    def _hardlink(source: Path, dest: Path) -> bool:
+        try:
+            os.link(source, dest)
+            return True
+        except OSError:
+            return False
+
+    def _pointer(self, digest: str, status: str, path_hint: str) -> AssetPointer:
+        return AssetPointer(
+            asset_id=AssetId(digest),
+            resolver=self.RESOLVER_KEY,
+            status=status,
+            path_hint=path_hint,
+        )
+
+    def _ensure_index(self, project_root: Path) -> None:
+        """Load the index of ``project_root`` once; callers hold ``_lock``."""
+        if self._index_root == project_root:
+            return
+        self._index_root = project_root
+        self._staged = {}
+        self._pinned = set()
+        index_path = project_root.joinpath(self.INDEX_FILE)
+        try:
+            data = json.loads(index_path.read_bytes())
+            refs = {str(path): int(count) for path, count in data["refs"].items()}
+        except FileNotFoundError:
+            refs = self._scan_final_assets(project_root)
+        except (ValueError, KeyError, TypeError, AttributeError):
+            log.warning("Rebuilding unreadable asset index %s", index_path)
+            refs = self._scan_final_assets(project_root)
+        self._refs = refs
+        self._by_digest = {
+            Path(path).stem: path for path in refs if path.startswith(f"{self.CAS_DIR}/")
+        }
+
+    def _scan_final_assets(self, project_root: Path) -> Dict[str, int]:
+        """Seed the index from disk, e.g. for projects saved before content addressing.
+
+        Counts start at zero; the next collection fills them in from the
+        hierarchies, so files nothing references are removed then.
+        """
+        assets = {path: 0 for path in self._list_final_assets(project_root)}
+        log.info("Indexed %d existing assets under %s", len(assets), project_root)
+        return assets
+
+    def _save_index(self, project_root: Path) -> None:
+        with self._lock:
+            if self._index_root != project_root:
+                return
+            payload = {"version": self._INDEX_VERSION, "refs": dict(sorted(self._refs.items()))}
+        index_path = project_root.joinpath(self.INDEX_FILE)
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(index_path, json.dumps(payload, indent=2).encode("utf-8"))
+
+
+def _is_digest(value: str) -> bool:
+    if len(value) != _DIGEST_SIZE * 2:
+        return False
+    try:
+        int(value, 16)
+    except ValueError:
+        return False
+    return True
@@ -1,22 +1,36 @@
 from __future__ import annotations
 
+import logging
+import os
 import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import BinaryIO, Callable, Iterable, Iterator, Mapping, Optional, Sequence
 
 from app.application.doc_units.ports import MediaStore
 from app.application.project.ports import CurrentProjectStore, IdGenerator
 from app.domain.doc_units.entities import AssetPointer
 from app.domain.doc_units.value_objects import AssetId
 
+log = logging.getLogger(__name__)
 
 class FileSystemMediaStore(MediaStore):
     TEMP_DIR = "temp/doc_units"
     FINAL_DIR = "docs_units/assets"
     RESOLVER_KEY = "doc_media"
-
-    def __init__(self, project_store: CurrentProjectStore, ids: IdGenerator) -> None:
+    MAX_IO_WORKERS = 8
+    COPY_CHUNK_SIZE = 1024 * 1024
+
+    def __init__(
+        self,
+        project_store: CurrentProjectStore,
+        ids: IdGenerator,
+        max_io_workers: Optional[int] = None,
+    ) -> None:
         self._project_store = project_store
         self._ids = ids
+        self._max_io_workers = max_io_workers or min(self.MAX_IO_WORKERS, (os.cpu_count() or 1) + 4)
 
     def import_temp(self, source_path: str) -> AssetPointer:
         project_root = self._require_project_root()
@@ -39,11 +53,62 @@ class FileSystemMediaStore(MediaStore):
             path_hint=relative_path,
         )
 
+    def import_stream(self, open_source: Callable[[], BinaryIO], suffix: str) -> AssetPointer:
+        """Stage the bytes of ``open_source()``, e.g. an archive member, copying in fixed-size chunks."""
+        project_root = self._require_project_root()
+        asset_id = AssetId(self._ids.generate())
+        dest_dir = project_root.joinpath(self.TEMP_DIR)
+        dest_dir.mkdir(parents=True, exist_ok=True)
+        dest_path = dest_dir.joinpath(f"{asset_id.value}{suffix}")
+
+        try:
+            with open_source() as source, open(dest_path, "wb") as dest:
+                shutil.copyfileobj(source, dest, self.COPY_CHUNK_SIZE)
+        except BaseException:
+            dest_path.unlink(missing_ok=True)
+            raise
+
+        relative_path = dest_path.relative_to(project_root).as_posix()
+        return AssetPointer(
+            asset_id=asset_id,
+            resolver=self.RESOLVER_KEY,
+            status="tmp",
+            path_hint=relative_path,
+        )
+
     def promote(self, pointer: AssetPointer) -> AssetPointer:
         if pointer.status == "final":
             return pointer
-
         project_root = self._require_project_root()
+        dest_dir = project_root.joinpath(self.FINAL_DIR)
+        dest_dir.mkdir(parents=True, exist_ok=True)
+        return self._promote_file(project_root, dest_dir, pointer)
+
+    def promote_many(
+        self,
+        pointers: Sequence[AssetPointer],
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> list[AssetPointer]:
+        """Promote ``pointers`` on a bounded thread pool; results keep the input order."""
+        if not pointers:
+            return []
+        project_root = self._require_project_root()
+        dest_dir = project_root.joinpath(self.FINAL_DIR)
+        dest_dir.mkdir(parents=True, exist_ok=True)
+
+        def promote_one(pointer: AssetPointer) -> AssetPointer:
+            if pointer.status == "final":
+                return pointer
+            return self._promote_file(project_root, dest_dir, pointer)
+
+        promoted: list[AssetPointer] = []
+        for pointer in self._map_io(promote_one, pointers):
+            promoted.append(pointer)
+            if progress:
+                progress(len(promoted), len(pointers))
+        return promoted
+
+    def _promote_file(self, project_root: Path, dest_dir: Path, pointer: AssetPointer) -> AssetPointer:
         if not pointer.path_hint:
             raise ValueError("Pointer without path_hint cannot be promoted.")
 
@@ -51,8 +116,6 @@ class FileSystemMediaStore(MediaStore):
         if not source_path.exists():
             raise FileNotFoundError(str(source_path))
 
-        dest_dir = project_root.joinpath(self.FINAL_DIR)
-        dest_dir.mkdir(parents=True, exist_ok=True)
         dest_path = dest_dir.joinpath(source_path.name)
 
         shutil.move(str(source_path), dest_path)
@@ -72,28 +135,74 @@ class FileSystemMediaStore(MediaStore):
         return str(project_root.joinpath(pointer.path_hint))
 
     def list_final_assets(self) -> list[str]:
-        project_root = self._require_project_root()
-        final_dir = project_root.joinpath(self.FINAL_DIR)
-        if not final_dir.exists():
-            return []
+        """Project-relative paths of all final assets, from a single ``scandir`` walk."""
+        return self._list_final_assets(self._require_project_root())
+
+    def _list_final_assets(self, project_root: Path) -> list[str]:
         assets: list[str] = []
-        for child in final_dir.rglob("*"):
-            if child.is_file():
-                assets.append(child.relative_to(project_root).as_posix())
+        stack = [(project_root.joinpath(self.FINAL_DIR), self.FINAL_DIR)]
+        while stack:
+            directory, relative_dir = stack.pop()
+            try:
+                entries = os.scandir(directory)
+            except FileNotFoundError:
+                continue
+            with entries:
+                for entry in entries:
+                    relative_path = f"{relative_dir}/{entry.name}"
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append((Path(entry.path), relative_path))
+                    elif entry.is_file(follow_symlinks=False):
+                        assets.append(relative_path)
         return assets
 
     def delete_asset(self, path_hint: str) -> None:
-        project_root = self._require_project_root()
-        target = project_root.joinpath(path_hint)
-        try:
-            target.relative_to(project_root.joinpath(self.FINAL_DIR))
-        except ValueError:
-            raise ValueError("Cannot delete asset outside final directory") from None
-        if target.exists():
-            target.unlink()
-            self._prune_empty_parents(target.parent, project_root.joinpath(self.FINAL_DIR))
-        else:
-            return
+        self.delete_assets([path_hint])
+
+    def delete_assets(self, path_hints: Iterable[str]) -> None:
+        """Delete final assets in parallel, then prune directories left empty."""
+        self._delete_assets(self._require_project_root(), path_hints)
+
+    def _delete_assets(self, project_root: Path, path_hints: Iterable[str]) -> None:
+        final_dir = project_root.joinpath(self.FINAL_DIR)
+        targets: list[Path] = []
+        for path_hint in path_hints:
+            target = project_root.joinpath(path_hint)
+            try:
+                target.relative_to(final_dir)
+            except ValueError:
+                raise ValueError("Cannot delete asset outside final directory") from None
+            targets.append(target)
+
+        for _ in self._map_io(lambda target: target.unlink(missing_ok=True), targets):
+            pass
+        # Deepest directories first so emptied parents are pruned in one pass.
+        for parent in sorted({target.parent for target in targets}, key=lambda path: len(path.parts), reverse=True):
+            self._prune_empty_parents(parent, final_dir)
+
+    def collect_garbage(
+        self, reference_counts: Mapping[str, int], project_root: Optional[str] = None
+    ) -> list[str]:
+        """Delete final assets missing from ``reference_counts`` by diffing the final directory.
+
+        ``project_root`` pins the project the counts belong to; it defaults to
+        the current one.
+        """
+        started = time.perf_counter()
+        root = Path(project_root) if project_root else self._require_project_root()
+        existing_assets = set(self._list_final_assets(root))
+        listed = time.perf_counter()
+        orphaned = sorted(path for path in existing_assets if not reference_counts.get(path))
+        if orphaned:
+            self._delete_assets(root, orphaned)
+        log.info(
+            "Media store: inventoried %d assets in %.3fs, deleted %d orphans in %.3fs",
+            len(existing_assets),
+            listed - started,
+            len(orphaned),
+            time.perf_counter() - listed,
+        )
+        return orphaned
 
     def cleanup_temp(self) -> None:
         project_root = self._require_project_root()
@@ -110,6 +219,14 @@ class FileSystemMediaStore(MediaStore):
             raise RuntimeError("Project metadata missing 'project_root_path'.")
         return Path(root)
 
+    def _map_io(self, fn: Callable, items: Sequence) -> Iterator:
+        """Apply ``fn`` to ``items`` on a bounded pool, yielding results in order as they finish."""
+        if len(items) <= 1 or self._max_io_workers <= 1:
+            yield from map(fn, items)
+            return
+        with ThreadPoolExecutor(max_workers=min(self._max_io_workers, len(items))) as pool:
+            yield from pool.map(fn, items)
+
     def _prune_empty_parents(self, path: Path, stop: Path) -> None:
         while path != stop and path.is_dir():
             try:
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Optional
+
+from app.application.doc_units.ports import PreviewStore
+from app.application.project.ports import CurrentProjectStore
+from app.interface_adapters.project.util.atomic_files import write_atomic
+
+
+class FileSystemPreviewStore(PreviewStore):
+    """Keeps rendered previews under the current project's temp directory.
+
+    Files are spread over two-character buckets so large projects do not end
+    up with one huge directory. They are pure cache: deleting the directory
+    only costs re-rendering. Without a loaded project nothing is cached.
+    """
+
+    PREVIEW_DIR = "temp/previews"
+    FILE_SUFFIX = ".preview"
+
+    def __init__(self, project_store: CurrentProjectStore) -> None:
+        self._project_store = project_store
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        if path is None:
+            return None
+        try:
+            return path.read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def put(self, key: str, data: bytes) -> None:
+        path = self._path(key)
+        if path is None:
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(path, data)
+
+    def _path(self, key: str) -> Optional[Path]:
+        project_data = self._project_store.get_data()
+        root = project_data.metadata.get("project_root_path") if project_data else None
+        if not root:
+            return None
+        return Path(root, self.PREVIEW_DIR, key[:2], f"{key}{self.FILE_SUFFIX}")
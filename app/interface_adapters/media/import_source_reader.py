@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import io
+import os
+import re
+import zipfile
+from functools import partial
+from pathlib import Path, PurePosixPath
+from typing import IO, Iterable, Optional, Tuple
+
+from app.application.doc_units.dto import ImportSourceEntry
+from app.application.doc_units.ports import ImportSourceReader
+
+_NUMBER_PATTERN = re.compile(r"(\d+)")
+
+
+def natural_sort_key(text: str) -> Tuple:
+    """Order ``page2`` before ``page10`` the way file browsers do."""
+    return tuple(int(part) if part.isdigit() else part.casefold() for part in _NUMBER_PATTERN.split(text))
+
+
+class FileSystemImportSourceReader(ImportSourceReader):
+    """Lists the images of a directory tree or a ZIP/CBZ archive without reading them.
+
+    Entries come back in natural order, folders first by path, and each one
+    opens its own stream when the media store copies it. Archive members are
+    decompressed straight from the archive; nothing is extracted up front.
+    """
+
+    IMAGE_SUFFIXES = frozenset({".png", ".jpg", ".jpeg", ".bmp", ".webp"})
+    ARCHIVE_SUFFIXES = frozenset({".zip", ".cbz"})
+
+    def read_entries(self, source_path: str) -> list[ImportSourceEntry]:
+        source = Path(source_path)
+        if source.is_dir():
+            entries = self._directory_entries(source)
+        elif source.suffix.lower() in self.ARCHIVE_SUFFIXES:
+            entries = self._archive_entries(source)
+        elif source.exists():
+            raise ValueError(f"Unsupported import source '{source_path}'.")
+        else:
+            raise FileNotFoundError(source_path)
+        return sorted(
+            entries,
+            key=lambda entry: (tuple(map(natural_sort_key, entry.folders)), natural_sort_key(entry.name)),
+        )
+
+    def _directory_entries(self, root: Path) -> Iterable[ImportSourceEntry]:
+        for directory, dirnames, filenames in os.walk(root):
+            dirnames[:] = [name for name in dirnames if not name.startswith(".")]
+            folders = Path(directory).relative_to(root).parts
+            for filename in filenames:
+                path = Path(directory, filename)
+                if filename.startswith(".") or path.suffix.lower() not in self.IMAGE_SUFFIXES:
+                    continue
+                yield ImportSourceEntry(
+                    folders=folders,
+                    name=path.stem,
+                    suffix=path.suffix.lower(),
+                    open=partial(open, path, "rb"),
+                )
+
+    def _archive_entries(self, archive_path: Path) -> Iterable[ImportSourceEntry]:
+        with zipfile.ZipFile(archive_path) as archive:
+            infos = archive.infolist()
+        for info in infos:
+            member = PurePosixPath(info.filename)
+            if info.is_dir() or any(part.startswith((".", "__MACOSX")) for part in member.parts):
+                continue
+            if member.suffix.lower() not in self.IMAGE_SUFFIXES:
+                continue
+            yield ImportSourceEntry(
+                folders=member.parent.parts,
+                name=member.stem,
+                suffix=member.suffix.lower(),
+                open=partial(_ArchiveMember, archive_path, info),
+            )
+
+
+class _ArchiveMember(io.RawIOBase):
+    """Read-only stream over one member, with its own archive handle so workers can read in parallel."""
+
+    def __init__(self, archive_path: Path, info: zipfile.ZipInfo) -> None:
+        super().__init__()
+        self._archive: Optional[zipfile.ZipFile] = None
+        self._stream: Optional[IO[bytes]] = None
+        self._archive = zipfile.ZipFile(archive_path)
+        self._stream = self._archive.open(info)
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        return self._stream.read(size)
+
+    def readinto(self, buffer) -> int:
+        data = self._stream.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+    def close(self) -> None:
+        if not self.closed:
+            try:
+                if self._stream is not None:
+                    self._stream.close()
+            finally:
+                if self._archive is not None:
+                    self._archive.close()
+        super().close()
@@ -0,0 +1,290 @@
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import signal
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from multiprocessing import shared_memory
+from multiprocessing.connection import Connection, wait
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from app.application.pipelines.dto import PageJob, PageOutcome
+from app.application.pipelines.ports import PageProcessor
+from app.interface_adapters.pipelines.runners.pyflow_page_processor import (
+    PyFlowPageProcessor,
+    cv2,
+    graph_fingerprint,
+    write_image,
+)
+
+try:
+    import numpy as np
+except ModuleNotFoundError:
+    np = None  # type: ignore[assignment]
+
+log = logging.getLogger(__name__)
+
+# Runs one page given its source path: returns the result image and the seconds spent per node.
+PageRunner = Callable[[str], Tuple[Any, Mapping[str, float]]]
+# Shared memory block name, array shape and dtype of a result image.
+SharedImage = Tuple[str, Tuple[int, ...], str]
+
+
+@dataclass(slots=True)
+class _Worker:
+    process: multiprocessing.process.BaseProcess
+    connection: Connection
+    job: Optional[int] = None  # sequence number of the page it is running
+
+
+class ProcessPoolPageProcessor(PageProcessor):
+    """Runs pages of a batch in parallel, one pipeline per worker process.
+
+    Each worker loads the graph once and keeps its nodes, and any model they
+    load, for every page it gets. Workers get one source path at a time over
+    their pipe, so the parent always knows which page a worker is on, and
+    return the result image in a shared memory block rather than pickled.
+
+    At most ``max_pending`` pages are in flight or waiting to be written; no
+    more are taken from the caller until the oldest is done, which bounds
+    memory use. Results are written and yielded in the order the pages came
+    in. A page that raises fails on its own; a worker that dies fails only
+    the page it was on and is replaced. Only an unloadable graph stops the
+    batch.
+
+    Workers start on the first page and stay up until :meth:`close`.
+    ``load_runner`` replaces the PyFlow graph with another picklable
+    ``PageRunner`` factory; it runs in each worker.
+    """
+
+    JOIN_TIMEOUT_S = 10.0
+
+    def __init__(
+        self,
+        graph_path: str,
+        workers: Optional[int] = None,
+        threads: int = 0,
+        max_pending: Optional[int] = None,
+        mp_context: Optional[multiprocessing.context.BaseContext] = None,
+        load_runner: Optional[Callable[[], PageRunner]] = None,
+    ) -> None:
+        if np is None or cv2 is None:
+            raise RuntimeError("Parallel pipeline runs need NumPy and OpenCV (cv2) to hand over and write pages.")
+        self._fingerprint = graph_fingerprint(Path(graph_path).read_bytes())
+        self._size = max(1, workers or os.cpu_count() or 1)
+        self._max_pending = max(self._size, max_pending or 2 * self._size)
+        # Spawned workers start clean instead of inheriting the parent's Qt and PyFlow state.
+        self._context = mp_context or multiprocessing.get_context("spawn")
+        self._load_runner = load_runner or partial(load_pyflow_runner, graph_path, threads)
+        self._workers: List[_Worker] = []
+
+    @property
+    def fingerprint(self) -> str:
+        return self._fingerprint
+
+    @property
+    def workers(self) -> int:
+        return self._size
+
+    def process(self, source_path: str, output_path: str) -> Mapping[str, float]:
+        (outcome,) = self.process_many([PageJob("", source_path, output_path)])
+        if outcome.error is not None:
+            raise RuntimeError(outcome.error)
+        return outcome.node_seconds
+
+    def process_many(self, jobs: Iterable[PageJob]) -> Iterator[PageOutcome]:
+        incoming = enumerate(jobs)
+        pending: Dict[int, PageJob] = {}  # taken from the caller, not yet yielded
+        queued: Deque[int] = deque()  # waiting for a worker
+        results: Dict[int, Tuple[str, Any]] = {}
+        next_out = 0
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and len(pending) < self._max_pending:
+                    try:
+                        sequence, job = next(incoming)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    pending[sequence] = job
+                    queued.append(sequence)
+
+                self._dispatch(queued, pending)
+                if next_out in results:
+                    yield self._finish(pending.pop(next_out), results.pop(next_out))
+                    next_out += 1
+                elif pending:
+                    self._collect(results)
+                elif exhausted:
+                    return
+        finally:
+            for kind, payload in results.values():
+                if kind == "done":
+                    _release(payload[0])
+            if any(worker.job is not None for worker in self._workers):
+                # Abandoned mid-batch: the busy workers' results have nowhere to go.
+                self._stop([worker for worker in self._workers if worker.job is not None])
+
+    def close(self) -> None:
+        """Stop the workers; the next batch starts new ones."""
+        self._stop(list(self._workers))
+
+    def _dispatch(self, queued: Deque[int], pending: Dict[int, PageJob]) -> None:
+        if queued:
+            while len(self._workers) < self._size:
+                self._workers.append(self._spawn())
+        for worker in self._workers:
+            if not queued:
+                return
+            if worker.job is None:
+                worker.job = queued.popleft()
+                worker.connection.send(pending[worker.job].source_path)
+
+    def _collect(self, results: Dict[int, Tuple[str, Any]]) -> None:
+        """Wait until at least one busy worker has finished its page or died."""
+        busy = [worker for worker in self._workers if worker.job is not None]
+        wait([worker.connection for worker in busy] + [worker.process.sentinel for worker in busy])
+        for worker in busy:
+            if worker.connection.poll():
+                try:
+                    kind, payload = worker.connection.recv()
+                except (EOFError, OSError):
+                    kind, payload = "crashed", None
+            elif not worker.process.is_alive():
+                kind, payload = "crashed", None
+            else:
+                continue
+
+            if kind == "load_error":
+                raise RuntimeError(f"A pipeline worker could not load the graph: {payload}")
+            if kind == "crashed":
+                worker.process.join(self.JOIN_TIMEOUT_S)
+                kind, payload = "error", f"The worker running this page died (exit code {worker.process.exitcode})."
+                log.warning("Pipeline worker %s died; starting a new one.", worker.process.pid)
+                self._replace(worker)
+            results[worker.job] = (kind, payload)
+            worker.job = None
+
+    def _finish(self, job: PageJob, result: Tuple[str, Any]) -> PageOutcome:
+        kind, payload = result
+        if kind == "error":
+            return PageOutcome(job, error=payload)
+        shared_image, node_seconds = payload
+        try:
+            _write_shared(job.output_path, shared_image)
+        except Exception as exc:  # noqa: BLE001 - reported per page
+            return PageOutcome(job, error=str(exc) or type(exc).__name__)
+        return PageOutcome(job, node_seconds)
+
+    def _spawn(self) -> _Worker:
+        parent_end, worker_end = self._context.Pipe()
+        process = self._context.Process(
+            target=_worker_main,
+            args=(self._load_runner, worker_end),
+            name="pipeline-worker",
+            daemon=True,
+        )
+        process.start()
+        worker_end.close()
+        return _Worker(process, parent_end)
+
+    def _replace(self, worker: _Worker) -> None:
+        worker.connection.close()
+        index = self._workers.index(worker)
+        self._workers[index] = self._spawn()
+
+    def _stop(self, workers: List[_Worker]) -> None:
+        for worker in workers:
+            try:
+                if worker.job is None:
+                    worker.connection.send(None)
+            except OSError:
+                pass
+        for worker in workers:
+            if worker.job is not None:
+                worker.process.terminate()
+            worker.process.join(self.JOIN_TIMEOUT_S)
+            if worker.process.is_alive():
+                worker.process.kill()
+                worker.process.join()
+            worker.connection.close()
+            self._workers.remove(worker)
+
+
+def load_pyflow_runner(graph_path: str, threads: int = 0) -> PageRunner:
+    """Load the graph in this process; ``threads`` runs independent thread-safe nodes in parallel."""
+    engine = None
+    if threads > 0:
+        from PyFlow.Core.ParallelEvaluationEngine import ParallelEvaluationEngine_Impl
+
+        engine = ParallelEvaluationEngine_Impl(threadPool=ThreadPoolExecutor(threads, "pipeline"))
+    return PyFlowPageProcessor(graph_path, engine).run
+
+
+def _worker_main(load_runner: Callable[[], PageRunner], connection: Connection) -> None:
+    # Ctrl+C reaches the whole process group; stopping is the parent's call.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    try:
+        run = load_runner()
+    except Exception as exc:  # noqa: BLE001 - reported to the parent
+        connection.send(("load_error", f"{type(exc).__name__}: {exc}"))
+        return
+
+    while True:
+        try:
+            source_path = connection.recv()
+        except EOFError:
+            return
+        if source_path is None:
+            return
+        try:
+            image, node_seconds = run(source_path)
+            shared_image = _share(image)
+        except Exception as exc:  # noqa: BLE001 - one bad page must not take the worker down
+            connection.send(("error", str(exc) or type(exc).__name__))
+            continue
+        connection.send(("done", (shared_image, dict(node_seconds))))
+
+
+def _share(image: Any) -> SharedImage:
+    """Copy ``image`` into a new shared memory block; the receiver unlinks it."""
+    array = np.ascontiguousarray(image)
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    try:
+        np.ndarray(array.shape, array.dtype, buffer=block.buf)[...] = array
+    except BaseException:
+        block.close()
+        block.unlink()
+        raise
+    block.close()
+    return block.name, array.shape, array.dtype.str
+
+
+def _write_shared(output_path: str, shared_image: SharedImage) -> None:
+    name, shape, dtype = shared_image
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        image = np.ndarray(shape, dtype, buffer=block.buf)
+        try:
+            write_image(output_path, image)
+        finally:
+            # The view must go before the block can close.
+            del image
+    finally:
+        block.close()
+        block.unlink()
+
+
+def _release(shared_image: SharedImage) -> None:
+    try:
+        block = shared_memory.SharedMemory(name=shared_image[0])
+    except FileNotFoundError:
+        return
+    block.close()
+    block.unlink()
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import io
+import json
+import logging
+import sys
+from functools import partial
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from app.application.pipelines.ports import PageProcessor
+from app.interface_adapters.project.util.atomic_files import write_atomic
+
+_PYFLOW_PACKAGE_DIR = Path(__file__).resolve().parents[3] / "third_party" / "PyFlow"
+if _PYFLOW_PACKAGE_DIR.exists():
+    pyflow_path = str(_PYFLOW_PACKAGE_DIR)
+    if pyflow_path not in sys.path:
+        sys.path.insert(0, pyflow_path)
+
+from PyFlow import GET_PACKAGES, INITIALIZE  # noqa: E402
+from PyFlow.Core import GraphManager  # noqa: E402
+from PyFlow.Core.EvaluationEngine import EvaluationEngine  # noqa: E402
+from PyFlow.Core.Interfaces import IEvaluationEngine  # noqa: E402
+
+try:
+    import cv2
+except ModuleNotFoundError:
+    cv2 = None  # type: ignore[assignment]
+
+log = logging.getLogger(__name__)
+
+
+class PyFlowPageProcessor(PageProcessor):
+    """Runs pages through a saved ``.pygraph`` pipeline without the editor.
+
+    PyFlow packages are loaded headless, so no QApplication is needed. The
+    graph is deserialized once and reused for every page: the page is fed to
+    its ``PipelineInputImageNode`` and pulled from its
+    ``PipelineOutputNode``, and only nodes downstream of the input rerun.
+    ``engine`` replaces PyFlow's evaluation engine for the whole process,
+    e.g. with a parallel one. Pages are read and written with OpenCV.
+    """
+
+    INPUT_NODE_CLASS = "PipelineInputImageNode"
+    OUTPUT_NODE_CLASS = "PipelineOutputNode"
+
+    def __init__(self, graph_path: str, engine: Optional[IEvaluationEngine] = None) -> None:
+        if cv2 is None:
+            raise RuntimeError("Headless pipeline runs need OpenCV (cv2) to read and write pages.")
+        initialize_pyflow()
+        if engine is not None:
+            EvaluationEngine().setImpl(engine)
+
+        data = Path(graph_path).read_bytes()
+        self._fingerprint = graph_fingerprint(data)
+        self._manager = GraphManager()
+        self._manager.deserialize(json.loads(data))
+        self._nodes = self._manager.getAllNodes()
+        inputs = self._manager.getAllNodes([self.INPUT_NODE_CLASS])
+        outputs = self._manager.getAllNodes([self.OUTPUT_NODE_CLASS])
+        if len(inputs) != 1 or len(outputs) != 1:
+            raise ValueError(
+                f"{graph_path} needs one {self.INPUT_NODE_CLASS} and one {self.OUTPUT_NODE_CLASS}, "
+                f"found {len(inputs)} and {len(outputs)}."
+            )
+        self._input, self._output = inputs[0], outputs[0]
+
+        self._timings: Dict[str, float] = {}
+        for node in self._nodes:
+            node.computed.connect(partial(self._record_timing, node), weak=False)
+
+    @property
+    def fingerprint(self) -> str:
+        return self._fingerprint
+
+    def process(self, source_path: str, output_path: str) -> Dict[str, float]:
+        image, timings = self.run(source_path)
+        write_image(output_path, image)
+        return timings
+
+    def run(self, source_path: str) -> Tuple[Any, Dict[str, float]]:
+        """Run the pipeline on one page; returns the result image and the seconds spent per node."""
+        image = cv2.imread(source_path, cv2.IMREAD_COLOR)
+        if image is None:
+            raise ValueError(f"Cannot decode {source_path}.")
+
+        self._timings = {}
+        self._input.set_image(image)
+        result = self._output.pipeline_result_image_input_pin.getData()
+        errors = [
+            f"{node.name}: {node.getLastErrorMessage()}"
+            for node in self._nodes
+            if node.name in self._timings and not node.isValid()
+        ]
+        if errors:
+            raise RuntimeError("; ".join(errors))
+        if result is None or getattr(result, "size", 0) == 0:
+            raise RuntimeError("The pipeline produced no image.")
+        return result, dict(self._timings)
+
+    def _record_timing(self, node, *_args) -> None:
+        computing_time = getattr(node, "_computingTime", None)
+        if computing_time is not None:
+            self._timings[node.name] = self._timings.get(node.name, 0.0) + computing_time.total_seconds()
+
+
+def initialize_pyflow() -> None:
+    """Load PyFlow's packages headless, once per process."""
+    if GET_PACKAGES():
+        return
+    with contextlib.redirect_stdout(io.StringIO()) as messages:
+        INITIALIZE(headless=True)
+    for line in messages.getvalue().splitlines():
+        log.debug("PyFlow: %s", line)
+
+
+def graph_fingerprint(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+
+def write_image(output_path: str, image: Any) -> None:
+    """Encode ``image`` in the format its suffix names and replace ``output_path`` with it."""
+    path = Path(output_path)
+    encoded, buffer = cv2.imencode(path.suffix, image)
+    if not encoded:
+        raise ValueError(f"Cannot encode the result as {path.suffix}.")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_atomic(path, buffer.tobytes())
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Sequence, Tuple
+
+from app.application.pipelines.dto import PageRecord
+from app.application.pipelines.ports import BatchOutputStore
+from app.interface_adapters.project.util.fs_names import safe_folder_name
+
+log = logging.getLogger(__name__)
+
+
+class FileSystemBatchOutputStore(BatchOutputStore):
+    """Writes batch results under ``output_dir`` and journals finished pages.
+
+    The journal is a JSON-lines file appended and synced once per page, so a
+    crash loses at most the page being written; a torn last line is ignored
+    on the next run. Later lines win. Pages whose output file has since been
+    deleted do not count as finished.
+    """
+
+    JOURNAL_FILE_NAME = "batch_journal.jsonl"
+    DEFAULT_SUFFIX = ".png"
+
+    def __init__(self, output_dir: str, suffix: str = DEFAULT_SUFFIX) -> None:
+        self._root = Path(output_dir)
+        self._suffix = suffix
+
+    @property
+    def journal_path(self) -> Path:
+        return self._root.joinpath(self.JOURNAL_FILE_NAME)
+
+    def paths_for(self, pages: Sequence[Tuple[str, Sequence[str], str]]) -> Dict[str, str]:
+        """``output_dir/<folders>/<page name><suffix>`` per node id.
+
+        Every page whose name is shared within its folder gets its node id
+        appended, so a page's path depends only on the pages passed in and
+        not on which of them a run gets to.
+        """
+        plain: Dict[str, Tuple[Path, str]] = {}
+        holders: Dict[Path, int] = {}
+        for node_id, folders, page_name in pages:
+            directory = self._root.joinpath(*(safe_folder_name(folder) for folder in folders))
+            stem = safe_folder_name(page_name)
+            plain[node_id] = (directory, stem)
+            target = directory.joinpath(f"{stem}{self._suffix}")
+            holders[target] = holders.get(target, 0) + 1
+        paths: Dict[str, str] = {}
+        for node_id, (directory, stem) in plain.items():
+            target = directory.joinpath(f"{stem}{self._suffix}")
+            if holders[target] > 1:
+                target = directory.joinpath(f"{stem}-{node_id}{self._suffix}")
+            paths[node_id] = str(target)
+        return paths
+
+    def completed(self) -> Dict[str, PageRecord]:
+        records: Dict[str, PageRecord] = {}
+        try:
+            lines = self.journal_path.read_text(encoding="utf-8").splitlines()
+        except FileNotFoundError:
+            return records
+        for number, line in enumerate(lines, start=1):
+            try:
+                record = PageRecord(**json.loads(line))
+            except (ValueError, TypeError):
+                log.warning("Ignoring unreadable line %d of %s", number, self.journal_path)
+                continue
+            records[record.node_id] = record
+        return {node_id: record for node_id, record in records.items() if os.path.exists(record.output_path)}
+
+    def record(self, record: PageRecord) -> None:
+        self._root.mkdir(parents=True, exist_ok=True)
+        line = json.dumps(
+            {"node_id": record.node_id, "fingerprint": record.fingerprint, "output_path": record.output_path},
+            ensure_ascii=False,
+        )
+        with self.journal_path.open("a+b") as journal:
+            if journal.tell() > 0:
+                journal.seek(-1, os.SEEK_END)
+                if journal.read(1) != b"\n":
+                    # Start after a line torn by a crash instead of extending it.
+                    journal.write(b"\n")
+            journal.write(f"{line}\n".encode("utf-8"))
+            journal.flush()
+            os.fsync(journal.fileno())
+
+    def clear(self) -> None:
+        """Forget finished pages; their files stay and are overwritten as pages are redone."""
+        self.journal_path.unlink(missing_ok=True)
@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import itertools
+import threading
+from typing import Any, Callable, Dict, Iterable, Iterator, Mapping, MutableMapping, Optional
+
+DocUnitDict = Dict[str, Any]
+DocUnitLoader = Callable[[str], DocUnitDict]
+# Stored asset reference counts of a unit, or ``None`` when none were stored.
+AssetReferenceLoader = Callable[[str], Optional[Dict[str, int]]]
+
+
+class LazyDocUnitMap(MutableMapping[str, DocUnitDict]):
+    """``ProjectData.doc_units`` mapping that loads unit dicts on first access.
+
+    Keys are known up front (from the project manifest) so listing, membership
+    and ordering never touch the disk, and neither do :meth:`summary` lookups
+    of the few fields the manifest keeps per unit. Values come from ``loader``
+    the first time they are read. :meth:`asset_references` of a unit that is
+    not loaded come from ``references_loader``, which reads far less than the
+    unit itself.
+    Assignments and deletions are tracked so persistence can rewrite only
+    what changed since the map was last bound to ``origin``.
+
+    :meth:`snapshot` hands a frozen copy to a background save. Every change is
+    stamped with a version, so when the snapshot is marked clean the live map
+    only forgets changes that were not superseded in the meantime.
+    """
+
+    def __init__(
+        self,
+        unit_ids: Iterable[str] = (),
+        loader: Optional[DocUnitLoader] = None,
+        origin: Optional[str] = None,
+        summaries: Optional[Mapping[str, DocUnitDict]] = None,
+        references_loader: Optional[AssetReferenceLoader] = None,
+    ) -> None:
+        self._order: Dict[str, None] = dict.fromkeys(unit_ids)
+        self._loaded: Dict[str, DocUnitDict] = {}
+        self._summaries: Dict[str, DocUnitDict] = dict(summaries or {})
+        self._references: Dict[str, Dict[str, int]] = {}
+        self._loader = loader
+        self._references_loader = references_loader
+        self._dirty: Dict[str, int] = {}
+        self._removed: Dict[str, int] = {}
+        self._versions = itertools.count(1)
+        self._lock = threading.Lock()
+        self._source: Optional[LazyDocUnitMap] = None
+        self.origin = origin
+
+    @classmethod
+    def from_loaded(cls, units: Dict[str, DocUnitDict]) -> "LazyDocUnitMap":
+        """Wrap already parsed units; all of them count as unsaved."""
+        mapping = cls(units.keys())
+        for unit_id, data in units.items():
+            mapping[unit_id] = data
+        return mapping
+
+    def __getitem__(self, unit_id: str) -> DocUnitDict:
+        if unit_id not in self._order:
+            raise KeyError(unit_id)
+        if unit_id not in self._loaded:
+            if self._loader is None:
+                raise KeyError(unit_id)
+            self._loaded[unit_id] = self._loader(unit_id)
+        return self._loaded[unit_id]
+
+    def __setitem__(self, unit_id: str, data: DocUnitDict) -> None:
+        with self._lock:
+            self._order[unit_id] = None
+            self._loaded[unit_id] = data
+            self._summaries[unit_id] = unit_summary(data)
+            self._references.pop(unit_id, None)
+            self._dirty[unit_id] = next(self._versions)
+            self._removed.pop(unit_id, None)
+
+    def __delitem__(self, unit_id: str) -> None:
+        with self._lock:
+            del self._order[unit_id]
+            self._loaded.pop(unit_id, None)
+            self._summaries.pop(unit_id, None)
+            self._references.pop(unit_id, None)
+            self._dirty.pop(unit_id, None)
+            self._removed[unit_id] = next(self._versions)
+
+    def __contains__(self, unit_id: object) -> bool:
+        return unit_id in self._order
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._order)
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(units={len(self._order)}, loaded={len(self._loaded)}, dirty={len(self._dirty)})"
+
+    def preload(self, unit_id: str, data: DocUnitDict) -> None:
+        """Seed an already persisted body, e.g. one replayed from a journal."""
+        if unit_id not in self._order:
+            raise KeyError(unit_id)
+        self._loaded[unit_id] = data
+        self._references.pop(unit_id, None)
+
+    def is_loaded(self, unit_id: str) -> bool:
+        return unit_id in self._loaded
+
+    def summary(self, unit_id: str) -> DocUnitDict:
+        """The manifest fields of a unit (see :func:`unit_summary`), loading it only if the manifest lacks them.
+
+        Summaries are recomputed only when a unit is assigned, so saving does
+        not walk unchanged units.
+        """
+        stored = self._summaries.get(unit_id)
+        if stored is None or not stored.keys() >= _SUMMARY_KEYS:
+            stored = self._summaries[unit_id] = unit_summary(self[unit_id])
+        return stored
+
+    def asset_references(self, unit_id: str) -> Dict[str, int]:
+        """Nodes referencing each final asset path of a unit (see :func:`count_asset_references`).
+
+        Units that are not loaded use the stored counts when there are any.
+        Results are kept until the unit is assigned again.
+        """
+        references = self._references.get(unit_id)
+        if references is None:
+            if unit_id not in self._loaded and self._references_loader is not None:
+                references = self._references_loader(unit_id)
+            if references is None:
+                references = count_asset_references(self[unit_id])
+            self._references[unit_id] = references
+        return references
+
+    @property
+    def dirty_ids(self) -> list[str]:
+        return [unit_id for unit_id in self._order if unit_id in self._dirty]
+
+    @property
+    def dirty_versions(self) -> Dict[str, int]:
+        """Change stamp per unsaved unit; a new stamp means the unit changed again."""
+        with self._lock:
+            return dict(self._dirty)
+
+    @property
+    def removed_ids(self) -> list[str]:
+        return sorted(self._removed)
+
+    def snapshot(self) -> "LazyDocUnitMap":
+        """Copy that can be persisted from another thread while this map keeps changing.
+
+        Unit dicts are shared, not copied: writers always assign fresh dicts.
+        Marking the snapshot clean settles the matching changes here as well.
+        """
+        with self._lock:
+            copy = LazyDocUnitMap(self._order, self._loader, self.origin, references_loader=self._references_loader)
+            copy._loaded = dict(self._loaded)
+            copy._summaries = dict(self._summaries)
+            copy._references = dict(self._references)
+            copy._dirty = dict(self._dirty)
+            copy._removed = dict(self._removed)
+            copy._source = self
+        return copy
+
+    def mark_clean(
+        self,
+        origin: str,
+        loader: DocUnitLoader,
+        references_loader: Optional[AssetReferenceLoader] = None,
+    ) -> None:
+        """Rebind to a persisted location once every change has been written there."""
+        with self._lock:
+            saved_dirty, saved_removed = self._dirty, self._removed
+            self.origin = origin
+            self._loader = loader
+            self._references_loader = references_loader
+            self._dirty = {}
+            self._removed = {}
+        if self._source is not None:
+            self._source._settle(origin, loader, references_loader, saved_dirty, saved_removed)
+
+    def _settle(
+        self,
+        origin: str,
+        loader: DocUnitLoader,
+        references_loader: Optional[AssetReferenceLoader],
+        saved_dirty: Dict[str, int],
+        saved_removed: Dict[str, int],
+    ) -> None:
+        with self._lock:
+            self.origin = origin
+            self._loader = loader
+            self._references_loader = references_loader
+            for unit_id, version in saved_dirty.items():
+                if self._dirty.get(unit_id) == version:
+                    del self._dirty[unit_id]
+            for unit_id, version in saved_removed.items():
+                if self._removed.get(unit_id) == version:
+                    del self._removed[unit_id]
+
+
+def unit_summary(data: DocUnitDict) -> DocUnitDict:
+    """The part of a unit dict the manifest repeats so units can be listed unloaded.
+
+    ``staged_assets`` tells whether a node still points at a staged asset, so
+    asset finalization knows which units to visit without loading the others.
+    """
+    staged = any(pointer.get("status", "final") != "final" for pointer in _iter_pointers(data))
+    return {
+        "name": data.get("name"),
+        "created_at": data.get("created_at"),
+        "staged_assets": staged,
+    }
+
+
+def count_asset_references(data: DocUnitDict) -> Dict[str, int]:
+    """Number of nodes of a unit dict referencing each final asset path."""
+    references: Dict[str, int] = {}
+    for pointer in _iter_pointers(data):
+        path_hint = pointer.get("path_hint")
+        if path_hint and pointer.get("status", "final") == "final":
+            references[path_hint] = references.get(path_hint, 0) + 1
+    return references
+
+
+def _iter_pointers(data: DocUnitDict) -> Iterator[DocUnitDict]:
+    stack = [data["hierarchy"]] if data.get("hierarchy") else []
+    while stack:
+        node = stack.pop()
+        if pointer := node.get("pointer"):
+            yield pointer
+        if node.get("type", "folder") == "folder":
+            stack.extend(node.get("children", ()))
+
+
+_SUMMARY_KEYS = unit_summary({}).keys()
@@ -1,23 +1,60 @@
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
+from app.application.project.errors import InvalidProjectDataError
 from app.domain.project.value_objects import ProjectData, ProjectID, ProjectName
 
-_SCHEMA_VERSION = 2
+from .lazy_doc_units import AssetReferenceLoader, DocUnitLoader, LazyDocUnitMap, unit_summary
+
+_SCHEMA_VERSION = 3
+_INLINE_DOC_UNITS_SCHEMA_VERSION = 2
 
 
 def to_dict(project_data: ProjectData) -> dict:
+    """Build the project manifest; doc unit bodies are stored separately."""
     return {
         "schema_version": _SCHEMA_VERSION,
         "project_id": project_data.project_id.value,
         "project_name": project_data.name.value,
-        "doc_units": project_data.doc_units,
+        "doc_unit_ids": list(project_data.doc_units.keys()),
+        "doc_unit_summaries": {unit_id: _summary(project_data, unit_id) for unit_id in project_data.doc_units},
         "last_active_doc_unit_id": project_data.last_active_doc_unit_id,
         "metadata": project_data.metadata,
     }
 
 
-def from_dict(project_data_dict: dict) -> ProjectData:
-    doc_units: Dict[str, Dict[str, Any]] = project_data_dict.get("doc_units", {})
+def from_dict(
+    project_data_dict: dict,
+    load_doc_unit: Optional[DocUnitLoader] = None,
+    origin: Optional[str] = None,
+    load_asset_references: Optional[AssetReferenceLoader] = None,
+) -> ProjectData:
+    """Build ``ProjectData`` from a manifest.
+
+    Schema 3 manifests only list doc unit ids and short summaries (names,
+    creation times); their bodies are fetched through ``load_doc_unit`` and
+    their asset reference counts through ``load_asset_references`` on first
+    access. Older documents keep units inline and are migrated on the fly:
+    all units are marked unsaved so the next save writes them out in the
+    current layout.
+    """
+    schema_version = project_data_dict.get("schema_version", _INLINE_DOC_UNITS_SCHEMA_VERSION)
+    if schema_version > _SCHEMA_VERSION:
+        raise InvalidProjectDataError(
+            f"Unsupported project schema version {schema_version} (max {_SCHEMA_VERSION})."
+        )
+
+    if schema_version <= _INLINE_DOC_UNITS_SCHEMA_VERSION:
+        inline_units: Dict[str, Dict[str, Any]] = project_data_dict.get("doc_units", {})
+        doc_units = LazyDocUnitMap.from_loaded(inline_units)
+    else:
+        doc_units = LazyDocUnitMap(
+            project_data_dict.get("doc_unit_ids", []),
+            load_doc_unit,
+            origin,
+            project_data_dict.get("doc_unit_summaries"),
+            load_asset_references,
+        )
+
     last_active = project_data_dict.get("last_active_doc_unit_id")
     metadata = project_data_dict.get("metadata", {})
 
@@ -28,3 +65,10 @@ def from_dict(project_data_dict: dict) -> ProjectData:
         last_active_doc_unit_id=last_active,
         metadata=metadata,
     )
+
+
+def _summary(project_data: ProjectData, unit_id: str) -> Dict[str, Any]:
+    doc_units = project_data.doc_units
+    if isinstance(doc_units, LazyDocUnitMap):
+        return doc_units.summary(unit_id)
+    return unit_summary(doc_units[unit_id])
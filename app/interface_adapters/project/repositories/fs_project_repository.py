@@ -1,6 +1,5 @@
 from pathlib import Path
-from typing import Optional
-import json
+from typing import Any, Dict, Iterable, Optional, Tuple
 
 from app.application.project.ports import ProjectRepository
 from app.domain.project.value_objects import ProjectData
@@ -10,20 +9,52 @@ from app.application.project.errors import (
     ProjectOverwriteError,
 )
 
+from ..mappers.lazy_doc_units import (
+    AssetReferenceLoader,
+    DocUnitLoader,
+    LazyDocUnitMap,
+    count_asset_references,
+)
 from ..mappers.project_data_mapper import to_dict, from_dict
+from ..serialization.project_serializer import (
+    ProjectSerializer,
+    default_serializer,
+    serializer_for,
+)
+from ..util.atomic_files import write_atomic
 from ..util.fs_names import safe_folder_name
+from .project_journal import ProjectJournal
 
 
 class FsProjectRepository(ProjectRepository):
 
     PROJECT_META_FILE_NAME = "project.mtmeta"
+    DOC_UNITS_DIR = "docs_units"
+    DOC_UNIT_FILE_SUFFIX = ".mtunit"
+    ASSET_REFS_FILE_SUFFIX = ".mtrefs"
+    JOURNAL_FILE_SUFFIX = ".mtjournal"
+    DEFAULT_JOURNAL_COMPACTION_BYTES = 4 * 1024 * 1024
+    _GENERATION_KEY = "journal_generation"
 
-    def __init__(self):
+    def __init__(
+        self,
+        journal_compaction_bytes: int = DEFAULT_JOURNAL_COMPACTION_BYTES,
+        doc_unit_serializer: Optional[ProjectSerializer] = None,
+    ):
+        """``journal_compaction_bytes`` caps the journal before a save compacts it
+        into a fresh snapshot; ``0`` disables the journal. ``doc_unit_serializer``
+        encodes doc unit files (e.g. ``MsgpackSerializer`` for a compact binary
+        layout, see ``serializer_named``); the manifest always stays JSON."""
         self._default_project_dirs: list = [
             "temp",
             "docs_units",
             "pipelines",
         ]
+        self._journal_compaction_bytes = journal_compaction_bytes
+        self._manifest_serializer = default_serializer(indent=True)
+        self._doc_unit_serializer = doc_unit_serializer or default_serializer()
+        # Project id and generation of manifests this repository last loaded or saved.
+        self._manifests: Dict[Path, Tuple[Optional[str], int]] = {}
 
     def load(self, path: str) -> ProjectData:
         base_path = Path(path)
@@ -34,8 +65,21 @@ class FsProjectRepository(ProjectRepository):
         raise ProjectDoesntExistError(str(base_path))
 
     def _read_from_file(self, path: Path) -> ProjectData:
-        project_data_dict = json.loads(path.read_text(encoding="utf-8"))
-        project_data = from_dict(project_data_dict)
+        project_data_dict = self._read(path)
+        units_dir = self._doc_units_dir(path)
+        generation = project_data_dict.get(self._GENERATION_KEY, 0)
+        self._manifests[path] = (project_data_dict.get("project_id"), generation)
+        journal = self._journal(path).replay(generation)
+        project_data = from_dict(
+            journal.manifest or project_data_dict,
+            load_doc_unit=self._doc_unit_loader(units_dir, generation),
+            origin=str(units_dir),
+            load_asset_references=self._asset_reference_loader(units_dir, generation),
+        )
+        if isinstance(project_data.doc_units, LazyDocUnitMap):
+            for unit_id, data in journal.puts.items():
+                if unit_id in project_data.doc_units:
+                    project_data.doc_units.preload(unit_id, data)
         project_data.metadata.setdefault("project_root_path", str(path.parent))
         project_data.metadata["project_meta_path"] = str(path)
         return project_data
@@ -53,23 +97,212 @@ class FsProjectRepository(ProjectRepository):
         project_dir_name = safe_folder_name(project_data.name.value)
         return self._create_project_files(base_path, project_dir_name, project_data)
 
+    def snapshot(self, project_data: ProjectData) -> ProjectData:
+        """Copy ``project_data`` for a save running off the calling thread.
+
+        Plain-dict doc units (projects never saved) are wrapped in place first
+        so the live project benefits from dirty tracking after the save.
+        """
+        if not isinstance(project_data.doc_units, LazyDocUnitMap):
+            project_data.doc_units = LazyDocUnitMap.from_loaded(dict(project_data.doc_units))
+        return ProjectData(
+            project_id=project_data.project_id,
+            name=project_data.name,
+            doc_units=project_data.doc_units.snapshot(),
+            last_active_doc_unit_id=project_data.last_active_doc_unit_id,
+            metadata=dict(project_data.metadata),
+        )
+
     def _atomic_write_json(self, file_path: Path, project_data: ProjectData):
-        if file_path.is_file():
-            project_data_in_file = self._read_from_file(file_path)
-            if project_data_in_file.project_id != project_data.project_id:
-                raise ProjectIdMismatchError(
-                    f"Existing id {project_data_in_file.project_id} != incoming {project_data.project_id}"
-                )
+        """Persist ``project_data`` at ``file_path``.
+
+        Saves on top of the snapshot the data was loaded from append one
+        journal batch with the dirty units. Other saves, and saves that find
+        the journal past its size threshold or torn by a crash, write a
+        snapshot instead.
+        """
+        existing = self._manifest_state(file_path)
+        if existing is not None and existing[0] != project_data.project_id.value:
+            raise ProjectIdMismatchError(f"Existing id {existing[0]} != incoming {project_data.project_id.value}")
+        generation = existing[1] if existing else 0
 
         project_data.metadata.setdefault("project_root_path", str(file_path.parent))
         project_data.metadata["project_meta_path"] = str(file_path)
 
-        project_data_dict = to_dict(project_data)
-        tmp = file_path.with_suffix(f"{file_path.suffix}.tmp")
-        tmp.write_text(json.dumps(project_data_dict, ensure_ascii=False, indent=2), encoding="utf-8")
-        tmp.replace(file_path)
+        units_dir = self._doc_units_dir(file_path)
+        journal = self._journal(file_path)
+        doc_units = project_data.doc_units
+        incremental = isinstance(doc_units, LazyDocUnitMap) and doc_units.origin == str(units_dir)
+
+        if (
+            incremental
+            and 0 < self._journal_compaction_bytes
+            and journal.size() < self._journal_compaction_bytes
+            and not journal.has_torn_tail()
+        ):
+            journal.append(
+                generation,
+                to_dict(project_data),
+                {unit_id: doc_units[unit_id] for unit_id in doc_units.dirty_ids},
+                doc_units.removed_ids,
+            )
+        else:
+            self._write_snapshot(file_path, project_data, generation, journal, incremental)
+            generation += 1
+        self._manifests[file_path] = (project_data.project_id.value, generation)
+
+        loader = self._doc_unit_loader(units_dir, generation)
+        references_loader = self._asset_reference_loader(units_dir, generation)
+        if isinstance(doc_units, LazyDocUnitMap):
+            doc_units.mark_clean(str(units_dir), loader, references_loader)
+        else:
+            persisted = LazyDocUnitMap(doc_units.keys(), loader)
+            for unit_id, data in doc_units.items():
+                persisted[unit_id] = data
+            persisted.mark_clean(str(units_dir), loader, references_loader)
+            project_data.doc_units = persisted
         return str(file_path)
 
+    def _manifest_state(self, file_path: Path) -> Optional[Tuple[Optional[str], int]]:
+        """Project id and generation of the manifest at ``file_path``, or None when there is none.
+
+        Only a manifest this repository has not loaded or saved yet is read.
+        """
+        if not file_path.is_file():
+            self._manifests.pop(file_path, None)
+            return None
+        state = self._manifests.get(file_path)
+        if state is None:
+            existing = self._read(file_path)
+            state = (existing.get("project_id"), existing.get(self._GENERATION_KEY, 0))
+        return state
+
+    def _write_snapshot(
+        self,
+        file_path: Path,
+        project_data: ProjectData,
+        generation: int,
+        journal: ProjectJournal,
+        incremental: bool,
+    ) -> None:
+        """Stage dirty doc unit files, replace the manifest, then move the staged files in place.
+
+        Units whose latest version only lives in the journal are folded in.
+        Unit files are first written under the new generation's staged name,
+        so until the manifest (which bumps the generation) is replaced the old
+        manifest still pairs with the old unit files. The bump also retires
+        the old journal even if deleting it below is interrupted. Once the
+        manifest is in place the staged files are renamed over the old ones;
+        if that is interrupted, loads read the staged files of the manifest's
+        generation and the next snapshot finishes the renames. Files of
+        removed units are deleted only after the new manifest is in place.
+
+        Each unit file gets a small sidecar with its asset reference counts,
+        staged and renamed along with it, so counting references does not
+        load units. Units saved only to the journal are loaded on open and
+        counted from their data instead.
+        """
+        units_dir = self._doc_units_dir(file_path)
+        units_dir.mkdir(parents=True, exist_ok=True)
+        self._settle_staged_units(units_dir, generation)
+        doc_units = project_data.doc_units
+        if incremental:
+            pending = journal.replay(generation)
+            changed_ids = list(dict.fromkeys([*doc_units.dirty_ids, *pending.puts]))
+            removed_ids = set(doc_units.removed_ids) | pending.deletes
+        else:
+            # First save at this location (new project, migration or save-as).
+            changed_ids, removed_ids = list(doc_units.keys()), set()
+
+        written = [unit_id for unit_id in changed_ids if unit_id in doc_units]
+        for unit_id in written:
+            data = doc_units[unit_id]
+            if isinstance(doc_units, LazyDocUnitMap):
+                references = doc_units.asset_references(unit_id)
+            else:
+                references = count_asset_references(data)
+            self._write(
+                self._staged(self._doc_unit_path(units_dir, unit_id), generation + 1),
+                data,
+                self._doc_unit_serializer,
+            )
+            self._write(
+                self._staged(self._asset_refs_path(units_dir, unit_id), generation + 1),
+                references,
+                self._doc_unit_serializer,
+            )
+        manifest = to_dict(project_data)
+        manifest[self._GENERATION_KEY] = generation + 1
+        self._write(file_path, manifest, self._manifest_serializer)
+        self._promote_staged_units(units_dir, written, generation + 1)
+        journal.discard()
+        for unit_id in removed_ids - set(doc_units.keys()):
+            self._doc_unit_path(units_dir, unit_id).unlink(missing_ok=True)
+            self._asset_refs_path(units_dir, unit_id).unlink(missing_ok=True)
+
+    def _journal(self, meta_path: Path) -> ProjectJournal:
+        return ProjectJournal(meta_path.with_suffix(self.JOURNAL_FILE_SUFFIX), default_serializer())
+
+    def _doc_units_dir(self, meta_path: Path) -> Path:
+        return meta_path.parent.joinpath(self.DOC_UNITS_DIR)
+
+    def _doc_unit_path(self, units_dir: Path, unit_id: str) -> Path:
+        return units_dir.joinpath(f"{unit_id}{self.DOC_UNIT_FILE_SUFFIX}")
+
+    def _asset_refs_path(self, units_dir: Path, unit_id: str) -> Path:
+        return units_dir.joinpath(f"{unit_id}{self.ASSET_REFS_FILE_SUFFIX}")
+
+    @staticmethod
+    def _staged(path: Path, generation: int) -> Path:
+        return path.with_name(f"{path.name}.g{generation}")
+
+    def _promote_staged_units(self, units_dir: Path, unit_ids: Iterable[str], generation: int) -> None:
+        for unit_id in unit_ids:
+            for path in (self._doc_unit_path(units_dir, unit_id), self._asset_refs_path(units_dir, unit_id)):
+                self._staged(path, generation).replace(path)
+
+    def _settle_staged_units(self, units_dir: Path, generation: int) -> None:
+        """Finish the renames of an interrupted snapshot of ``generation``; drop files of uncommitted ones."""
+        for suffix in (self.DOC_UNIT_FILE_SUFFIX, self.ASSET_REFS_FILE_SUFFIX):
+            for staged in units_dir.glob(f"*{suffix}.g*"):
+                name, _, staged_generation = staged.name.rpartition(".g")
+                if staged_generation == str(generation):
+                    staged.replace(staged.with_name(name))
+                else:
+                    staged.unlink(missing_ok=True)
+
+    def _read_unit_file(self, path: Path, generation: int) -> Any:
+        # A staged file of the manifest's generation is newer than the file it was not yet renamed over.
+        try:
+            return self._read(self._staged(path, generation))
+        except FileNotFoundError:
+            return self._read(path)
+
+    def _doc_unit_loader(self, units_dir: Path, generation: int) -> DocUnitLoader:
+        def load_doc_unit(unit_id: str) -> dict:
+            return self._read_unit_file(self._doc_unit_path(units_dir, unit_id), generation)
+
+        return load_doc_unit
+
+    def _asset_reference_loader(self, units_dir: Path, generation: int) -> AssetReferenceLoader:
+        def load_asset_references(unit_id: str) -> Optional[dict]:
+            try:
+                return self._read_unit_file(self._asset_refs_path(units_dir, unit_id), generation)
+            except (OSError, ValueError):
+                # Projects saved before sidecars existed; the unit is counted instead.
+                return None
+
+        return load_asset_references
+
+    @staticmethod
+    def _read(path: Path) -> Any:
+        data = path.read_bytes()
+        return serializer_for(data).loads(data)
+
+    @staticmethod
+    def _write(path: Path, payload: Any, serializer: ProjectSerializer) -> None:
+        write_atomic(path, serializer.dumps(payload))
+
     def _create_project_files(self, base_path: Path, project_dir_name: str, project_data: ProjectData):
         project_folder_path = base_path.joinpath(project_dir_name)
         if self.resolve_meta(str(project_folder_path)):
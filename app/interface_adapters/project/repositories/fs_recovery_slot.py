@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import shutil
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from app.application.project.ports import RecoveryStore
+from app.domain.project.value_objects import ProjectData
+
+from ..mappers.lazy_doc_units import LazyDocUnitMap
+from ..mappers.project_data_mapper import to_dict
+from ..serialization.project_serializer import (
+    ProjectSerializer,
+    default_serializer,
+    serializer_for,
+)
+from ..util.atomic_files import write_atomic
+from .fs_project_repository import FsProjectRepository
+
+
+class FsRecoverySlot(RecoveryStore):
+    """Autosave target under ``<project>/temp/recovery``.
+
+    Only units with unsaved changes are stored, and a unit file is rewritten
+    only when the unit changed again since the previous autosave. The user's
+    project files are never touched; a successful regular save clears the slot.
+    Writes must be serialized by the caller (one worker thread).
+    """
+
+    RECOVERY_DIR = "temp/recovery"
+    MANIFEST_FILE_NAME = "recovery.mtmeta"
+    DOC_UNIT_FILE_SUFFIX = ".mtunit"
+    _RECOVERED_KEY = "recovered_unit_ids"
+
+    def __init__(self, serializer: Optional[ProjectSerializer] = None) -> None:
+        self._serializer = serializer or default_serializer()
+        self._written: Dict[str, Dict[str, int]] = {}
+
+    def write(self, project_data: ProjectData) -> int:
+        slot = self._slot_dir(project_data)
+        slot.mkdir(parents=True, exist_ok=True)
+        doc_units = project_data.doc_units
+        if isinstance(doc_units, LazyDocUnitMap):
+            versions = doc_units.dirty_versions
+        else:
+            versions = dict.fromkeys(doc_units, 0)
+
+        written = self._written.setdefault(str(slot), {})
+        bytes_written = 0
+        for unit_id, version in versions.items():
+            if written.get(unit_id) == version:
+                continue
+            data = self._serializer.dumps(doc_units[unit_id])
+            write_atomic(self._unit_path(slot, unit_id), data)
+            written[unit_id] = version
+            bytes_written += len(data)
+
+        manifest = to_dict(project_data)
+        manifest[self._RECOVERED_KEY] = list(versions)
+        data = self._serializer.dumps(manifest)
+        write_atomic(slot.joinpath(self.MANIFEST_FILE_NAME), data)
+        bytes_written += len(data)
+
+        for unit_id in set(written) - set(versions):
+            self._unit_path(slot, unit_id).unlink(missing_ok=True)
+            del written[unit_id]
+        return bytes_written
+
+    def clear(self, project_data: ProjectData) -> None:
+        slot = self._slot_dir(project_data)
+        self._written.pop(str(slot), None)
+        shutil.rmtree(slot, ignore_errors=True)
+
+    def pending(self, project_data: ProjectData) -> bool:
+        """A slot for this project written after its manifest and journal last changed."""
+        manifest_path = self._slot_dir(project_data).joinpath(self.MANIFEST_FILE_NAME)
+        if not manifest_path.is_file():
+            return False
+        if self._read(manifest_path).get("project_id") != project_data.project_id.value:
+            return False
+        meta_path = project_data.metadata.get("project_meta_path")
+        if not meta_path:
+            return True
+        saved_paths = [Path(meta_path), Path(meta_path).with_suffix(FsProjectRepository.JOURNAL_FILE_SUFFIX)]
+        saved_at = max((path.stat().st_mtime_ns for path in saved_paths if path.is_file()), default=0)
+        return manifest_path.stat().st_mtime_ns > saved_at
+
+    def restore(self, project_data: ProjectData) -> List[str]:
+        """Apply a recovery slot left behind by a crash; return the recovered unit ids.
+
+        Recovered units become unsaved changes of ``project_data``.
+        """
+        slot = self._slot_dir(project_data)
+        manifest_path = slot.joinpath(self.MANIFEST_FILE_NAME)
+        if not manifest_path.is_file():
+            return []
+        manifest = self._read(manifest_path)
+        if manifest.get("project_id") != project_data.project_id.value:
+            return []
+
+        recovered: List[str] = manifest.get(self._RECOVERED_KEY, [])
+        for unit_id in recovered:
+            project_data.doc_units[unit_id] = self._read(self._unit_path(slot, unit_id))
+        kept = set(manifest.get("doc_unit_ids", []))
+        for unit_id in [unit_id for unit_id in project_data.doc_units if unit_id not in kept]:
+            del project_data.doc_units[unit_id]
+        project_data.last_active_doc_unit_id = manifest.get("last_active_doc_unit_id")
+        return recovered
+
+    def _slot_dir(self, project_data: ProjectData) -> Path:
+        root = project_data.metadata.get("project_root_path")
+        if not root:
+            raise RuntimeError("Project metadata missing 'project_root_path'.")
+        return Path(root).joinpath(self.RECOVERY_DIR)
+
+    def _unit_path(self, slot: Path, unit_id: str) -> Path:
+        return slot.joinpath(f"{unit_id}{self.DOC_UNIT_FILE_SUFFIX}")
+
+    @staticmethod
+    def _read(path: Path) -> dict:
+        data = path.read_bytes()
+        return serializer_for(data).loads(data)
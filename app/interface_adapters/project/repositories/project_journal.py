@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import logging
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, Mapping, Optional, Set
+
+from ..serialization.project_serializer import ProjectSerializer
+
+log = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class JournalState:
+    """Net effect of the journal batches that belong to one snapshot generation."""
+
+    manifest: Optional[Dict[str, Any]] = None
+    puts: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    deletes: Set[str] = field(default_factory=set)
+    batches: int = 0
+
+    @property
+    def is_empty(self) -> bool:
+        return self.batches == 0
+
+
+class ProjectJournal:
+    """Append-only JSON-lines log of saves made on top of a project snapshot.
+
+    Every save appends exactly one line holding the new manifest plus the doc
+    units written and deleted by that save, tagged with the snapshot
+    ``generation`` it applies to. A line is either fully present or, after a
+    crash mid-append, unparsable; replay skips bad lines, so each save is
+    applied all-or-nothing and saves appended after a tear still count.
+    Appends start on a fresh line rather than extending a torn one. Lines of
+    an older generation are left over from an interrupted compaction and are
+    ignored.
+    """
+
+    def __init__(self, path: Path, serializer: ProjectSerializer) -> None:
+        """``serializer`` must emit single-line output (a JSON codec without indent)."""
+        self._path = path
+        self._serializer = serializer
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def size(self) -> int:
+        try:
+            return self._path.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def has_torn_tail(self) -> bool:
+        """Whether the last append was cut short; reads only the final byte."""
+        try:
+            with self._path.open("rb") as handle:
+                if handle.seek(0, os.SEEK_END) == 0:
+                    return False
+                handle.seek(-1, os.SEEK_END)
+                return handle.read(1) != b"\n"
+        except FileNotFoundError:
+            return False
+
+    def append(
+        self,
+        generation: int,
+        manifest: Dict[str, Any],
+        puts: Mapping[str, Dict[str, Any]],
+        deletes: Iterable[str],
+    ) -> None:
+        record = {
+            "generation": generation,
+            "manifest": manifest,
+            "put": dict(puts),
+            "delete": list(deletes),
+        }
+        with self._path.open("a+b") as handle:
+            if handle.tell() > 0:
+                handle.seek(-1, os.SEEK_END)
+                if handle.read(1) != b"\n":
+                    # Start after a line torn by a crash instead of extending it.
+                    handle.write(b"\n")
+            handle.write(self._serializer.dumps(record) + b"\n")
+            handle.flush()
+            os.fsync(handle.fileno())
+
+    def replay(self, generation: int) -> JournalState:
+        state = JournalState()
+        try:
+            handle = self._path.open("rb")
+        except FileNotFoundError:
+            return state
+
+        with handle:
+            for line_number, line in enumerate(handle, start=1):
+                try:
+                    record = self._serializer.loads(line)
+                except ValueError:
+                    log.warning("Skipping torn journal line in %s at line %d", self._path, line_number)
+                    continue
+                if record.get("generation") != generation:
+                    continue
+                state.manifest = record["manifest"]
+                for unit_id, data in record.get("put", {}).items():
+                    state.puts[unit_id] = data
+                    state.deletes.discard(unit_id)
+                for unit_id in record.get("delete", []):
+                    state.puts.pop(unit_id, None)
+                    state.deletes.add(unit_id)
+                state.batches += 1
+        return state
+
+    def discard(self) -> None:
+        self._path.unlink(missing_ok=True)
@@ -0,0 +1,119 @@
+"""Byte codecs used to persist project manifests, doc units and journals.
+
+``default_serializer`` picks orjson when it is installed and falls back to the
+standard library. ``MsgpackSerializer`` is an opt-in compact binary format for
+doc unit files, picked by name through :func:`serializer_named`; it needs the
+``msgpack`` package. Both packages are optional (see requirements.txt). Readers do not need to know
+which codec wrote a file: :func:`serializer_for` sniffs the first byte.
+"""
+from __future__ import annotations
+
+import json
+import logging
+from typing import Any, Optional, Protocol
+
+from app.application.project.errors import InvalidProjectDataError
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - depends on the environment
+    msgpack = None
+
+log = logging.getLogger(__name__)
+
+
+class ProjectSerializer(Protocol):
+    name: str
+
+    def dumps(self, payload: Any) -> bytes:
+        ...
+
+    def loads(self, data: bytes) -> Any:
+        ...
+
+
+class JsonSerializer:
+    name = "json"
+
+    def __init__(self, indent: Optional[int] = None) -> None:
+        self._indent = indent
+        self._separators = None if indent else (",", ":")
+
+    def dumps(self, payload: Any) -> bytes:
+        return json.dumps(
+            payload, ensure_ascii=False, indent=self._indent, separators=self._separators
+        ).encode("utf-8")
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+class OrjsonSerializer:
+    name = "orjson"
+
+    def __init__(self, indent: bool = False) -> None:
+        if orjson is None:
+            raise RuntimeError("orjson is not installed.")
+        self._option = orjson.OPT_INDENT_2 if indent else 0
+
+    def dumps(self, payload: Any) -> bytes:
+        return orjson.dumps(payload, option=self._option)
+
+    def loads(self, data: bytes) -> Any:
+        return orjson.loads(data)
+
+
+class MsgpackSerializer:
+    name = "msgpack"
+
+    def __init__(self) -> None:
+        if msgpack is None:
+            raise RuntimeError("msgpack is not installed.")
+
+    def dumps(self, payload: Any) -> bytes:
+        return msgpack.packb(payload, use_bin_type=True)
+
+    def loads(self, data: bytes) -> Any:
+        return msgpack.unpackb(data, raw=False)
+
+
+def default_serializer(indent: bool = False) -> ProjectSerializer:
+    """Fastest available JSON codec; ``indent`` keeps the output human readable."""
+    if orjson is not None:
+        return OrjsonSerializer(indent=indent)
+    return JsonSerializer(indent=2 if indent else None)
+
+
+def serializer_named(name: str) -> ProjectSerializer:
+    """Codec for doc unit files chosen in the settings: ``"json"`` or ``"msgpack"``.
+
+    Falls back to JSON with a warning when msgpack is not installed, so a
+    setting carried over to another machine does not stop saves.
+    """
+    if name == JsonSerializer.name:
+        return default_serializer()
+    if name == MsgpackSerializer.name:
+        if msgpack is None:
+            log.warning("msgpack is not installed; doc units are saved as JSON.")
+            return default_serializer()
+        return MsgpackSerializer()
+    raise ValueError(f"Unknown doc unit format: {name!r}")
+
+
+def serializer_for(data: bytes) -> ProjectSerializer:
+    """Pick the codec able to read ``data``.
+
+    JSON documents start with ``{`` or ``[`` (possibly after whitespace);
+    anything else is treated as msgpack.
+    """
+    head = data.lstrip()[:1]
+    if head in (b"{", b"["):
+        return default_serializer()
+    if msgpack is None:
+        raise InvalidProjectDataError("Project file is not JSON and msgpack is not installed.")
+    return MsgpackSerializer()
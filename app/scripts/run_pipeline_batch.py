@@ -0,0 +1,138 @@
+"""Run a pipeline over every page of a doc unit, without the GUI.
+
+    python -m app.scripts.run_pipeline_batch PROJECT GRAPH UNIT_ID [--output DIR]
+
+PROJECT is a project folder or its ``project.mtmeta``; GRAPH a ``.pygraph``
+saved from the pipeline editor. Results go to ``PROJECT/outputs/<unit id>``
+unless ``--output`` says otherwise. Running the same command again resumes:
+pages whose result is still current are skipped, ``--restart`` redoes them
+all. ``--workers N`` runs N pages at once in worker processes that each load
+the pipeline once; results are still written in page order. Ctrl+C stops
+after the pages being processed; press it twice to abort at once.
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import signal
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Optional
+
+from app.application.pipelines.dto import BatchReport, RunBatchRequest
+from app.application.pipelines.use_cases.run_doc_unit_batch import RunDocUnitBatch
+from app.interface_adapters.doc_units.repositories.project_doc_unit_repository import ProjectDocUnitRepository
+from app.interface_adapters.media.content_addressed_media_store import ContentAddressedMediaStore
+from app.interface_adapters.pipelines.runners.process_pool_page_processor import ProcessPoolPageProcessor
+from app.interface_adapters.pipelines.runners.pyflow_page_processor import PyFlowPageProcessor
+from app.interface_adapters.pipelines.stores.filesystem_batch_output_store import FileSystemBatchOutputStore
+from app.interface_adapters.project.repositories.fs_project_repository import FsProjectRepository
+from app.interface_adapters.project.repositories.mem_current_project_store import MemCurrentProjectStore
+from app.interface_adapters.project.util.idgen_uuid import UUIDGenerator
+
+OUTPUT_DIR = "outputs"
+
+
+def parse_args(argv: Optional[List[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("project", help="project folder or project.mtmeta")
+    parser.add_argument("graph", help=".pygraph pipeline to run")
+    parser.add_argument("unit_id", help="id of the doc unit whose pages are processed")
+    parser.add_argument("--output", help=f"result folder (default: PROJECT/{OUTPUT_DIR}/UNIT_ID)")
+    parser.add_argument("--restart", action="store_true", help="redo pages finished by an earlier run")
+    parser.add_argument("--limit", type=int, help="process at most this many pages")
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=0,
+        help="run independent thread-safe nodes of a page on this many threads (default: sequential)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="run this many pages at once, each worker process with its own copy of the pipeline "
+        "(default: one page at a time in this process)",
+    )
+    parser.add_argument("-v", "--verbose", action="store_true", help="log every page")
+    return parser.parse_args(argv)
+
+
+def print_report(report: BatchReport) -> None:
+    state = "cancelled" if report.cancelled else "done"
+    print(
+        f"{state}: {report.processed} processed, {report.skipped} skipped, {len(report.failed)} failed "
+        f"in {report.seconds:.1f}s ({report.pages_per_second:.2f} pages/s)"
+    )
+    for node_id, error in report.failed.items():
+        print(f"  failed {node_id}: {error}")
+    if report.node_seconds:
+        print(f"{'node':<32}{'total s':>10}{'per page s':>12}")
+        for name, seconds in sorted(report.node_seconds.items(), key=lambda item: item[1], reverse=True):
+            print(f"{name:<32}{seconds:>10.2f}{seconds / max(report.processed, 1):>12.3f}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format="%(levelname).1s %(asctime)s %(name)s | %(message)s",
+    )
+
+    project_data = FsProjectRepository().load(args.project)
+    project_store = MemCurrentProjectStore()
+    project_store.set_data(project_data)
+    project_root = Path(project_data.metadata["project_root_path"])
+    output_dir = args.output or str(project_root.joinpath(OUTPUT_DIR, args.unit_id))
+
+    pool = None
+    if args.workers > 0:
+        processor = ProcessPoolPageProcessor(args.graph, args.workers, threads=args.threads)
+    else:
+        engine = None
+        if args.threads > 0:
+            from PyFlow.Core.ParallelEvaluationEngine import ParallelEvaluationEngine_Impl
+
+            pool = ThreadPoolExecutor(args.threads, "pipeline")
+            engine = ParallelEvaluationEngine_Impl(threadPool=pool)
+        processor = PyFlowPageProcessor(args.graph, engine)
+
+    stop_requested = False
+
+    def request_stop(*_args) -> None:
+        nonlocal stop_requested
+        if stop_requested:
+            raise KeyboardInterrupt
+        stop_requested = True
+        print("Stopping after the pages in progress; press Ctrl+C again to abort.", file=sys.stderr)
+
+    def show_progress(done: int, total: int) -> None:
+        print(f"\r{done}/{total} pages", end="" if done < total else "\n", file=sys.stderr, flush=True)
+
+    try:
+        runner = RunDocUnitBatch(
+            ProjectDocUnitRepository(project_store),
+            ContentAddressedMediaStore(project_store, UUIDGenerator()),
+            processor,
+            FileSystemBatchOutputStore(output_dir),
+        )
+        signal.signal(signal.SIGINT, request_stop)
+        report = runner.execute(
+            RunBatchRequest(args.unit_id, resume=not args.restart, limit=args.limit),
+            progress=show_progress,
+            cancelled=lambda: stop_requested,
+        )
+    finally:
+        if isinstance(processor, ProcessPoolPageProcessor):
+            processor.close()
+        if pool is not None:
+            pool.shutdown()
+
+    print_report(report)
+    print(f"results in {output_dir}")
+    return 1 if report.failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
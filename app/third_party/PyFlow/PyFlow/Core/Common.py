@@ -323,6 +323,27 @@ def getConnectedPins(pin):
     return result
 
 
+_evaluationPlansVersion = 0
+
+
+def invalidateEvaluationPlans():
+    """Marks cached evaluation orders stale
+
+    Called whenever dependencies between pins change (connect, disconnect, pin or node kill),
+    so :class:`~PyFlow.Core.EvaluationEngine.DefaultEvaluationEngine_Impl` rebuilds its plans.
+    """
+    global _evaluationPlansVersion
+    _evaluationPlansVersion += 1
+
+
+def evaluationPlansVersion():
+    """Returns a number that changes every time :func:`invalidateEvaluationPlans` is called
+
+    :rtype: int
+    """
+    return _evaluationPlansVersion
+
+
 def pinAffects(lhs, rhs):
     """This function for establish dependencies between pins
 
@@ -336,6 +357,7 @@ def pinAffects(lhs, rhs):
     assert lhs is not rhs, "pin can not affect itself"
     lhs.affects.add(rhs)
     rhs.affected_by.add(lhs)
+    invalidateEvaluationPlans()
 
 
 def canConnectPins(src, dst):
@@ -662,6 +684,7 @@ def disconnectPins(src, dst):
             src, dst = dst, src
         src.affects.remove(dst)
         dst.affected_by.remove(src)
+        invalidateEvaluationPlans()
         src.pinDisconnected(dst)
         dst.pinDisconnected(src)
         push(dst)
@@ -679,12 +702,18 @@ def push(start_from):
     :param start_from: pin from which recursion begins
     :type start_from: :py:class:`~PyFlow.Core.PinBase.PinBase`
     """
-    #print("push", start_from.name, start_from.owningNode().name)
-    if not len(start_from.affects) == 0:
-        start_from.setDirty()
-        for i in start_from.affects:
-            i.setDirty()
-            push(i)
+    # Each pin is visited once; following every path blows up on graphs with many diamonds.
+    if len(start_from.affects) == 0:
+        return
+    visited = {start_from}
+    stack = [start_from]
+    while stack:
+        pin = stack.pop()
+        pin.setDirty()
+        for i in pin.affects:
+            if i not in visited:
+                visited.add(i)
+                stack.append(i)
 
 
 def extractDigitsFromEndOfString(string):
@@ -1018,8 +1047,12 @@ class NodeMeta:
     :var CATEGORY: To specify category for node. Will be considered by node box
     :var KEYWORDS: To specify list of additional keywords, used in node box search field
     :var CACHE_ENABLED: To specify if node is cached or not
+    :var THREAD_SAFE: To specify if node function can run on a worker thread
+    :var PROCESS_SAFE: To specify if node function can run in a worker process
     """
 
     CATEGORY = "Category"
     KEYWORDS = "Keywords"
     CACHE_ENABLED = "CacheEnabled"
+    THREAD_SAFE = "ThreadSafe"
+    PROCESS_SAFE = "ProcessSafe"
@@ -13,14 +13,57 @@
 ## limitations under the License.
 
 
+import weakref
+from collections import Counter
+
 from PyFlow.Core.Common import *
 from PyFlow.Core.Interfaces import IEvaluationEngine
 
 
+class EvaluationStats(object):
+    """Counters of upstream nodes handled by pin pulls
+
+    ``processed`` counts nodes that were run, ``skipped`` nodes of the full
+    upstream order left alone because they were clean. ``processedNodes``
+    counts runs per node name.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.pulls = 0
+        self.processed = 0
+        self.skipped = 0
+        self.processedNodes = Counter()
+
+    def record(self, order, planSize):
+        self.pulls += 1
+        self.processed += len(order)
+        self.skipped += planSize - len(order)
+        self.processedNodes.update(node.name for node in order)
+
+
 class DefaultEvaluationEngine_Impl(IEvaluationEngine):
     """Default evaluation engine implementation
+
+    Upstream evaluation orders are cached per node in ``_plans`` and dropped
+    as a whole whenever pin connections change (see
+    :func:`~PyFlow.Core.Common.invalidateEvaluationPlans`). The caches hold
+    their nodes weakly, so they do not keep killed nodes or closed graphs
+    alive.
+
+    With ``bIncremental`` set (the default) a pull only runs the dirty part of
+    the upstream graph, see :meth:`getDirtyEvaluationOrder`. ``stats`` counts
+    what every pull ran and skipped.
     """
 
+    _plans = weakref.WeakKeyDictionary()
+    _layers = weakref.WeakKeyDictionary()
+    _plansVersion = -1
+    bIncremental = True
+    stats = EvaluationStats()
+
     def __init__(self):
         super(DefaultEvaluationEngine_Impl, self).__init__()
 
@@ -34,7 +77,7 @@ class DefaultEvaluationEngine_Impl(IEvaluationEngine):
         if not bOwningNodeCallable:
             return pin.currentData()
 
-        order = DefaultEvaluationEngine_Impl.getEvaluationOrderIterative(pin.owningNode())
+        order = DefaultEvaluationEngine_Impl.getPullOrder(pin.owningNode())
         [node.processNode() for node in order]
 
         if not bOwningNodeCallable:
@@ -42,22 +85,107 @@ class DefaultEvaluationEngine_Impl(IEvaluationEngine):
         return pin.currentData()
 
     @staticmethod
-    def TEST_getPinData(pin):
-        if not pin.hasConnections():
-            return pin.currentData()
+    def getPullOrder(node):
+        """Returns the upstream nodes a pull from ``node`` runs, in order, and counts them in ``stats``
+
+        :rtype: list
+        """
+        plan = DefaultEvaluationEngine_Impl.getEvaluationPlan(node)
+        if DefaultEvaluationEngine_Impl.bIncremental:
+            order = DefaultEvaluationEngine_Impl.getDirtyEvaluationOrder(node)
+        else:
+            order = plan
+        DefaultEvaluationEngine_Impl.stats.record(order, len(plan))
+        return order
 
-        bOwningNodeCallable = pin.owningNode().bCallable
+    @staticmethod
+    def getDirtyEvaluationOrder(node):
+        """Returns the upstream nodes of ``node`` that have to run, in order
+
+        Walks the cached plan front to back and keeps a node when it is dirty,
+        has caching disabled, or reads from a node that was kept. Setting a
+        pin only marks the pins it directly affects dirty, so a clean node
+        does not prove that nothing above it changed; dirtiness is carried
+        along the plan instead.
+
+        :rtype: list
+        """
+        plan = DefaultEvaluationEngine_Impl.getEvaluationPlan(node)
+        upstream = DefaultEvaluationEngine_Impl._upstreamNodes
+        stale = set()
+        order = []
+        for current in plan:
+            if not current.bCacheEnabled or current.isDirty() or any(n in stale for n in upstream(current)):
+                stale.add(current)
+                order.append(current)
+        return order
 
-        if not pin.dirty:
-            return pin.currentData()
-        
-        order = DefaultEvaluationEngine_Impl.getEvaluationOrderIterative(pin.owningNode())
-        [node.processNode() for node in order]
+    @staticmethod
+    def _upstreamNodes(node):
+        """:meth:`getNextLayerNodes` of ``node``, cached like plans"""
+        layers = DefaultEvaluationEngine_Impl._layers
+        layer = layers.get(node)
+        if layer is None:
+            layer = layers[node] = tuple(DefaultEvaluationEngine_Impl.getNextLayerNodes(node))
+        return layer
 
-        #if pin.dirty:
-        #    pin.owningNode().processNode()
+    @staticmethod
+    def getEvaluationPlan(node):
+        """Returns nodes that have to be processed before ``node``, in order
+
+        Same order as :meth:`getEvaluationOrderIterative`, but cached until
+        pin connections change. While building a plan, upstream nodes that
+        already have one are not walked again; their plan is spliced in.
+
+        :rtype: tuple
+        """
+        plans = DefaultEvaluationEngine_Impl._plans
+        version = evaluationPlansVersion()
+        if DefaultEvaluationEngine_Impl._plansVersion != version:
+            plans.clear()
+            DefaultEvaluationEngine_Impl._layers.clear()
+            DefaultEvaluationEngine_Impl._plansVersion = version
+        plan = plans.get(node)
+        if plan is None:
+            plan = DefaultEvaluationEngine_Impl._buildEvaluationPlan(node, plans)
+            plans[node] = plan
+        return plan
 
-        return pin.currentData()
+    @staticmethod
+    def _buildEvaluationPlan(node, plans):
+        visited = set()
+        order = []
+        stack = [(node, False)]
+
+        while stack:
+            current, expanded = stack.pop()
+
+            if current in visited:
+                continue
+
+            if expanded:
+                visited.add(current)
+                order.append(current)
+                continue
+
+            cached = plans.get(current) if current is not node else None
+            if cached is not None:
+                # A cached plan is a valid order of everything above ``current``.
+                for upstream in cached:
+                    if upstream not in visited:
+                        visited.add(upstream)
+                        order.append(upstream)
+                visited.add(current)
+                order.append(current)
+                continue
+
+            stack.append((current, True))
+            for n in DefaultEvaluationEngine_Impl.getNextLayerNodes(current):
+                if n not in visited:
+                    stack.append((n, False))
+
+        order.pop()
+        return tuple(order)
 
     @staticmethod
     def getEvaluationOrderIterative(node, forward=False):
@@ -65,8 +193,6 @@ class DefaultEvaluationEngine_Impl(IEvaluationEngine):
         order = []
         stack = [(node, False)]  # (node, expanded)
 
-        engine = DefaultEvaluationEngine_Impl()
-
         while stack:
             current, expanded = stack.pop()
 
@@ -79,9 +205,9 @@ class DefaultEvaluationEngine_Impl(IEvaluationEngine):
             else: # First visit: push node back with expanded=True
                 stack.append((current, True))
                 if forward:
-                    neighbors = engine.getForwardNextLayerNodes(current)
+                    neighbors = DefaultEvaluationEngine_Impl.getForwardNextLayerNodes(current)
                 else:
-                    neighbors = engine.getNextLayerNodes(current)
+                    neighbors = DefaultEvaluationEngine_Impl.getNextLayerNodes(current)
 
                 for n in neighbors:
                     if n not in visited:
@@ -172,5 +298,17 @@ class EvaluationEngine(object):
     def __init__(self):
         self._impl = DefaultEvaluationEngine_Impl()
 
+    def impl(self):
+        return self._impl
+
+    def setImpl(self, impl):
+        """Replaces the engine every pin read goes through
+
+        :param impl: Engine implementation, e.g.
+            :class:`~PyFlow.Core.ParallelEvaluationEngine.ParallelEvaluationEngine_Impl`
+        :type impl: :class:`~PyFlow.Core.Interfaces.IEvaluationEngine`
+        """
+        self._impl = impl
+
     def getPinData(self, pin):
         return self._impl.getPinData(pin)
@@ -17,6 +17,7 @@ from blinker import Signal
 import uuid
 from collections import OrderedDict
 from copy import copy
+from functools import partial
 
 from inspect import getfullargspec
 from types import MethodType
@@ -58,12 +59,31 @@ class NodePinsSuggestionsHelper(object):
         self.outputStructs.add(struct)
 
 
+def evaluateFunction(foo, refNames, bReturns, inputs):
+    """Calls a function library node function with input values
+
+    Reference outputs are collected instead of being set on pins.
+
+    :rtype: dict
+    """
+    outputs = {}
+    kwds = dict(inputs)
+    for name in refNames:
+        kwds[name] = partial(outputs.__setitem__, name)
+    result = foo(**kwds)
+    if bReturns:
+        outputs["out"] = result
+    return outputs
+
+
 class NodeBase(INode):
     _packageName = ""
 
     def __init__(self, name, uid=None):
         super(NodeBase, self).__init__()
         self.bCacheEnabled = True
+        self.bThreadSafe = False
+        self.bProcessSafe = False
         self.cacheMaxSize = 1000
         self.cache = {}
 
@@ -342,6 +362,7 @@ class NodeBase(INode):
         for pin in self.outputs.values():
             pin.kill()
         self.graph().getNodes().pop(self.uid)
+        invalidateEvaluationPlans()
 
         PathsRegistry().rebuild()
 
@@ -392,9 +413,11 @@ class NodeBase(INode):
                     self.compute()
                     self.clearError()
                     self.checkForErrors()
-                    self.afterCompute()
                 except Exception as e:
                     self.setError(traceback.format_exc())
+                # Settled even when it failed, like :meth:`applyEvaluation`: it runs again once
+                # its inputs change, not on every pull.
+                self.afterCompute()
         else:
             try:
                 self.compute()
@@ -406,6 +429,40 @@ class NodeBase(INode):
         self._computingTime = delta
         self.computed.send()
 
+    def getEvaluator(self):
+        """Returns a callable that computes this node's outputs from input values, or None
+
+        Used by :class:`~PyFlow.Core.ParallelEvaluationEngine.ParallelEvaluationEngine_Impl`
+        to run nodes declared :attr:`bThreadSafe` or :attr:`bProcessSafe` off the calling thread.
+        The callable takes a dict of value input pin names to values and returns a dict of output
+        pin names to values. It must not touch pins or the graph; its outputs are written back with
+        :meth:`applyEvaluation`. Evaluators of process safe nodes must be picklable.
+        """
+        return None
+
+    def applyEvaluation(self, outputs, computingTime=None):
+        """Writes what this node's evaluator returned to the output pins
+
+        Does what :meth:`processNode` does around :meth:`compute`. ``outputs`` may also be the
+        exception the evaluator raised, which is reported as the node error and settled the same
+        way.
+        """
+        self.computing.send()
+        try:
+            if isinstance(outputs, BaseException):
+                raise outputs
+            for pinName, data in outputs.items():
+                self.setData(pinName, data, PinSelectionGroup.Outputs)
+            self.clearError()
+            self.checkForErrors()
+        except Exception as e:
+            self.setError(traceback.format_exc())
+        if self.bCacheEnabled:
+            self.afterCompute()
+        if computingTime is not None:
+            self._computingTime = computingTime
+        self.computed.send()
+
     # INode interface
 
     def compute(self, *args, **kwargs):
@@ -868,6 +925,15 @@ class NodeBase(INode):
         raw_inst._nodeMetaData = meta
         if "CacheEnabled" in meta:
             raw_inst.bCacheEnabled = meta["CacheEnabled"]
+        raw_inst.bProcessSafe = meta.get(NodeMeta.PROCESS_SAFE, False)
+        raw_inst.bThreadSafe = meta.get(NodeMeta.THREAD_SAFE, False) or raw_inst.bProcessSafe
+        if raw_inst.bThreadSafe and nodeType != NodeTypes.Callable:
+
+            def getEvaluator(self):
+                refNames = [ref.name for ref in refs]
+                return partial(evaluateFunction, foo, refNames, returnType is not None)
+
+            raw_inst.getEvaluator = MethodType(getEvaluator, raw_inst)
 
         # create execs if callable
         if nodeType == NodeTypes.Callable:
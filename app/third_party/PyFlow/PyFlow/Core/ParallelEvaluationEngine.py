@@ -0,0 +1,142 @@
+## Copyright 2015-2019 Ilgar Lunin, Pedro Cabrera
+
+## Licensed under the Apache License, Version 2.0 (the "License");
+## you may not use this file except in compliance with the License.
+## You may obtain a copy of the License at
+
+##     http://www.apache.org/licenses/LICENSE-2.0
+
+## Unless required by applicable law or agreed to in writing, software
+## distributed under the License is distributed on an "AS IS" BASIS,
+## WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+## See the License for the specific language governing permissions and
+## limitations under the License.
+
+
+import time
+from datetime import timedelta
+
+from PyFlow.Core.EvaluationEngine import DefaultEvaluationEngine_Impl
+from PyFlow.Core.Interfaces import IEvaluationEngine
+
+
+def timedEvaluation(evaluator, inputs):
+    """Runs a node evaluator on a worker and returns its outputs with the time it took
+
+    :rtype: tuple(dict, float)
+    """
+    start = time.perf_counter()
+    outputs = evaluator(inputs)
+    return outputs, time.perf_counter() - start
+
+
+class ParallelEvaluationEngine_Impl(IEvaluationEngine):
+    """Evaluation engine that runs independent upstream nodes concurrently
+
+    A pull orders the upstream nodes like
+    :class:`~PyFlow.Core.EvaluationEngine.DefaultEvaluationEngine_Impl` does and splits the order
+    into dependency levels: a node's level is one more than the highest level of the nodes it
+    reads, so nodes of one level never depend on each other. Within a level, dirty nodes declared
+    :attr:`~PyFlow.Core.NodeBase.NodeBase.bProcessSafe` go to ``processPool`` and the ones declared
+    :attr:`~PyFlow.Core.NodeBase.NodeBase.bThreadSafe` to ``threadPool``, through their
+    :meth:`~PyFlow.Core.NodeBase.NodeBase.getEvaluator`. Every other node runs on the calling
+    thread meanwhile.
+
+    Evaluators only get input values. Their outputs are written to the pins on the calling thread,
+    after the level's other nodes and in evaluation order, whichever worker finishes first, so
+    downstream nodes see the same writes in the same order on every run. Input values are shared
+    with the workers and must not be modified by evaluators.
+
+    Nodes downstream of a node that failed are left out of the pull: they keep their outputs and
+    stay dirty, so they run once the failing node computes again.
+
+    Either pool may be None. The engine does not shut the pools down.
+    """
+
+    def __init__(self, threadPool=None, processPool=None):
+        super(ParallelEvaluationEngine_Impl, self).__init__()
+        self.threadPool = threadPool
+        self.processPool = processPool
+
+    def getPinData(self, pin):
+        if not pin.hasConnections():
+            return pin.currentData()
+
+        if not pin.owningNode().bCallable:
+            return pin.currentData()
+
+        order = DefaultEvaluationEngine_Impl.getPullOrder(pin.owningNode())
+        blocked = set()
+        for level in self.getEvaluationLevels(order):
+            runnable = []
+            for node in level:
+                if self._isBlocked(node, blocked):
+                    blocked.add(node)
+                else:
+                    runnable.append(node)
+            self._evaluateLevel(runnable)
+        return pin.currentData()
+
+    @staticmethod
+    def _isBlocked(node, blocked):
+        """Whether ``node`` reads from a node that failed or was left out of this pull"""
+        return any(
+            upstream in blocked or not upstream.isValid()
+            for upstream in DefaultEvaluationEngine_Impl.getNextLayerNodes(node)
+        )
+
+    @staticmethod
+    def getEvaluationLevels(order):
+        """Splits an evaluation order into lists of nodes that do not depend on each other
+
+        Levels come in the order they have to run; nodes keep their relative order.
+
+        :rtype: list(list)
+        """
+        levelByNode = {}
+        levels = []
+        for node in order:
+            level = 0
+            for upstream in DefaultEvaluationEngine_Impl.getNextLayerNodes(node):
+                if upstream in levelByNode:
+                    level = max(level, levelByNode[upstream] + 1)
+            levelByNode[node] = level
+            if level == len(levels):
+                levels.append([])
+            levels[level].append(node)
+        return levels
+
+    def _evaluateLevel(self, level):
+        if not level:
+            return
+        if len(level) == 1:
+            level[0].processNode()
+            return
+
+        jobs = [(node, self._submit(node)) for node in level]
+        for node, future in jobs:
+            if future is None:
+                node.processNode()
+        for node, future in jobs:
+            if future is not None:
+                try:
+                    outputs, seconds = future.result()
+                except Exception as e:
+                    node.applyEvaluation(e)
+                else:
+                    node.applyEvaluation(outputs, timedelta(seconds=seconds))
+
+    def _submit(self, node):
+        if node.bCacheEnabled and not node.isDirty():
+            return None
+        if node.bProcessSafe and self.processPool is not None:
+            pool = self.processPool
+        elif (node.bThreadSafe or node.bProcessSafe) and self.threadPool is not None:
+            pool = self.threadPool
+        else:
+            return None
+        evaluator = node.getEvaluator()
+        if evaluator is None:
+            return None
+        inputs = {pin.name: pin.currentData() for pin in node.inputs.values() if pin.IsValuePin()}
+        return pool.submit(timedEvaluation, evaluator, inputs)
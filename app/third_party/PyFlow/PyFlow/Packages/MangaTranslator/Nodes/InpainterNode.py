@@ -1,3 +1,6 @@
+import threading
+from functools import partial
+
 from PyFlow.Core import NodeBase
 from PyFlow.Core.NodeBase import NodePinsSuggestionsHelper
 from PyFlow.Core.Common import *
@@ -14,6 +17,20 @@ except ModuleNotFoundError:
         chunks_deepest_boxes = []
 
 
+# The model is not known to be thread safe: one call at a time, whichever node or thread makes it.
+_model_lock = threading.Lock()
+
+
+def inpaint(inpainter, inputs):
+    """Evaluator of :class:`InpainterNode`; model calls are serialized, so it may run on a worker thread"""
+    hierarchy = inputs['Hierarchy']
+    input_image = inputs['Image']
+    if input_image is None or hierarchy is None or not isinstance(hierarchy, Hierarchy):
+        raise ValueError("Wrong node inputs.")
+    with _model_lock:
+        inpainted_image = inpainter.inpaint_bboxes(input_image.copy(), hierarchy.chunks_deepest_boxes)
+    return {'Inpainted': inpainted_image}
+
 
 class InpainterNode(NodeBase):
     def __init__(self, name):
@@ -24,6 +41,13 @@ class InpainterNode(NodeBase):
         self.image_inp_pin = self.createInputPin('Image', 'ImageArrayPin')
         self.hierarchy_inp_pin = self.createInputPin('Hierarchy', 'HierarchyPin')
         self.inpainted_image_out_pin = self.createOutputPin('Inpainted', 'ImageArrayPin')
+        # Model calls hold ``_model_lock``, so the node may overlap with other branches.
+        self.bThreadSafe = True
+
+    def getEvaluator(self):
+        if self.inpainter is None:
+            return None
+        return partial(inpaint, self.inpainter)
 
     @staticmethod
     def pinTypeHints():
@@ -58,7 +82,8 @@ class InpainterNode(NodeBase):
 
         if (not input_image is None and not hierarchy is None
                 and isinstance(hierarchy, Hierarchy)):
-            inpainted_image = self.inpainter.inpaint_bboxes(input_image.copy(), hierarchy.chunks_deepest_boxes)
+            with _model_lock:
+                inpainted_image = self.inpainter.inpaint_bboxes(input_image.copy(), hierarchy.chunks_deepest_boxes)
 
             self.inpainted_image_out_pin.setData(inpainted_image)
         else:
@@ -78,6 +78,12 @@ class PipelineInputImageNode(NodeBase):
         return path and os.path.exists(path)
     
 
+    def set_image(self, image):
+        """Feed an already decoded page, for runs without the editor's preview image."""
+        self._image_path = None
+        self.image_out_pin.setData(image)
+
+
     def import_image(self):
         if not self.check_path(self._image_path):
             return
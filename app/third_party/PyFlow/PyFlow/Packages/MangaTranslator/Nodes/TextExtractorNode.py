@@ -1,3 +1,6 @@
+import threading
+from functools import partial
+
 from PyFlow.Core import NodeBase
 from PyFlow.Core.NodeBase import NodePinsSuggestionsHelper
 from PyFlow.Core.Common import *
@@ -14,6 +17,20 @@ except ModuleNotFoundError:
         text_chunks = []
 
 
+# The model is not known to be thread safe: one call at a time, whichever node or thread makes it.
+_model_lock = threading.Lock()
+
+
+def extract_text(text_extractor, inputs):
+    """Evaluator of :class:`TextExtractorNode`; model calls are serialized, so it may run on a worker thread"""
+    image = inputs['Image']
+    hierarchy = inputs['Hierarchy']
+    if image is None or hierarchy is None or not isinstance(hierarchy, Hierarchy):
+        raise ValueError("Wrong node inputs.")
+    with _model_lock:
+        text_areas, original_text = text_extractor.extract_text(image.copy(), hierarchy.text_chunks)
+    return {'Text areas': text_areas, 'Text': original_text}
+
 
 class TextExtractorNode(NodeBase):
     def __init__(self, name):
@@ -25,6 +42,13 @@ class TextExtractorNode(NodeBase):
         self.hierarchy_inp_pin = self.createInputPin('Hierarchy', 'HierarchyPin')
         self.text_areas_out_pin = self.createOutputPin('Text areas', 'IntPin', structure=StructureType.Array)
         self.text_out_pin = self.createOutputPin('Text', 'StringPin', structure=StructureType.Array)
+        # Model calls hold ``_model_lock``, so the node may overlap with other branches.
+        self.bThreadSafe = True
+
+    def getEvaluator(self):
+        if self.text_extractor is None:
+            return None
+        return partial(extract_text, self.text_extractor)
 
     @staticmethod
     def pinTypeHints():
@@ -59,8 +83,9 @@ class TextExtractorNode(NodeBase):
             return
         if (not image is None and not hierarchy is None
                 and isinstance(hierarchy, Hierarchy)):
-            text_areas, original_text = self.text_extractor.extract_text(image.copy()
-                                                            , hierarchy.text_chunks)
+            with _model_lock:
+                text_areas, original_text = self.text_extractor.extract_text(image.copy()
+                                                                , hierarchy.text_chunks)
 
             self.text_areas_out_pin.setData(text_areas)
             self.text_out_pin.setData(original_text)
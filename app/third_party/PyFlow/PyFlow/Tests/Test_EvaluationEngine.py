@@ -0,0 +1,177 @@
+import gc
+import weakref
+
+from PyFlow.Tests.TestsBase import *
+from PyFlow.Core.Common import *
+from PyFlow.Core.EvaluationEngine import DefaultEvaluationEngine_Impl
+
+
+class TestEvaluationEngine(unittest.TestCase):
+    def setUp(self):
+        print("\t[BEGIN TEST]", self._testMethodName)
+
+    def tearDown(self):
+        print("--------------------------------\n")
+
+    def _addChain(self, man, length):
+        packages = GET_PACKAGES()
+        mathLib = packages["PyFlowBase"].GetFunctionLibraries()["MathAbstractLib"]
+        defaultLib = packages["PyFlowBase"].GetFunctionLibraries()["DefaultLib"]
+        makeIntNode = NodeBase.initializeFromFunction(defaultLib.getFunctions()["makeInt"])
+        man.activeGraph().addNode(makeIntNode)
+        makeIntNode.setData("i", 1)
+        nodes = [makeIntNode]
+        for _ in range(length):
+            addNode = NodeBase.initializeFromFunction(mathLib.getFunctions()["add"])
+            man.activeGraph().addNode(addNode)
+            addNode.setData("b", 1)
+            self.assertTrue(connectPins(nodes[-1]["out"], addNode["a"]))
+            nodes.append(addNode)
+        return nodes
+
+    def _pull(self, man, pin):
+        printNode = GET_PACKAGES()["PyFlowBase"].GetNodeClasses()["consoleOutput"]("print")
+        man.activeGraph().addNode(printNode)
+        self.assertTrue(connectPins(pin, printNode["entity"]))
+        printNode[DEFAULT_IN_EXEC_NAME].call()
+        return pin.currentData()
+
+    def test_plan_is_cached_until_connections_change(self):
+        man = GraphManager()
+        nodes = self._addChain(man, 5)
+        last = nodes[-1]
+
+        plan = DefaultEvaluationEngine_Impl.getEvaluationPlan(last)
+        self.assertEqual(list(plan), nodes[:-1])
+        self.assertIs(DefaultEvaluationEngine_Impl.getEvaluationPlan(last), plan)
+        self.assertEqual(self._pull(man, last["out"]), 6)
+
+        disconnectPins(nodes[2]["out"], nodes[3]["a"])
+        self.assertEqual(list(DefaultEvaluationEngine_Impl.getEvaluationPlan(last)), nodes[3:-1])
+
+        self.assertTrue(connectPins(nodes[1]["out"], nodes[3]["a"]))
+        self.assertEqual(list(DefaultEvaluationEngine_Impl.getEvaluationPlan(last)), nodes[:2] + nodes[3:-1])
+        self.assertEqual(self._pull(man, last["out"]), 5)
+
+    def test_plans_reuse_upstream_plans_and_match_full_walk(self):
+        man = GraphManager()
+        nodes = self._addChain(man, 6)
+        packages = GET_PACKAGES()
+        mathLib = packages["PyFlowBase"].GetFunctionLibraries()["MathAbstractLib"]
+        joinNode = NodeBase.initializeFromFunction(mathLib.getFunctions()["add"])
+        man.activeGraph().addNode(joinNode)
+        self.assertTrue(connectPins(nodes[3]["out"], joinNode["a"]))
+        self.assertTrue(connectPins(nodes[-1]["out"], joinNode["b"]))
+
+        DefaultEvaluationEngine_Impl.getEvaluationPlan(nodes[3])
+        plan = DefaultEvaluationEngine_Impl.getEvaluationPlan(joinNode)
+        self.assertEqual(set(plan), set(DefaultEvaluationEngine_Impl.getEvaluationOrderIterative(joinNode)))
+        positions = {node: index for index, node in enumerate(plan)}
+        for upstream, downstream in zip(nodes, nodes[1:]):
+            self.assertLess(positions[upstream], positions[downstream])
+        self.assertEqual(self._pull(man, joinNode["out"]), 4 + 7)
+
+    def test_killing_a_node_invalidates_plans(self):
+        man = GraphManager()
+        nodes = self._addChain(man, 3)
+        last = nodes[-1]
+        self.assertEqual(len(DefaultEvaluationEngine_Impl.getEvaluationPlan(last)), 3)
+
+        nodes[1].kill()
+
+        self.assertEqual(list(DefaultEvaluationEngine_Impl.getEvaluationPlan(last)), [nodes[2]])
+
+    def _addBranches(self, man):
+        """Two chains joined by an add node; the first stands in for the expensive branch"""
+        mathLib = GET_PACKAGES()["PyFlowBase"].GetFunctionLibraries()["MathAbstractLib"]
+        expensive = self._addChain(man, 2)
+        cheap = self._addChain(man, 1)
+        joinNode = NodeBase.initializeFromFunction(mathLib.getFunctions()["add"])
+        man.activeGraph().addNode(joinNode)
+        self.assertTrue(connectPins(expensive[-1]["out"], joinNode["a"]))
+        self.assertTrue(connectPins(cheap[-1]["out"], joinNode["b"]))
+        return expensive, cheap, joinNode
+
+    def test_pull_skips_clean_upstream_nodes(self):
+        man = GraphManager()
+        expensive, cheap, joinNode = self._addBranches(man)
+        stats = DefaultEvaluationEngine_Impl.stats
+        self.assertEqual(self._pull(man, joinNode["out"]), 3 + 2)
+
+        stats.reset()
+        cheap[0].setData("i", 10)
+        self.assertEqual(self._pull(man, joinNode["out"]), 3 + 11)
+
+        self.assertEqual(set(stats.processedNodes), {node.name for node in cheap + [joinNode]})
+        self.assertGreaterEqual(stats.skipped, len(expensive))
+
+    def test_nodes_below_cache_disabled_nodes_are_not_pruned(self):
+        man = GraphManager()
+        expensive, cheap, joinNode = self._addBranches(man)
+        self._pull(man, joinNode["out"])
+        expensive[1].bCacheEnabled = False
+
+        stats = DefaultEvaluationEngine_Impl.stats
+        stats.reset()
+        self._pull(man, joinNode["out"])
+
+        self.assertEqual(set(stats.processedNodes), {expensive[1].name, expensive[2].name, joinNode.name})
+
+    def test_full_mode_processes_every_upstream_node(self):
+        man = GraphManager()
+        expensive, cheap, joinNode = self._addBranches(man)
+        self._pull(man, joinNode["out"])
+        stats = DefaultEvaluationEngine_Impl.stats
+        stats.reset()
+        DefaultEvaluationEngine_Impl.bIncremental = False
+        try:
+            self._pull(man, joinNode["out"])
+        finally:
+            DefaultEvaluationEngine_Impl.bIncremental = True
+
+        self.assertEqual(stats.skipped, 0)
+        self.assertEqual(set(stats.processedNodes), {node.name for node in expensive + cheap + [joinNode]})
+
+    def test_pull_reruns_nodes_below_a_pin_set_without_push(self):
+        man = GraphManager()
+        nodes = self._addChain(man, 4)
+        self.assertEqual(self._pull(man, nodes[-1]["out"]), 5)
+
+        # A value changed behind the pin's back, e.g. an array edited in place. setDirty
+        # only marks the pins it affects directly, so the nodes below stay clean.
+        nodes[1]["b"]._data = 10
+        nodes[1]["b"].setDirty()
+        self.assertFalse(nodes[2].isDirty())
+
+        self.assertEqual(self._pull(man, nodes[-1]["out"]), 14)
+
+    def test_plans_do_not_keep_nodes_alive(self):
+        man = GraphManager()
+        nodes = self._addChain(man, 2)
+        DefaultEvaluationEngine_Impl.getEvaluationPlan(nodes[-1])
+        DefaultEvaluationEngine_Impl.getDirtyEvaluationOrder(nodes[-1])
+        self.assertIn(nodes[-1], DefaultEvaluationEngine_Impl._plans)
+
+        last = weakref.ref(nodes[-1])
+        nodes[-1].kill()
+        del nodes
+        man.clear()
+        gc.collect()
+
+        self.assertIsNone(last())
+
+    def test_push_marks_every_downstream_pin_dirty(self):
+        man = GraphManager()
+        expensive, cheap, joinNode = self._addBranches(man)
+        self._pull(man, joinNode["out"])
+        self.assertFalse(joinNode.isDirty())
+
+        push(expensive[0]["out"])
+
+        for node in expensive[1:] + [joinNode]:
+            self.assertTrue(node.isDirty())
+        self.assertFalse(any(node.isDirty() for node in cheap))
+
+
+if __name__ == "__main__":
+    unittest.main()
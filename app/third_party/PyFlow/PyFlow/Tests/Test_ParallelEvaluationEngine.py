@@ -0,0 +1,221 @@
+## Copyright 2015-2019 Ilgar Lunin, Pedro Cabrera
+
+## Licensed under the Apache License, Version 2.0 (the "License");
+## you may not use this file except in compliance with the License.
+## You may obtain a copy of the License at
+
+##     http://www.apache.org/licenses/LICENSE-2.0
+
+## Unless required by applicable law or agreed to in writing, software
+## distributed under the License is distributed on an "AS IS" BASIS,
+## WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+## See the License for the specific language governing permissions and
+## limitations under the License.
+
+
+from PyFlow.Tests.TestsBase import *
+from PyFlow.Core.Common import *
+from PyFlow.Core.EvaluationEngine import DefaultEvaluationEngine_Impl, EvaluationEngine
+from PyFlow.Core.ParallelEvaluationEngine import ParallelEvaluationEngine_Impl
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+import os
+import threading
+import time
+
+
+def offset(amount, delay, inputs):
+    time.sleep(delay)
+    if inputs["in"] < 0:
+        raise ValueError("negative input")
+    return {"out": inputs["in"] + amount, "worker": threading.get_ident(), "pid": os.getpid()}
+
+
+class OffsetNode(NodeBase):
+    """Adds ``amount`` to its input after ``delay`` seconds"""
+
+    def __init__(self, name, amount=1, delay=0.0, threadSafe=True, processSafe=False):
+        super(OffsetNode, self).__init__(name)
+        self.inp = self.createInputPin("in", "IntPin")
+        self.out = self.createOutputPin("out", "IntPin")
+        self.worker = self.createOutputPin("worker", "IntPin")
+        self.pid = self.createOutputPin("pid", "IntPin")
+        self.bThreadSafe = threadSafe
+        self.bProcessSafe = processSafe
+        self.evaluator = partial(offset, amount, delay)
+
+    def compute(self, *args, **kwargs):
+        for name, value in self.evaluator({"in": self.inp.getData()}).items():
+            self.setData(name, value, PinSelectionGroup.Outputs)
+
+    def getEvaluator(self):
+        return self.evaluator
+
+
+class TestParallelEvaluationEngine(unittest.TestCase):
+    def setUp(self):
+        print("\t[BEGIN TEST]", self._testMethodName)
+        self.defaultImpl = EvaluationEngine().impl()
+
+    def tearDown(self):
+        EvaluationEngine().setImpl(self.defaultImpl)
+        print("--------------------------------\n")
+
+    def _addFan(self, man, branches):
+        """makeInt -> branches -> chain of adds summing the branch outputs"""
+        packages = GET_PACKAGES()
+        mathLib = packages["PyFlowBase"].GetFunctionLibraries()["MathAbstractLib"]
+        defaultLib = packages["PyFlowBase"].GetFunctionLibraries()["DefaultLib"]
+        source = NodeBase.initializeFromFunction(defaultLib.getFunctions()["makeInt"])
+        man.activeGraph().addNode(source)
+        source.setData("i", 1)
+        total = None
+        for branch in branches:
+            man.activeGraph().addNode(branch)
+            self.assertTrue(connectPins(source["out"], branch["in"]))
+            if total is None:
+                total = branch
+                continue
+            addNode = NodeBase.initializeFromFunction(mathLib.getFunctions()["add"])
+            man.activeGraph().addNode(addNode)
+            self.assertTrue(connectPins(total["out"], addNode["a"]))
+            self.assertTrue(connectPins(branch["out"], addNode["b"]))
+            total = addNode
+        return source, total
+
+    def _pull(self, man, pin):
+        printNode = GET_PACKAGES()["PyFlowBase"].GetNodeClasses()["consoleOutput"]("print")
+        man.activeGraph().addNode(printNode)
+        self.assertTrue(connectPins(pin, printNode["entity"]))
+        printNode[DEFAULT_IN_EXEC_NAME].call()
+        return pin.currentData()
+
+    def test_levels_group_independent_nodes(self):
+        man = GraphManager()
+        branches = [OffsetNode("offset", amount) for amount in range(3)]
+        source, total = self._addFan(man, branches)
+        order = DefaultEvaluationEngine_Impl.getEvaluationPlan(total)
+
+        levels = ParallelEvaluationEngine_Impl.getEvaluationLevels(order)
+
+        self.assertEqual(levels[0], [source])
+        self.assertEqual(set(levels[1]), set(branches))
+        self.assertEqual(sum(len(level) for level in levels), len(order))
+
+    def test_thread_safe_branches_run_on_pool_with_same_result(self):
+        man = GraphManager()
+        branches = [OffsetNode("offset", amount, delay=0.05) for amount in range(4)]
+        source, total = self._addFan(man, branches)
+        expected = self._pull(man, total["out"])
+
+        with ThreadPoolExecutor(4) as pool:
+            EvaluationEngine().setImpl(ParallelEvaluationEngine_Impl(threadPool=pool))
+            source.setData("i", 1)
+            started = time.perf_counter()
+            result = self._pull(man, total["out"])
+            elapsed = time.perf_counter() - started
+
+        self.assertEqual(result, expected)
+        workers = {branch.worker.currentData() for branch in branches}
+        self.assertNotIn(threading.get_ident(), workers)
+        self.assertLess(elapsed, 4 * 0.05)
+
+    def test_outputs_are_written_in_evaluation_order(self):
+        man = GraphManager()
+        # Later branches finish first.
+        branches = [OffsetNode("offset", amount, delay=0.02 * (4 - amount)) for amount in range(4)]
+        source, total = self._addFan(man, branches + [OffsetNode("unsafe", threadSafe=False)])
+        order = [node for node in DefaultEvaluationEngine_Impl.getEvaluationPlan(total) if node in branches]
+        computed = []
+        for node in order:
+            node.computed.connect(lambda *args, node=node: computed.append(node), weak=False)
+
+        with ThreadPoolExecutor(4) as pool:
+            EvaluationEngine().setImpl(ParallelEvaluationEngine_Impl(threadPool=pool))
+            self._pull(man, total["out"])
+
+        self.assertEqual(computed, order)
+
+    def test_unsafe_nodes_run_on_calling_thread(self):
+        man = GraphManager()
+        branches = [OffsetNode("safe"), OffsetNode("unsafe", threadSafe=False)]
+        source, total = self._addFan(man, branches)
+
+        with ThreadPoolExecutor(2) as pool:
+            EvaluationEngine().setImpl(ParallelEvaluationEngine_Impl(threadPool=pool))
+            self.assertEqual(self._pull(man, total["out"]), 2 + 2)
+
+        self.assertNotEqual(branches[0].worker.currentData(), threading.get_ident())
+        self.assertEqual(branches[1].worker.currentData(), threading.get_ident())
+
+    def test_evaluator_errors_are_reported_on_the_node(self):
+        man = GraphManager()
+        branches = [OffsetNode("offset"), OffsetNode("offset")]
+        source, total = self._addFan(man, branches)
+        source.setData("i", -1)
+
+        with ThreadPoolExecutor(2) as pool:
+            EvaluationEngine().setImpl(ParallelEvaluationEngine_Impl(threadPool=pool))
+            self._pull(man, total["out"])
+
+        for branch in branches:
+            self.assertFalse(branch.isValid())
+            self.assertIn("negative input", branch.getLastErrorMessage())
+
+    def test_dependents_of_failed_nodes_are_not_evaluated(self):
+        man = GraphManager()
+        branches = [OffsetNode("offset"), OffsetNode("offset")]
+        source, total = self._addFan(man, branches)
+        source.setData("i", -1)
+        computed = []
+        total.computed.connect(lambda *args: computed.append(total), weak=False)
+
+        with ThreadPoolExecutor(2) as pool:
+            EvaluationEngine().setImpl(ParallelEvaluationEngine_Impl(threadPool=pool))
+            self._pull(man, total["out"])
+
+            self.assertEqual(computed, [])
+            self.assertTrue(total.isDirty())
+            for branch in branches:
+                self.assertFalse(branch.isValid())
+                self.assertFalse(branch.isDirty())
+
+            source.setData("i", 1)
+            self.assertEqual(self._pull(man, total["out"]), 2 + 2)
+
+        self.assertIn(total, computed)
+
+    def test_failures_on_the_calling_thread_settle_like_pooled_ones(self):
+        man = GraphManager()
+        branches = [OffsetNode("safe"), OffsetNode("unsafe", threadSafe=False)]
+        source, total = self._addFan(man, branches)
+        source.setData("i", -1)
+
+        with ThreadPoolExecutor(2) as pool:
+            EvaluationEngine().setImpl(ParallelEvaluationEngine_Impl(threadPool=pool))
+            self._pull(man, total["out"])
+
+            for branch in branches:
+                self.assertFalse(branch.isValid())
+                self.assertFalse(branch.isDirty())
+
+            source.setData("i", 1)
+            self.assertEqual(self._pull(man, total["out"]), 2 + 2)
+
+        for branch in branches:
+            self.assertTrue(branch.isValid())
+
+    def test_process_safe_nodes_run_in_processes(self):
+        man = GraphManager()
+        branches = [OffsetNode("offset", amount, processSafe=True) for amount in range(2)]
+        source, total = self._addFan(man, branches)
+
+        with ProcessPoolExecutor(2) as processes, ThreadPoolExecutor(2) as threads:
+            EvaluationEngine().setImpl(ParallelEvaluationEngine_Impl(threadPool=threads, processPool=processes))
+            self.assertEqual(self._pull(man, total["out"]), 1 + 2)
+
+        self.assertNotIn(os.getpid(), {branch.pid.currentData() for branch in branches})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -157,18 +157,25 @@ def getRawNodeInstance(nodeClassName, packageName=None, libName=None, **kwargs):
                         return compoundNode
 
 
-def INITIALIZE(additionalPackageLocations=None, software=""):
+def INITIALIZE(additionalPackageLocations=None, software="", headless=False):
+    """Loads packages
+
+    With ``headless`` set, only the core of each package is registered: no UI
+    factories and no tools, and load errors are printed instead of shown in a
+    message box, so no QApplication is needed.
+    """
     __PACKAGES.clear()
     __PACKAGE_PATHS.clear()
     __HASHABLE_TYPES.clear()
     if additionalPackageLocations is None:
         additionalPackageLocations = []
-    from PyFlow.UI.Tool import REGISTER_TOOL
-    from PyFlow.UI.Widgets.InputWidgets import REGISTER_UI_INPUT_WIDGET_PIN_FACTORY
-    from PyFlow.UI.Canvas.UINodeBase import REGISTER_UI_NODE_FACTORY
-    from PyFlow.UI.Canvas.UIPinBase import REGISTER_UI_PIN_FACTORY
-    from PyFlow import ConfigManager
-    from qtpy.QtWidgets import QMessageBox
+    if not headless:
+        from PyFlow.UI.Tool import REGISTER_TOOL
+        from PyFlow.UI.Widgets.InputWidgets import REGISTER_UI_INPUT_WIDGET_PIN_FACTORY
+        from PyFlow.UI.Canvas.UINodeBase import REGISTER_UI_NODE_FACTORY
+        from PyFlow.UI.Canvas.UIPinBase import REGISTER_UI_PIN_FACTORY
+        from PyFlow import ConfigManager
+        from qtpy.QtWidgets import QMessageBox
 
     packagePaths = Packages.__path__
 
@@ -218,9 +225,12 @@ def INITIALIZE(additionalPackageLocations=None, software=""):
                 __PACKAGES[modname] = package
                 __PACKAGE_PATHS[modname] = os.path.normpath(mod.__path__[0])
         except Exception as e:
-            QMessageBox.critical(
-                None, "Fatal error", "Error On Module %s :\n%s" % (modname, str(e))
-            )
+            if headless:
+                print("Error On Module %s :\n%s" % (modname, str(e)))
+            else:
+                QMessageBox.critical(
+                    None, "Fatal error", "Error On Module %s :\n%s" % (modname, str(e))
+                )
             continue
 
     registeredInternalPinDataTypes = set()
@@ -242,6 +252,9 @@ def INITIALIZE(additionalPackageLocations=None, software=""):
                     )
                 registeredInternalPinDataTypes.add(internalType)
 
+        if headless:
+            continue
+
         uiPinsFactory = package.UIPinsFactory()
         if uiPinsFactory is not None:
             REGISTER_UI_PIN_FACTORY(packageName, uiPinsFactory)
@@ -0,0 +1,103 @@
+"""Benchmark hierarchy edit cost against tree size and tree depth.
+
+Run from the repository root:
+
+    python -m benchmarks.domain.doc_units.bench_hierarchy_edits
+
+Every edit is measured as wall time per call plus the number of nodes that the
+edit had to re-create (nodes of the new tree that are not shared with the old
+one). With path copying the copied-node count equals the depth of the edited
+node, independent of how many pages the unit holds. The ``scan`` mode locates
+nodes by walking the tree; ``indexed`` passes a maintained HierarchyIndex so
+lookups stop depending on the tree size as well.
+"""
+from __future__ import annotations
+
+import argparse
+import itertools
+import time
+from typing import Callable, Iterator
+
+from app.domain.doc_units.entities import HierarchyNode
+from app.domain.doc_units.services import HierarchyIndex, move_nodes, rename_node
+
+
+def build_tree(depth: int, pages_per_folder: int) -> HierarchyNode:
+    """Build a chain of ``depth`` nested folders, each holding ``pages_per_folder`` pages."""
+    ids = itertools.count()
+    node: HierarchyNode | None = None
+    for level in reversed(range(depth)):
+        children = [
+            HierarchyNode(
+                node_id=f"page-{next(ids)}",
+                name="page",
+                node_type=HierarchyNode.IMAGE_TYPE,
+                settings={"level": level},
+            )
+            for _ in range(pages_per_folder)
+        ]
+        if node is not None:
+            children.append(node)
+        node = HierarchyNode(
+            node_id=f"folder-{level}",
+            name=f"folder {level}",
+            node_type=HierarchyNode.FOLDER_TYPE,
+            settings={},
+            children=children,
+        )
+    assert node is not None
+    return node
+
+
+def iter_nodes(root: HierarchyNode) -> Iterator[HierarchyNode]:
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(node.children)
+
+
+def copied_nodes(before: HierarchyNode, after: HierarchyNode) -> int:
+    shared = {id(node) for node in iter_nodes(before)}
+    return sum(1 for node in iter_nodes(after) if id(node) not in shared)
+
+
+def measure(edit: Callable[..., HierarchyNode], root: HierarchyNode, repeat: int, indexed: bool) -> tuple[float, int]:
+    """Apply ``edit`` ``repeat`` times in a row; return seconds per edit and nodes copied by the last one."""
+    index = HierarchyIndex(root) if indexed else None
+    current = previous = root
+    started = time.perf_counter()
+    for _ in range(repeat):
+        previous, current = current, edit(current, index)
+    elapsed = (time.perf_counter() - started) / repeat
+    return elapsed, copied_nodes(previous, current)
+
+
+def run(repeat: int) -> None:
+    print(f"{'scenario':<10}{'depth':>7}{'nodes':>10}{'edit':>8}{'mode':>9}{'us/edit':>12}{'copied':>9}")
+    scenarios = [("size", 4, pages) for pages in (250, 2_500, 25_000)]
+    scenarios += [("depth", depth, 2_000 // depth) for depth in (2, 20, 200)]
+    for label, depth, pages in scenarios:
+        root = build_tree(depth, pages)
+        total = sum(1 for _ in iter_nodes(root))
+        deepest = f"folder-{depth - 1}"
+        edits = {
+            "rename": lambda tree, index: rename_node(tree, deepest, "renamed", index=index),
+            # page-0 is the first page of the deepest folder; lift it to the top.
+            "move": lambda tree, index: move_nodes(tree, ["page-0"], "folder-0", 0, index=index),
+        }
+        for name, edit in edits.items():
+            for mode in ("scan", "indexed"):
+                seconds, copied = measure(edit, root, repeat, mode == "indexed")
+                print(f"{label:<10}{depth:>7}{total:>10}{name:>8}{mode:>9}{seconds * 1e6:>12.1f}{copied:>9}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=50, help="edits per measurement")
+    args = parser.parse_args()
+    run(args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Benchmark HierarchyTreeModel index traversal over one large flat folder.
+
+Run from the repository root (needs PySide6):
+
+    python -m benchmarks.frameworks.pyside6_gui.doc_units.bench_hierarchy_tree_model
+
+A unit holding a single folder of ``pages`` images is loaded into the model
+and the folder is fetched. The ``index+parent`` pass asks for every row's
+index and its parent, as a view does while painting or selecting; the
+``find`` pass resolves every page with ``find_index_by_id``, as selection
+sync does. Both are reported as time per call, which stays flat as the folder
+grows because items carry their own row.
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+from PySide6.QtCore import QCoreApplication
+
+from app.domain.doc_units.entities import HierarchyNode
+from app.frameworks.pyside6_gui.tabs.doc_units.hierarchy.tree_model import HierarchyTreeModel
+from app.interface_adapters.doc_units.presenters.hierarchy_presenter import HierarchyNodeViewModel
+
+
+def build_unit(pages: int) -> HierarchyNode:
+    folder = HierarchyNode(
+        node_id="chapter",
+        name="chapter",
+        node_type=HierarchyNode.FOLDER_TYPE,
+        settings={},
+        children=[
+            HierarchyNode(node_id=f"page-{page}", name=f"page {page}", node_type=HierarchyNode.IMAGE_TYPE, settings={})
+            for page in range(pages)
+        ],
+    )
+    return HierarchyNode(node_id="root", name="root", node_type=HierarchyNode.FOLDER_TYPE, settings={}, children=[folder])
+
+
+def load_model(pages: int) -> HierarchyTreeModel:
+    model = HierarchyTreeModel(rename_handler=lambda *_: False, move_handler=lambda *_: False)
+    model.update_tree(HierarchyNodeViewModel(build_unit(pages)))
+    model.fetchMore(model.find_index_by_id("chapter"))
+    return model
+
+
+def measure_index_parent(model: HierarchyTreeModel, pages: int, repeat: int) -> float:
+    folder = model.find_index_by_id("chapter")
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for row in range(pages):
+            model.parent(model.index(row, 0, folder))
+    return (time.perf_counter() - started) / (repeat * pages)
+
+
+def measure_find(model: HierarchyTreeModel, pages: int, repeat: int) -> float:
+    node_ids = [f"page-{page}" for page in range(pages)]
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for node_id in node_ids:
+            model.find_index_by_id(node_id)
+    return (time.perf_counter() - started) / (repeat * pages)
+
+
+def run(repeat: int) -> None:
+    print(f"{'pages':>8}{'index+parent us':>18}{'find us':>10}")
+    for pages in (200, 2_000, 20_000):
+        model = load_model(pages)
+        index_parent = measure_index_parent(model, pages, repeat)
+        find = measure_find(model, pages, repeat)
+        print(f"{pages:>8}{index_parent * 1e6:>18.2f}{find * 1e6:>10.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="passes over the folder per measurement")
+    args = parser.parse_args()
+    _app = QCoreApplication.instance() or QCoreApplication([])
+    run(args.repeat)
+
+
+if __name__ == "__main__":
+    main()
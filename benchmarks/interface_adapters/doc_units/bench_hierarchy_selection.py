@@ -0,0 +1,152 @@
+"""Benchmark hierarchy selection latency in the details presenter against tree size.
+
+Run from the repository root:
+
+    python -m benchmarks.interface_adapters.doc_units.bench_hierarchy_selection
+
+A unit of ``chapters`` folders holding the requested number of pages is
+stored in a ``ProjectDocUnitRepository`` and loaded into a
+``HierarchyDetailsPresenter`` the way the tab does it (``HierarchyLoaded``).
+Selections are then published for pages in random order, as arrow-key or
+click navigation does, with a view that drops what it is shown. ``first``
+is the first selection after loading, which builds or borrows the node
+index; ``per selection`` is the mean of the rest and stays flat as the tree
+grows. ``update`` is a ``HierarchyUpdated`` for a rename saved the way the
+use cases do it (the repository index rebound in place), which refreshes the
+selected page against the new root.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import List
+
+from app.application.doc_units.events import (
+    ActiveDocUnitChanged,
+    DocUnitEventBus,
+    HierarchyLoaded,
+    HierarchySelectionChanged,
+    HierarchyUpdated,
+)
+from app.domain.doc_units.entities import AssetPointer
+from app.domain.doc_units.services import rename_node
+from app.domain.doc_units.value_objects import DocUnitId
+from app.domain.project.services import new_project
+from app.interface_adapters.doc_units.presenters.hierarchy_details_presenter import HierarchyDetailsPresenter
+from app.interface_adapters.doc_units.repositories.project_doc_unit_repository import ProjectDocUnitRepository
+from app.interface_adapters.doc_units.stores.mem_active_doc_unit_store import MemActiveDocUnitStore
+from app.interface_adapters.project.repositories.mem_current_project_store import MemCurrentProjectStore
+
+UNIT_ID = "unit-0"
+
+
+class _PathMediaStore:
+    def resolve_path(self, pointer: AssetPointer) -> str:
+        return f"/project/{pointer.path_hint}"
+
+
+class _NullView:
+    def show_hierarchy_item(self, view_model) -> None:  # noqa: ANN001
+        pass
+
+    def show_preview(self, node_id, preview) -> None:  # noqa: ANN001
+        pass
+
+    def show_no_selection(self) -> None:
+        pass
+
+
+def build_repository(pages: int, chapters: int) -> ProjectDocUnitRepository:
+    project = new_project("bench-project", "Bench")
+    per_chapter = max(1, pages // chapters)
+    project.doc_units[UNIT_ID] = {
+        "name": "Volume",
+        "created_at": "2025-10-18T00:00:00+00:00",
+        "hierarchy": {
+            "id": "root",
+            "name": "root",
+            "type": "folder",
+            "settings": {},
+            "children": [
+                {
+                    "id": f"chapter-{chapter}",
+                    "name": f"Chapter {chapter}",
+                    "type": "folder",
+                    "settings": {},
+                    "children": [
+                        {
+                            "id": f"page-{chapter}-{page}",
+                            "name": f"{page:04d}.png",
+                            "type": "image",
+                            "settings": {},
+                            "pointer": {
+                                "asset_id": f"asset-{chapter}-{page}",
+                                "resolver": "doc_media",
+                                "status": "final",
+                                "path_hint": f"docs_units/assets/{chapter}/{page:04d}.png",
+                            },
+                        }
+                        for page in range(per_chapter)
+                    ],
+                }
+                for chapter in range(chapters)
+            ],
+        },
+        "metadata": {},
+    }
+    store = MemCurrentProjectStore()
+    store.set_data(project)
+    return ProjectDocUnitRepository(store)
+
+
+def measure(pages: int, chapters: int, selections: int) -> List[float]:
+    repository = build_repository(pages, chapters)
+    bus = DocUnitEventBus()
+    active_store = MemActiveDocUnitStore()
+    active_store.set(DocUnitId(UNIT_ID))
+    presenter = HierarchyDetailsPresenter(bus, repository, active_store, _PathMediaStore())
+    presenter.attach_view(_NullView())
+    bus.publish(ActiveDocUnitChanged(UNIT_ID))
+    root = repository.get_hierarchy(DocUnitId(UNIT_ID))
+    bus.publish(HierarchyLoaded(UNIT_ID, root))
+
+    node_ids = [page.node_id for chapter in root.children for page in chapter.children]
+    rng = random.Random(0)
+    order = [rng.choice(node_ids) for _ in range(selections + 1)]
+
+    def select(node_id: str) -> float:
+        started = time.perf_counter()
+        bus.publish(HierarchySelectionChanged(UNIT_ID, node_id, [node_id]))
+        return time.perf_counter() - started
+
+    first = select(order[0])
+    rest = sum(select(node_id) for node_id in order[1:]) / selections
+
+    unit_id = DocUnitId(UNIT_ID)
+    updated = rename_node(root, order[-1], "renamed", index=repository.get_hierarchy_index(unit_id))
+    repository.save_hierarchy(unit_id, updated)
+    started = time.perf_counter()
+    bus.publish(HierarchyUpdated(UNIT_ID, updated, [order[-1]]))
+    update = time.perf_counter() - started
+    return [first, rest, update]
+
+
+def run(page_counts: List[int], chapters: int, selections: int) -> None:
+    print(f"{'pages':>8}{'first us':>12}{'per selection us':>18}{'update us':>11}")
+    for pages in page_counts:
+        first, rest, update = measure(pages, chapters, selections)
+        print(f"{pages:>8}{first * 1e6:>12.1f}{rest * 1e6:>18.2f}{update * 1e6:>11.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, nargs="+", default=[1_000, 10_000, 100_000], help="image nodes per unit")
+    parser.add_argument("--chapters", type=int, default=50, help="folders the pages are spread over")
+    parser.add_argument("--selections", type=int, default=2_000, help="selection changes per size")
+    args = parser.parse_args()
+    run(args.pages, args.chapters, args.selections)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Benchmark page-parallel pipeline runs against one page at a time.
+
+Run from the repository root (needs NumPy and OpenCV):
+
+    python -m benchmarks.interface_adapters.pipelines.bench_page_parallel
+
+A stub pipeline stands in for the PyFlow graph: loading it sleeps ``--load``
+seconds, like nodes bringing up their models, and each page spins the CPU
+for ``--cost`` milliseconds before returning a ``--size`` RGB image. Rows:
+
+* ``reload`` loads the pipeline for every page, in this process;
+* ``warm`` loads it once and runs the pages one by one, like the default
+  in-process processor;
+* ``pool N`` uses ProcessPoolPageProcessor with N workers, each loading
+  the pipeline once and handing results back through shared memory.
+
+All rows write every result as PNG in page order from this process; the
+pool rows include starting their workers. The encode stays serial, so it
+bounds the speedup once the workers outpace it.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from functools import partial
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Mapping, Tuple
+
+import numpy as np
+
+from app.application.pipelines.dto import PageJob, PageOutcome
+from app.application.pipelines.ports import PageProcessor
+from app.interface_adapters.pipelines.runners.process_pool_page_processor import ProcessPoolPageProcessor
+from app.interface_adapters.pipelines.runners.pyflow_page_processor import write_image
+
+
+def load_stub(
+    load_s: float, cost_s: float, size: Tuple[int, int]
+) -> Callable[[str], Tuple[np.ndarray, Mapping[str, float]]]:
+    time.sleep(load_s)
+    return partial(run_stub, cost_s, size)
+
+
+def run_stub(cost_s: float, size: Tuple[int, int], source_path: str) -> Tuple[np.ndarray, Mapping[str, float]]:
+    started = time.thread_time()
+    while time.thread_time() - started < cost_s:
+        pass
+    value = int(Path(source_path).stem) % 256
+    return np.full((size[1], size[0], 3), value, np.uint8), {"stub": cost_s}
+
+
+class InProcessStub(PageProcessor):
+    fingerprint = "stub"
+
+    def __init__(self, load: Callable[[], Callable], reload: bool) -> None:
+        self._load = load
+        self._reload = reload
+        self._run = None
+
+    def process(self, source_path: str, output_path: str) -> Mapping[str, float]:
+        if self._run is None or self._reload:
+            self._run = self._load()
+        image, node_seconds = self._run(source_path)
+        write_image(output_path, image)
+        return node_seconds
+
+
+def jobs(pages: int, output_dir: Path) -> Iterator[PageJob]:
+    for page in range(pages):
+        yield PageJob(str(page), f"{page}.png", str(output_dir / f"{page:04d}.png"))
+
+
+def timed(processor: PageProcessor, page_jobs: Iterable[PageJob]) -> float:
+    started = time.perf_counter()
+    outcomes: List[PageOutcome] = list(processor.process_many(page_jobs))
+    elapsed = time.perf_counter() - started
+    failed = [outcome for outcome in outcomes if outcome.error is not None]
+    assert not failed, failed[0].error
+    return elapsed
+
+
+def run(pages: int, load_s: float, cost_s: float, size: Tuple[int, int], worker_counts: List[int]) -> None:
+    load = partial(load_stub, load_s, cost_s, size)
+    print(f"{os.cpu_count()} CPUs, {pages} pages of {size[0]}x{size[1]}")
+    print(f"{'mode':<10}{'seconds':>10}{'pages/s':>10}")
+    with tempfile.TemporaryDirectory() as output_dir:
+        rows: List[Tuple[str, PageProcessor]] = [
+            ("reload", InProcessStub(load, reload=True)),
+            ("warm", InProcessStub(load, reload=False)),
+        ]
+        # The stub has no graph file; this one only feeds the fingerprint.
+        rows += [
+            (f"pool {count}", ProcessPoolPageProcessor(__file__, count, load_runner=load))
+            for count in worker_counts
+        ]
+        for name, processor in rows:
+            try:
+                seconds = timed(processor, jobs(pages, Path(output_dir)))
+            finally:
+                if isinstance(processor, ProcessPoolPageProcessor):
+                    processor.close()
+            print(f"{name:<10}{seconds:>10.2f}{pages / seconds:>10.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=24, help="pages per run")
+    parser.add_argument("--load", type=float, default=0.5, help="seconds to load the stub pipeline")
+    parser.add_argument("--cost", type=float, default=100.0, help="CPU milliseconds per page")
+    parser.add_argument("--size", type=int, nargs=2, default=[1600, 2400], help="result width and height")
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, 4], help="pool sizes to try")
+    args = parser.parse_args()
+    run(args.pages, args.load, args.cost / 1e3, tuple(args.size), args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""Benchmark project save/load cost per doc unit codec.
+
+Run from the repository root:
+
+    python -m benchmarks.interface_adapters.project.bench_project_serialization
+
+A synthetic project with the requested total number of hierarchy nodes
+(spread over doc units of ``--pages`` pages each) is saved as a fresh
+snapshot and loaded back with every unit touched. Each row reports wall time
+and the tracemalloc peak for both directions plus the bytes written. Peaks
+come from a second, traced pass so tracing does not skew the timings. Codecs
+whose package is not installed are skipped. Loading always goes through the
+fastest reader for the detected format, so json and orjson rows only differ
+on the save side.
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Tuple
+
+from app.domain.project.services import new_project
+from app.domain.project.value_objects import ProjectData
+from app.interface_adapters.project.repositories.fs_project_repository import FsProjectRepository
+from app.interface_adapters.project.serialization.project_serializer import (
+    JsonSerializer,
+    MsgpackSerializer,
+    OrjsonSerializer,
+    ProjectSerializer,
+)
+
+
+def build_project(total_nodes: int, pages_per_unit: int) -> ProjectData:
+    project = new_project("bench-project", "Bench")
+    unit_count = max(1, total_nodes // (pages_per_unit + 1))
+    for unit_no in range(unit_count):
+        project.doc_units[f"unit-{unit_no}"] = {
+            "name": f"Chapter {unit_no}",
+            "created_at": "2025-10-18T00:00:00+00:00",
+            "hierarchy": {
+                "id": f"root-{unit_no}",
+                "name": "root",
+                "type": "folder",
+                "settings": {},
+                "children": [
+                    {
+                        "id": f"page-{unit_no}-{page_no}",
+                        "name": f"{page_no:04d}.png",
+                        "type": "image",
+                        "settings": {"language": "ja", "dpi": 300},
+                        "pointer": {
+                            "asset_id": f"asset-{unit_no}-{page_no}",
+                            "resolver": "doc_media",
+                            "status": "final",
+                            "path_hint": f"docs_units/assets/unit-{unit_no}/{page_no:04d}.png",
+                        },
+                    }
+                    for page_no in range(pages_per_unit)
+                ],
+            },
+            "metadata": {},
+        }
+    return project
+
+
+def available_serializers() -> Iterator[Tuple[str, Callable[[], ProjectSerializer]]]:
+    yield "json", JsonSerializer
+    for name, factory in (("orjson", OrjsonSerializer), ("msgpack", MsgpackSerializer)):
+        try:
+            factory()
+        except RuntimeError:
+            continue
+        yield name, factory
+
+
+def timed(action: Callable[[], object], trace: bool) -> float:
+    """Seconds spent in ``action``, or its peak traced bytes when ``trace`` is set."""
+    if not trace:
+        started = time.perf_counter()
+        action()
+        return time.perf_counter() - started
+    tracemalloc.start()
+    action()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def bytes_on_disk(root: Path) -> int:
+    return sum(path.stat().st_size for path in root.rglob("*") if path.is_file())
+
+
+def save_and_load(
+    serializer: ProjectSerializer, total_nodes: int, pages_per_unit: int, trace: bool
+) -> Tuple[float, float, int]:
+    with tempfile.TemporaryDirectory() as workdir:
+        repository = FsProjectRepository(journal_compaction_bytes=0, doc_unit_serializer=serializer)
+        project = build_project(total_nodes, pages_per_unit)
+        meta_path: Dict[str, str] = {}
+        save = timed(lambda: meta_path.setdefault("path", repository.save(workdir, project)), trace)
+
+        def load_all() -> None:
+            loaded = repository.load(meta_path["path"])
+            for unit_id in loaded.doc_units:
+                loaded.doc_units[unit_id]
+
+        load = timed(load_all, trace)
+        return save, load, bytes_on_disk(Path(workdir))
+
+
+def measure(serializer: ProjectSerializer, total_nodes: int, pages_per_unit: int) -> Dict[str, float]:
+    save_s, load_s, size = save_and_load(serializer, total_nodes, pages_per_unit, trace=False)
+    save_peak, load_peak, _ = save_and_load(serializer, total_nodes, pages_per_unit, trace=True)
+    return {
+        "save_ms": save_s * 1e3,
+        "save_peak_mb": save_peak / 2**20,
+        "load_ms": load_s * 1e3,
+        "load_peak_mb": load_peak / 2**20,
+        "size_mb": size / 2**20,
+    }
+
+
+def run(node_counts: list[int], pages_per_unit: int) -> None:
+    print(f"{'nodes':>8}{'codec':>9}{'save ms':>10}{'save MB':>9}{'load ms':>10}{'load MB':>9}{'disk MB':>9}")
+    for total_nodes in node_counts:
+        for name, factory in available_serializers():
+            row = measure(factory(), total_nodes, pages_per_unit)
+            print(
+                f"{total_nodes:>8}{name:>9}{row['save_ms']:>10.1f}{row['save_peak_mb']:>9.1f}"
+                f"{row['load_ms']:>10.1f}{row['load_peak_mb']:>9.1f}{row['size_mb']:>9.2f}"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, nargs="+", default=[10_000, 100_000], help="total hierarchy nodes")
+    parser.add_argument("--pages", type=int, default=200, help="pages per doc unit")
+    args = parser.parse_args()
+    run(args.nodes, args.pages)
+
+
+if __name__ == "__main__":
+    main()
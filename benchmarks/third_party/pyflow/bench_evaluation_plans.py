@@ -0,0 +1,136 @@
+"""Benchmark PyFlow evaluation-order lookups with and without the plan cache.
+
+Run from the repository root (needs PySide6; PyFlow's packages load through Qt):
+
+    python -m benchmarks.third_party.pyflow.bench_evaluation_plans
+
+Each graph is ``layers`` layers of ``width`` pure ``add`` nodes; every node
+adds two nodes of the previous layer, the first layer reads ``makeInt``
+nodes. ``walk`` computes the upstream order of every node from scratch with
+``getEvaluationOrderIterative`` (what every pin read used to do), ``cold``
+builds cached plans for every node in topological order right after a
+connection change (so upstream plans get spliced in), and ``warm`` looks them
+all up again. ``pull`` times a full evaluation of the last layer through an
+exec-driven ``consoleOutput`` node per output, with every node dirty, once
+with the walk and once with the cache. Pull times are dominated by dirty
+propagation (``push`` follows every path of the lattice when outputs are set),
+which is why the default graphs stay shallow.
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+_PYFLOW_PACKAGE_DIR = Path(__file__).resolve().parents[3] / "app" / "third_party" / "PyFlow"
+if str(_PYFLOW_PACKAGE_DIR) not in sys.path:
+    sys.path.insert(0, str(_PYFLOW_PACKAGE_DIR))
+
+from PySide6.QtWidgets import QApplication  # noqa: E402
+
+
+def build_graph(width: int, layers: int):
+    from PyFlow import GET_PACKAGES
+    from PyFlow.Core import GraphManager, NodeBase
+    from PyFlow.Core.Common import DEFAULT_IN_EXEC_NAME, connectPins
+
+    packages = GET_PACKAGES()
+    add = packages["PyFlowBase"].GetFunctionLibraries()["MathAbstractLib"].getFunctions()["add"]
+    make_int = packages["PyFlowBase"].GetFunctionLibraries()["DefaultLib"].getFunctions()["makeInt"]
+    manager = GraphManager()
+    graph = manager.activeGraph()
+
+    previous = []
+    for column in range(width):
+        node = NodeBase.initializeFromFunction(make_int)
+        graph.addNode(node)
+        node.setData("i", column)
+        previous.append(node)
+    ordered: List = list(previous)
+    for _ in range(layers):
+        layer = []
+        for column in range(width):
+            node = NodeBase.initializeFromFunction(add)
+            graph.addNode(node)
+            connectPins(previous[column]["out"], node["a"])
+            connectPins(previous[(column + 1) % width]["out"], node["b"])
+            layer.append(node)
+        ordered.extend(layer)
+        previous = layer
+
+    sinks = []
+    for node in previous:
+        sink = packages["PyFlowBase"].GetNodeClasses()["consoleOutput"]("print")
+        graph.addNode(sink)
+        connectPins(node["out"], sink["entity"])
+        sinks.append(sink)
+
+    def pull() -> None:
+        # Dirty every node directly; ``push`` from the inputs walks every path of the lattice.
+        for node in ordered:
+            for pin in node.outputs.values():
+                pin.setDirty()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for sink in sinks:
+                sink[DEFAULT_IN_EXEC_NAME].call()
+
+    return manager, ordered, pull
+
+
+def timed(action: Callable[[], object]) -> float:
+    started = time.perf_counter()
+    action()
+    return time.perf_counter() - started
+
+
+def measure(width: int, layers: int) -> Tuple[float, ...]:
+    from PyFlow.Core.Common import invalidateEvaluationPlans
+    from PyFlow.Core.EvaluationEngine import DefaultEvaluationEngine_Impl as Engine
+
+    _manager, nodes, pull = build_graph(width, layers)
+
+    walk = timed(lambda: [Engine.getEvaluationOrderIterative(node) for node in nodes])
+    invalidateEvaluationPlans()
+    cold = timed(lambda: [Engine.getEvaluationPlan(node) for node in nodes])
+    warm = timed(lambda: [Engine.getEvaluationPlan(node) for node in nodes])
+
+    cached_plan = Engine.getEvaluationPlan
+    Engine.getEvaluationPlan = staticmethod(Engine.getEvaluationOrderIterative)
+    try:
+        pull_walk = timed(pull)
+    finally:
+        Engine.getEvaluationPlan = staticmethod(cached_plan)
+    invalidateEvaluationPlans()
+    pull_cached = timed(pull)
+    return len(nodes), walk, cold, warm, pull_walk, pull_cached
+
+
+def run(width: int, layer_counts: List[int]) -> None:
+    print(f"{'nodes':>7}{'walk ms':>10}{'cold ms':>10}{'warm ms':>10}{'pull walk ms':>14}{'pull cached ms':>16}")
+    for layers in layer_counts:
+        nodes, walk, cold, warm, pull_walk, pull_cached = measure(width, layers)
+        print(
+            f"{nodes:>7}{walk * 1e3:>10.1f}{cold * 1e3:>10.1f}{warm * 1e3:>10.2f}"
+            f"{pull_walk * 1e3:>14.1f}{pull_cached * 1e3:>16.1f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--width", type=int, default=10, help="nodes per layer")
+    parser.add_argument("--layers", type=int, nargs="+", default=[4, 6, 8], help="layer counts to measure")
+    args = parser.parse_args()
+    _app = QApplication.instance() or QApplication([])
+    from PyFlow import INITIALIZE
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        INITIALIZE()
+    run(args.width, args.layers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""Benchmark PyFlow's parallel evaluation engine on wide synthetic graphs.
+
+Run from the repository root (needs PySide6; PyFlow's packages load through Qt):
+
+    python -m benchmarks.third_party.pyflow.bench_parallel_evaluation
+
+Each graph feeds one ``makeInt`` node into ``width`` independent stub nodes
+whose outputs are summed by a chain of ``add`` nodes. ``sleep`` stubs wait
+``--cost`` milliseconds, standing in for work that releases the GIL (model
+inference, image IO); ``cpu`` stubs spin pure Python for about as long. Every
+row times one full pull of the sum, with the default engine (``serial``) and
+with ParallelEvaluationEngine_Impl on a thread pool and on a process pool of
+``--workers``. Threads help the ``sleep`` stubs only; ``cpu`` stubs need
+processes.
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+_PYFLOW_PACKAGE_DIR = Path(__file__).resolve().parents[3] / "app" / "third_party" / "PyFlow"
+if str(_PYFLOW_PACKAGE_DIR) not in sys.path:
+    sys.path.insert(0, str(_PYFLOW_PACKAGE_DIR))
+
+from PySide6.QtWidgets import QApplication  # noqa: E402
+
+
+def sleep_stub(seconds: float, inputs: Dict[str, object]) -> Dict[str, object]:
+    time.sleep(seconds)
+    return {"out": inputs["in"] + 1}
+
+
+def cpu_stub(seconds: float, inputs: Dict[str, object]) -> Dict[str, object]:
+    deadline = time.thread_time() + seconds
+    spins = 0
+    while time.thread_time() < deadline:
+        spins += 1
+    return {"out": inputs["in"] + 1}
+
+
+STUBS = {"sleep": sleep_stub, "cpu": cpu_stub}
+
+
+def stub_node_class():
+    from PyFlow.Core import NodeBase
+    from PyFlow.Core.Common import PinSelectionGroup
+
+    class StubNode(NodeBase):
+        def __init__(self, name: str, evaluator: Callable[[Dict[str, object]], Dict[str, object]]) -> None:
+            super().__init__(name)
+            self.inp = self.createInputPin("in", "IntPin")
+            self.createOutputPin("out", "IntPin")
+            self.bThreadSafe = True
+            self.bProcessSafe = True
+            self.evaluator = evaluator
+
+        def compute(self, *args, **kwargs) -> None:
+            for name, value in self.evaluator({"in": self.inp.getData()}).items():
+                self.setData(name, value, PinSelectionGroup.Outputs)
+
+        def getEvaluator(self):
+            return self.evaluator
+
+    return StubNode
+
+
+def build_graph(width: int, kind: str, cost: float):
+    from PyFlow import GET_PACKAGES
+    from PyFlow.Core import GraphManager, NodeBase
+    from PyFlow.Core.Common import DEFAULT_IN_EXEC_NAME, connectPins
+
+    packages = GET_PACKAGES()
+    add = packages["PyFlowBase"].GetFunctionLibraries()["MathAbstractLib"].getFunctions()["add"]
+    make_int = packages["PyFlowBase"].GetFunctionLibraries()["DefaultLib"].getFunctions()["makeInt"]
+    stub_class = stub_node_class()
+    manager = GraphManager()
+    graph = manager.activeGraph()
+
+    source = NodeBase.initializeFromFunction(make_int)
+    graph.addNode(source)
+    total = None
+    for column in range(width):
+        stub = stub_class(f"stub{column}", partial(STUBS[kind], cost))
+        graph.addNode(stub)
+        connectPins(source["out"], stub["in"])
+        if total is None:
+            total = stub
+            continue
+        node = NodeBase.initializeFromFunction(add)
+        graph.addNode(node)
+        connectPins(total["out"], node["a"])
+        connectPins(stub["out"], node["b"])
+        total = node
+    sink = packages["PyFlowBase"].GetNodeClasses()["consoleOutput"]("print")
+    graph.addNode(sink)
+    connectPins(total["out"], sink["entity"])
+
+    def pull() -> int:
+        source.setData("i", 0)
+        with contextlib.redirect_stdout(io.StringIO()):
+            sink[DEFAULT_IN_EXEC_NAME].call()
+        return total["out"].currentData()
+
+    return manager, pull
+
+
+def timed(pull: Callable[[], int]) -> Tuple[float, int]:
+    started = time.perf_counter()
+    result = pull()
+    return time.perf_counter() - started, result
+
+
+def measure(width: int, kind: str, cost: float, workers: int) -> Tuple[float, float, float]:
+    from PyFlow.Core.EvaluationEngine import EvaluationEngine
+    from PyFlow.Core.ParallelEvaluationEngine import ParallelEvaluationEngine_Impl
+
+    _manager, pull = build_graph(width, kind, cost)
+    engine = EvaluationEngine()
+    default = engine.impl()
+    serial, expected = timed(pull)
+    try:
+        with ThreadPoolExecutor(workers) as pool:
+            engine.setImpl(ParallelEvaluationEngine_Impl(threadPool=pool))
+            threads, result = timed(pull)
+            assert result == expected, (result, expected)
+        with ProcessPoolExecutor(workers) as pool:
+            engine.setImpl(ParallelEvaluationEngine_Impl(processPool=pool))
+            # Start every worker before timing.
+            list(pool.map(time.sleep, [0.05] * workers))
+            processes, result = timed(pull)
+            assert result == expected, (result, expected)
+    finally:
+        engine.setImpl(default)
+    return serial, threads, processes
+
+
+def run(widths: List[int], cost: float, workers: int) -> None:
+    print(f"{'stub':>6}{'width':>7}{'serial ms':>11}{'threads ms':>12}{'processes ms':>14}")
+    for kind in STUBS:
+        for width in widths:
+            serial, threads, processes = measure(width, kind, cost, workers)
+            print(f"{kind:>6}{width:>7}{serial * 1e3:>11.1f}{threads * 1e3:>12.1f}{processes * 1e3:>14.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--widths", type=int, nargs="+", default=[4, 16, 32], help="stub nodes per graph")
+    parser.add_argument("--cost", type=float, default=20.0, help="milliseconds of work per stub node")
+    parser.add_argument("--workers", type=int, default=4, help="pool size")
+    args = parser.parse_args()
+    _app = QApplication.instance() or QApplication([])
+    from PyFlow import INITIALIZE
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        INITIALIZE()
+    run(args.widths, args.cost / 1e3, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import pytest
+
+from app.application.doc_units.events import (
+    ActiveDocUnitChanged,
+    DocUnitEventBus,
+    HierarchySelectionChanged,
+    HierarchyUpdated,
+    ProjectDirtyStateChanged,
+    ProjectSaveStarted,
+)
+from app.domain.doc_units.entities import HierarchyNode
+from app.domain.doc_units.services import HierarchyChange
+
+
+def _root(name: str) -> HierarchyNode:
+    return HierarchyNode(node_id="root", name=name, node_type=HierarchyNode.FOLDER_TYPE, settings={})
+
+
+def _recording_bus(*event_types):
+    bus = DocUnitEventBus()
+    received = []
+    for event_type in event_types:
+        bus.subscribe(event_type, received.append)
+    return bus, received
+
+
+def test_publish_outside_batch_dispatches_immediately():
+    bus, received = _recording_bus(ProjectDirtyStateChanged)
+
+    bus.publish(ProjectDirtyStateChanged(True))
+
+    assert received == [ProjectDirtyStateChanged(True)]
+    assert bus.stats["ProjectDirtyStateChanged"].dispatched == 1
+
+
+def test_batch_merges_hierarchy_updates_per_unit_and_collapses_dirty_flags():
+    bus, received = _recording_bus(HierarchyUpdated, ProjectDirtyStateChanged, ActiveDocUnitChanged)
+    first, second = _root("first"), _root("second")
+
+    with bus.batch():
+        bus.publish(HierarchyUpdated("unit-1", first, ["a", "b"]))
+        bus.publish(ProjectDirtyStateChanged(True))
+        bus.publish(HierarchyUpdated("unit-2", first, ["x"]))
+        with bus.batch():
+            bus.publish(HierarchyUpdated("unit-1", second, ["b", "c"]))
+            bus.publish(ProjectDirtyStateChanged(False))
+        assert received == []
+        bus.publish(ActiveDocUnitChanged("unit-1"))
+
+    assert received == [
+        HierarchyUpdated("unit-1", second, ["a", "b", "c"]),
+        ProjectDirtyStateChanged(False),
+        HierarchyUpdated("unit-2", first, ["x"]),
+        ActiveDocUnitChanged("unit-1"),
+    ]
+    assert bus.stats["HierarchyUpdated"].published == 3
+    assert bus.stats["HierarchyUpdated"].coalesced == 1
+    assert bus.stats["ProjectDirtyStateChanged"].dispatched == 1
+
+
+def test_batch_chains_hierarchy_changes_only_when_roots_line_up():
+    bus, received = _recording_bus(HierarchyUpdated)
+    first, second, third = _root("first"), _root("second"), _root("third")
+    rename_a = [HierarchyChange(kind=HierarchyChange.UPDATED, node_id="a")]
+    rename_b = [HierarchyChange(kind=HierarchyChange.UPDATED, node_id="b")]
+
+    with bus.batch():
+        bus.publish(HierarchyUpdated("unit-1", second, ["a"], changes=rename_a, previous_root=first))
+        bus.publish(HierarchyUpdated("unit-1", third, ["b"], changes=rename_b, previous_root=second))
+    with bus.batch():
+        bus.publish(HierarchyUpdated("unit-2", second, ["a"], changes=rename_a, previous_root=first))
+        bus.publish(HierarchyUpdated("unit-2", third, ["b"], changes=rename_b, previous_root=_root("other")))
+
+    chained, broken = received
+    assert chained.changes == rename_a + rename_b
+    assert chained.previous_root is first and chained.root is third
+    assert broken.changes is None and broken.previous_root is None
+    assert broken.changed_node_ids == ["a", "b"]
+
+
+def test_batch_keeps_every_event_without_a_merge_rule():
+    bus, received = _recording_bus(ProjectSaveStarted)
+
+    with bus.batch():
+        bus.publish(ProjectSaveStarted("a.mtmeta"))
+        bus.publish(ProjectSaveStarted("b.mtmeta"))
+
+    assert received == [ProjectSaveStarted("a.mtmeta"), ProjectSaveStarted("b.mtmeta")]
+
+
+def test_batch_merges_only_runs_of_one_kind_per_unit():
+    bus, received = _recording_bus(HierarchyUpdated, HierarchySelectionChanged)
+    first, second = _root("first"), _root("second")
+
+    with bus.batch():
+        bus.publish(HierarchyUpdated("unit-1", first, ["a"]))
+        bus.publish(HierarchySelectionChanged("unit-1", "a", ["a"]))
+        bus.publish(HierarchyUpdated("unit-2", first, ["x"]))
+        bus.publish(HierarchySelectionChanged("unit-1", "a", ["a"]))
+        bus.publish(HierarchyUpdated("unit-1", second, ["b"]))
+
+    assert received == [
+        HierarchyUpdated("unit-1", first, ["a"]),
+        HierarchySelectionChanged("unit-1", "a", ["a"]),
+        HierarchyUpdated("unit-2", first, ["x"]),
+        HierarchyUpdated("unit-1", second, ["b"]),
+    ]
+
+
+def test_batch_drops_its_events_when_the_block_raises():
+    bus, received = _recording_bus(ProjectDirtyStateChanged, ActiveDocUnitChanged)
+
+    with pytest.raises(RuntimeError):
+        with bus.batch():
+            bus.publish(ProjectDirtyStateChanged(True))
+            raise RuntimeError("boom")
+    assert received == []
+
+    with bus.batch():
+        bus.publish(ActiveDocUnitChanged("unit-1"))
+        with pytest.raises(RuntimeError):
+            with bus.batch():
+                bus.publish(ProjectDirtyStateChanged(True))
+                raise RuntimeError("boom")
+
+    assert received == [ActiveDocUnitChanged("unit-1")]
+
+
+def test_handler_timings_are_recorded_per_handler():
+    bus = DocUnitEventBus()
+
+    def slow_handler(event) -> None:
+        pass
+
+    bus.subscribe(ProjectDirtyStateChanged, slow_handler)
+    bus.publish(ProjectDirtyStateChanged(True))
+    bus.publish(ProjectDirtyStateChanged(False))
+
+    stats = bus.handler_stats[id(slow_handler)]
+    assert stats.label == slow_handler.__qualname__
+    assert stats.calls == 2
+    assert stats.max_s >= 0.0
+    assert stats.mean_s <= stats.max_s
+
+
+def test_handlers_sharing_a_name_are_timed_apart():
+    bus = DocUnitEventBus()
+    first, second = [], []
+    bus.subscribe(ProjectDirtyStateChanged, first.append)
+    bus.subscribe(ActiveDocUnitChanged, second.append)
+
+    bus.publish(ProjectDirtyStateChanged(True))
+    bus.publish(ActiveDocUnitChanged(None))
+    bus.publish(ActiveDocUnitChanged("unit-1"))
+
+    assert sorted(stats.calls for stats in bus.handler_stats.values()) == [1, 2]
+    assert {stats.label for stats in bus.handler_stats.values()} == {"list.append"}
@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pytest
+
+from app.application.doc_units.use_cases import asset_preview_cache
+from app.application.doc_units.use_cases.asset_preview_cache import AssetPreviewCache
+from app.domain.doc_units.entities import AssetPointer
+from app.domain.doc_units.value_objects import AssetId
+
+
+class _DeferredExecutor:
+    """Runs submitted work only when ``run_all`` is called, like a busy pool."""
+
+    def __init__(self) -> None:
+        self.queued: List[tuple] = []
+
+    def submit(self, fn, *args) -> Future:
+        future: Future = Future()
+        self.queued.append((future, fn, args))
+        return future
+
+    def run_next(self) -> None:
+        future, fn, args = self.queued.pop(0)
+        try:
+            future.set_result(fn(*args))
+        except Exception as exc:  # noqa: BLE001
+            future.set_exception(exc)
+
+    def run_all(self) -> None:
+        while self.queued:
+            self.run_next()
+
+
+class _ImmediateDispatcher:
+    def post(self, callback) -> None:
+        callback()
+
+
+class _Renderer:
+    def __init__(self, size: int = 10) -> None:
+        self.calls: List[str] = []
+        self._size = size
+
+    def render(self, source_path: str, max_edge: int) -> bytes:
+        self.calls.append(source_path)
+        data = Path(source_path).read_bytes()
+        if data == b"broken":
+            raise ValueError("cannot decode")
+        return data[:1] * self._size
+
+
+class _Store:
+    def __init__(self) -> None:
+        self.entries: Dict[str, bytes] = {}
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.entries.get(key)
+
+    def put(self, key: str, data: bytes) -> None:
+        self.entries[key] = data
+
+
+class _Media:
+    def __init__(self, root: Path) -> None:
+        self._root = root
+
+    def resolve_path(self, pointer: AssetPointer) -> str:
+        return str(self._root / pointer.asset_id.value)
+
+
+def _pointer(asset_id: str) -> AssetPointer:
+    return AssetPointer(asset_id=AssetId(asset_id), resolver="doc_media", status="perm", path_hint=asset_id)
+
+
+def _build(tmp_path: Path, **kwargs):
+    executor = _DeferredExecutor()
+    renderer = _Renderer()
+    store = _Store()
+    cache = AssetPreviewCache(_Media(tmp_path), renderer, store, _ImmediateDispatcher(), executor, **kwargs)
+    return cache, executor, renderer, store
+
+
+def test_concurrent_requests_share_one_render_and_then_hit_memory(tmp_path):
+    (tmp_path / "a").write_bytes(b"a")
+    cache, executor, renderer, store = _build(tmp_path)
+    received: List[Optional[bytes]] = []
+
+    assert cache.request(_pointer("a"), 64, received.append) is None
+    assert cache.request(_pointer("a"), 64, received.append) is None
+    executor.run_all()
+
+    assert received == [b"a" * 10, b"a" * 10]
+    assert len(renderer.calls) == 1 and len(store.entries) == 1
+    assert cache.request(_pointer("a"), 64, received.append) == b"a" * 10
+    assert executor.queued == []
+
+
+def test_disk_store_is_used_before_rendering(tmp_path):
+    (tmp_path / "a").write_bytes(b"a")
+    cache, executor, renderer, store = _build(tmp_path)
+    cache.request(_pointer("a"), 64, lambda _: None)
+    executor.run_all()
+
+    fresh = AssetPreviewCache(_Media(tmp_path), renderer, store, _ImmediateDispatcher(), executor)
+    received: List[Optional[bytes]] = []
+    fresh.request(_pointer("a"), 64, received.append)
+    executor.run_all()
+
+    assert received == [b"a" * 10]
+    assert len(renderer.calls) == 1
+
+
+def test_changed_source_file_gets_a_new_preview_once_rechecked(tmp_path):
+    source = tmp_path / "a"
+    source.write_bytes(b"a")
+    cache, executor, renderer, _ = _build(tmp_path, recheck_interval_s=0.0)
+    cache.request(_pointer("a"), 64, lambda _: None)
+    executor.run_all()
+
+    source.write_bytes(b"b")
+    stat = source.stat()
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    # The stale preview is served while the mtime is read again in the background.
+    assert cache.request(_pointer("a"), 64, lambda _: None) == b"a" * 10
+    executor.run_all()
+    received: List[Optional[bytes]] = []
+    assert cache.request(_pointer("a"), 64, received.append) is None
+    executor.run_all()
+
+    assert received == [b"b" * 10]
+    assert len(renderer.calls) == 2
+
+
+def test_requests_never_touch_the_disk_on_the_calling_thread(tmp_path, monkeypatch):
+    (tmp_path / "a").write_bytes(b"a")
+    cache, executor, _, _ = _build(tmp_path)
+
+    def forbidden_stat(path):
+        raise AssertionError(f"stat of {path} on the calling thread")
+
+    monkeypatch.setattr(asset_preview_cache.os, "stat", forbidden_stat)
+    cache.request(_pointer("a"), 64, lambda _: None)
+    cache.request(_pointer("missing"), 64, lambda _: None)
+    monkeypatch.undo()
+    executor.run_all()
+    monkeypatch.setattr(asset_preview_cache.os, "stat", forbidden_stat)
+
+    received: List[Optional[bytes]] = []
+    assert cache.request(_pointer("a"), 64, received.append) == b"a" * 10
+    assert cache.request(_pointer("missing"), 64, received.append) is None
+    assert received == [None]
+    assert executor.queued == []
+
+
+def test_memory_cache_evicts_least_recently_used_over_budget(tmp_path):
+    for name in "abc":
+        (tmp_path / name).write_bytes(name.encode())
+    cache, executor, _, _ = _build(tmp_path, memory_budget_bytes=25)
+    for name in "ab":
+        cache.request(_pointer(name), 64, lambda _: None)
+    executor.run_all()
+    assert cache.request(_pointer("a"), 64, lambda _: None) is not None
+
+    cache.request(_pointer("c"), 64, lambda _: None)
+    executor.run_all()
+
+    assert cache.memory_bytes == 20
+    assert cache.request(_pointer("a"), 64, lambda _: None) is not None
+    assert cache.request(_pointer("b"), 64, lambda _: None) is None
+
+
+def test_unreadable_assets_report_no_preview(tmp_path):
+    (tmp_path / "broken").write_bytes(b"broken")
+    cache, executor, _, store = _build(tmp_path)
+    received: List[Optional[bytes]] = []
+
+    cache.request(_pointer("broken"), 64, received.append)
+    cache.request(_pointer("missing"), 64, received.append)
+    executor.run_all()
+    cache.request(_pointer("broken"), 64, received.append)
+
+    assert received == [None, None, None]
+    assert store.entries == {}
+    assert cache.memory_bytes == 0
+    assert executor.queued == []
+    assert cache.stats.failures == 1
+
+
+
+def test_source_that_turns_up_later_calls_back_the_caller_told_it_was_missing(tmp_path):
+    cache, executor, _, _ = _build(tmp_path, recheck_interval_s=0.0)
+    details: List[Optional[bytes]] = []
+    cache.request(_pointer("a"), 256, details.append)
+    executor.run_all()
+    assert details == [None]
+
+    (tmp_path / "a").write_bytes(b"a")
+    thumbnails: List[Optional[bytes]] = []
+    assert cache.request(_pointer("a"), 48, thumbnails.append) is None
+    executor.run_all()
+
+    assert thumbnails == [b"a" * 10]
+    assert details == [None, b"a" * 10]
+
+
+def test_queued_loads_run_visible_first_then_newest_first(tmp_path):
+    for name in "abcde":
+        (tmp_path / name).write_bytes(name.encode())
+    cache, executor, renderer, _ = _build(tmp_path, max_in_flight=1)
+
+    cache.request(_pointer("a"), 64, lambda _: None)
+    for name in "bc":
+        cache.request(_pointer(name), 64, priority=AssetPreviewCache.PRIORITY_PREFETCH)
+    cache.request(_pointer("d"), 64, lambda _: None)
+    cache.request(_pointer("e"), 64, lambda _: None)
+    cache.request(_pointer("b"), 64, lambda _: None)
+    assert len(executor.queued) == 1
+    executor.run_all()
+
+    assert [Path(path).name for path in renderer.calls] == ["a", "b", "e", "d", "c"]
+
+
+def test_discarded_requests_are_never_loaded(tmp_path):
+    for name in "abc":
+        (tmp_path / name).write_bytes(name.encode())
+    cache, executor, renderer, _ = _build(tmp_path, max_in_flight=1)
+    received: List[Optional[bytes]] = []
+    for name in "abc":
+        cache.request(_pointer(name), 64, received.append)
+
+    cache.discard_queued(64, keep_asset_ids={"c"})
+    executor.run_all()
+
+    assert [Path(path).name for path in renderer.calls] == ["a", "c"]
+    assert received == [b"a" * 10, b"c" * 10]
+    assert cache.stats.discarded == 1
+
+
+def test_stats_count_hits_misses_and_sources(tmp_path):
+    (tmp_path / "a").write_bytes(b"a")
+    cache, executor, renderer, store = _build(tmp_path, memory_budget_bytes=10)
+    cache.request(_pointer("a"), 64, lambda _: None)
+    cache.request(_pointer("a"), 32, lambda _: None)
+    executor.run_all()
+    cache.request(_pointer("a"), 32, lambda _: None)
+
+    stats = cache.stats
+    assert (stats.memory_hits, stats.memory_misses) == (1, 2)
+    assert (stats.renders, stats.disk_hits, stats.evictions) == (2, 0, 1)
+    assert stats.hit_rate == pytest.approx(1 / 3)
+
+    cache.request(_pointer("a"), 64, lambda _: None)
+    executor.run_all()
+    assert cache.stats.disk_hits == 1
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from unittest.mock import Mock
+import sys
+from unittest.mock import MagicMock, Mock
 
 from app.application.doc_units.events import HierarchyUpdated
 from app.application.doc_units.use_cases.finalize_doc_unit_assets import FinalizeDocUnitAssets
@@ -41,9 +42,11 @@ def _build_doc_unit(pointer_status: str, path_hint: str | None) -> DocUnit:
 def test_finalize_promotes_pending_assets():
     repo = Mock()
     doc_unit = _build_doc_unit(pointer_status="temp", path_hint=None)
-    repo.list_units.return_value = [doc_unit]
+    repo.units_with_staged_assets.return_value = [doc_unit]
+    repo.asset_reference_counts.return_value = {"media/final.png": 1}
 
     media = Mock()
+    media.collect_garbage.return_value = []
 
     def promote(pointer: AssetPointer) -> AssetPointer:
         return AssetPointer(
@@ -53,10 +56,9 @@ def test_finalize_promotes_pending_assets():
             path_hint="media/final.png",
         )
 
-    media.promote.side_effect = promote
-    media.list_final_assets.return_value = ["media/final.png", "media/orphan.png"]
+    media.promote_many.side_effect = lambda pointers, progress=None: [promote(pointer) for pointer in pointers]
 
-    events = Mock()
+    events = MagicMock()
 
     use_case = FinalizeDocUnitAssets(repo, media, events)
     use_case.execute()
@@ -67,9 +69,9 @@ def test_finalize_promotes_pending_assets():
     assert saved_pointer.status == "final"
     assert saved_pointer.path_hint == "media/final.png"
 
-    media.promote.assert_called_once()
+    media.promote_many.assert_called_once()
     media.cleanup_temp.assert_called_once_with()
-    media.delete_asset.assert_called_once_with("media/orphan.png")
+    media.collect_garbage.assert_called_once_with({"media/final.png": 1}, project_root=None)
 
     events.publish.assert_called_once()
     event = events.publish.call_args[0][0]
@@ -80,20 +82,50 @@ def test_finalize_promotes_pending_assets():
 
 def test_finalize_skips_when_hierarchy_already_final():
     repo = Mock()
-    doc_unit = _build_doc_unit(pointer_status="final", path_hint="media/final.png")
-    repo.list_units.return_value = [doc_unit]
+    repo.units_with_staged_assets.return_value = []
+    repo.asset_reference_counts.return_value = {"media/final.png": 1}
 
     media = Mock()
-    media.list_final_assets.return_value = ["media/final.png"]
+    media.collect_garbage.return_value = []
 
-    events = Mock()
+    events = MagicMock()
 
     use_case = FinalizeDocUnitAssets(repo, media, events)
     use_case.execute()
 
     repo.save_unit.assert_not_called()
-    media.promote.assert_not_called()
+    media.promote_many.assert_not_called()
     events.publish.assert_not_called()
 
     media.cleanup_temp.assert_called_once_with()
-    media.delete_asset.assert_not_called()
+    media.collect_garbage.assert_called_once_with({"media/final.png": 1}, project_root=None)
+
+
+def test_finalize_promotes_hierarchies_deeper_than_the_recursion_limit():
+    leaf = HierarchyNode(
+        node_id="image-node",
+        name="Page 1",
+        node_type=HierarchyNode.IMAGE_TYPE,
+        pointer=AssetPointer(asset_id=AssetId("asset-1"), resolver="file", status="temp"),
+    )
+    node = leaf
+    for depth in range(sys.getrecursionlimit() + 100):
+        node = HierarchyNode(
+            node_id=f"folder-{depth}",
+            name=f"Folder {depth}",
+            node_type=HierarchyNode.FOLDER_TYPE,
+            children=[node],
+        )
+    sibling = HierarchyNode(node_id="sibling", name="Untouched", node_type=HierarchyNode.FOLDER_TYPE)
+    node.children.append(sibling)
+    final = AssetPointer(asset_id=AssetId("asset-1"), resolver="file", status="final", path_hint="media/final.png")
+
+    promoted_root, changed_ids, pending_temp = FinalizeDocUnitAssets._promote_hierarchy(node, {"asset-1": final})
+
+    assert changed_ids == ["image-node"]
+    assert pending_temp is False
+    assert promoted_root is not node
+    assert promoted_root.children[1] is sibling
+    while promoted_root.children:
+        promoted_root = promoted_root.children[0]
+    assert promoted_root.pointer is final
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import itertools
+from unittest.mock import MagicMock, Mock
+
+import pytest
+
+from app.application.doc_units.dto import ImportAssetsRequest
+from app.application.doc_units.events import HierarchyUpdated, ProjectDirtyStateChanged
+from app.application.doc_units.use_cases.import_doc_unit_assets import ImportDocUnitAssets
+from app.domain.doc_units.entities import AssetPointer, HierarchyNode
+from app.domain.doc_units.services import HierarchyIndex
+from app.domain.doc_units.value_objects import AssetId, DocUnitId
+
+
+def _root() -> HierarchyNode:
+    return HierarchyNode(
+        node_id="root",
+        name="Chapter",
+        node_type=HierarchyNode.FOLDER_TYPE,
+        settings={},
+        children=[
+            HierarchyNode(
+                node_id="existing",
+                name="Cover",
+                node_type=HierarchyNode.IMAGE_TYPE,
+                settings={},
+            )
+        ],
+    )
+
+
+def _pointer(source_path: str) -> AssetPointer:
+    return AssetPointer(
+        asset_id=AssetId(source_path),
+        resolver="doc_media",
+        status="tmp",
+        path_hint=f"temp/{source_path}",
+    )
+
+
+def _build(media: Mock):
+    repository = Mock()
+    root = _root()
+    repository.get_hierarchy.return_value = root
+    repository.get_hierarchy_index.return_value = HierarchyIndex(root)
+    ids = Mock()
+    counter = itertools.count(1)
+    ids.generate.side_effect = lambda: f"node-{next(counter)}"
+    events = MagicMock()
+    use_case = ImportDocUnitAssets(repository, media, ids, events, max_workers=4)
+    return use_case, repository, events
+
+
+def test_import_commits_all_files_once_in_request_order():
+    media = Mock()
+    media.import_temp.side_effect = _pointer
+    use_case, repository, events = _build(media)
+    sources = [f"/scans/page-{index:03d}.png" for index in range(20)]
+    progress: list[tuple[int, int]] = []
+
+    response = use_case.execute(
+        ImportAssetsRequest(unit_id="unit-1", source_paths=sources),
+        progress=lambda done, total: progress.append((done, total)),
+    )
+
+    repository.save_hierarchy.assert_called_once()
+    unit_id, saved_root = repository.save_hierarchy.call_args[0]
+    assert unit_id == DocUnitId("unit-1")
+    assert [child.name for child in saved_root.children] == ["Cover"] + [f"page-{index:03d}" for index in range(20)]
+    assert saved_root.children[1].pointer == _pointer(sources[0])
+    assert response.node_ids == [child.node_id for child in saved_root.children[1:]]
+    assert progress[-1] == (20, 20)
+
+    published = [call.args[0] for call in events.publish.call_args_list]
+    assert [type(event) for event in published] == [HierarchyUpdated, ProjectDirtyStateChanged]
+    assert published[0].changed_node_ids == response.node_ids
+
+
+def test_import_reports_failed_files_and_keeps_the_rest():
+    media = Mock()
+
+    def import_temp(source_path: str) -> AssetPointer:
+        if "missing" in source_path:
+            raise FileNotFoundError(source_path)
+        return _pointer(source_path)
+
+    media.import_temp.side_effect = import_temp
+    use_case, repository, _ = _build(media)
+
+    response = use_case.execute(
+        ImportAssetsRequest(unit_id="unit-1", source_paths=["a.png", "missing.png", "b.png"])
+    )
+
+    assert list(response.failed) == ["missing.png"]
+    saved_root = repository.save_hierarchy.call_args[0][1]
+    assert [child.name for child in saved_root.children[1:]] == ["a", "b"]
+
+
+def test_cancelled_import_commits_nothing():
+    media = Mock()
+    media.import_temp.side_effect = _pointer
+    use_case, repository, events = _build(media)
+
+    response = use_case.execute(
+        ImportAssetsRequest(unit_id="unit-1", source_paths=[f"{index}.png" for index in range(50)]),
+        cancelled=lambda: True,
+    )
+
+    assert response.cancelled
+    assert response.node_ids == []
+    assert media.import_temp.call_count < 50
+    repository.save_hierarchy.assert_not_called()
+    events.publish.assert_not_called()
+
+
+def test_import_into_image_node_is_rejected():
+    media = Mock()
+    media.import_temp.side_effect = _pointer
+    use_case, repository, _ = _build(media)
+
+    with pytest.raises(ValueError):
+        use_case.execute(ImportAssetsRequest(unit_id="unit-1", source_paths=["a.png"], parent_node_id="existing"))
+
+    repository.save_hierarchy.assert_not_called()
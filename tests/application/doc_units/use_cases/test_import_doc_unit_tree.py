@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import io
+import itertools
+import zlib
+from unittest.mock import MagicMock, Mock
+
+from app.application.doc_units.dto import ImportSourceEntry, ImportTreeRequest
+from app.application.doc_units.use_cases.import_doc_unit_assets import ImportDocUnitAssets
+from app.application.doc_units.use_cases.import_doc_unit_tree import ImportDocUnitTree
+from app.domain.doc_units.entities import AssetPointer, HierarchyNode
+from app.domain.doc_units.services import HierarchyIndex
+from app.domain.doc_units.value_objects import AssetId
+
+
+def _entry(folders: tuple[str, ...], name: str) -> ImportSourceEntry:
+    data = "/".join((*folders, name)).encode()
+    return ImportSourceEntry(folders=folders, name=name, suffix=".png", open=lambda: io.BytesIO(data))
+
+
+def _import_stream(open_source, suffix: str) -> AssetPointer:
+    with open_source() as stream:
+        key = stream.read().decode()
+    if key.endswith("broken"):
+        raise OSError("corrupt member")
+    if key.endswith("deflated"):
+        raise zlib.error("Error -3 while decompressing data")
+    return AssetPointer(asset_id=AssetId(key), resolver="doc_media", status="tmp", path_hint=f"temp/{key}{suffix}")
+
+
+def _build(entries):
+    root = HierarchyNode(node_id="root", name="Unit", node_type=HierarchyNode.FOLDER_TYPE, settings={})
+    repository = Mock()
+    repository.get_hierarchy_index.return_value = HierarchyIndex(root)
+    ids = Mock()
+    counter = itertools.count(1)
+    ids.generate.side_effect = lambda: f"node-{next(counter)}"
+    media = Mock()
+    media.import_stream.side_effect = _import_stream
+    reader = Mock()
+    reader.read_entries.return_value = entries
+    events = MagicMock()
+    importer = ImportDocUnitAssets(repository, media, ids, events, max_workers=3)
+    return ImportDocUnitTree(importer, reader, media, ids, max_workers=3), repository, events
+
+
+def _shape(node: HierarchyNode):
+    if node.node_type == HierarchyNode.IMAGE_TYPE:
+        return node.name
+    return {node.name: [_shape(child) for child in node.children]}
+
+
+def test_tree_import_mirrors_folders_in_one_commit():
+    entries = [
+        _entry((), "cover"),
+        _entry(("ch1",), "p1"),
+        _entry(("ch1",), "p2"),
+        _entry(("ch1", "extra"), "p1"),
+        _entry(("ch2",), "p1"),
+    ]
+    use_case, repository, events = _build(entries)
+
+    response = use_case.execute(ImportTreeRequest(unit_id="unit-1", source_path="/scans/Volume 1.cbz"))
+
+    repository.save_hierarchy.assert_called_once()
+    saved_root = repository.save_hierarchy.call_args[0][1]
+    [volume] = saved_root.children
+    assert _shape(volume) == {"Volume 1": ["cover", {"ch1": ["p1", "p2", {"extra": ["p1"]}]}, {"ch2": ["p1"]}]}
+    assert volume.children[1].children[0].pointer.asset_id == AssetId("ch1/p1")
+    assert response.node_ids == [volume.node_id]
+    assert events.publish.call_count == 2
+
+
+def test_tree_import_skips_failed_entries_and_empty_folders():
+    use_case, repository, _ = _build([_entry(("bad",), "broken"), _entry((), "p1")])
+
+    response = use_case.execute(ImportTreeRequest(unit_id="unit-1", source_path="/scans/Volume"))
+
+    assert response.failed == {"bad/broken": "corrupt member"}
+    [volume] = repository.save_hierarchy.call_args[0][1].children
+    assert _shape(volume) == {"Volume": ["p1"]}
+
+
+def test_tree_import_reports_a_member_that_fails_to_decompress():
+    use_case, repository, _ = _build([_entry((), "deflated"), _entry((), "p1")])
+
+    response = use_case.execute(ImportTreeRequest(unit_id="unit-1", source_path="/scans/Volume.cbz"))
+
+    assert response.failed == {"deflated": "Error -3 while decompressing data"}
+    [volume] = repository.save_hierarchy.call_args[0][1].children
+    assert _shape(volume) == {"Volume": ["p1"]}
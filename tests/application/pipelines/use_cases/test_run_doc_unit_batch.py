@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from unittest.mock import Mock
+
+from app.application.pipelines.dto import PageOutcome, RunBatchRequest
+from app.application.pipelines.ports import PageProcessor
+from app.application.pipelines.use_cases.run_doc_unit_batch import RunDocUnitBatch, iter_pages
+from app.domain.doc_units.entities import AssetPointer, HierarchyNode
+from app.domain.doc_units.value_objects import AssetId, DocUnitId
+from app.interface_adapters.pipelines.stores.filesystem_batch_output_store import FileSystemBatchOutputStore
+
+
+def _image(node_id: str, name: str) -> HierarchyNode:
+    pointer = AssetPointer(asset_id=AssetId(f"asset-{node_id}"), resolver="file", status="final")
+    return HierarchyNode(node_id=node_id, name=name, node_type=HierarchyNode.IMAGE_TYPE, pointer=pointer)
+
+
+def _folder(node_id: str, name: str, *children: HierarchyNode) -> HierarchyNode:
+    return HierarchyNode(node_id=node_id, name=name, node_type=HierarchyNode.FOLDER_TYPE, children=list(children))
+
+
+class FakeProcessor(PageProcessor):
+    fingerprint = "graph-1"
+
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+        self.failing: set[str] = set()
+
+    def process(self, source_path: str, output_path: str) -> dict:
+        self.calls.append(Path(source_path).name)
+        if Path(source_path).name in self.failing:
+            raise RuntimeError("boom")
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        Path(output_path).write_bytes(Path(source_path).read_bytes())
+        return {"Inpainter": 0.5, "TextExtractor": 0.25}
+
+
+def _setup(tmp_path: Path, hierarchy: HierarchyNode, processor: FakeProcessor):
+    sources = tmp_path / "sources"
+    sources.mkdir(exist_ok=True)
+    for node, _folders in iter_pages(hierarchy):
+        source = sources / f"{node.node_id}.png"
+        if not source.exists():
+            source.write_bytes(node.node_id.encode())
+
+    repository = Mock()
+    repository.get_hierarchy.return_value = hierarchy
+    media_store = Mock()
+    media_store.resolve_path.side_effect = lambda pointer: str(sources / f"{pointer.asset_id.value[6:]}.png")
+    outputs = FileSystemBatchOutputStore(str(tmp_path / "out"))
+    return RunDocUnitBatch(repository, media_store, processor, outputs), sources, repository
+
+
+def _chapter() -> HierarchyNode:
+    return _folder(
+        "root",
+        "Unit",
+        _image("p1", "001"),
+        _folder("f1", "Chapter 1", _image("p2", "002"), _image("p3", "003")),
+        _folder("f2", "Empty"),
+    )
+
+
+def test_processes_pages_in_hierarchy_order_and_sums_node_timings(tmp_path):
+    processor = FakeProcessor()
+    runner, _sources, repository = _setup(tmp_path, _chapter(), processor)
+    progress = []
+
+    report = runner.execute(RunBatchRequest("unit-1"), progress=lambda done, total: progress.append((done, total)))
+
+    repository.get_hierarchy.assert_called_once_with(DocUnitId("unit-1"))
+    assert processor.calls == ["p1.png", "p2.png", "p3.png"]
+    assert (tmp_path / "out" / "001.png").read_bytes() == b"p1"
+    assert (tmp_path / "out" / "Chapter 1" / "003.png").read_bytes() == b"p3"
+    assert report.processed == 3 and report.skipped == 0 and not report.failed
+    assert report.node_seconds == {"Inpainter": 1.5, "TextExtractor": 0.75}
+    assert progress == [(1, 3), (2, 3), (3, 3)]
+
+
+def test_resume_skips_finished_pages_and_redoes_changed_ones(tmp_path):
+    processor = FakeProcessor()
+    runner, sources, _repository = _setup(tmp_path, _chapter(), processor)
+    runner.execute(RunBatchRequest("unit-1"))
+    processor.calls.clear()
+
+    changed = sources / "p2.png"
+    changed.write_bytes(b"p2, retouched")
+    stat = changed.stat()
+    os.utime(changed, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    report = runner.execute(RunBatchRequest("unit-1"))
+
+    assert processor.calls == ["p2.png"]
+    assert report.processed == 1 and report.skipped == 2
+
+    processor.fingerprint = "graph-2"
+    processor.calls.clear()
+    report = runner.execute(RunBatchRequest("unit-1"))
+    assert processor.calls == ["p1.png", "p2.png", "p3.png"]
+
+    processor.calls.clear()
+    report = runner.execute(RunBatchRequest("unit-1", resume=False))
+    assert report.processed == 3 and report.skipped == 0
+
+
+def test_failed_page_is_reported_and_the_batch_goes_on(tmp_path):
+    processor = FakeProcessor()
+    processor.failing.add("p2.png")
+    runner, _sources, _repository = _setup(tmp_path, _chapter(), processor)
+
+    report = runner.execute(RunBatchRequest("unit-1"))
+
+    assert report.failed == {"p2": "boom"}
+    assert report.processed == 2
+
+    processor.failing.clear()
+    processor.calls.clear()
+    report = runner.execute(RunBatchRequest("unit-1"))
+    assert processor.calls == ["p2.png"]
+    assert not report.failed
+
+
+def test_cancel_stops_between_pages_and_limit_caps_the_batch(tmp_path):
+    processor = FakeProcessor()
+    runner, _sources, _repository = _setup(tmp_path, _chapter(), processor)
+
+    report = runner.execute(RunBatchRequest("unit-1"), cancelled=lambda: len(processor.calls) >= 1)
+    assert report.cancelled and report.processed == 1
+
+    report = runner.execute(RunBatchRequest("unit-1", limit=2))
+    assert not report.cancelled
+    assert processor.calls == ["p1.png", "p2.png"]
+    assert report.skipped == 1 and report.processed == 1
+
+
+
+def test_resumed_run_keeps_same_named_pages_apart(tmp_path):
+    processor = FakeProcessor()
+    processor.failing.add("p2.png")
+    pages = _folder("root", "Unit", _image("p1", "001"), _image("p2", "001"))
+    runner, _sources, _repository = _setup(tmp_path, pages, processor)
+    runner.execute(RunBatchRequest("unit-1"))
+
+    processor.failing.clear()
+    processor.calls.clear()
+    runner, _sources, _repository = _setup(tmp_path, pages, processor)
+    report = runner.execute(RunBatchRequest("unit-1"))
+
+    assert processor.calls == ["p2.png"] and report.skipped == 1
+    assert (tmp_path / "out" / "001-p1.png").read_bytes() == b"p1"
+    assert (tmp_path / "out" / "001-p2.png").read_bytes() == b"p2"
+
+
+class ReadAheadProcessor(FakeProcessor):
+    """Takes every job before reporting any, like a processor running pages concurrently."""
+
+    def process_many(self, jobs):
+        taken = list(jobs)
+        for job in taken:
+            self.process(job.source_path, job.output_path)
+        for job in taken:
+            yield PageOutcome(job, {"Inpainter": 1.0})
+
+
+def test_processor_running_pages_ahead_gets_them_in_order_and_each_is_recorded(tmp_path):
+    processor = ReadAheadProcessor()
+    runner, _sources, _repository = _setup(tmp_path, _chapter(), processor)
+    progress = []
+
+    report = runner.execute(RunBatchRequest("unit-1"), progress=lambda done, total: progress.append(done))
+
+    assert processor.calls == ["p1.png", "p2.png", "p3.png"]
+    assert report.processed == 3 and report.node_seconds == {"Inpainter": 3.0}
+    assert progress == [1, 2, 3]
+    report = runner.execute(RunBatchRequest("unit-1"))
+    assert report.skipped == 3
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from concurrent.futures import Executor, Future
+from typing import Callable
+from unittest.mock import Mock
+
+from app.application.doc_units.events import (
+    DocUnitEventBus,
+    ProjectDirtyStateChanged,
+    ProjectSaveFinished,
+)
+from app.application.project.use_cases.autosave_scheduler import (
+    AutosavePolicy,
+    AutosaveScheduler,
+)
+from app.application.project.use_cases.save_project import SaveProject
+from app.domain.project.services import new_project
+
+
+class _InlineExecutor(Executor):
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as ex:
+            future.set_exception(ex)
+        return future
+
+
+class _FakeTimers:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.pending: list[tuple[float, Callable[[], None]]] = []
+
+    def schedule(self, delay: float, callback: Callable[[], None]) -> None:
+        self.pending.append((self.now + delay, callback))
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+        while due := [item for item in self.pending if item[0] <= self.now]:
+            self.pending.remove(due[0])
+            due[0][1]()
+
+
+def _build(meta_path: str | None = "project/project.mtmeta"):
+    project = new_project("project-1", "Project")
+    if meta_path:
+        project.metadata["project_meta_path"] = meta_path
+    project_slot = Mock()
+    project_slot.get_data.return_value = project
+    repository = Mock()
+    repository.snapshot.side_effect = lambda data: data
+    recovery = Mock()
+    recovery.write.return_value = 128
+    events = DocUnitEventBus()
+    timers = _FakeTimers()
+    dispatcher = Mock()
+    dispatcher.post.side_effect = lambda callback: callback()
+    scheduler = AutosaveScheduler(
+        SaveProject(project_slot, repository, Mock()),
+        recovery,
+        dispatcher,
+        events,
+        _InlineExecutor(),
+        policy=AutosavePolicy(debounce_s=2, max_delay_s=10, min_interval_s=30),
+        timer=timers.schedule,
+        clock=lambda: timers.now,
+    )
+    return scheduler, recovery, repository, events, timers
+
+
+def test_burst_of_edits_produces_one_recovery_write_after_quiet_period():
+    scheduler, recovery, repository, events, timers = _build()
+
+    for _ in range(3):
+        events.publish(ProjectDirtyStateChanged(True))
+        timers.advance(1)
+    assert recovery.write.call_count == 0
+    timers.advance(2)
+
+    assert recovery.write.call_count == 1
+    repository.save.assert_not_called()
+    assert scheduler.metrics.runs == 1
+    assert scheduler.metrics.bytes_written == 128
+
+
+def test_continuous_edits_are_capped_by_max_delay():
+    _, recovery, _, events, timers = _build()
+
+    for _ in range(12):
+        events.publish(ProjectDirtyStateChanged(True))
+        timers.advance(1)
+
+    assert recovery.write.call_count == 1
+
+
+def test_min_interval_limits_write_rate():
+    _, recovery, _, events, timers = _build()
+
+    events.publish(ProjectDirtyStateChanged(True))
+    timers.advance(2)
+    events.publish(ProjectDirtyStateChanged(True))
+    timers.advance(20)
+    assert recovery.write.call_count == 1
+    timers.advance(10)
+
+    assert recovery.write.call_count == 2
+
+
+def test_unsaved_project_is_not_autosaved():
+    scheduler, recovery, _, events, timers = _build(meta_path=None)
+
+    events.publish(ProjectDirtyStateChanged(True))
+    timers.advance(5)
+
+    recovery.write.assert_not_called()
+    assert scheduler.metrics.deferred == 1
+
+
+def test_successful_save_clears_recovery_slot():
+    _, recovery, _, events, _ = _build()
+
+    events.publish(ProjectSaveFinished("project/project.mtmeta", None, 0.1))
+
+    recovery.clear.assert_called_once()
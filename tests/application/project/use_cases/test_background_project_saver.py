@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import queue
+import threading
+from typing import Callable
+from unittest.mock import Mock
+
+from app.application.doc_units.events import (
+    DocUnitEventBus,
+    ProjectDirtyStateChanged,
+    ProjectSaveFinished,
+    ProjectSaveProgress,
+    ProjectSaveStarted,
+)
+from app.application.project.dto import SaveProjectRequest
+from app.application.project.use_cases.background_project_saver import (
+    BackgroundProjectSaver,
+)
+from app.application.project.use_cases.save_project import SaveProject
+from app.domain.project.services import new_project
+
+
+class _QueueDispatcher:
+    """Stands in for the GUI event loop: callbacks run when the test drains them."""
+
+    def __init__(self) -> None:
+        self.callbacks: "queue.Queue[Callable[[], None]]" = queue.Queue()
+
+    def post(self, callback: Callable[[], None]) -> None:
+        self.callbacks.put(callback)
+
+    def drain(self, saver: BackgroundProjectSaver) -> None:
+        while saver.is_saving or not self.callbacks.empty():
+            self.callbacks.get(timeout=5)()
+
+
+def _build_saver(repository: Mock, finalize=None):
+    project = new_project("project-1", "Project")
+    project.metadata["project_root_path"] = "/projects/project-1"
+    project_slot = Mock()
+    project_slot.get_data.return_value = project
+    repository.snapshot.side_effect = lambda data: data
+    events = DocUnitEventBus()
+    published: list = []
+    for event_type in (ProjectSaveStarted, ProjectSaveProgress, ProjectSaveFinished, ProjectDirtyStateChanged):
+        events.subscribe(event_type, published.append)
+    dispatcher = _QueueDispatcher()
+    saver = BackgroundProjectSaver(
+        SaveProject(project_slot, repository, Mock()),
+        dispatcher,
+        events,
+        finalize_assets=finalize,
+    )
+    return saver, dispatcher, events, published
+
+
+def test_request_writes_on_worker_and_reports_completion():
+    save_threads: list[threading.Thread] = []
+    steps: list[str] = []
+    repository = Mock()
+    repository.save.side_effect = lambda path, data: save_threads.append(threading.current_thread()) or path
+    finalize = Mock()
+    finalize.collect.return_value = []
+    finalize.apply.return_value = {"docs_units/assets/a.png"}
+    finalize.prune.side_effect = lambda referenced, root: steps.append(f"prune after {repository.save.call_count} writes")
+    saver, dispatcher, _, published = _build_saver(repository, finalize)
+
+    saver.request(SaveProjectRequest("project.mtmeta"))
+    dispatcher.drain(saver)
+
+    assert save_threads and save_threads[0] is not threading.current_thread()
+    finalize.prune.assert_called_once_with({"docs_units/assets/a.png"}, "/projects/project-1")
+    assert steps == ["prune after 1 writes"]
+    assert isinstance(published[0], ProjectSaveStarted)
+    assert ProjectDirtyStateChanged(False) in published
+    finished = published[-1]
+    assert isinstance(finished, ProjectSaveFinished)
+    assert finished.succeeded and finished.access_path == "project.mtmeta"
+
+
+def test_requests_during_a_save_are_coalesced():
+    release = threading.Event()
+    repository = Mock()
+    repository.save.side_effect = lambda path, data: release.wait(5) and path
+    saver, dispatcher, _, published = _build_saver(repository)
+
+    saver.request(SaveProjectRequest("project.mtmeta"))
+    saver.request(SaveProjectRequest("project.mtmeta"))
+    saver.request(SaveProjectRequest("project.mtmeta"))
+    release.set()
+    dispatcher.drain(saver)
+
+    assert repository.save.call_count == 2
+    assert sum(isinstance(event, ProjectSaveFinished) for event in published) == 2
+
+
+def test_failed_save_reports_error_and_keeps_project_dirty():
+    repository = Mock()
+    repository.save.side_effect = OSError("disk full")
+    finalize = Mock()
+    finalize.collect.return_value = []
+    finalize.apply.return_value = {}
+    saver, dispatcher, _, published = _build_saver(repository, finalize)
+
+    saver.request(SaveProjectRequest("project.mtmeta"))
+    dispatcher.drain(saver)
+
+    assert ProjectDirtyStateChanged(False) not in published
+    assert published[-1].error == "disk full"
+    finalize.prune.assert_not_called()
+
+
+def test_prune_uses_the_project_root_captured_with_the_snapshot():
+    writing, release = threading.Event(), threading.Event()
+    repository = Mock()
+    repository.save.side_effect = lambda path, data: writing.set() or (release.wait(5) and path)
+    finalize = Mock()
+    finalize.collect.return_value = []
+    finalize.apply.return_value = {}
+    saver, dispatcher, _, published = _build_saver(repository, finalize)
+
+    saver.request(SaveProjectRequest("project.mtmeta"))
+    while not writing.is_set():
+        try:
+            dispatcher.callbacks.get(timeout=0.05)()
+        except queue.Empty:
+            pass
+    saver._save_project.project_slot.get_data.return_value = new_project("project-2", "Other")
+    release.set()
+    dispatcher.drain(saver)
+
+    finalize.prune.assert_called_once_with({}, "/projects/project-1")
+
+
+def test_edits_after_snapshot_keep_project_dirty():
+    writing, release = threading.Event(), threading.Event()
+    repository = Mock()
+    repository.save.side_effect = lambda path, data: writing.set() or (release.wait(5) and path)
+    saver, dispatcher, events, published = _build_saver(repository)
+
+    saver.request(SaveProjectRequest("project.mtmeta"))
+    while not writing.is_set():
+        try:
+            dispatcher.callbacks.get(timeout=0.05)()
+        except queue.Empty:
+            pass
+    events.publish(ProjectDirtyStateChanged(True))
+    release.set()
+    dispatcher.drain(saver)
+
+    assert published[-1].succeeded
+    assert ProjectDirtyStateChanged(False) not in published
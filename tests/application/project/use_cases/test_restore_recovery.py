@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from unittest.mock import Mock
+
+import pytest
+
+from app.application.project.use_cases.restore_recovery import RestoreRecovery
+from app.domain.project.services import new_project
+
+
+def _build(pending: bool = True):
+    project = new_project("project-1", "Project")
+    project.metadata["project_root_path"] = "/projects/p"
+    store = Mock()
+    store.get_data.return_value = project
+    recovery = Mock()
+    recovery.pending.return_value = pending
+    recovery.restore.return_value = ["unit-1"]
+    return RestoreRecovery(store, recovery), store, recovery, project
+
+
+def test_restore_applies_slot_and_republishes_project():
+    use_case, store, recovery, project = _build()
+
+    assert use_case.available()
+    assert use_case.execute() == ["unit-1"]
+
+    recovery.restore.assert_called_once_with(project)
+    store.set_data.assert_called_once_with(project)
+    recovery.clear.assert_not_called()
+
+
+def test_not_available_without_saved_project_or_pending_slot():
+    use_case, _, recovery, project = _build(pending=False)
+    assert not use_case.available()
+
+    del project.metadata["project_root_path"]
+    recovery.pending.return_value = True
+    assert not use_case.available()
+
+
+def test_discard_clears_slot():
+    use_case, _, recovery, project = _build()
+
+    use_case.discard()
+
+    recovery.clear.assert_called_once_with(project)
+
+
+def test_execute_requires_project():
+    use_case, store, _, _ = _build()
+    store.get_data.return_value = None
+
+    with pytest.raises(RuntimeError):
+        use_case.execute()
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from unittest.mock import Mock
+
+from app.application.project.dto import SaveProjectRequest
+from app.application.project.use_cases.save_project import SaveProject
+from app.domain.project.services import new_project
+
+
+def test_execute_flushes_pending_changes_before_saving():
+    project = new_project("project-1", "Project")
+    project_slot = Mock()
+    project_slot.get_data.return_value = project
+    calls: list[str] = []
+    repository = Mock()
+    repository.snapshot.side_effect = lambda data: calls.append("snapshot") or data
+    repository.save.side_effect = lambda path, data: calls.append("save") or path
+    pending = Mock()
+    pending.flush.side_effect = lambda: calls.append("flush")
+
+    use_case = SaveProject(project_slot, repository, Mock(), pending_changes=[pending])
+    response = use_case.execute(SaveProjectRequest("project.mtmeta"))
+
+    assert calls == ["flush", "snapshot", "save"]
+    assert response.access_path == "project.mtmeta"
@@ -0,0 +1,265 @@
+from __future__ import annotations
+
+import itertools
+
+import pytest
+
+from app.domain.doc_units.entities import HierarchyNode
+from app.domain.doc_units.services import (
+    HierarchyChange,
+    HierarchyIndex,
+    collect_node_map,
+    delete_nodes,
+    insert_nodes,
+    move_nodes,
+    rename_node,
+)
+
+
+def _image(node_id: str) -> HierarchyNode:
+    return HierarchyNode(
+        node_id=node_id,
+        name=node_id,
+        node_type=HierarchyNode.IMAGE_TYPE,
+        settings={"dpi": 300},
+    )
+
+
+def _folder(node_id: str, children: list[HierarchyNode]) -> HierarchyNode:
+    return HierarchyNode(
+        node_id=node_id,
+        name=node_id,
+        node_type=HierarchyNode.FOLDER_TYPE,
+        settings={},
+        children=children,
+    )
+
+
+def _build_tree() -> HierarchyNode:
+    return _folder(
+        "root",
+        [
+            _folder("ch1", [_image("p1"), _image("p2"), _image("p3")]),
+            _folder("ch2", [_image("p4"), _folder("ch2a", [_image("p5")])]),
+        ],
+    )
+
+
+def _child_ids(node: HierarchyNode) -> list[str]:
+    return [child.node_id for child in node.children]
+
+
+def test_rename_node_shares_untouched_subtrees():
+    root = _build_tree()
+
+    updated = rename_node(root, "p2", "Renamed")
+
+    nodes = collect_node_map(updated)
+    assert nodes["p2"].name == "Renamed"
+    assert updated is not root
+    assert nodes["ch1"] is not root.children[0]
+    assert nodes["ch2"] is root.children[1]
+    assert nodes["p1"] is root.children[0].children[0]
+    assert nodes["p1"].settings is root.children[0].children[0].settings
+    assert collect_node_map(root)["p2"].name == "p2"
+
+
+def test_rename_node_with_unknown_id_returns_same_root():
+    root = _build_tree()
+
+    assert rename_node(root, "missing", "Name") is root
+
+
+def test_insert_nodes_clamps_index_and_keeps_siblings():
+    root = _build_tree()
+
+    updated = insert_nodes(root, "ch2a", 10, [_image("p6")])
+
+    ch2a = collect_node_map(updated)["ch2a"]
+    assert _child_ids(ch2a) == ["p5", "p6"]
+    assert ch2a.children[0] is root.children[1].children[1].children[0]
+    assert updated.children[0] is root.children[0]
+
+
+def test_insert_nodes_with_unknown_parent_raises():
+    with pytest.raises(KeyError):
+        insert_nodes(_build_tree(), "missing", 0, [_image("p6")])
+
+
+def test_delete_nodes_removes_nested_selection_once():
+    root = _build_tree()
+
+    updated = delete_nodes(root, ["ch2a", "p5", "p1"])
+
+    nodes = collect_node_map(updated)
+    assert "ch2a" not in nodes and "p5" not in nodes and "p1" not in nodes
+    assert _child_ids(nodes["ch1"]) == ["p2", "p3"]
+    assert _child_ids(nodes["ch2"]) == ["p4"]
+
+
+def test_delete_nodes_rejects_root():
+    with pytest.raises(ValueError):
+        delete_nodes(_build_tree(), ["root"])
+
+
+def test_move_nodes_within_parent_adjusts_insert_index():
+    root = _build_tree()
+
+    updated = move_nodes(root, ["p1"], "ch1", 3)
+
+    assert _child_ids(updated.children[0]) == ["p2", "p3", "p1"]
+    assert updated.children[1] is root.children[1]
+
+
+def test_move_nodes_between_folders_reuses_moved_subtree():
+    root = _build_tree()
+    moved = root.children[1].children[1]
+
+    updated = move_nodes(root, ["ch2a"], "ch1", 0)
+
+    assert _child_ids(updated.children[0]) == ["ch2a", "p1", "p2", "p3"]
+    assert updated.children[0].children[0] is moved
+    assert _child_ids(updated.children[1]) == ["p4"]
+
+
+def test_move_nodes_copy_assigns_new_ids():
+    root = _build_tree()
+    counter = itertools.count()
+
+    updated = move_nodes(root, ["ch2a"], "ch1", 0, copy=True, id_factory=lambda: f"copy-{next(counter)}")
+
+    copied = updated.children[0].children[0]
+    assert copied.node_id == "copy-0"
+    assert _child_ids(copied) == ["copy-1"]
+    assert _child_ids(updated.children[1]) == ["p4", "ch2a"]
+
+
+def test_move_nodes_into_descendant_raises():
+    with pytest.raises(ValueError):
+        move_nodes(_build_tree(), ["ch2"], "ch2a", 0)
+
+
+def _assert_index_matches(index: HierarchyIndex, root: HierarchyNode) -> None:
+    fresh = HierarchyIndex(root)
+    assert index.root is root
+    assert set(index) == set(fresh)
+    for node_id in fresh:
+        expected = fresh.entry(node_id)
+        actual = index.entry(node_id)
+        assert actual.node is expected.node
+        assert (actual.parent_id, actual.child_index, actual.depth) == (
+            expected.parent_id,
+            expected.child_index,
+            expected.depth,
+        )
+
+
+def test_index_lookups_report_parent_position_and_depth():
+    index = HierarchyIndex(_build_tree())
+
+    assert index.parent("p5").node_id == "ch2a"
+    assert index.child_index("ch2a") == 1
+    assert index.depth("p5") == 3
+    assert [node.node_id for node in index.path("p5")] == ["root", "ch2", "ch2a", "p5"]
+    assert index.is_ancestor("ch2", "p5")
+    assert not index.is_ancestor("ch1", "p5")
+
+
+def test_edits_keep_index_in_sync_with_returned_root():
+    root = _build_tree()
+    index = HierarchyIndex(root)
+    counter = itertools.count()
+
+    root = rename_node(root, "p5", "Renamed", index=index)
+    _assert_index_matches(index, root)
+    root = insert_nodes(root, "ch1", 1, [_folder("new", [_image("p7")])], index=index)
+    _assert_index_matches(index, root)
+    root = move_nodes(root, ["ch2a", "p1"], "new", 0, index=index)
+    _assert_index_matches(index, root)
+    root = move_nodes(root, ["new"], "ch2", 0, copy=True, id_factory=lambda: f"copy-{next(counter)}", index=index)
+    _assert_index_matches(index, root)
+    root = delete_nodes(root, ["ch1"], index=index)
+    _assert_index_matches(index, root)
+
+
+def test_apply_refreshes_depth_of_a_subtree_moved_between_levels():
+    root = _build_tree()
+    index = HierarchyIndex(root)
+    ch1, ch2 = root.children
+    ch2a = ch2.children[1]
+
+    # ch2a moves up to the root and ch1 moves down into it, in one path-copying edit.
+    new_ch2 = _folder("ch2", [ch2.children[0]])
+    new_ch2a = _folder("ch2a", [*ch2a.children, ch1])
+    new_root = _folder("root", [new_ch2, new_ch2a])
+    index.apply(new_root, [new_root, new_ch2, new_ch2a], reordered=["root", "ch2", "ch2a"])
+
+    _assert_index_matches(index, new_root)
+    assert (index.depth("ch2a"), index.depth("ch1"), index.depth("p1")) == (1, 2, 3)
+
+
+def _shape(root: HierarchyNode) -> dict[str, tuple[str, list[str]]]:
+    return {node_id: (node.name, _child_ids(node)) for node_id, node in collect_node_map(root).items()}
+
+
+def _replay(root: HierarchyNode, changes: list[HierarchyChange]) -> dict[str, tuple[str, list[str]]]:
+    """Apply ``changes`` to the shape of ``root`` the way a row-based view would."""
+    shape = _shape(root)
+    for change in changes:
+        if change.kind in (HierarchyChange.REMOVED, HierarchyChange.MOVED):
+            siblings = shape[change.source_parent_id][1]
+            assert siblings[change.source_row] == change.node_id
+            del siblings[change.source_row]
+        if change.kind == HierarchyChange.REMOVED:
+            stack = [change.node_id]
+            while stack:
+                stack.extend(shape.pop(stack.pop())[1])
+        elif change.kind == HierarchyChange.INSERTED:
+            shape.update(_shape(change.node))
+            shape[change.parent_id][1].insert(change.row, change.node_id)
+        elif change.kind == HierarchyChange.MOVED:
+            shape[change.parent_id][1].insert(change.row, change.node_id)
+        elif change.kind == HierarchyChange.UPDATED:
+            shape[change.node_id] = (change.node.name, shape[change.node_id][1])
+    return shape
+
+
+@pytest.mark.parametrize(
+    "edit",
+    [
+        lambda root, changes: rename_node(root, "p5", "Renamed", changes=changes),
+        lambda root, changes: insert_nodes(root, "ch1", 1, [_folder("new", [_image("p7")]), _image("p8")], changes=changes),
+        lambda root, changes: delete_nodes(root, ["p3", "p1", "ch2a", "p5"], changes=changes),
+        lambda root, changes: move_nodes(root, ["p1"], "ch1", 3, changes=changes),
+        lambda root, changes: move_nodes(root, ["p3"], "ch1", 0, changes=changes),
+        lambda root, changes: move_nodes(root, ["p3", "p4", "p1"], "ch1", 1, changes=changes),
+        lambda root, changes: move_nodes(root, ["ch2a", "p2"], "root", 1, changes=changes),
+        lambda root, changes: move_nodes(
+            root, ["ch2"], "ch1", 1, copy=True, id_factory=iter(["c1", "c2", "c3", "c4"]).__next__, changes=changes
+        ),
+    ],
+)
+def test_recorded_changes_replay_to_the_returned_tree(edit):
+    root = _build_tree()
+    changes: list[HierarchyChange] = []
+
+    updated = edit(root, changes)
+
+    assert changes
+    assert _replay(root, changes) == _shape(updated)
+
+
+def test_edit_with_index_of_other_root_raises():
+    index = HierarchyIndex(_build_tree())
+
+    with pytest.raises(ValueError):
+        rename_node(_build_tree(), "p1", "Name", index=index)
+
+
+def test_collect_node_map_handles_deep_nesting():
+    node = _image("leaf")
+    for level in range(5000):
+        node = _folder(f"f{level}", [node])
+
+    assert len(collect_node_map(node)) == 5001
+    assert HierarchyIndex(node).depth("leaf") == 5000
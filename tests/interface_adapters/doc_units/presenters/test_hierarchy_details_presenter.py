@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from unittest.mock import Mock
+
+from app.application.doc_units.events import (
+    ActiveDocUnitChanged,
+    DocUnitEventBus,
+    HierarchyLoaded,
+    HierarchySelectionChanged,
+    HierarchyUpdated,
+)
+from app.domain.doc_units.entities import AssetPointer, HierarchyNode
+from app.domain.doc_units.services import rename_node
+from app.domain.doc_units.value_objects import AssetId, DocUnitId
+from app.interface_adapters.doc_units.presenters.hierarchy_details_presenter import HierarchyDetailsPresenter
+
+
+def _page(node_id: str) -> HierarchyNode:
+    pointer = AssetPointer(asset_id=AssetId(f"asset-{node_id}"), resolver="doc_media", status="perm", path_hint=node_id)
+    return HierarchyNode(node_id=node_id, name=node_id, node_type=HierarchyNode.IMAGE_TYPE, settings={}, pointer=pointer)
+
+
+def _root() -> HierarchyNode:
+    chapter = HierarchyNode(
+        node_id="ch1", name="ch1", node_type=HierarchyNode.FOLDER_TYPE, settings={}, children=[_page("p1"), _page("p2")]
+    )
+    return HierarchyNode(node_id="root", name="root", node_type=HierarchyNode.FOLDER_TYPE, settings={}, children=[chapter])
+
+
+def _loaded(root: HierarchyNode):
+    bus = DocUnitEventBus()
+    repository = Mock()
+    active_store = Mock()
+    active_store.get.return_value = DocUnitId("unit-1")
+    media_store = Mock()
+    media_store.resolve_path.side_effect = lambda pointer: f"/assets/{pointer.asset_id.value}.png"
+    presenter = HierarchyDetailsPresenter(bus, repository, active_store, media_store)
+    view = Mock()
+    presenter.attach_view(view)
+    bus.publish(HierarchyLoaded("unit-1", root))
+    return bus, repository, media_store, view
+
+
+def _select(bus: DocUnitEventBus, node_id: str) -> None:
+    bus.publish(HierarchySelectionChanged("unit-1", node_id, [node_id]))
+
+
+def test_selection_resolves_nodes_from_the_event_root_and_caches_image_paths():
+    bus, repository, media_store, view = _loaded(_root())
+
+    for node_id in ("p1", "p2", "p1", "ch1", "p2"):
+        _select(bus, node_id)
+
+    shown = [call.args[0] for call in view.show_hierarchy_item.call_args_list]
+    assert [model.node_id for model in shown] == ["p1", "p2", "p1", "ch1", "p2"]
+    assert shown[0].image_path == "/assets/asset-p1.png"
+    assert shown[3].children_count == 2
+    repository.get_hierarchy.assert_not_called()
+    assert media_store.resolve_path.call_count == 2
+
+
+def test_updates_rebind_the_root_and_unit_changes_drop_cached_paths():
+    root = _root()
+    bus, _, media_store, view = _loaded(root)
+    _select(bus, "p1")
+
+    bus.publish(HierarchyUpdated("unit-1", rename_node(root, "p1", "Cover"), ["p1"]))
+    assert view.show_hierarchy_item.call_args[0][0].name == "Cover"
+
+    bus.publish(ActiveDocUnitChanged("unit-1"))
+    bus.publish(HierarchyLoaded("unit-1", root))
+    _select(bus, "p1")
+    assert view.show_hierarchy_item.call_args[0][0].name == "p1"
+    assert media_store.resolve_path.call_count == 2
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from unittest.mock import Mock
+
+import pytest
+
+from app.application.doc_units.events import (
+    ActiveDocUnitChanged,
+    DocUnitEventBus,
+    HierarchyLoaded,
+    HierarchyUpdated,
+)
+from app.domain.doc_units.entities import HierarchyNode
+from app.domain.doc_units.services import HierarchyChange, insert_nodes, rename_node
+from app.interface_adapters.doc_units.presenters.hierarchy_presenter import HierarchyPresenter
+
+
+def _node(node_id: str, node_type: str = HierarchyNode.FOLDER_TYPE, children=None) -> HierarchyNode:
+    return HierarchyNode(node_id=node_id, name=node_id, node_type=node_type, settings={}, children=children or [])
+
+
+def _loaded_presenter(root: HierarchyNode):
+    bus = DocUnitEventBus()
+    presenter = HierarchyPresenter(bus, Mock())
+    view = Mock()
+    view.apply_hierarchy_changes.return_value = True
+    presenter.attach_view(view)
+    bus.publish(ActiveDocUnitChanged("unit-1"))
+    bus.publish(HierarchyLoaded("unit-1", root))
+    view.reset_mock()
+    return bus, view
+
+
+def test_update_with_changes_patches_the_view_without_rebuilding():
+    root = _node("root", children=[_node("ch1", children=[_node("p1", HierarchyNode.IMAGE_TYPE)])])
+    bus, view = _loaded_presenter(root)
+    changes: list[HierarchyChange] = []
+    updated = insert_nodes(root, "root", 0, [_node("ch0", children=[_node("p0", HierarchyNode.IMAGE_TYPE)])], changes=changes)
+    updated = rename_node(updated, "ch1", "Chapter 1", changes=changes)
+
+    bus.publish(HierarchyUpdated("unit-1", updated, ["ch0"], changes=changes, previous_root=root))
+
+    view.display_hierarchy.assert_not_called()
+    root_model, (inserted, renamed), changed_ids = view.apply_hierarchy_changes.call_args[0]
+    assert root_model.source is updated
+    assert changed_ids == ["ch0"]
+    assert (inserted.kind, inserted.parent_id, inserted.row) == ("inserted", "root", 0)
+    assert [child.node_id for child in inserted.node.children] == ["p0"]
+    assert (renamed.kind, renamed.node.name, renamed.node.child_count) == ("updated", "Chapter 1", 1)
+
+
+def test_view_models_read_nodes_on_demand_without_copying_settings():
+    image = HierarchyNode(node_id="p1", name="Page", node_type=HierarchyNode.IMAGE_TYPE, settings={"dpi": 300})
+    root = _node("root", children=[_node("ch1", children=[image])])
+    bus, view = _loaded_presenter(root)
+    view.display_hierarchy.reset_mock()
+
+    bus.publish(HierarchyUpdated("unit-1", root, []))
+
+    model = view.display_hierarchy.call_args[0][0]
+    assert model.source is root and model.child_count == 1
+    page = model.children[0].children[0]
+    assert page.settings == {"dpi": 300}
+    with pytest.raises(TypeError):
+        page.settings["dpi"] = 72
+
+
+def test_update_falls_back_to_full_display_when_changes_do_not_apply():
+    root = _node("root", children=[_node("ch1")])
+    bus, view = _loaded_presenter(root)
+    renamed = rename_node(root, "ch1", "Chapter 1")
+    stale = [HierarchyChange(kind=HierarchyChange.UPDATED, node_id="ch1", node=renamed.children[0])]
+
+    bus.publish(HierarchyUpdated("unit-1", renamed, ["ch1"], changes=stale, previous_root=_node("root")))
+    view.apply_hierarchy_changes.assert_not_called()
+    assert view.display_hierarchy.call_count == 1
+
+    view.apply_hierarchy_changes.return_value = False
+    bus.publish(HierarchyUpdated("unit-1", rename_node(renamed, "ch1", "Again"), ["ch1"], changes=stale, previous_root=renamed))
+    view.apply_hierarchy_changes.assert_called_once()
+    assert view.display_hierarchy.call_count == 2
+    assert view.display_hierarchy.call_args[0][0].children[0].name == "Again"
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from unittest.mock import Mock
+
+from app.application.doc_units.use_cases.asset_preview_cache import AssetPreviewCache
+from app.domain.doc_units.entities import AssetPointer, HierarchyNode
+from app.domain.doc_units.value_objects import AssetId
+from app.interface_adapters.doc_units.presenters.hierarchy_presenter import HierarchyNodeViewModel
+from app.interface_adapters.doc_units.presenters.hierarchy_thumbnail_presenter import (
+    HierarchyThumbnailPresenter,
+)
+
+
+def _image(node_id: str) -> HierarchyNodeViewModel:
+    pointer = AssetPointer(asset_id=AssetId(f"asset-{node_id}"), resolver="doc_media", status="perm", path_hint=node_id)
+    return HierarchyNodeViewModel(
+        HierarchyNode(node_id=node_id, name=node_id, node_type=HierarchyNode.IMAGE_TYPE, settings={}, pointer=pointer)
+    )
+
+
+def _folder(node_id: str) -> HierarchyNodeViewModel:
+    return HierarchyNodeViewModel(HierarchyNode(node_id=node_id, name=node_id, node_type=HierarchyNode.FOLDER_TYPE, settings={}))
+
+
+def test_thumbnail_reports_only_successful_loads_by_node_id():
+    previews = Mock()
+    previews.request.return_value = None
+    presenter = HierarchyThumbnailPresenter(previews, edge=32)
+    ready: list[str] = []
+
+    assert presenter.thumbnail(_image("p1"), ready.append) is None
+    assert presenter.thumbnail(_folder("ch1"), ready.append) is None
+
+    previews.request.assert_called_once()
+    pointer, edge, on_ready = previews.request.call_args[0]
+    assert (pointer.asset_id.value, edge) == ("asset-p1", 32)
+    on_ready(None)
+    on_ready(b"thumb")
+    assert ready == ["p1"]
+
+
+def test_prefetch_and_retain_cover_image_nodes_only():
+    previews = Mock()
+    presenter = HierarchyThumbnailPresenter(previews, edge=32)
+    window = [_folder("ch1"), _image("p1"), _image("p2")]
+
+    presenter.retain(window)
+    presenter.prefetch(window)
+
+    previews.discard_queued.assert_called_once_with(32, {"asset-p1", "asset-p2"})
+    assert [call.kwargs["priority"] for call in previews.request.call_args_list] == [AssetPreviewCache.PRIORITY_PREFETCH] * 2
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from app.domain.doc_units.entities import DocUnit, HierarchyNode
+from app.domain.doc_units.services import rename_node
+from app.domain.doc_units.value_objects import DocUnitId, DocUnitName
+from app.domain.project.services import new_project
+from app.interface_adapters.doc_units.repositories.project_doc_unit_repository import (
+    ProjectDocUnitRepository,
+)
+from app.interface_adapters.project.repositories.fs_project_repository import FsProjectRepository
+from app.interface_adapters.project.repositories.mem_current_project_store import (
+    MemCurrentProjectStore,
+)
+
+
+def _unit_dict(name: str) -> dict:
+    return {
+        "name": name,
+        "hierarchy": {
+            "id": "root",
+            "name": "root",
+            "type": HierarchyNode.FOLDER_TYPE,
+            "settings": {},
+            "children": [{"id": "page", "name": "Page", "type": HierarchyNode.IMAGE_TYPE, "settings": {}}],
+        },
+        "metadata": {},
+    }
+
+
+def _build_repository() -> tuple[ProjectDocUnitRepository, MemCurrentProjectStore]:
+    store = MemCurrentProjectStore()
+    project = new_project("project-1", "Project")
+    project.doc_units["unit-1"] = _unit_dict("Unit 1")
+    store.set_data(project)
+    return ProjectDocUnitRepository(store), store
+
+
+def test_get_unit_returns_cached_instance():
+    repository, _ = _build_repository()
+
+    first = repository.get_unit(DocUnitId("unit-1"))
+    second = repository.get_unit(DocUnitId("unit-1"))
+
+    assert first is second
+    assert repository.stats.misses == 1
+    assert repository.stats.hits == 1
+    assert repository.stats.hit_rate == 0.5
+
+
+def test_save_hierarchy_defers_serialization_until_flush():
+    repository, store = _build_repository()
+    unit_id = DocUnitId("unit-1")
+    index = repository.get_hierarchy_index(unit_id)
+
+    updated = rename_node(index.root, "page", "Renamed", index=index)
+    repository.save_hierarchy(unit_id, updated)
+
+    project = store.get_data()
+    assert project.doc_units["unit-1"]["hierarchy"]["children"][0]["name"] == "Page"
+    assert repository.get_hierarchy(unit_id) is updated
+    assert repository.get_hierarchy_index(unit_id) is index
+
+    repository.flush()
+
+    assert project.doc_units["unit-1"]["hierarchy"]["children"][0]["name"] == "Renamed"
+    assert repository.stats.write_backs == 1
+
+
+def test_new_units_are_listed_before_flush():
+    repository, store = _build_repository()
+    repository.save_unit(
+        DocUnit(
+            unit_id=DocUnitId("unit-2"),
+            name=DocUnitName("Unit 2"),
+            created_at=None,
+            hierarchy=HierarchyNode(node_id="unit-2-root", name="root", node_type=HierarchyNode.FOLDER_TYPE),
+        )
+    )
+
+    assert [unit.unit_id.value for unit in repository.list_units()] == ["unit-1", "unit-2"]
+    assert "unit-2" not in store.get_data().doc_units
+
+    repository.delete_unit(DocUnitId("unit-2"))
+    repository.flush()
+
+    assert [unit.unit_id.value for unit in repository.list_units()] == ["unit-1"]
+    assert "unit-2" not in store.get_data().doc_units
+
+
+def test_loading_another_project_drops_cache():
+    repository, store = _build_repository()
+    repository.get_unit(DocUnitId("unit-1"))
+
+    other = new_project("project-2", "Other")
+    other.doc_units["unit-1"] = _unit_dict("Other unit")
+    store.set_data(other)
+
+    assert repository.get_unit(DocUnitId("unit-1")).name.value == "Other unit"
+
+
+def test_list_summaries_reads_names_without_hydrating_units():
+    repository, store = _build_repository()
+    store.get_data().doc_units["unit-2"] = {**_unit_dict("Unit 2"), "created_at": "2026-10-18"}
+
+    summaries = repository.list_summaries()
+
+    assert [(summary.unit_id, summary.name, summary.created_at) for summary in summaries] == [
+        ("unit-1", "Unit 1", None),
+        ("unit-2", "Unit 2", "2026-10-18"),
+    ]
+    assert repository.stats.misses == 0
+
+    unit = repository.get_unit(DocUnitId("unit-1"))
+    repository.save_unit(
+        DocUnit(unit_id=unit.unit_id, name=DocUnitName("Renamed"), created_at=None, hierarchy=unit.hierarchy)
+    )
+    repository.delete_unit(DocUnitId("unit-2"))
+
+    assert [(summary.unit_id, summary.name) for summary in repository.list_summaries()] == [("unit-1", "Renamed")]
+
+
+def test_list_summaries_of_a_saved_project_loads_no_unit_file(tmp_path):
+    project = new_project("project-1", "Project")
+    project.doc_units["unit-1"] = _unit_dict("Unit 1")
+    project.doc_units["unit-2"] = {**_unit_dict("Unit 2"), "created_at": "2026-10-18"}
+    repository_fs = FsProjectRepository()
+    meta_path = repository_fs.save(str(tmp_path), project)
+
+    store = MemCurrentProjectStore()
+    store.set_data(repository_fs.load(meta_path))
+    doc_units = store.get_data().doc_units
+    summaries = ProjectDocUnitRepository(store).list_summaries()
+
+    assert [(summary.unit_id, summary.name, summary.created_at) for summary in summaries] == [
+        ("unit-1", "Unit 1", None),
+        ("unit-2", "Unit 2", "2026-10-18"),
+    ]
+    assert not doc_units.is_loaded("unit-1") and not doc_units.is_loaded("unit-2")
+
+
+def _unit_with_pointer(name: str, status: str, path_hint: str | None) -> dict:
+    data = _unit_dict(name)
+    pointer = {"asset_id": f"{name}-asset", "resolver": "file", "status": status}
+    if path_hint:
+        pointer["path_hint"] = path_hint
+    data["hierarchy"]["children"][0]["pointer"] = pointer
+    return data
+
+
+def test_asset_references_of_a_saved_project_load_only_units_with_staged_assets(tmp_path):
+    project = new_project("project-1", "Project")
+    project.doc_units["unit-1"] = _unit_with_pointer("Unit 1", "final", "media/shared.png")
+    project.doc_units["unit-2"] = _unit_with_pointer("Unit 2", "final", "media/shared.png")
+    project.doc_units["unit-3"] = _unit_with_pointer("Unit 3", "temp", None)
+    repository_fs = FsProjectRepository()
+    meta_path = repository_fs.save(str(tmp_path), project)
+    # The counts live next to the unit files, not in the manifest.
+    assert "assets" not in json.loads(Path(meta_path).read_text(encoding="utf-8"))["doc_unit_summaries"]["unit-1"]
+
+    store = MemCurrentProjectStore()
+    store.set_data(repository_fs.load(meta_path))
+    doc_units = store.get_data().doc_units
+    repository = ProjectDocUnitRepository(store)
+
+    assert repository.asset_reference_counts() == {"media/shared.png": 2}
+    assert [unit.unit_id.value for unit in repository.units_with_staged_assets()] == ["unit-3"]
+    assert [unit_id for unit_id in doc_units if doc_units.is_loaded(unit_id)] == ["unit-3"]
+
+    unit_id = DocUnitId("unit-1")
+    hierarchy = repository.get_hierarchy(unit_id)
+    repository.save_hierarchy(
+        unit_id, HierarchyNode(node_id=hierarchy.node_id, name="root", node_type=HierarchyNode.FOLDER_TYPE)
+    )
+
+    assert repository.asset_reference_counts() == {"media/shared.png": 1}
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import io
+from pathlib import Path
+
+from app.domain.project.services import new_project
+from app.interface_adapters.media.content_addressed_media_store import (
+    ContentAddressedMediaStore,
+)
+from app.interface_adapters.project.repositories.mem_current_project_store import (
+    MemCurrentProjectStore,
+)
+
+
+class _SequentialIds:
+    def __init__(self) -> None:
+        self._next = 0
+
+    def generate(self) -> str:
+        self._next += 1
+        return f"asset-{self._next}"
+
+
+def _build_store(tmp_path: Path, **kwargs) -> ContentAddressedMediaStore:
+    store = MemCurrentProjectStore()
+    project = new_project("project-1", "Project")
+    project.metadata["project_root_path"] = str(tmp_path / "project")
+    store.set_data(project)
+    return ContentAddressedMediaStore(store, _SequentialIds(), **kwargs)
+
+
+def _write(path: Path, data: bytes) -> str:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_identical_imports_share_one_staged_file(tmp_path):
+    media = _build_store(tmp_path)
+    first = media.import_temp(_write(tmp_path / "a" / "page.png", b"same bytes"))
+    second = media.import_temp(_write(tmp_path / "b" / "copy.png", b"same bytes"))
+    other = media.import_temp(_write(tmp_path / "c.png", b"other bytes"))
+
+    assert first == second
+    assert first.asset_id.value == ContentAddressedMediaStore.hash_file(tmp_path / "a" / "page.png")
+    assert other.asset_id != first.asset_id
+    assert len(list((tmp_path / "project" / media.TEMP_DIR).iterdir())) == 2
+
+
+def test_promote_stores_blob_once_and_reimport_reuses_it(tmp_path):
+    media = _build_store(tmp_path)
+    staged = media.import_temp(_write(tmp_path / "page.png", b"page"))
+
+    [promoted] = media.promote_many([staged])
+    reimported = media.import_temp(_write(tmp_path / "again.png", b"page"))
+
+    assert promoted.status == "final"
+    assert promoted.path_hint.startswith(f"{media.CAS_DIR}/")
+    assert (tmp_path / "project" / promoted.path_hint).read_bytes() == b"page"
+    assert reimported == promoted
+
+
+def test_collect_garbage_counts_references_and_drops_unused_blobs(tmp_path):
+    media = _build_store(tmp_path)
+    kept, dropped = media.promote_many(
+        [
+            media.import_temp(_write(tmp_path / "kept.png", b"kept")),
+            media.import_temp(_write(tmp_path / "dropped.png", b"dropped")),
+        ]
+    )
+
+    deleted = media.collect_garbage({kept.path_hint: 3})
+
+    assert deleted == [dropped.path_hint]
+    assert not (tmp_path / "project" / dropped.path_hint).exists()
+    assert media.reference_count(kept) == 3
+
+    reloaded = _build_store(tmp_path)
+    assert reloaded.reference_count(kept) == 3
+    assert reloaded.collect_garbage({}) == [kept.path_hint]
+
+
+def test_blob_imported_before_collection_survives_it(tmp_path):
+    media = _build_store(tmp_path)
+    [promoted] = media.promote_many([media.import_temp(_write(tmp_path / "page.png", b"page"))])
+
+    # Imported while a save was already counting references without it.
+    reimported = media.import_temp(_write(tmp_path / "again.png", b"page"))
+    assert media.collect_garbage({}) == []
+
+    assert (tmp_path / "project" / reimported.path_hint).exists()
+    assert media.collect_garbage({}) == [promoted.path_hint]
+
+
+def test_existing_assets_are_indexed_on_first_use(tmp_path):
+    media = _build_store(tmp_path)
+    final_dir = tmp_path / "project" / media.FINAL_DIR
+    _write(final_dir / "legacy.png", b"legacy")
+    _write(final_dir / "unused.png", b"unused")
+
+    deleted = media.collect_garbage({"docs_units/assets/legacy.png": 1})
+
+    assert deleted == ["docs_units/assets/unused.png"]
+    assert (final_dir / "legacy.png").exists()
+
+
+def test_hardlink_mode_links_to_source(tmp_path):
+    media = _build_store(tmp_path, use_hardlinks=True)
+    source = tmp_path / "page.png"
+    _write(source, b"page")
+    media._reflink = lambda source, dest: False
+
+    pointer = media.import_temp(str(source))
+
+    assert (tmp_path / "project" / pointer.path_hint).stat().st_ino == source.stat().st_ino
+
+
+def test_import_stream_hashes_while_copying_and_deduplicates(tmp_path):
+    media = _build_store(tmp_path)
+    from_file = media.import_temp(_write(tmp_path / "page.png", b"page bytes"))
+
+    from_stream = media.import_stream(lambda: io.BytesIO(b"page bytes"), ".png")
+    other = media.import_stream(lambda: io.BytesIO(b"other"), ".PNG")
+
+    assert from_stream == from_file
+    assert other.path_hint.endswith(".png")
+    assert (tmp_path / "project" / other.path_hint).read_bytes() == b"other"
+    assert not list((tmp_path / "project" / media.TEMP_DIR).glob("*.part"))
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import io
+import zlib
+from pathlib import Path
+
+import pytest
+
+from app.domain.project.services import new_project
+from app.interface_adapters.media.filesystem_media_store import FileSystemMediaStore
+from app.interface_adapters.project.repositories.mem_current_project_store import (
+    MemCurrentProjectStore,
+)
+
+
+class _SequentialIds:
+    def __init__(self) -> None:
+        self._next = 0
+
+    def generate(self) -> str:
+        self._next += 1
+        return f"asset-{self._next}"
+
+
+def _build_store(tmp_path: Path, **kwargs) -> FileSystemMediaStore:
+    store = MemCurrentProjectStore()
+    project = new_project("project-1", "Project")
+    project.metadata["project_root_path"] = str(tmp_path)
+    store.set_data(project)
+    return FileSystemMediaStore(store, _SequentialIds(), **kwargs)
+
+
+def test_promote_many_moves_files_and_keeps_order(tmp_path):
+    media = _build_store(tmp_path, max_io_workers=4)
+    sources = []
+    for index in range(5):
+        source = tmp_path / f"page-{index}.png"
+        source.write_bytes(bytes([index]))
+        sources.append(media.import_temp(str(source)))
+    progress: list[tuple[int, int]] = []
+
+    promoted = media.promote_many(sources, progress=lambda done, total: progress.append((done, total)))
+
+    assert [pointer.asset_id for pointer in promoted] == [pointer.asset_id for pointer in sources]
+    assert all(pointer.status == "final" for pointer in promoted)
+    assert (tmp_path / promoted[3].path_hint).read_bytes() == bytes([3])
+    assert not (tmp_path / sources[3].path_hint).exists()
+    assert progress[-1] == (5, 5)
+
+
+def test_list_final_assets_walks_nested_directories(tmp_path):
+    media = _build_store(tmp_path)
+    final_dir = tmp_path / FileSystemMediaStore.FINAL_DIR
+    (final_dir / "unit" / "nested").mkdir(parents=True)
+    (final_dir / "a.png").write_bytes(b"a")
+    (final_dir / "unit" / "nested" / "b.png").write_bytes(b"b")
+
+    assets = media.list_final_assets()
+
+    assert sorted(assets) == ["docs_units/assets/a.png", "docs_units/assets/unit/nested/b.png"]
+
+
+def test_delete_assets_removes_files_and_empty_directories(tmp_path):
+    media = _build_store(tmp_path, max_io_workers=4)
+    final_dir = tmp_path / FileSystemMediaStore.FINAL_DIR
+    (final_dir / "unit" / "nested").mkdir(parents=True)
+    (final_dir / "keep.png").write_bytes(b"k")
+    (final_dir / "unit" / "x.png").write_bytes(b"x")
+    (final_dir / "unit" / "nested" / "y.png").write_bytes(b"y")
+
+    media.delete_assets(["docs_units/assets/unit/x.png", "docs_units/assets/unit/nested/y.png"])
+
+    assert media.list_final_assets() == ["docs_units/assets/keep.png"]
+    assert not (final_dir / "unit").exists()
+
+
+def test_collect_garbage_deletes_unreferenced_final_assets(tmp_path):
+    media = _build_store(tmp_path)
+    final_dir = tmp_path / FileSystemMediaStore.FINAL_DIR
+    final_dir.mkdir(parents=True)
+    (final_dir / "keep.png").write_bytes(b"k")
+    (final_dir / "orphan.png").write_bytes(b"o")
+
+    deleted = media.collect_garbage({"docs_units/assets/keep.png": 2})
+
+    assert deleted == ["docs_units/assets/orphan.png"]
+    assert media.list_final_assets() == ["docs_units/assets/keep.png"]
+
+
+def test_import_stream_stages_stream_contents(tmp_path):
+    media = _build_store(tmp_path)
+
+    pointer = media.import_stream(lambda: io.BytesIO(b"member"), ".png")
+
+    assert pointer.status == "tmp"
+    assert pointer.path_hint == "temp/doc_units/asset-1.png"
+    assert (tmp_path / pointer.path_hint).read_bytes() == b"member"
+
+
+class _CorruptMember(io.BytesIO):
+    def read(self, size=-1):
+        if self.tell():
+            raise zlib.error("Error -3 while decompressing data")
+        return super().read(4)
+
+
+def test_import_stream_removes_the_partial_copy_of_a_corrupt_member(tmp_path):
+    media = _build_store(tmp_path)
+
+    with pytest.raises(zlib.error):
+        media.import_stream(lambda: _CorruptMember(b"member"), ".png")
+
+    assert list((tmp_path / "temp" / "doc_units").iterdir()) == []
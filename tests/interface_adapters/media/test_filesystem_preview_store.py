@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from app.domain.project.services import new_project
+from app.interface_adapters.media.filesystem_preview_store import FileSystemPreviewStore
+from app.interface_adapters.project.repositories.mem_current_project_store import (
+    MemCurrentProjectStore,
+)
+
+
+def test_previews_round_trip_under_project_temp_dir(tmp_path: Path):
+    project_store = MemCurrentProjectStore()
+    project = new_project("project-1", "Project")
+    project.metadata["project_root_path"] = str(tmp_path)
+    project_store.set_data(project)
+    store = FileSystemPreviewStore(project_store)
+
+    assert store.get("abc-1-64") is None
+    store.put("abc-1-64", b"preview")
+
+    assert store.get("abc-1-64") == b"preview"
+    assert (tmp_path / "temp" / "previews" / "ab" / "abc-1-64.preview").is_file()
+
+
+def test_nothing_is_cached_without_a_project():
+    store = FileSystemPreviewStore(MemCurrentProjectStore())
+
+    store.put("abc-1-64", b"preview")
+
+    assert store.get("abc-1-64") is None
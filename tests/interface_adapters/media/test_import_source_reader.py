@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import zipfile
+
+import pytest
+
+from app.interface_adapters.media.import_source_reader import FileSystemImportSourceReader
+
+
+def _layout(entries):
+    return [("/".join(entry.folders), entry.name, entry.suffix) for entry in entries]
+
+
+def test_directory_entries_are_nested_and_naturally_ordered(tmp_path):
+    source = tmp_path / "Volume 1"
+    (source / "Chapter 10").mkdir(parents=True)
+    (source / "Chapter 2").mkdir()
+    for path in ("page10.png", "page2.JPG", "notes.txt", ".hidden.png", "Chapter 10/001.png", "Chapter 2/001.png"):
+        (source / path).write_bytes(path.encode())
+
+    entries = FileSystemImportSourceReader().read_entries(str(source))
+
+    assert _layout(entries) == [
+        ("", "page2", ".jpg"),
+        ("", "page10", ".png"),
+        ("Chapter 2", "001", ".png"),
+        ("Chapter 10", "001", ".png"),
+    ]
+    with entries[0].open() as stream:
+        assert stream.read() == b"page2.JPG"
+
+
+def test_archive_entries_stream_members_without_extracting(tmp_path):
+    archive_path = tmp_path / "volume.cbz"
+    with zipfile.ZipFile(archive_path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("ch1/p1.png", b"one" * 1000)
+        archive.writestr("ch1/", b"")
+        archive.writestr("__MACOSX/ch1/._p1.png", b"junk")
+        archive.writestr("cover.webp", b"cover")
+
+    entries = FileSystemImportSourceReader().read_entries(str(archive_path))
+
+    assert _layout(entries) == [("", "cover", ".webp"), ("ch1", "p1", ".png")]
+    with entries[1].open() as stream:
+        assert stream.read(3) == b"one"
+        assert len(stream.read()) == 2997
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["volume.cbz"]
+
+
+def test_unsupported_source_is_rejected(tmp_path):
+    source = tmp_path / "page.png"
+    source.write_bytes(b"png")
+
+    with pytest.raises(ValueError):
+        FileSystemImportSourceReader().read_entries(str(source))
+    with pytest.raises(FileNotFoundError):
+        FileSystemImportSourceReader().read_entries(str(tmp_path / "missing"))
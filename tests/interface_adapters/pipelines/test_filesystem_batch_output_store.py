@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from app.application.pipelines.dto import PageRecord
+from app.interface_adapters.pipelines.stores.filesystem_batch_output_store import FileSystemBatchOutputStore
+
+
+def _finish(store: FileSystemBatchOutputStore, node_id: str, path: str, fingerprint: str = "fp") -> None:
+    with open(path, "wb") as handle:
+        handle.write(b"page")
+    store.record(PageRecord(node_id, fingerprint, path))
+
+
+def _path(store: FileSystemBatchOutputStore, page_name: str, node_id: str) -> str:
+    return store.paths_for([(node_id, [], page_name)])[node_id]
+
+
+def test_paths_for_uses_folder_names_and_separates_same_named_pages(tmp_path):
+    store = FileSystemBatchOutputStore(str(tmp_path))
+    pages = [("a", ["Chapter 1"], "001"), ("b", ["Chapter 1"], "001"), ("c", ["Chapter 1"], "002"), ("d", [], "001")]
+
+    paths = store.paths_for(pages)
+
+    assert paths == {
+        "a": str(tmp_path / "Chapter 1" / "001-a.png"),
+        "b": str(tmp_path / "Chapter 1" / "001-b.png"),
+        "c": str(tmp_path / "Chapter 1" / "002.png"),
+        "d": str(tmp_path / "001.png"),
+    }
+    assert FileSystemBatchOutputStore(str(tmp_path)).paths_for(list(reversed(pages))) == paths
+
+
+def test_records_survive_a_new_store_and_later_lines_win(tmp_path):
+    store = FileSystemBatchOutputStore(str(tmp_path))
+    _finish(store, "a", _path(store, "001", "a"), "old")
+    _finish(store, "b", _path(store, "002", "b"))
+    _finish(store, "a", _path(store, "001", "a"), "new")
+
+    completed = FileSystemBatchOutputStore(str(tmp_path)).completed()
+
+    assert set(completed) == {"a", "b"}
+    assert completed["a"].fingerprint == "new"
+
+
+def test_torn_line_is_ignored_and_next_record_still_reads(tmp_path):
+    store = FileSystemBatchOutputStore(str(tmp_path))
+    _finish(store, "a", _path(store, "001", "a"))
+    with store.journal_path.open("ab") as journal:
+        journal.write(b'{"node_id": "b", "finger')
+    _finish(store, "c", _path(store, "003", "c"))
+
+    assert set(store.completed()) == {"a", "c"}
+
+
+def test_pages_whose_output_is_gone_are_not_completed(tmp_path):
+    store = FileSystemBatchOutputStore(str(tmp_path))
+    path = _path(store, "001", "a")
+    _finish(store, "a", path)
+
+    (tmp_path / "001.png").unlink()
+
+    assert store.completed() == {}
+
+
+def test_clear_forgets_finished_pages_but_keeps_their_files(tmp_path):
+    store = FileSystemBatchOutputStore(str(tmp_path))
+    _finish(store, "a", _path(store, "001", "a"))
+
+    store.clear()
+
+    assert store.completed() == {}
+    assert (tmp_path / "001.png").exists()
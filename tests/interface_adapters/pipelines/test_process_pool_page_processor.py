@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+cv2 = pytest.importorskip("cv2")
+np = pytest.importorskip("numpy")
+
+from app.application.pipelines.dto import PageJob  # noqa: E402
+from app.interface_adapters.pipelines.runners.process_pool_page_processor import ProcessPoolPageProcessor  # noqa: E402
+from app.interface_adapters.pipelines.runners.pyflow_page_processor import (  # noqa: E402
+    PyFlowPageProcessor,
+    initialize_pyflow,
+)
+
+
+def _run_fake_page(source_path: str):
+    name = Path(source_path).stem
+    if name == "crash":
+        os._exit(3)
+    if name == "bad":
+        raise ValueError("unreadable page")
+    value = int(name)
+    # Earlier pages take longer, so they finish out of order.
+    time.sleep(max(0, 4 - value) * 0.05)
+    return np.full((3, 4, 3), value, np.uint8), {"Fake": 0.5}
+
+
+def _load_fake_runner():
+    return _run_fake_page
+
+
+def _load_broken_runner():
+    raise ValueError("no such graph")
+
+
+@pytest.fixture
+def make_pool(tmp_path):
+    graph = tmp_path / "pipeline.pygraph"
+    graph.write_text("{}")
+    pools = []
+
+    def make(load_runner=_load_fake_runner, **kwargs):
+        pool = ProcessPoolPageProcessor(str(graph), load_runner=load_runner, **kwargs)
+        pools.append(pool)
+        return pool
+
+    yield make
+    for pool in pools:
+        pool.close()
+
+
+def _jobs(tmp_path, names, taken=None):
+    for name in names:
+        if taken is not None:
+            taken.append(name)
+        yield PageJob(name, f"/pages/{name}.png", str(tmp_path / "out" / f"{name}.png"))
+
+
+def test_pages_are_written_and_yielded_in_order_with_bounded_lookahead(tmp_path, make_pool):
+    pool = make_pool(workers=2, max_pending=3)
+    names = [str(value) for value in range(6)]
+    taken = []
+
+    outcomes = []
+    for outcome in pool.process_many(_jobs(tmp_path, names, taken)):
+        assert len(taken) - len(outcomes) <= 3
+        outcomes.append(outcome)
+
+    assert [outcome.job.node_id for outcome in outcomes] == names
+    assert all(outcome.error is None and outcome.node_seconds == {"Fake": 0.5} for outcome in outcomes)
+    for name in names:
+        assert cv2.imread(str(tmp_path / "out" / f"{name}.png")).mean() == int(name)
+
+
+def test_failing_and_crashing_pages_fail_alone(tmp_path, make_pool):
+    pool = make_pool(workers=2)
+
+    outcomes = list(pool.process_many(_jobs(tmp_path, ["1", "crash", "bad", "2"])))
+
+    errors = {outcome.job.node_id: outcome.error for outcome in outcomes}
+    assert errors["1"] is None and errors["2"] is None
+    assert errors["bad"] == "unreadable page"
+    assert "died" in errors["crash"]
+    assert pool.process("/pages/3.png", str(tmp_path / "again.png")) == {"Fake": 0.5}
+
+
+def test_unloadable_graph_stops_the_batch(tmp_path, make_pool):
+    pool = make_pool(load_runner=_load_broken_runner, workers=1)
+
+    with pytest.raises(RuntimeError, match="no such graph"):
+        list(pool.process_many(_jobs(tmp_path, ["1"])))
+
+
+def test_workers_run_the_saved_graph(tmp_path):
+    from PyFlow import getRawNodeInstance
+    from PyFlow.Core import GraphManager
+    from PyFlow.Core.Common import connectPins
+
+    initialize_pyflow()
+    manager = GraphManager()
+    source = getRawNodeInstance(PyFlowPageProcessor.INPUT_NODE_CLASS, "MangaTranslator")
+    result = getRawNodeInstance(PyFlowPageProcessor.OUTPUT_NODE_CLASS, "MangaTranslator")
+    manager.activeGraph().addNode(source)
+    manager.activeGraph().addNode(result)
+    connectPins(source.image_out_pin, result.pipeline_result_image_input_pin)
+    graph = tmp_path / "copy.pygraph"
+    graph.write_text(json.dumps(manager.serialize()))
+
+    pool = ProcessPoolPageProcessor(str(graph), workers=2)
+    try:
+        jobs = []
+        for value in (5, 9, 13):
+            source = tmp_path / f"in-{value}.png"
+            cv2.imwrite(str(source), np.full((4, 6, 3), value, np.uint8))
+            jobs.append(PageJob(str(value), str(source), str(tmp_path / "out" / f"{value}.png")))
+
+        outcomes = list(pool.process_many(jobs))
+    finally:
+        pool.close()
+
+    assert [outcome.error for outcome in outcomes] == [None, None, None]
+    for value in (5, 9, 13):
+        assert cv2.imread(str(tmp_path / "out" / f"{value}.png")).mean() == value
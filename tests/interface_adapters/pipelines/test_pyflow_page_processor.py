@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+cv2 = pytest.importorskip("cv2")
+np = pytest.importorskip("numpy")
+
+from app.interface_adapters.pipelines.runners.pyflow_page_processor import (  # noqa: E402
+    PyFlowPageProcessor,
+    initialize_pyflow,
+)
+
+
+def _write_graph(path, connect: bool = True) -> None:
+    from PyFlow import getRawNodeInstance
+    from PyFlow.Core import GraphManager
+    from PyFlow.Core.Common import connectPins
+
+    initialize_pyflow()
+    manager = GraphManager()
+    source = getRawNodeInstance(PyFlowPageProcessor.INPUT_NODE_CLASS, "MangaTranslator")
+    result = getRawNodeInstance(PyFlowPageProcessor.OUTPUT_NODE_CLASS, "MangaTranslator")
+    manager.activeGraph().addNode(source)
+    manager.activeGraph().addNode(result)
+    if connect:
+        connectPins(source.image_out_pin, result.pipeline_result_image_input_pin)
+    path.write_text(json.dumps(manager.serialize()))
+
+
+def test_processor_feeds_each_page_through_the_saved_graph(tmp_path):
+    graph = tmp_path / "copy.pygraph"
+    _write_graph(graph)
+    processor = PyFlowPageProcessor(str(graph))
+
+    for value in (7, 42):
+        source = tmp_path / f"in-{value}.png"
+        cv2.imwrite(str(source), np.full((4, 6, 3), value, np.uint8))
+        output = tmp_path / "out" / f"{value}.png"
+
+        timings = processor.process(str(source), str(output))
+
+        assert cv2.imread(str(output)).mean() == value
+        assert PyFlowPageProcessor.INPUT_NODE_CLASS in timings
+
+
+def test_processor_fingerprint_follows_the_graph_file(tmp_path):
+    graph = tmp_path / "copy.pygraph"
+    _write_graph(graph)
+    first = PyFlowPageProcessor(str(graph)).fingerprint
+
+    assert PyFlowPageProcessor(str(graph)).fingerprint == first
+    graph.write_text(graph.read_text() + " ")
+    assert PyFlowPageProcessor(str(graph)).fingerprint != first
+
+
+def test_processor_reports_a_graph_that_yields_no_image(tmp_path):
+    graph = tmp_path / "unconnected.pygraph"
+    _write_graph(graph, connect=False)
+    source = tmp_path / "in.png"
+    cv2.imwrite(str(source), np.zeros((2, 2, 3), np.uint8))
+
+    with pytest.raises(RuntimeError):
+        PyFlowPageProcessor(str(graph)).process(str(source), str(tmp_path / "out.png"))
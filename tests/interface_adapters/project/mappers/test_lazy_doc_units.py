@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from app.interface_adapters.project.mappers.lazy_doc_units import LazyDocUnitMap
+
+
+def _loader(unit_id: str) -> dict:
+    return {"name": f"loaded {unit_id}"}
+
+
+def test_membership_and_iteration_do_not_load_units():
+    calls: list[str] = []
+    mapping = LazyDocUnitMap(["a", "b"], lambda unit_id: calls.append(unit_id) or {})
+
+    assert "a" in mapping and list(mapping) == ["a", "b"] and len(mapping) == 2
+    assert calls == []
+
+
+def test_marking_snapshot_clean_keeps_changes_made_after_it():
+    live = LazyDocUnitMap(["a", "b"], _loader, origin="old")
+    live["a"] = {"name": "saved"}
+    live["b"] = {"name": "saved"}
+    snapshot = live.snapshot()
+
+    live["b"] = {"name": "edited during save"}
+    del live["a"]
+    snapshot.mark_clean("new", _loader)
+
+    assert live.origin == "new"
+    assert live.dirty_ids == ["b"]
+    assert live.removed_ids == ["a"]
+    assert snapshot["b"] == {"name": "saved"}
+
+
+def _unit_with_asset(path_hint: str) -> dict:
+    page = {"id": "p", "type": "image", "pointer": {"asset_id": "a", "status": "final", "path_hint": path_hint}}
+    return {"name": "unit", "hierarchy": {"id": "root", "type": "folder", "children": [page]}}
+
+
+def test_asset_references_use_stored_counts_until_the_unit_changes():
+    loads: list[str] = []
+    mapping = LazyDocUnitMap(
+        ["a"],
+        lambda unit_id: loads.append(unit_id) or _unit_with_asset("stored.png"),
+        summaries={"a": {"name": "unit", "created_at": None, "staged_assets": False}},
+        references_loader=lambda unit_id: {"stored.png": 1},
+    )
+
+    assert mapping.asset_references("a") == {"stored.png": 1}
+    assert mapping.summary("a")["name"] == "unit"
+    assert loads == []
+
+    mapping["a"] = _unit_with_asset("new.png")
+    assert mapping.asset_references("a") == {"new.png": 1}
+    assert "assets" not in mapping.summary("a")
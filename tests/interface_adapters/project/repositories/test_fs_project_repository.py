@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from app.application.project.errors import ProjectIdMismatchError
+from app.domain.project.services import new_project
+from app.interface_adapters.project.mappers.lazy_doc_units import LazyDocUnitMap
+from app.interface_adapters.project.repositories.fs_project_repository import (
+    FsProjectRepository,
+)
+from app.interface_adapters.project.serialization.project_serializer import (
+    JsonSerializer,
+)
+
+
+def _unit_dict(name: str) -> dict:
+    return {
+        "name": name,
+        "hierarchy": {"id": "root", "name": "root", "type": "folder", "settings": {}, "children": []},
+        "metadata": {},
+    }
+
+
+def _saved_project(tmp_path: Path, **kwargs) -> tuple[FsProjectRepository, Path]:
+    repository = FsProjectRepository(**kwargs)
+    project = new_project("project-1", "Project")
+    project.doc_units["unit-1"] = _unit_dict("Unit 1")
+    project.doc_units["unit-2"] = _unit_dict("Unit 2")
+    meta_path = Path(repository.save(str(tmp_path), project))
+    return repository, meta_path
+
+
+def test_save_writes_manifest_and_one_file_per_unit(tmp_path):
+    _, meta_path = _saved_project(tmp_path)
+
+    manifest = json.loads(meta_path.read_text(encoding="utf-8"))
+    units_dir = meta_path.parent / FsProjectRepository.DOC_UNITS_DIR
+
+    assert manifest["schema_version"] == 3
+    assert manifest["doc_unit_ids"] == ["unit-1", "unit-2"]
+    assert "doc_units" not in manifest
+    assert json.loads((units_dir / "unit-2.mtunit").read_text(encoding="utf-8"))["name"] == "Unit 2"
+
+
+def test_load_reads_units_on_first_access(tmp_path):
+    repository, meta_path = _saved_project(tmp_path)
+
+    project = repository.load(str(meta_path.parent))
+
+    assert isinstance(project.doc_units, LazyDocUnitMap)
+    assert list(project.doc_units) == ["unit-1", "unit-2"]
+    assert not project.doc_units.is_loaded("unit-1")
+    assert project.doc_units["unit-1"]["name"] == "Unit 1"
+    assert project.doc_units.is_loaded("unit-1")
+    assert not project.doc_units.is_loaded("unit-2")
+
+
+def test_snapshot_save_rewrites_only_dirty_units_and_drops_deleted_ones(tmp_path):
+    repository, meta_path = _saved_project(tmp_path, journal_compaction_bytes=0)
+    units_dir = meta_path.parent / FsProjectRepository.DOC_UNITS_DIR
+    project = repository.load(str(meta_path.parent))
+    (units_dir / "unit-1.mtunit").write_text("not json", encoding="utf-8")
+
+    project.doc_units["unit-3"] = _unit_dict("Unit 3")
+    del project.doc_units["unit-2"]
+    repository.save(str(meta_path.parent), project)
+
+    assert (units_dir / "unit-1.mtunit").read_text(encoding="utf-8") == "not json"
+    assert not (units_dir / "unit-2.mtunit").exists()
+    assert json.loads((units_dir / "unit-3.mtunit").read_text(encoding="utf-8"))["name"] == "Unit 3"
+    assert json.loads(meta_path.read_text(encoding="utf-8"))["doc_unit_ids"] == ["unit-1", "unit-3"]
+
+
+def test_snapshot_interrupted_before_the_manifest_keeps_the_old_units(tmp_path, monkeypatch):
+    repository, meta_path = _saved_project(tmp_path, journal_compaction_bytes=0)
+    project = repository.load(str(meta_path.parent))
+    project.doc_units["unit-1"] = _unit_dict("Renamed")
+    project.doc_units["unit-2"] = _unit_dict("Renamed too")
+    write = repository._write
+
+    def crash_on_manifest(path, payload, serializer):
+        if path == meta_path:
+            raise OSError("disk full")
+        write(path, payload, serializer)
+
+    monkeypatch.setattr(repository, "_write", crash_on_manifest)
+    with pytest.raises(OSError):
+        repository.save(str(meta_path.parent), project)
+    monkeypatch.undo()
+
+    reloaded = repository.load(str(meta_path.parent))
+    assert [reloaded.doc_units[unit_id]["name"] for unit_id in reloaded.doc_units] == ["Unit 1", "Unit 2"]
+
+    reloaded.doc_units["unit-1"] = _unit_dict("Saved")
+    repository.save(str(meta_path.parent), reloaded)
+    units_dir = meta_path.parent / FsProjectRepository.DOC_UNITS_DIR
+    assert sorted(path.name for path in units_dir.iterdir()) == [
+        "unit-1.mtrefs",
+        "unit-1.mtunit",
+        "unit-2.mtrefs",
+        "unit-2.mtunit",
+    ]
+    assert json.loads((units_dir / "unit-1.mtunit").read_text(encoding="utf-8"))["name"] == "Saved"
+
+
+def test_snapshot_interrupted_after_the_manifest_loads_the_new_units(tmp_path, monkeypatch):
+    repository, meta_path = _saved_project(tmp_path, journal_compaction_bytes=0)
+    units_dir = meta_path.parent / FsProjectRepository.DOC_UNITS_DIR
+    project = repository.load(str(meta_path.parent))
+    project.doc_units["unit-1"] = _unit_dict("Renamed")
+
+    monkeypatch.setattr(repository, "_promote_staged_units", lambda *args: None)
+    repository.save(str(meta_path.parent), project)
+    monkeypatch.undo()
+
+    assert json.loads((units_dir / "unit-1.mtunit").read_text(encoding="utf-8"))["name"] == "Unit 1"
+    reloaded = repository.load(str(meta_path.parent))
+    assert reloaded.doc_units["unit-1"]["name"] == "Renamed"
+
+    reloaded.doc_units["unit-2"] = _unit_dict("Saved")
+    repository.save(str(meta_path.parent), reloaded)
+    assert sorted(path.name for path in units_dir.iterdir()) == [
+        "unit-1.mtrefs",
+        "unit-1.mtunit",
+        "unit-2.mtrefs",
+        "unit-2.mtunit",
+    ]
+    assert json.loads((units_dir / "unit-1.mtunit").read_text(encoding="utf-8"))["name"] == "Renamed"
+
+
+def test_load_migrates_inline_schema_2_project(tmp_path):
+    meta_path = tmp_path / FsProjectRepository.PROJECT_META_FILE_NAME
+    meta_path.write_text(
+        json.dumps(
+            {
+                "schema_version": 2,
+                "project_id": "project-1",
+                "project_name": "Project",
+                "doc_units": {"unit-1": _unit_dict("Unit 1")},
+                "last_active_doc_unit_id": "unit-1",
+                "metadata": {},
+            }
+        ),
+        encoding="utf-8",
+    )
+    repository = FsProjectRepository()
+
+    project = repository.load(str(tmp_path))
+    assert project.doc_units["unit-1"]["name"] == "Unit 1"
+    repository.save(str(tmp_path), project)
+
+    manifest = json.loads(meta_path.read_text(encoding="utf-8"))
+    assert manifest["schema_version"] == 3
+    assert manifest["last_active_doc_unit_id"] == "unit-1"
+    assert (tmp_path / "docs_units" / "unit-1.mtunit").is_file()
+
+
+def test_save_rejects_manifest_of_another_project(tmp_path):
+    repository, meta_path = _saved_project(tmp_path)
+    other = new_project("project-2", "Other")
+
+    with pytest.raises(ProjectIdMismatchError):
+        repository.save(str(meta_path.parent), other)
+
+
+def test_save_does_not_read_the_manifest_it_loaded(tmp_path, monkeypatch):
+    repository, meta_path = _saved_project(tmp_path)
+    project = repository.load(str(meta_path.parent))
+    read = []
+    original_read = repository._read
+    monkeypatch.setattr(repository, "_read", lambda path: read.append(path) or original_read(path))
+
+    project.doc_units["unit-1"] = _unit_dict("Renamed")
+    repository.save(str(meta_path.parent), project)
+    repository.save(str(meta_path.parent), project)
+
+    assert meta_path not in read
+    with pytest.raises(ProjectIdMismatchError):
+        repository.save(str(meta_path.parent), new_project("project-2", "Other"))
+
+
+def test_incremental_save_appends_journal_and_load_replays_it(tmp_path):
+    repository, meta_path = _saved_project(tmp_path)
+    units_dir = meta_path.parent / FsProjectRepository.DOC_UNITS_DIR
+    snapshot = meta_path.read_bytes()
+    project = repository.load(str(meta_path.parent))
+
+    project.doc_units["unit-1"] = _unit_dict("Renamed")
+    del project.doc_units["unit-2"]
+    project.last_active_doc_unit_id = "unit-1"
+    repository.save(str(meta_path.parent), project)
+
+    assert meta_path.read_bytes() == snapshot
+    assert json.loads((units_dir / "unit-1.mtunit").read_text(encoding="utf-8"))["name"] == "Unit 1"
+    reloaded = repository.load(str(meta_path.parent))
+    assert list(reloaded.doc_units) == ["unit-1"]
+    assert reloaded.doc_units["unit-1"]["name"] == "Renamed"
+    assert reloaded.last_active_doc_unit_id == "unit-1"
+
+
+def test_load_ignores_torn_journal_tail(tmp_path):
+    repository, meta_path = _saved_project(tmp_path)
+    project = repository.load(str(meta_path.parent))
+    project.doc_units["unit-1"] = _unit_dict("Renamed")
+    repository.save(str(meta_path.parent), project)
+    journal_path = meta_path.with_suffix(FsProjectRepository.JOURNAL_FILE_SUFFIX)
+    with journal_path.open("a", encoding="utf-8") as handle:
+        handle.write('{"generation": 1, "manifest": {"proj')
+
+    reloaded = repository.load(str(meta_path.parent))
+
+    assert reloaded.doc_units["unit-1"]["name"] == "Renamed"
+
+
+def test_save_after_a_torn_journal_tail_writes_a_snapshot(tmp_path):
+    repository, meta_path = _saved_project(tmp_path)
+    project = repository.load(str(meta_path.parent))
+    journal_path = meta_path.with_suffix(FsProjectRepository.JOURNAL_FILE_SUFFIX)
+    journal_path.write_text('{"generation": 1, "manifest": {"proj', encoding="utf-8")
+
+    project.doc_units["unit-1"] = _unit_dict("Renamed")
+    repository.save(str(meta_path.parent), project)
+
+    assert not journal_path.exists()
+    assert repository.load(str(meta_path.parent)).doc_units["unit-1"]["name"] == "Renamed"
+
+
+def test_save_compacts_journal_past_threshold(tmp_path):
+    repository, meta_path = _saved_project(tmp_path, journal_compaction_bytes=1)
+    units_dir = meta_path.parent / FsProjectRepository.DOC_UNITS_DIR
+    journal_path = meta_path.with_suffix(FsProjectRepository.JOURNAL_FILE_SUFFIX)
+    project = repository.load(str(meta_path.parent))
+
+    project.doc_units["unit-1"] = _unit_dict("Journaled")
+    repository.save(str(meta_path.parent), project)
+    assert journal_path.is_file()
+    project.doc_units["unit-2"] = _unit_dict("Snapshot")
+    repository.save(str(meta_path.parent), project)
+
+    assert not journal_path.exists()
+    assert json.loads((units_dir / "unit-1.mtunit").read_text(encoding="utf-8"))["name"] == "Journaled"
+    assert json.loads((units_dir / "unit-2.mtunit").read_text(encoding="utf-8"))["name"] == "Snapshot"
+
+
+def test_load_skips_journal_of_previous_generation(tmp_path):
+    repository, meta_path = _saved_project(tmp_path, journal_compaction_bytes=1)
+    journal_path = meta_path.with_suffix(FsProjectRepository.JOURNAL_FILE_SUFFIX)
+    project = repository.load(str(meta_path.parent))
+    project.doc_units["unit-1"] = _unit_dict("Stale")
+    repository.save(str(meta_path.parent), project)
+    stale_journal = journal_path.read_bytes()
+    project.doc_units["unit-1"] = _unit_dict("Fresh")
+    repository.save(str(meta_path.parent), project)
+
+    # Simulate a crash between the snapshot and the journal removal.
+    journal_path.write_bytes(stale_journal)
+    reloaded = repository.load(str(meta_path.parent))
+
+    assert reloaded.doc_units["unit-1"]["name"] == "Fresh"
+
+
+def test_load_reads_units_written_with_another_codec(tmp_path):
+    repository, meta_path = _saved_project(tmp_path, doc_unit_serializer=JsonSerializer(indent=2))
+
+    project = FsProjectRepository().load(str(meta_path.parent))
+
+    assert project.doc_units["unit-2"]["name"] == "Unit 2"
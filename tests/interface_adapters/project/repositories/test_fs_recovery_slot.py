@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from app.domain.project.services import new_project
+from app.interface_adapters.project.mappers.lazy_doc_units import LazyDocUnitMap
+from app.interface_adapters.project.repositories.fs_project_repository import FsProjectRepository
+from app.interface_adapters.project.repositories.fs_recovery_slot import FsRecoverySlot
+
+
+def _project(tmp_path):
+    project = new_project("project-1", "Project")
+    project.metadata["project_root_path"] = str(tmp_path)
+    project.doc_units = LazyDocUnitMap(["a", "b"], lambda unit_id: {"name": f"saved {unit_id}"}, origin="x")
+    return project
+
+
+def test_write_stores_only_units_changed_since_previous_autosave(tmp_path):
+    slot = FsRecoverySlot()
+    project = _project(tmp_path)
+    slot_dir = tmp_path / FsRecoverySlot.RECOVERY_DIR
+
+    project.doc_units["a"] = {"name": "edited a"}
+    slot.write(project)
+    (slot_dir / "a.mtunit").write_text("{}", encoding="utf-8")
+    project.doc_units["b"] = {"name": "edited b"}
+    slot.write(project)
+
+    assert (slot_dir / "a.mtunit").read_text(encoding="utf-8") == "{}"
+    assert (slot_dir / "b.mtunit").is_file()
+
+
+def test_restore_reapplies_recovered_changes(tmp_path):
+    slot = FsRecoverySlot()
+    crashed = _project(tmp_path)
+    crashed.doc_units["a"] = {"name": "edited a"}
+    del crashed.doc_units["b"]
+    slot.write(crashed)
+
+    reopened = _project(tmp_path)
+    recovered = slot.restore(reopened)
+
+    assert recovered == ["a"]
+    assert list(reopened.doc_units) == ["a"]
+    assert reopened.doc_units["a"] == {"name": "edited a"}
+    assert reopened.doc_units.dirty_ids == ["a"]
+
+
+def test_clear_removes_slot(tmp_path):
+    slot = FsRecoverySlot()
+    project = _project(tmp_path)
+    project.doc_units["a"] = {"name": "edited a"}
+    slot.write(project)
+
+    slot.clear(project)
+
+    assert not (tmp_path / FsRecoverySlot.RECOVERY_DIR).exists()
+
+
+def _saved_project(tmp_path):
+    project = new_project("project-1", "Project")
+    project.doc_units["a"] = {"name": "saved a"}
+    project.doc_units["b"] = {"name": "saved b"}
+    repository = FsProjectRepository()
+    meta_path = repository.save(str(tmp_path), project)
+    return repository, meta_path
+
+
+def test_loading_a_project_with_a_newer_slot_offers_and_restores_it(tmp_path):
+    repository, meta_path = _saved_project(tmp_path)
+    crashed = repository.load(meta_path)
+    crashed.doc_units["a"] = {"name": "edited a"}
+    slot = FsRecoverySlot()
+    slot.write(crashed)
+
+    reopened = repository.load(meta_path)
+
+    assert slot.pending(reopened)
+    assert slot.restore(reopened) == ["a"]
+    assert reopened.doc_units["a"] == {"name": "edited a"}
+    assert reopened.doc_units["b"] == {"name": "saved b"}
+
+
+def test_slot_older_than_the_last_save_is_not_offered(tmp_path):
+    repository, meta_path = _saved_project(tmp_path)
+    project = repository.load(meta_path)
+    project.doc_units["a"] = {"name": "edited a"}
+    slot = FsRecoverySlot()
+    slot.write(project)
+    manifest = Path(meta_path).parent / FsRecoverySlot.RECOVERY_DIR / FsRecoverySlot.MANIFEST_FILE_NAME
+    saved_at = Path(meta_path).stat().st_mtime_ns
+    os.utime(manifest, ns=(saved_at - 1_000_000_000, saved_at - 1_000_000_000))
+
+    assert not slot.pending(repository.load(meta_path))
+    assert not slot.pending(_project(tmp_path / "elsewhere"))
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from app.interface_adapters.project.repositories.project_journal import ProjectJournal
+from app.interface_adapters.project.serialization.project_serializer import JsonSerializer
+
+
+def _append(journal: ProjectJournal, name: str) -> None:
+    journal.append(0, {"project_name": name}, {name: {"name": name}}, [])
+
+
+def test_appends_after_a_torn_line_are_replayed(tmp_path):
+    journal = ProjectJournal(tmp_path / "project.mtjournal", JsonSerializer())
+    _append(journal, "first")
+    with journal.path.open("ab") as handle:
+        handle.write(b'{"generation": 0, "manifest": {"proj')
+    assert journal.has_torn_tail()
+
+    _append(journal, "second")
+    _append(journal, "third")
+    state = journal.replay(0)
+
+    assert not journal.has_torn_tail()
+    assert state.batches == 3
+    assert state.manifest == {"project_name": "third"}
+    assert list(state.puts) == ["first", "second", "third"]
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import pytest
+
+from app.interface_adapters.project.serialization.project_serializer import (
+    JsonSerializer,
+    MsgpackSerializer,
+    default_serializer,
+    serializer_for,
+    serializer_named,
+)
+
+_PAYLOAD = {"name": "Chapter ✓", "children": [{"id": "a", "settings": {"dpi": 300}}]}
+
+
+def test_json_serializer_round_trips_non_ascii():
+    serializer = JsonSerializer()
+
+    data = serializer.dumps(_PAYLOAD)
+
+    assert "✓".encode("utf-8") in data
+    assert serializer.loads(data) == _PAYLOAD
+
+
+def test_serializer_for_reads_output_of_any_json_codec():
+    for data in (JsonSerializer(indent=2).dumps(_PAYLOAD), default_serializer().dumps(_PAYLOAD)):
+        assert serializer_for(data).loads(data) == _PAYLOAD
+
+
+def test_serializer_for_detects_msgpack():
+    pytest.importorskip("msgpack")
+    data = MsgpackSerializer().dumps(_PAYLOAD)
+
+    assert serializer_for(data).name == "msgpack"
+    assert serializer_for(data).loads(data) == _PAYLOAD
+
+
+def test_serializer_named_picks_the_configured_codec():
+    assert serializer_named("json").name == default_serializer().name
+    with pytest.raises(ValueError):
+        serializer_named("yaml")
+
+
+def test_serializer_named_falls_back_to_json_without_msgpack(monkeypatch):
+    from app.interface_adapters.project.serialization import project_serializer
+
+    monkeypatch.setattr(project_serializer, "msgpack", None)
+
+    assert serializer_named("msgpack").name == default_serializer().name